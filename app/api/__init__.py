@@ -4,6 +4,7 @@ API routes and endpoints.
 
 from fastapi import APIRouter
 
+from app.api.documents import router as documents_router
 from app.api.health import router as health_router
 
 # Main API router
@@ -11,7 +12,8 @@ router = APIRouter()
 
 # Include sub-routers
 router.include_router(health_router)
+router.include_router(documents_router)
 
-__all__ = ["router", "health_router"]
+__all__ = ["router", "health_router", "documents_router"]
 
 
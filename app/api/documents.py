@@ -0,0 +1,173 @@
+"""
+Streaming document upload endpoint.
+
+JSON-RPC tool calls carry a document as one string, so rag_ingest holds the
+whole document in every process it passes through. This endpoint takes the
+raw content as the request body and ingests it while it arrives: nothing
+holds more than one MinIO multipart part of it.
+
+The endpoint is outside the MCP middleware stack and applies the same
+checks: OAuth 2.0 Bearer token or API key, tenant membership, the tenant
+context used by RLS and the ingestion roles, the per-tenant rate limit and
+an audit log entry.
+"""
+
+import asyncio
+import json
+import time
+from ipaddress import ip_address as parse_ip_address
+from typing import Optional
+
+import structlog
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import JSONResponse
+
+from app.config.settings import settings
+from app.mcp.middleware.audit import log_audit_event
+from app.mcp.middleware.auth import authenticate_request, get_auth_method_from_context
+from app.mcp.middleware.rate_limit import enforce_rate_limit
+from app.mcp.middleware.tenant import tenant_context, validate_tenant_membership
+from app.mcp.tools.document_ingestion import ingest_document_stream
+from app.utils.errors import RateLimitExceededError, ValidationError, handle_error
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+def _client_ip(request: Request) -> Optional[str]:
+    """
+    Get the client IP of a request.
+    
+    X-Forwarded-For is only honoured when the connection comes from a
+    proxy in TRUSTED_PROXY_IPS: the client is the last address not added
+    by a trusted proxy. Any other client could forge the header.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        str: Client IP address, or None if unknown
+    """
+    peer = request.client.host if request.client else None
+    trusted = set(settings.trusted_proxy_ips)
+    if peer is None or peer not in trusted:
+        return peer
+    
+    client = peer
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        try:
+            parse_ip_address(hop)
+        except ValueError:
+            break
+        client = hop
+        if hop not in trusted:
+            break
+    return client
+
+
+@router.post("/stream")
+async def stream_document(
+    request: Request,
+    title: str,
+    tenant_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+    filename: Optional[str] = None,
+    document_type: Optional[str] = None,
+    metadata: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    x_api_key: Optional[str] = Header(None),
+):
+    """
+    Ingest a document streamed as the request body (UTF-8 text).
+    
+    Args:
+        request: Request whose body is the document content
+        title: Document title
+        tenant_id: Tenant UUID (optional, taken from the credentials if not provided)
+        document_id: Document UUID (optional, auto-generated if not provided)
+        filename: Original file name (optional)
+        document_type: Document type (optional, defaults to the Content-Type)
+        metadata: Further metadata fields as a JSON object (optional)
+    
+    Returns:
+        dict: Ingestion result, as returned by rag_ingest
+    """
+    ip_address = _client_ip(request)
+    auth_context = None
+    start_time = time.monotonic()
+    result = None
+    error = None
+    try:
+        auth_context = await authenticate_request(
+            authorization_header=authorization,
+            api_key_header=x_api_key,
+            ip_address=ip_address,
+        )
+        # Uber Admin can access any tenant
+        if auth_context.role != "uber_admin":
+            await validate_tenant_membership(auth_context.user_id, auth_context.tenant_id)
+        
+        with tenant_context(auth_context.tenant_id, auth_context.user_id, auth_context.role):
+            await enforce_rate_limit(auth_context.tenant_id, auth_context.user_id, auth_context.role)
+            
+            document_metadata = {}
+            if metadata:
+                try:
+                    document_metadata = json.loads(metadata)
+                except ValueError:
+                    document_metadata = None
+                if not isinstance(document_metadata, dict):
+                    raise ValidationError(
+                        "metadata must be a JSON object.",
+                        field="metadata",
+                        error_code="FR-VALIDATION-001"
+                    )
+            document_metadata.update({
+                "title": title,
+                "type": document_type or request.headers.get("content-type") or "text/plain",
+            })
+            if filename:
+                document_metadata["filename"] = filename
+            
+            result = await ingest_document_stream(
+                request.stream(),
+                document_metadata,
+                tenant_id=tenant_id,
+                document_id=document_id,
+            )
+            return result
+    except Exception as e:
+        error = handle_error(e)
+        logger.warning(
+            "Streamed document upload rejected",
+            status_code=error["status_code"],
+            error=str(e),
+        )
+        headers = None
+        if isinstance(e, RateLimitExceededError):
+            headers = {"Retry-After": str(error["error"]["details"]["retry_after"])}
+        return JSONResponse(status_code=error["status_code"], content=error, headers=headers)
+    finally:
+        # Authentication failures are logged by authenticate_request
+        if auth_context is not None:
+            asyncio.create_task(
+                log_audit_event(
+                    action="rag_ingest_stream",
+                    resource_type="rag_operation",
+                    resource_id=(result or {}).get("document_id") or document_id,
+                    tenant_id=auth_context.tenant_id,
+                    user_id=auth_context.user_id,
+                    role=auth_context.role,
+                    auth_method=get_auth_method_from_context(),
+                    success=error is None,
+                    details={
+                        "title": title,
+                        "ingestion_status": (result or {}).get("ingestion_status"),
+                        "error_code": error["error"]["code"] if error else None,
+                        "duration_ms": round((time.monotonic() - start_time) * 1000, 1),
+                    },
+                    ip_address=ip_address,
+                )
+            )
@@ -0,0 +1,108 @@
+"""
+Embedding generation configuration using Pydantic Settings.
+"""
+
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class EmbeddingSettings(BaseSettings):
+    """Embedding generation configuration."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        env_prefix="EMBEDDING_",
+    )
+
+    # Request coalescing (micro-batching)
+    batch_max_wait_ms: float = Field(
+        default=5.0,
+        description="Time concurrent embedding requests are collected before one batched backend call",
+    )
+    batch_max_size: int = Field(
+        default=64, description="Texts per batched backend call; a full batch is sent without waiting"
+    )
+
+    # Embedding cache (in-process LRU in front of Redis)
+    cache_enabled: bool = Field(default=True, description="Reuse embeddings of previously embedded texts")
+    cache_max_entries: int = Field(
+        default=10_000, description="Embeddings kept in the in-process LRU tier per worker"
+    )
+    cache_redis_enabled: bool = Field(
+        default=True, description="Share cached embeddings across workers and restarts through Redis"
+    )
+    cache_ttl_seconds: int = Field(
+        default=30 * 24 * 3600, description="Lifetime of embeddings cached in Redis (0 = no expiry)"
+    )
+
+    # OpenAI fallback backend
+    openai_base_url: Optional[str] = Field(
+        default=None,
+        description="OpenAI-compatible API base URL, e.g. a local stub server (defaults to OPENAI_BASE_URL or api.openai.com)",
+    )
+    openai_max_batch_inputs: int = Field(default=2048, description="Maximum inputs per embeddings request")
+    openai_max_batch_tokens: int = Field(default=300_000, description="Maximum estimated tokens per embeddings request")
+    openai_max_concurrency: int = Field(default=4, description="Embeddings requests in flight per worker")
+    openai_max_connections: int = Field(default=16, description="Connections in the shared HTTP pool")
+    openai_timeout_seconds: float = Field(default=30.0, description="Timeout of one embeddings request")
+    openai_max_retries: int = Field(default=2, description="Retries of a failed embeddings request")
+
+    # GPU-AI MCP server
+    gpu_ai_dimension: int = Field(default=384, description="Vector dimension of GPU-AI embedding models")
+
+    # GPU-AI task completion
+    gpu_ai_poll_initial_ms: float = Field(
+        default=10.0, description="Delay before the first status poll of a GPU-AI embedding task"
+    )
+    gpu_ai_poll_max_ms: float = Field(
+        default=250.0, description="Cap of the doubling delay between status polls of one task"
+    )
+    gpu_ai_poll_jitter: float = Field(default=0.2, description="Relative random spread of status poll delays")
+    gpu_ai_task_timeout_seconds: float = Field(
+        default=60.0, description="Maximum time to wait for a GPU-AI embedding task"
+    )
+
+    # Scheduling of embedding traffic
+    scheduler_max_in_flight: int = Field(default=16, description="Embedding requests in flight per worker")
+    scheduler_interactive_reserved: int = Field(
+        default=4, description="In-flight slots reserved for interactive (query) embeddings"
+    )
+    gpu_ai_breaker_error_rate: float = Field(
+        default=0.5, description="GPU-AI failure ratio that opens the circuit breaker"
+    )
+    gpu_ai_breaker_min_requests: int = Field(
+        default=10, description="GPU-AI calls within the window before the failure ratio is considered"
+    )
+    gpu_ai_breaker_window_seconds: float = Field(default=30.0, description="Window of GPU-AI call outcomes considered")
+    gpu_ai_breaker_cooldown_seconds: float = Field(
+        default=15.0, description="Time GPU-AI is bypassed once the breaker opens"
+    )
+
+    # In-process providers, selected per tenant by model_configuration["embedding_model"]
+    hashing_model_name: str = Field(
+        default="hashing", description="Model name of the deterministic feature-hashing provider"
+    )
+    hashing_dimension: int = Field(default=384, description="Vector dimension of the feature-hashing provider")
+    local_model_name: str = Field(default="local", description="Model name of the local model provider")
+    local_model_path: Optional[str] = Field(
+        default=None,
+        description="Directory of a sentence-transformers model to serve in-process (unset = provider disabled)",
+    )
+    local_model_dimension: Optional[int] = Field(
+        default=None,
+        description="Vector dimension of the local model (unset = read from the model, which loads it)",
+    )
+    local_model_pool: str = Field(
+        default="thread", description="Pool running the local model: 'thread' or 'process'"
+    )
+    local_model_workers: int = Field(default=1, description="Worker threads or processes of the local model pool")
+    local_model_batch_size: int = Field(default=32, description="Texts per forward pass of the local model")
+
+
+# Global embedding settings instance
+embedding_settings = EmbeddingSettings()
@@ -19,25 +19,86 @@ class FAISSSettings(BaseSettings):
 
     # FAISS Index Configuration
     index_path: str = Field(default="/data/faiss_indices", description="FAISS index storage path")
-    index_type: str = Field(default="IndexFlatL2", description="FAISS index type")
+    index_type: str = Field(
+        default="IndexFlatL2",
+        description="FAISS index type (IndexFlatL2, IndexFlatIP, IVFFlat, IVFPQ, HNSW, or auto)",
+    )
+    metric: str = Field(default="L2", description="Distance metric for non-flat index types (L2 or IP)")
     dimension: int = Field(default=768, description="Vector dimension")
-    use_mmap: bool = Field(default=True, description="Use memory-mapped files for persistence")
-
-
-# Global FAISS settings instance
-faiss_settings = FAISSSettings()
-
-
-
-
-
-
-
-
-
-
+    use_mmap: bool = Field(
+        default=True,
+        description="Open indices memory-mapped read-only so workers share them through the page cache",
+    )
+    snapshot_max_pending_vectors: int = Field(
+        default=1_000,
+        description="Vectors added since the last snapshot that trigger rewriting the index file",
+    )
+    snapshot_interval_seconds: float = Field(
+        default=30.0,
+        description="Maximum age of an unsnapshotted vector before the index file is rewritten (0 disables)",
+    )
+    vector_log_fsync: bool = Field(
+        default=True, description="fsync the append-only vector log after every commit"
+    )
+    mmap_delta_max_vectors: int = Field(
+        default=10_000,
+        description="Vectors buffered in the writable delta before it is merged into the memory-mapped index",
+    )
+    executor_max_workers: int = Field(
+        default=0,
+        description="Threads running FAISS searches and index I/O off the event loop (0 = min(4, CPUs))",
+    )
+    omp_threads_per_worker: int = Field(
+        default=0,
+        description="FAISS OpenMP threads per executor thread (0 = CPUs / executor_max_workers)",
+    )
+    tombstone_compaction_ratio: float = Field(
+        default=0.2,
+        description="Fraction of deleted-but-still-stored vectors that triggers a background index rebuild (0 disables)",
+    )
 
+    # Approximate index parameters
+    ivf_nprobe: int = Field(default=16, description="Default number of IVF lists probed per query")
+    ivf_min_train_points_per_list: int = Field(
+        default=39, description="Minimum training vectors per IVF list before IVF is used"
+    )
+    ivf_max_train_points_per_list: int = Field(
+        default=256, description="Maximum training vectors sampled per IVF list"
+    )
+    pq_m: int = Field(default=16, description="Number of PQ sub-quantizers for IVFPQ")
+    pq_nbits: int = Field(default=8, description="Bits per PQ code for IVFPQ")
+    hnsw_m: int = Field(default=32, description="HNSW graph neighbours per node")
+    hnsw_ef_construction: int = Field(default=200, description="HNSW efConstruction")
+    hnsw_ef_search: int = Field(default=64, description="Default HNSW efSearch")
+    search_effort: float = Field(
+        default=1.0,
+        description="Default recall/latency multiplier applied to nprobe/efSearch at query time",
+    )
+    filter_max_effort_boost: float = Field(
+        default=8.0,
+        description="Maximum search_effort multiplier applied to selective filtered searches on approximate indices",
+    )
 
+    # "auto" index type policy
+    auto_approximate_type: str = Field(
+        default="IVFFlat", description="Index type used by 'auto' once a tenant crosses auto_ivf_threshold"
+    )
+    auto_ivf_threshold: int = Field(
+        default=50_000, description="Vector count at which 'auto' moves a tenant off Flat"
+    )
+    auto_ivfpq_threshold: int = Field(
+        default=1_000_000, description="Vector count at which 'auto' moves a tenant to IVFPQ"
+    )
 
+    # Loaded index cache
+    cache_max_bytes: int = Field(
+        default=2 * 1024**3,
+        description="Memory budget for loaded tenant indices per worker in bytes (0 disables eviction)",
+    )
+    pinned_tenants: str = Field(
+        default="", description="Comma-separated tenant IDs whose indices are never evicted"
+    )
 
 
+# Global FAISS settings instance
+faiss_settings = FAISSSettings()
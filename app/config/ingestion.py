@@ -0,0 +1,70 @@
+"""
+Document ingestion configuration using Pydantic Settings.
+"""
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class IngestionSettings(BaseSettings):
+    """Document ingestion configuration."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        env_prefix="INGESTION_",
+    )
+
+    # Bulk ingestion (rag_ingest_batch)
+    batch_max_documents: int = Field(default=500, description="Maximum documents per rag_ingest_batch call")
+    embedding_batch_size: int = Field(
+        default=64, description="Texts per embedding request of a batch (bounded by the model's own limits)"
+    )
+    upload_concurrency: int = Field(default=8, description="MinIO uploads in flight per batch")
+
+    # Chunking (one FAISS vector per passage)
+    chunk_size_tokens: int = Field(default=256, description="Tokens per chunk embedded as one vector")
+    chunk_overlap_tokens: int = Field(default=32, description="Tokens shared by consecutive chunks")
+    chunk_max_per_document: int = Field(
+        default=1024, description="Maximum chunks per document (the remainder is merged into the last chunk)"
+    )
+    chunk_aggregation: str = Field(
+        default="max",
+        description="How chunk scores combine into a document score: 'max' (best passage) or 'sum' (all matching passages)",
+    )
+    chunk_search_oversample: int = Field(
+        default=4, description="Chunk hits fetched per requested document when chunks crowd out documents"
+    )
+
+    # Streamed uploads (POST /api/documents/stream)
+    stream_max_bytes: int = Field(default=512 * 1024 * 1024, description="Maximum size of a streamed document upload")
+    stream_part_size_bytes: int = Field(
+        default=16 * 1024 * 1024,
+        description="MinIO multipart part size of streamed uploads (at least 5 MiB); bounds the memory of one upload",
+    )
+    stream_read_chunk_bytes: int = Field(
+        default=1024 * 1024, description="Bytes per read when streamed content is read back from MinIO"
+    )
+
+    # Asynchronous ingestion (outbox drained by background indexers)
+    outbox_enabled: bool = Field(
+        default=True,
+        description="Queue rag_ingest documents for the background indexers instead of indexing inline",
+    )
+    indexer_workers: int = Field(default=2, description="Background indexer workers per process")
+    indexer_batch_size: int = Field(default=64, description="Outbox entries claimed per indexer batch")
+    indexer_poll_interval_seconds: float = Field(
+        default=1.0, description="Idle wait between outbox polls when not woken by a new document"
+    )
+    indexer_lease_seconds: float = Field(
+        default=300.0, description="Time an indexer has to finish a claimed batch before it is retried"
+    )
+    indexer_max_attempts: int = Field(default=5, description="Indexing attempts before a document is marked failed")
+    indexer_retry_base_seconds: float = Field(default=2.0, description="Delay before the first retry (doubled per attempt)")
+    indexer_retry_max_seconds: float = Field(default=300.0, description="Cap of the delay between retries")
+
+
+# Global ingestion settings instance
+ingestion_settings = IngestionSettings()
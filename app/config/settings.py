@@ -3,6 +3,8 @@ Base settings configuration using Pydantic Settings.
 All service-specific configurations inherit from this base class.
 """
 
+from typing import List
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -33,6 +35,9 @@ class Settings(BaseSettings):
     tenant_isolation_enabled: bool = Field(default=True, description="Enable tenant isolation")
     tenant_id_header: str = Field(default="X-Tenant-ID", description="HTTP header for tenant ID")
     tenant_validation_enabled: bool = Field(default=True, description="Enable tenant validation")
+    tenant_config_cache_ttl_seconds: float = Field(
+        default=60.0, description="Seconds a worker serves tenant configuration from memory (0 disables)"
+    )
 
     # Compliance Configuration
     audit_logging_enabled: bool = Field(default=True, description="Enable audit logging")
@@ -43,6 +48,11 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = Field(default=1000, description="Rate limit per tenant per minute")
     rate_limit_window_seconds: int = Field(default=60, description="Rate limit window in seconds")
 
+    # Reverse proxies whose X-Forwarded-For header is trusted (REST endpoints)
+    trusted_proxy_ips: List[str] = Field(
+        default_factory=list, description="Reverse proxy IPs whose X-Forwarded-For header names the client"
+    )
+
     # Feature Flags
     feature_multimodal: bool = Field(default=False, description="Enable multimodal processing")
     feature_cross_modal_search: bool = Field(default=False, description="Enable cross-modal search")
@@ -0,0 +1,48 @@
+"""
+Add FAISS vector ID to documents.
+
+Revision ID: 007_add_document_faiss_id
+Revises: 006_create_custom_variables
+Create Date: 2026-10-16
+
+Adds a faiss_id column with a unique (tenant_id, faiss_id) index so FAISS
+search hits can be resolved to documents with a single indexed lookup.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '007_add_document_faiss_id'
+down_revision: Union[str, None] = '006_create_custom_variables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('faiss_id', sa.BigInteger(), nullable=True))
+    
+    # Backfill existing rows with the same derivation as
+    # app.services.faiss_manager.document_id_to_faiss_id: the first 8 bytes
+    # of the UUID as a big-endian integer, masked to a positive int64.
+    op.execute("""
+        UPDATE documents
+        SET faiss_id = (
+            ('x' || substr(replace(document_id::text, '-', ''), 1, 16))::bit(64)::bigint
+            & 9223372036854775807
+        )
+        WHERE faiss_id IS NULL
+    """)
+    
+    op.create_index(
+        'ix_documents_tenant_id_faiss_id',
+        'documents',
+        ['tenant_id', 'faiss_id'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_tenant_id_faiss_id', table_name='documents')
+    op.drop_column('documents', 'faiss_id')
@@ -0,0 +1,81 @@
+"""
+Add the ingestion outbox.
+
+Revision ID: 008_add_ingestion_outbox
+Revises: 007_add_document_faiss_id
+Create Date: 2026-10-16
+
+Adds the ingestion_outbox table, written in the same transaction as a
+document row and drained by the background ingestion indexer into MinIO,
+FAISS and Meilisearch.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '008_add_ingestion_outbox'
+down_revision: Union[str, None] = '007_add_document_faiss_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingestion_outbox',
+        sa.Column('outbox_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('document_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=False),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('metadata', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('document_created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('indexed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.document_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('outbox_id'),
+    )
+    op.create_index(op.f('ix_ingestion_outbox_tenant_id'), 'ingestion_outbox', ['tenant_id'], unique=False)
+    op.create_index(op.f('ix_ingestion_outbox_document_id'), 'ingestion_outbox', ['document_id'], unique=False)
+    op.create_index(
+        'ix_ingestion_outbox_status_next_attempt_at',
+        'ingestion_outbox',
+        ['status', 'next_attempt_at'],
+        unique=False,
+    )
+    
+    # Enable RLS on ingestion_outbox table
+    op.execute("ALTER TABLE ingestion_outbox ENABLE ROW LEVEL SECURITY")
+    
+    # Create RLS policy for tenant isolation
+    op.execute("""
+        CREATE POLICY ingestion_outbox_isolation_policy ON ingestion_outbox
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+    
+    # Create RLS policy for Uber Admin bypass (the indexer claims entries of every tenant)
+    op.execute("""
+        CREATE POLICY ingestion_outbox_uber_admin_bypass ON ingestion_outbox
+        FOR ALL
+        USING (current_setting('app.current_role', true) = 'uber_admin')
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policies
+    op.execute("DROP POLICY IF EXISTS ingestion_outbox_uber_admin_bypass ON ingestion_outbox")
+    op.execute("DROP POLICY IF EXISTS ingestion_outbox_isolation_policy ON ingestion_outbox")
+    
+    op.drop_index('ix_ingestion_outbox_status_next_attempt_at', table_name='ingestion_outbox')
+    op.drop_index(op.f('ix_ingestion_outbox_document_id'), table_name='ingestion_outbox')
+    op.drop_index(op.f('ix_ingestion_outbox_tenant_id'), table_name='ingestion_outbox')
+    op.drop_table('ingestion_outbox')
@@ -0,0 +1,75 @@
+"""
+Add document chunks.
+
+Revision ID: 009_add_document_chunks
+Revises: 008_add_ingestion_outbox
+Create Date: 2026-10-16
+
+Adds the document_chunks table holding the FAISS vector ID and character
+offsets of every embedded passage, with a unique (tenant_id, faiss_id)
+index so chunk hits resolve to documents and passages in one lookup.
+Documents indexed before chunking have no rows and keep resolving through
+documents.faiss_id.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '009_add_document_chunks'
+down_revision: Union[str, None] = '008_add_ingestion_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_chunks',
+        sa.Column('document_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('chunk_no', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('faiss_id', sa.BigInteger(), nullable=False),
+        sa.Column('start_offset', sa.Integer(), nullable=False),
+        sa.Column('end_offset', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.document_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.tenant_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('document_id', 'chunk_no'),
+    )
+    op.create_index(op.f('ix_document_chunks_tenant_id'), 'document_chunks', ['tenant_id'], unique=False)
+    op.create_index(
+        'ix_document_chunks_tenant_id_faiss_id',
+        'document_chunks',
+        ['tenant_id', 'faiss_id'],
+        unique=True,
+    )
+    
+    # Enable RLS on document_chunks table
+    op.execute("ALTER TABLE document_chunks ENABLE ROW LEVEL SECURITY")
+    
+    # Create RLS policy for tenant isolation
+    op.execute("""
+        CREATE POLICY document_chunks_isolation_policy ON document_chunks
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+    
+    # Create RLS policy for Uber Admin bypass
+    op.execute("""
+        CREATE POLICY document_chunks_uber_admin_bypass ON document_chunks
+        FOR ALL
+        USING (current_setting('app.current_role', true) = 'uber_admin')
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policies
+    op.execute("DROP POLICY IF EXISTS document_chunks_uber_admin_bypass ON document_chunks")
+    op.execute("DROP POLICY IF EXISTS document_chunks_isolation_policy ON document_chunks")
+    
+    op.drop_index('ix_document_chunks_tenant_id_faiss_id', table_name='document_chunks')
+    op.drop_index(op.f('ix_document_chunks_tenant_id'), table_name='document_chunks')
+    op.drop_table('document_chunks')
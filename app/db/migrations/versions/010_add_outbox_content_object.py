@@ -0,0 +1,29 @@
+"""
+Add content object reference to the ingestion outbox.
+
+Revision ID: 010_add_outbox_content_object
+Revises: 009_add_document_chunks
+Create Date: 2026-10-16
+
+Streamed uploads are written to MinIO before their document is queued, so
+their outbox entries reference the uploaded object (content_object) instead
+of carrying the content.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '010_add_outbox_content_object'
+down_revision: Union[str, None] = '009_add_document_chunks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ingestion_outbox', sa.Column('content_object', sa.String(length=1024), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingestion_outbox', 'content_object')
@@ -4,7 +4,9 @@ Database models for the application.
 
 from app.db.models.audit_log import AuditLog
 from app.db.models.document import Document
+from app.db.models.document_chunk import DocumentChunk
 from app.db.models.document_version import DocumentVersion
+from app.db.models.ingestion_outbox import IngestionOutbox
 from app.db.models.template import Template
 from app.db.models.tenant import Tenant
 from app.db.models.tenant_api_key import TenantApiKey
@@ -15,7 +17,9 @@ __all__ = [
     "Tenant",
     "User",
     "Document",
+    "DocumentChunk",
     "DocumentVersion",
+    "IngestionOutbox",
     "AuditLog",
     "TenantApiKey",
     "Template",
@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
-from sqlalchemy import String, ForeignKey, JSON, Text, Integer, DateTime
+from sqlalchemy import BigInteger, String, ForeignKey, JSON, Text, Integer, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -71,6 +71,11 @@ class Document(TenantScopedModel):
         default=1,
         comment="Current version number (starts at 1)"
     )
+    faiss_id: Mapped[int | None] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="Stable 64-bit FAISS vector ID derived from document_id"
+    )
     deleted_at: Mapped[datetime | None] = mapped_column(
         "deleted_at",
         DateTime(timezone=True),
@@ -96,6 +101,11 @@ class Document(TenantScopedModel):
         order_by="DocumentVersion.version_number"
     )
     
+    # Constraints
+    __table_args__ = (
+        Index("ix_documents_tenant_id_faiss_id", "tenant_id", "faiss_id", unique=True),
+    )
+    
     def __repr__(self) -> str:
         return f"<Document(document_id={self.document_id}, title={self.title}, tenant_id={self.tenant_id}, user_id={self.user_id}, version={self.version_number})>"
 
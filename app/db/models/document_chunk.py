@@ -0,0 +1,67 @@
+"""
+DocumentChunk model for the passages of a document indexed in FAISS.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import TenantScopedModel
+
+
+class DocumentChunk(TenantScopedModel):
+    """
+    DocumentChunk model representing one embedded passage of a document.
+    
+    Each chunk is a separate vector in the tenant's FAISS index. Its
+    character offsets locate the passage in the document content, so a
+    search hit can be shown as a snippet without re-chunking the document.
+    """
+    
+    __tablename__ = "document_chunks"
+    
+    document_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("documents.document_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+        comment="Foreign key to documents table"
+    )
+    chunk_no: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        nullable=False,
+        comment="Position of the chunk in the document, from 0"
+    )
+    tenant_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("tenants.tenant_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="Foreign key to tenants table"
+    )
+    faiss_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="FAISS vector ID of the chunk (see faiss_manager.chunk_faiss_id)"
+    )
+    start_offset: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Offset of the passage's first character in the document content"
+    )
+    end_offset: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Offset just past the passage's last character"
+    )
+    
+    # Constraints
+    __table_args__ = (
+        Index("ix_document_chunks_tenant_id_faiss_id", "tenant_id", "faiss_id", unique=True),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<DocumentChunk(document_id={self.document_id}, chunk_no={self.chunk_no}, start={self.start_offset}, end={self.end_offset})>"
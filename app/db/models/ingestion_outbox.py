@@ -0,0 +1,117 @@
+"""
+IngestionOutbox model for documents waiting to be indexed.
+"""
+
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import ForeignKey, Integer, String, Text, JSON, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import TenantScopedModel
+
+# Outbox entry statuses
+OUTBOX_PENDING = "pending"
+OUTBOX_PROCESSING = "processing"
+OUTBOX_INDEXED = "indexed"
+OUTBOX_FAILED = "failed"
+OUTBOX_SUPERSEDED = "superseded"
+OUTBOX_CANCELLED = "cancelled"
+
+
+class IngestionOutbox(TenantScopedModel):
+    """
+    IngestionOutbox model representing one document version to index.
+    
+    Written in the same transaction as the document row, so every committed
+    document is indexed into MinIO, FAISS and Meilisearch by the background
+    ingestion indexer, which drains the outbox with retries.
+    """
+    
+    __tablename__ = "ingestion_outbox"
+    
+    outbox_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        nullable=False,
+        comment="Unique identifier for the outbox entry"
+    )
+    tenant_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.tenant_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="Foreign key to tenants table"
+    )
+    document_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.document_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="Foreign key to documents table"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=OUTBOX_PENDING,
+        comment="Indexing status (pending, processing, indexed, failed, superseded, cancelled)"
+    )
+    title: Mapped[str] = mapped_column(
+        String(500),
+        nullable=False,
+        comment="Document title"
+    )
+    content: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Document content to index (cleared once indexed)"
+    )
+    content_object: Mapped[str | None] = mapped_column(
+        String(1024),
+        nullable=True,
+        comment="MinIO object holding the content of a streamed upload (instead of content)"
+    )
+    metadata_json: Mapped[dict[str, Any] | None] = mapped_column(
+        "metadata",
+        JSON,
+        nullable=True,
+        comment="Document metadata (JSON)"
+    )
+    document_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Creation time of the document, used by filtered searches"
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Indexing attempts made so far"
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        comment="Earliest time of the next attempt (lease expiry while processing)"
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Error of the last failed attempt"
+    )
+    indexed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Time the document was indexed"
+    )
+    
+    # Constraints
+    __table_args__ = (
+        Index("ix_ingestion_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<IngestionOutbox(outbox_id={self.outbox_id}, document_id={self.document_id}, status={self.status}, attempts={self.attempts})>"
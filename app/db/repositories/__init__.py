@@ -6,6 +6,7 @@ from app.db.repositories.audit_log_repository import AuditLogRepository
 from app.db.repositories.base_repository import BaseRepository
 from app.db.repositories.document_repository import DocumentRepository
 from app.db.repositories.document_version_repository import DocumentVersionRepository
+from app.db.repositories.ingestion_outbox_repository import IngestionOutboxRepository
 from app.db.repositories.template_repository import TemplateRepository
 from app.db.repositories.tenant_api_key_repository import TenantApiKeyRepository
 from app.db.repositories.tenant_config_repository import TenantConfigRepository
@@ -18,6 +19,7 @@ __all__ = [
     "UserRepository",
     "DocumentRepository",
     "DocumentVersionRepository",
+    "IngestionOutboxRepository",
     "AuditLogRepository",
     "TenantApiKeyRepository",
     "TemplateRepository",
@@ -5,7 +5,7 @@ Base repository class for database operations.
 from typing import Generic, TypeVar, Type, Optional, List, Any
 from uuid import UUID
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -96,6 +96,20 @@ class BaseRepository(Generic[ModelType]):
         await self.session.refresh(instance)
         return instance
     
+    async def bulk_create(self, rows: List[dict[str, Any]]) -> None:
+        """
+        Insert many records with one multi-row INSERT.
+        
+        Skips the ORM unit of work: rows are not loaded back into the session.
+        
+        Args:
+            rows: Column values of each record
+        """
+        if not rows:
+            return
+        await self.session.execute(insert(self.model), rows)
+        await self.session.flush()
+    
     async def update(self, id: UUID, **kwargs) -> Optional[ModelType]:
         """
         Update a record by ID.
@@ -2,13 +2,16 @@
 Repository for Document model operations.
 """
 
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, Dict, Optional, List, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import BigInteger, String, any_, bindparam, delete, insert, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.document import Document
+from app.db.models.document_chunk import DocumentChunk
 from app.db.repositories.base_repository import BaseRepository
 
 
@@ -40,6 +43,49 @@ class DocumentRepository(BaseRepository[Document]):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_existing(
+        self,
+        tenant_id: UUID,
+        content_hashes: List[str],
+        document_ids: Optional[List[UUID]] = None,
+    ) -> List[Tuple[UUID, str]]:
+        """
+        Find a tenant's documents matching any of many content hashes or IDs.
+        
+        One query serves the deduplication of a whole ingestion batch.
+        
+        Args:
+            tenant_id: Tenant ID
+            content_hashes: SHA-256 hashes of document contents
+            document_ids: Optional explicitly requested document IDs
+            
+        Returns:
+            List of (document_id, content_hash) of every matching document
+        """
+        conditions = []
+        if content_hashes:
+            conditions.append(
+                Document.content_hash == any_(
+                    bindparam("content_hashes", value=list(content_hashes), type_=ARRAY(String))
+                )
+            )
+        if document_ids:
+            conditions.append(
+                Document.document_id == any_(
+                    bindparam("document_ids", value=list(document_ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+                )
+            )
+        if not conditions:
+            return []
+        
+        query = select(Document.document_id, Document.content_hash).where(
+            Document.tenant_id == tenant_id,
+            or_(*conditions),
+        )
+        
+        result = await self.session.execute(query)
+        return [(document_id, content_hash) for document_id, content_hash in result.all()]
+    
     async def get_by_user(
         self,
         user_id: UUID,
@@ -85,15 +131,142 @@ class DocumentRepository(BaseRepository[Document]):
             List of Document instances
         """
         return await self.get_all(skip=skip, limit=limit, tenant_id=tenant_id)
-
-
-
-
-
-
-
-
-
-
-
-
+    
+    async def get_document_ids_by_faiss_ids(
+        self,
+        tenant_id: UUID,
+        faiss_ids: List[int],
+    ) -> Dict[int, UUID]:
+        """
+        Resolve FAISS vector IDs to live (non-deleted) document IDs.
+        
+        Issues a single ``faiss_id = ANY(:faiss_ids)`` query served by the
+        unique (tenant_id, faiss_id) index, selecting only the ID columns so
+        cost scales with the number of hits rather than the tenant's corpus.
+        
+        Args:
+            tenant_id: Tenant ID
+            faiss_ids: FAISS vector IDs returned by search
+            
+        Returns:
+            Dict mapping faiss_id to document_id for every live match
+        """
+        if not faiss_ids:
+            return {}
+        
+        query = select(Document.faiss_id, Document.document_id).where(
+            Document.tenant_id == tenant_id,
+            Document.faiss_id == any_(
+                bindparam("faiss_ids", value=list(faiss_ids), type_=ARRAY(BigInteger))
+            ),
+            Document.deleted_at.is_(None),
+        )
+        
+        result = await self.session.execute(query)
+        return {faiss_id: document_id for faiss_id, document_id in result.all()}
+    
+    async def get_passages_by_faiss_ids(
+        self,
+        tenant_id: UUID,
+        faiss_ids: List[int],
+    ) -> Dict[int, Tuple[UUID, int, int, int]]:
+        """
+        Resolve FAISS chunk vector IDs to live documents and passage offsets.
+        
+        Issues a single ``faiss_id = ANY(:faiss_ids)`` query served by the
+        unique (tenant_id, faiss_id) index of document_chunks, joined to the
+        documents table to exclude soft-deleted documents. Documents indexed
+        before chunking have no chunk rows; resolve their IDs with
+        get_document_ids_by_faiss_ids().
+        
+        Args:
+            tenant_id: Tenant ID
+            faiss_ids: FAISS vector IDs returned by search
+            
+        Returns:
+            Dict mapping faiss_id to (document_id, chunk_no, start_offset,
+            end_offset) for every chunk of a live document
+        """
+        if not faiss_ids:
+            return {}
+        
+        query = (
+            select(
+                DocumentChunk.faiss_id,
+                DocumentChunk.document_id,
+                DocumentChunk.chunk_no,
+                DocumentChunk.start_offset,
+                DocumentChunk.end_offset,
+            )
+            .join(Document, Document.document_id == DocumentChunk.document_id)
+            .where(
+                DocumentChunk.tenant_id == tenant_id,
+                DocumentChunk.faiss_id == any_(
+                    bindparam("faiss_ids", value=list(faiss_ids), type_=ARRAY(BigInteger))
+                ),
+                Document.deleted_at.is_(None),
+            )
+        )
+        
+        result = await self.session.execute(query)
+        return {
+            faiss_id: (document_id, chunk_no, start_offset, end_offset)
+            for faiss_id, document_id, chunk_no, start_offset, end_offset in result.all()
+        }
+    
+    async def replace_chunks(
+        self,
+        document_ids: List[UUID],
+        rows: List[dict[str, Any]],
+    ) -> None:
+        """
+        Replace the chunk rows of documents with one DELETE and one INSERT.
+        
+        Args:
+            document_ids: Documents whose chunks are replaced
+            rows: Column values of every new chunk of those documents
+        """
+        if not document_ids:
+            return
+        await self.session.execute(
+            delete(DocumentChunk).where(
+                DocumentChunk.document_id == any_(
+                    bindparam("document_ids", value=list(document_ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+                )
+            )
+        )
+        if rows:
+            await self.session.execute(insert(DocumentChunk), rows)
+        await self.session.flush()
+    
+    async def get_filter_attributes_by_faiss_ids(
+        self,
+        tenant_id: UUID,
+        faiss_ids: List[int],
+    ) -> Dict[int, Tuple[Optional[Dict[str, Any]], datetime]]:
+        """
+        Load the metadata and creation time of live documents by FAISS ID.
+        
+        Used once per tenant to backfill the FAISS attribute postings of
+        documents indexed before attributes were recorded.
+        
+        Args:
+            tenant_id: Tenant ID
+            faiss_ids: FAISS vector IDs
+            
+        Returns:
+            Dict mapping faiss_id to (metadata_json, created_at) for every live match
+        """
+        if not faiss_ids:
+            return {}
+        
+        query = select(Document.faiss_id, Document.metadata_json, Document.created_at).where(
+            Document.tenant_id == tenant_id,
+            Document.faiss_id == any_(
+                bindparam("faiss_ids", value=list(faiss_ids), type_=ARRAY(BigInteger))
+            ),
+            Document.deleted_at.is_(None),
+        )
+        
+        result = await self.session.execute(query)
+        return {faiss_id: (metadata, created_at) for faiss_id, metadata, created_at in result.all()}
@@ -0,0 +1,173 @@
+"""
+Repository for IngestionOutbox model operations.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.ingestion_outbox import (
+    OUTBOX_INDEXED,
+    OUTBOX_PENDING,
+    OUTBOX_PROCESSING,
+    OUTBOX_SUPERSEDED,
+    IngestionOutbox,
+)
+from app.db.repositories.base_repository import BaseRepository
+
+
+class IngestionOutboxRepository(BaseRepository[IngestionOutbox]):
+    """Repository for IngestionOutbox operations."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(IngestionOutbox, session)
+
+    async def enqueue(
+        self,
+        tenant_id: UUID,
+        document_id: UUID,
+        title: str,
+        content: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+        document_created_at: datetime,
+        content_object: Optional[str] = None,
+    ) -> IngestionOutbox:
+        """
+        Queue a document version for indexing.
+        
+        Entries of older versions of the document still waiting are
+        superseded, so only the newest content is indexed.
+        
+        Args:
+            tenant_id: Tenant ID
+            document_id: Document UUID
+            title: Document title
+            content: Document content to index (None if content_object is set)
+            metadata: Document metadata
+            document_created_at: Creation time of the document
+            content_object: MinIO object already holding the content (streamed uploads)
+            
+        Returns:
+            Created IngestionOutbox instance
+        """
+        await self.session.execute(
+            update(IngestionOutbox)
+            .where(
+                IngestionOutbox.document_id == document_id,
+                IngestionOutbox.status == OUTBOX_PENDING,
+            )
+            .values(status=OUTBOX_SUPERSEDED, content=None)
+        )
+        return await self.create(
+            tenant_id=tenant_id,
+            document_id=document_id,
+            status=OUTBOX_PENDING,
+            title=title,
+            content=content,
+            content_object=content_object,
+            metadata_json=metadata,
+            document_created_at=document_created_at,
+            attempts=0,
+        )
+
+    async def claim(self, limit: int, lease_seconds: float) -> List[IngestionOutbox]:
+        """
+        Claim due entries of any tenant for one indexer.
+        
+        Claimed entries move to processing with a lease: if the indexer dies,
+        they become due again once the lease expires. Entries claimed by
+        concurrent indexers are skipped (FOR UPDATE SKIP LOCKED).
+        
+        Args:
+            limit: Maximum entries to claim
+            lease_seconds: Time the indexer has to finish them
+            
+        Returns:
+            List of claimed IngestionOutbox instances, oldest first
+        """
+        due = (
+            select(IngestionOutbox.outbox_id)
+            .where(
+                IngestionOutbox.status.in_((OUTBOX_PENDING, OUTBOX_PROCESSING)),
+                IngestionOutbox.next_attempt_at <= func.now(),
+            )
+            .order_by(IngestionOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(IngestionOutbox)
+            .where(IngestionOutbox.outbox_id.in_(due.scalar_subquery()))
+            .values(
+                status=OUTBOX_PROCESSING,
+                attempts=IngestionOutbox.attempts + 1,
+                next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+            )
+            .returning(IngestionOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        entries = list(result.scalars().all())
+        return sorted(entries, key=lambda entry: entry.created_at)
+
+    async def set_status(
+        self,
+        outbox_ids: List[UUID],
+        status: str,
+        error: Optional[str] = None,
+        retry_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Record the outcome of indexing attempts.
+        
+        Args:
+            outbox_ids: Outbox entry IDs
+            status: New status (indexed entries drop their content)
+            error: Error of a failed attempt
+            retry_at: Time of the next attempt of a rescheduled entry
+        """
+        if not outbox_ids:
+            return
+        values: Dict[str, Any] = {"status": status, "last_error": error}
+        if status == OUTBOX_INDEXED:
+            values["content"] = None
+            values["indexed_at"] = func.now()
+        if retry_at is not None:
+            values["next_attempt_at"] = retry_at
+        await self.session.execute(
+            update(IngestionOutbox)
+            .where(IngestionOutbox.outbox_id.in_(list(outbox_ids)))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_latest_by_document_ids(
+        self,
+        tenant_id: UUID,
+        document_ids: List[UUID],
+    ) -> Dict[UUID, IngestionOutbox]:
+        """
+        Get the newest outbox entry of each document.
+        
+        Args:
+            tenant_id: Tenant ID
+            document_ids: Document UUIDs
+            
+        Returns:
+            Dict mapping document_id to its newest IngestionOutbox entry
+        """
+        if not document_ids:
+            return {}
+        query = (
+            select(IngestionOutbox)
+            .where(
+                IngestionOutbox.tenant_id == tenant_id,
+                IngestionOutbox.document_id.in_(list(document_ids)),
+            )
+            .order_by(IngestionOutbox.document_id, IngestionOutbox.created_at.desc())
+            .distinct(IngestionOutbox.document_id)
+        )
+        result = await self.session.execute(query)
+        return {entry.document_id: entry for entry in result.scalars().all()}
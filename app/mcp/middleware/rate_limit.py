@@ -119,6 +119,105 @@ async def check_rate_limit(
         return (True, limit - 1, int(time.time()) + window_seconds, 0)
 
 
+def rate_limit_exceeded(
+    tenant_id: UUID,
+    user_id: Optional[UUID],
+    role: Optional[str],
+    limit: int,
+    window_seconds: int,
+    retry_after: int,
+    reset_time: int,
+) -> RateLimitExceededError:
+    """
+    Log and audit a rate limit violation.
+    
+    Args:
+        tenant_id: Tenant ID that exceeded its limit
+        user_id: User ID of the rejected request
+        role: Role of the rejected request
+        limit: Maximum number of requests allowed in the window
+        window_seconds: Time window in seconds
+        retry_after: Seconds until the rate limit window resets
+        reset_time: Unix timestamp when the rate limit window resets
+        
+    Returns:
+        RateLimitExceededError: Error to raise (429 Too Many Requests)
+    """
+    logger.warning(
+        "Rate limit exceeded",
+        tenant_id=str(tenant_id),
+        user_id=str(user_id),
+        limit=limit,
+        window_seconds=window_seconds,
+        retry_after=retry_after,
+    )
+    
+    # Log rate limit violation to audit logs
+    asyncio.create_task(
+        log_audit_event(
+            action="rate_limit_exceeded",
+            resource_type="rate_limit",
+            resource_id=str(tenant_id),
+            tenant_id=tenant_id,
+            user_id=user_id,
+            role=role,
+            success=False,
+            details={
+                "limit": limit,
+                "window_seconds": window_seconds,
+                "retry_after": retry_after,
+                "reset_time": reset_time,
+            },
+        )
+    )
+    
+    return RateLimitExceededError(
+        message=f"Rate limit exceeded: {limit} requests per {window_seconds} seconds. Retry after {retry_after} seconds.",
+        retry_after=retry_after,
+        limit=limit,
+        remaining=0,
+        reset_time=reset_time,
+    )
+
+
+async def enforce_rate_limit(
+    tenant_id: UUID,
+    user_id: Optional[UUID] = None,
+    role: Optional[str] = None,
+) -> None:
+    """
+    Apply the per-tenant rate limit to a request outside the MCP middleware stack.
+    
+    Uses the same limit, window and audit trail as RateLimitMiddleware.
+    
+    Args:
+        tenant_id: Tenant ID for rate limit key
+        user_id: User ID of the request
+        role: Role of the request
+        
+    Raises:
+        RateLimitExceededError: If rate limit is exceeded (429 Too Many Requests)
+    """
+    if not settings.rate_limit_enabled:
+        return
+    
+    allowed, _, reset_time, retry_after = await check_rate_limit(
+        tenant_id=tenant_id,
+        limit=settings.rate_limit_per_minute,
+        window_seconds=settings.rate_limit_window_seconds,
+    )
+    if not allowed:
+        raise rate_limit_exceeded(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            role=role,
+            limit=settings.rate_limit_per_minute,
+            window_seconds=settings.rate_limit_window_seconds,
+            retry_after=retry_after,
+            reset_time=reset_time,
+        )
+
+
 class RateLimitMiddleware(Middleware):
     """
     Rate limiting middleware for FastMCP server.
@@ -178,41 +277,13 @@ class RateLimitMiddleware(Middleware):
             }
         
         if not allowed:
-            # Rate limit exceeded - log to audit and raise error
-            logger.warning(
-                "Rate limit exceeded",
-                tenant_id=str(tenant_id),
-                user_id=str(user_id),
+            raise rate_limit_exceeded(
+                tenant_id=tenant_id,
+                user_id=user_id,
+                role=role,
                 limit=self.limit,
                 window_seconds=self.window_seconds,
                 retry_after=retry_after,
-            )
-            
-            # Log rate limit violation to audit logs
-            asyncio.create_task(
-                log_audit_event(
-                    action="rate_limit_exceeded",
-                    resource_type="rate_limit",
-                    resource_id=str(tenant_id),
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                    role=role,
-                    success=False,
-                    details={
-                        "limit": self.limit,
-                        "window_seconds": self.window_seconds,
-                        "retry_after": retry_after,
-                        "reset_time": reset_time,
-                    },
-                )
-            )
-            
-            # Raise error with retry_after and rate limit info
-            raise RateLimitExceededError(
-                message=f"Rate limit exceeded: {self.limit} requests per {self.window_seconds} seconds. Retry after {retry_after} seconds.",
-                retry_after=retry_after,
-                limit=self.limit,
-                remaining=remaining,
                 reset_time=reset_time,
             )
         
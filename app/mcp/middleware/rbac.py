@@ -74,6 +74,8 @@ TOOL_PERMISSIONS: dict[str, Set[UserRole]] = {
     
     # Document management tools
     "rag_ingest": {UserRole.UBER_ADMIN, UserRole.TENANT_ADMIN, UserRole.PROJECT_ADMIN},
+    "rag_ingest_batch": {UserRole.UBER_ADMIN, UserRole.TENANT_ADMIN, UserRole.PROJECT_ADMIN},
+    "rag_get_indexing_status": {UserRole.UBER_ADMIN, UserRole.TENANT_ADMIN, UserRole.PROJECT_ADMIN, UserRole.END_USER},
     "rag_delete_document": {UserRole.UBER_ADMIN, UserRole.TENANT_ADMIN, UserRole.PROJECT_ADMIN},
     "rag_get_document": {UserRole.UBER_ADMIN, UserRole.TENANT_ADMIN, UserRole.PROJECT_ADMIN, UserRole.END_USER},
     "rag_list_documents": {UserRole.UBER_ADMIN, UserRole.TENANT_ADMIN, UserRole.PROJECT_ADMIN, UserRole.END_USER},
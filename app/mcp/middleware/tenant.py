@@ -6,8 +6,9 @@ and sets PostgreSQL session variables for RLS enforcement.
 Executes after authentication middleware and before authorization middleware.
 """
 
+from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Optional
+from typing import Iterator, Optional
 from uuid import UUID
 
 import structlog
@@ -54,6 +55,40 @@ def get_role_from_context() -> Optional[str]:
     return _role_context.get()
 
 
+@contextmanager
+def tenant_context(
+    tenant_id: Optional[UUID] = None,
+    user_id: Optional[UUID] = None,
+    role: Optional[str] = None,
+) -> Iterator[None]:
+    """
+    Set the tenant context for code running outside TenantExtractionMiddleware.
+    
+    Used by HTTP endpoints and background workers, which have no MCP request
+    to take the context from. Values left as None keep their current value;
+    every value is restored on exit.
+    
+    Args:
+        tenant_id: Tenant ID used by RLS and tenant-scoped services
+        user_id: Authenticated user ID
+        role: User role (uber_admin bypasses tenant RLS)
+    """
+    tokens = [
+        (context, context.set(value))
+        for context, value in (
+            (_tenant_id_context, tenant_id),
+            (_user_id_context, user_id),
+            (_role_context, role),
+        )
+        if value is not None
+    ]
+    try:
+        yield
+    finally:
+        for context, token in reversed(tokens):
+            context.reset(token)
+
+
 # TenantValidationError is now imported from app.utils.errors
 
 
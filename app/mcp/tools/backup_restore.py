@@ -27,10 +27,27 @@ from app.db.repositories.tenant_config_repository import TenantConfigRepository
 from app.mcp.middleware.rbac import UserRole, check_tool_permission
 from app.mcp.middleware.tenant import get_tenant_id_from_context, get_role_from_context
 from app.mcp.server import mcp_server
-from app.services.faiss_manager import faiss_manager, get_tenant_index_path
+from app.services.batch_ingestion import chunk_rows
+from app.services.document_chunker import chunk_text
+from app.services.faiss_attribute_store import document_attributes
+from app.services.faiss_executor import faiss_executor
+from app.services.faiss_manager import (
+    document_id_to_faiss_id,
+    faiss_manager,
+    get_tenant_attributes_path,
+    get_tenant_delta_path,
+    get_tenant_id_map_path,
+    get_tenant_index_path,
+    get_tenant_params_path,
+    get_tenant_reduction_path,
+    get_tenant_tombstones_path,
+    get_tenant_vector_log_path,
+)
 from app.services.minio_client import create_minio_client, get_tenant_bucket, get_document_content
 from app.services.meilisearch_client import create_meilisearch_client, get_tenant_index_name
+from app.services.embedding_scheduler import PRIORITY_BULK
 from app.services.embedding_service import embedding_service
+from app.services.tenant_config_cache import tenant_config_cache
 from app.utils.errors import AuthorizationError, ResourceNotFoundError, ValidationError
 
 logger = structlog.get_logger(__name__)
@@ -136,6 +153,19 @@ async def backup_faiss_index(tenant_id: UUID, backup_dir: Path) -> Dict[str, Any
         import shutil
         shutil.copy2(index_path, backup_file)
         
+        # Copy FAISS sidecars (ID map, index parameters, PCA projection, write delta, vector log, tombstones, attributes) alongside the index
+        for sidecar_path in (
+            get_tenant_id_map_path(tenant_id),
+            get_tenant_params_path(tenant_id),
+            get_tenant_reduction_path(tenant_id),
+            get_tenant_delta_path(tenant_id),
+            get_tenant_vector_log_path(tenant_id),
+            get_tenant_tombstones_path(tenant_id),
+            get_tenant_attributes_path(tenant_id),
+        ):
+            if sidecar_path.exists():
+                shutil.copy2(sidecar_path, backup_file.with_suffix("".join(sidecar_path.suffixes[-2:])))
+        
         checksum = calculate_file_checksum(backup_file)
         file_size = backup_file.stat().st_size
         
@@ -691,6 +721,8 @@ async def restore_postgresql_data(tenant_id: UUID, backup_file: Path) -> Dict[st
                     logger.warning("Failed to restore tenant config", tenant_id=str(tenant_id), error=str(e))
             
             await session.commit()
+            if config_restored:
+                tenant_config_cache.invalidate(tenant_id)
             
             logger.info(
                 "PostgreSQL data restored",
@@ -730,8 +762,26 @@ async def restore_faiss_index(tenant_id: UUID, backup_file: Path) -> Dict[str, A
         import shutil
         shutil.copy2(backup_file, index_path)
         
-        # Reload index in manager
-        faiss_manager.load_index(tenant_id)
+        # Restore FAISS sidecars (ID map, index parameters, PCA projection, write delta, vector log, tombstones, attributes) if they were backed up
+        for sidecar_path in (
+            get_tenant_id_map_path(tenant_id),
+            get_tenant_params_path(tenant_id),
+            get_tenant_reduction_path(tenant_id),
+            get_tenant_delta_path(tenant_id),
+            get_tenant_vector_log_path(tenant_id),
+            get_tenant_tombstones_path(tenant_id),
+            get_tenant_attributes_path(tenant_id),
+        ):
+            sidecar_backup = backup_file.with_suffix("".join(sidecar_path.suffixes[-2:]))
+            if sidecar_backup.exists():
+                shutil.copy2(sidecar_backup, sidecar_path)
+            elif sidecar_path not in (get_tenant_id_map_path(tenant_id), get_tenant_params_path(tenant_id)):
+                # Vectors buffered or deleted for the replaced index must not apply to the restored one
+                sidecar_path.unlink(missing_ok=True)
+        
+        # Reload index in manager (drop the cached copy of the replaced index first)
+        faiss_manager.unload_index(tenant_id)
+        await faiss_executor.run(faiss_manager.load_index, tenant_id)
         
         logger.info(
             "FAISS index restored",
@@ -1228,8 +1278,9 @@ async def _perform_rebuild(
                 )
                 # Create empty index
                 embedding_dimension = await _get_tenant_embedding_dimension(str(tenant_uuid))
-                faiss_manager.create_index(tenant_uuid, dimension=embedding_dimension)
-                faiss_manager.save_index(tenant_uuid, faiss_manager.get_index(tenant_uuid))
+                await faiss_executor.run(faiss_manager.create_index, tenant_uuid, dimension=embedding_dimension)
+                index = await faiss_executor.run(faiss_manager.get_index, tenant_uuid)
+                await faiss_executor.run(faiss_manager.save_index, tenant_uuid, index)
                 
                 return {
                     "tenant_id": str(tenant_uuid),
@@ -1249,15 +1300,15 @@ async def _perform_rebuild(
             existing_index_path = get_tenant_index_path(tenant_uuid)
             if existing_index_path.exists():
                 # Use delete_index which removes from cache and deletes file
-                faiss_manager.delete_index(tenant_uuid)
+                await faiss_executor.run(faiss_manager.delete_index, tenant_uuid)
                 logger.info("Deleted existing FAISS index", tenant_id=str(tenant_uuid))
             
             # Get embedding dimension for tenant
             embedding_dimension = await _get_tenant_embedding_dimension(str(tenant_uuid))
             
             # Create new index
-            faiss_manager.create_index(tenant_uuid, dimension=embedding_dimension)
-            index = faiss_manager.get_index(tenant_uuid)
+            await faiss_executor.run(faiss_manager.create_index, tenant_uuid, dimension=embedding_dimension)
+            index = await faiss_executor.run(faiss_manager.get_index, tenant_uuid)
             
             if index is None:
                 raise RuntimeError("Failed to create FAISS index")
@@ -1295,20 +1346,36 @@ async def _perform_rebuild(
                         content_bytes = await get_document_content(tenant_uuid, document.document_id)
                         text_content = content_bytes.decode("utf-8")
                         
-                        # Regenerate embedding
-                        embedding = await embedding_service.generate_embedding(
-                            text=text_content,
-                            tenant_id=str(tenant_uuid),
+                        # Regenerate the embeddings of the document's chunks
+                        chunks = chunk_text(text_content)
+                        embeddings = await embedding_service.generate_embeddings(
+                            [chunk.text for chunk in chunks],
+                            str(tenant_uuid),
+                            priority=PRIORITY_BULK,
                         )
                         embeddings_regenerated += 1
                         
                         # Add to FAISS index
-                        faiss_manager.add_document(
+                        attributes = document_attributes(document.metadata_json, document.created_at)
+                        await faiss_executor.run(
+                            faiss_manager.add_documents,
                             tenant_id=tenant_uuid,
-                            document_id=document.document_id,
-                            embedding=embedding,
+                            document_ids=[document.document_id] * len(chunks),
+                            embeddings=embeddings,
+                            attributes=[attributes] * len(chunks),
+                            chunk_numbers=[chunk.chunk_no for chunk in chunks],
+                        )
+                        index_size += len(chunks)
+                        
+                        # Keep the indexed faiss_id lookup column and the
+                        # chunk offsets in sync
+                        faiss_id = document_id_to_faiss_id(document.document_id)
+                        if document.faiss_id != faiss_id:
+                            await doc_repo.update(document.document_id, faiss_id=faiss_id)
+                        await doc_repo.replace_chunks(
+                            [document.document_id],
+                            chunk_rows(tenant_uuid, document.document_id, chunks),
                         )
-                        index_size += 1
                         
                     except Exception as e:
                         logger.warning(
@@ -1320,8 +1387,11 @@ async def _perform_rebuild(
                         # Continue with next document
                         continue
                 
-                # Save index periodically (every batch) to avoid data loss
-                faiss_manager.save_index(tenant_uuid, index)
+                # Save index periodically (every batch) to avoid data loss.
+                # add_documents may have swapped in a migrated index, so save
+                # whatever the manager currently holds.
+                index = await faiss_executor.run(faiss_manager.get_index, tenant_uuid)
+                await faiss_executor.run(faiss_manager.save_index, tenant_uuid, index)
                 logger.debug(
                     "Saved index after batch",
                     tenant_id=str(tenant_uuid),
@@ -1330,7 +1400,13 @@ async def _perform_rebuild(
                 )
             
             # Final save
-            faiss_manager.save_index(tenant_uuid, index)
+            index = await faiss_executor.run(faiss_manager.get_index, tenant_uuid)
+            await faiss_executor.run(faiss_manager.save_index, tenant_uuid, index)
+            await session.commit()
+            
+            # Retrain approximate indices on the full corpus (sizes IVF lists
+            # for the current tenant size and persists nprobe/efSearch)
+            await faiss_executor.run(faiss_manager.optimize_index, tenant_uuid, retrain=True)
             
             # Validate index integrity
             integrity_validated = await _validate_index_integrity(tenant_uuid, index_size)
@@ -1409,7 +1485,7 @@ async def _validate_index_integrity(tenant_id: UUID, expected_size: int) -> bool
         bool: True if integrity is valid, False otherwise
     """
     try:
-        index = faiss_manager.get_index(tenant_id)
+        index = await faiss_executor.run(faiss_manager.get_index, tenant_id)
         if index is None:
             logger.warning("Index not found for integrity validation", tenant_id=str(tenant_id))
             return False
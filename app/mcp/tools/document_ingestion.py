@@ -2,67 +2,69 @@
 Document ingestion MCP tool for ingesting documents into the knowledge base.
 """
 
+import asyncio
 import hashlib
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 import structlog
 
+from app.config.ingestion import ingestion_settings
 from app.db.connection import get_db_session
 from app.mcp.server import mcp_server
 from app.db.models.document import Document
 from app.db.repositories.document_repository import DocumentRepository
+from app.db.repositories.ingestion_outbox_repository import IngestionOutboxRepository
 from app.mcp.middleware.rbac import UserRole
 from app.mcp.middleware.tenant import (
     get_role_from_context,
     get_tenant_id_from_context,
     get_user_id_from_context,
 )
+from app.services.batch_ingestion import (
+    IngestionItem,
+    batch_ingestion_service,
+    chunk_rows,
+    embed_items,
+    index_items,
+    write_chunks,
+)
+from app.services.content_stream import TextContentStream, read_text
+from app.services.document_chunker import chunk_text
+from app.services.embedding_scheduler import PRIORITY_BULK
 from app.services.embedding_service import embedding_service
-from app.services.faiss_manager import faiss_manager
+from app.services.faiss_attribute_store import document_attributes
+from app.services.faiss_executor import faiss_executor
+from app.services.faiss_manager import document_id_to_faiss_id, faiss_manager
+from app.services.ingestion_indexer import ingestion_indexer
+from app.services.ingestion_stages import StageTimer, undo_ingestion
 from app.services.meilisearch_client import add_document_to_index
-from app.services.minio_client import upload_document_content
+from app.services.minio_client import (
+    backup_document_content,
+    restore_document_content,
+    stream_document_content,
+    upload_document_content,
+    upload_document_stream,
+)
 from app.utils.errors import AuthorizationError, ValidationError
 
 logger = structlog.get_logger(__name__)
 
 
-@mcp_server.tool()
-async def rag_ingest(
-    document_content: str,
-    document_metadata: Dict[str, Any],
-    tenant_id: Optional[str] = None,
-    document_id: Optional[str] = None,
-) -> Dict[str, Any]:
+def _resolve_ingestion_context(tenant_id: Optional[str]) -> Tuple[UUID, UUID]:
     """
-    Ingest a document into the knowledge base.
-    
-    Processes document content, generates embeddings, and indexes the document
-    in PostgreSQL, MinIO, FAISS, and Meilisearch for searchability.
-    
-    Access restricted to Tenant Admin and End User roles.
+    Check the caller may ingest documents and resolve the target tenant and user.
     
     Args:
-        document_content: Document content (text, images, tables) as string
-        document_metadata: Document metadata dictionary containing:
-            - title: Document title (required)
-            - source: Document source (optional)
-            - type: Document type (optional, e.g., "text", "image", "table")
-            - Other custom metadata fields (optional)
         tenant_id: Tenant UUID (optional, extracted from context if not provided)
-        document_id: Document UUID (optional, auto-generated if not provided)
         
     Returns:
-        dict: Ingestion result containing:
-            - document_id: Created document ID
-            - ingestion_status: Status of ingestion
-            - indexed_in: List of indexes where document was indexed
-            - processing_metadata: Processing details (embedding model, dimensions, etc.)
-            
+        tuple: (tenant_uuid, user_id)
+        
     Raises:
-        AuthorizationError: If user is not Tenant Admin or End User
-        ValidationError: If document_content or metadata is invalid
-        ValueError: If tenant_id or document_id format is invalid
+        AuthorizationError: If user is not Tenant Admin or End User, or the tenant mismatches
+        ValidationError: If the tenant or user context is missing or tenant_id is invalid
     """
     # Check authorization - Tenant Admin and End User can ingest documents
     current_role = get_role_from_context()
@@ -109,14 +111,100 @@ async def rag_ingest(
     else:
         tenant_uuid = context_tenant_id
     
-    # Validate document_content
-    if not document_content or not document_content.strip():
-        raise ValidationError(
-            "Document content cannot be empty.",
-            field="document_content",
-            error_code="FR-VALIDATION-001"
+    return tenant_uuid, context_user_id
+
+
+async def _abandon_inline_stages(
+    tenant_uuid: UUID,
+    doc_uuid: UUID,
+    embedding_task: Optional["asyncio.Future"],
+    upload_task: Optional["asyncio.Future"],
+    delete_upload: bool,
+) -> bool:
+    """
+    Stop the embedding and upload started for a document that is not ingested.
+    
+    The upload runs on a thread and cannot be interrupted, so it is awaited
+    before its object is deleted.
+    
+    Args:
+        tenant_uuid: Tenant ID
+        doc_uuid: Document ID the content was uploaded under
+        embedding_task: Running embedding stage (None for queued ingestion)
+        upload_task: Running upload stage (None for queued ingestion)
+        delete_upload: Delete the uploaded object
+        
+    Returns:
+        bool: True if the content had been uploaded
+    """
+    if embedding_task is None or upload_task is None:
+        return False
+    embedding_task.cancel()
+    results = await asyncio.gather(embedding_task, upload_task, return_exceptions=True)
+    uploaded = not isinstance(results[1], BaseException)
+    if uploaded and delete_upload:
+        await undo_ingestion(tenant_uuid, [doc_uuid], minio=True)
+    return uploaded
+
+
+async def _undo_inline_ingestion(
+    tenant_uuid: UUID,
+    doc_uuid: UUID,
+    embedding_task: Optional["asyncio.Future"],
+    upload_task: Optional["asyncio.Future"],
+    is_new_document: bool,
+    explicit_id: bool,
+    written: List[str],
+) -> None:
+    """
+    Undo the stores written by a failed inline ingestion.
+    
+    Only new documents are undone: a failed update leaves the stores with
+    the new version, as removing it would also remove the previous one.
+    
+    Args:
+        tenant_uuid: Tenant ID
+        doc_uuid: Document ID
+        embedding_task: Embedding stage (None for queued ingestion)
+        upload_task: Upload stage (None for queued ingestion)
+        is_new_document: Whether the document row was being created
+        explicit_id: Whether the caller chose the document ID
+        written: Stores written before the failure ("minio", "faiss", "meilisearch")
+    """
+    if embedding_task is None or upload_task is None:
+        return
+    # A generated document ID cannot belong to an existing document
+    new_object = is_new_document or not explicit_id
+    if not (embedding_task.done() and upload_task.done()):
+        # Failed in the database stage, before the other stages were awaited
+        await _abandon_inline_stages(
+            tenant_uuid, doc_uuid, embedding_task, upload_task, delete_upload=new_object
         )
+        return
+    if not new_object or not written:
+        return
+    await undo_ingestion(
+        tenant_uuid,
+        [doc_uuid],
+        minio="minio" in written,
+        faiss="faiss" in written,
+        meilisearch="meilisearch" in written,
+    )
+
+
+def _validate_document_metadata(document_metadata: Dict[str, Any]) -> str:
+    """
+    Validate the metadata of a document to ingest.
     
+    Args:
+        document_metadata: Document metadata dictionary
+        
+    Returns:
+        str: Document title
+        
+    Raises:
+        ValidationError: If the metadata is not a dictionary with a title
+    """
     # Validate document_metadata
     if not document_metadata or not isinstance(document_metadata, dict):
         raise ValidationError(
@@ -133,18 +221,202 @@ async def rag_ingest(
             error_code="FR-VALIDATION-001"
         )
     
-    # Parse document_id if provided
-    if document_id:
-        try:
-            doc_uuid = UUID(document_id)
-        except ValueError:
-            raise ValidationError(
-                f"Invalid document_id format: {document_id}. Must be a valid UUID.",
-                field="document_id",
-                error_code="FR-VALIDATION-001"
-            )
+    return title
+
+
+def _parse_document_id(document_id: Optional[str]) -> UUID:
+    """
+    Parse the requested document ID, or generate one.
+    
+    Args:
+        document_id: Document UUID (optional)
+        
+    Returns:
+        UUID: Document ID
+        
+    Raises:
+        ValidationError: If document_id is not a valid UUID
+    """
+    if not document_id:
+        return uuid4()
+    try:
+        return UUID(document_id)
+    except ValueError:
+        raise ValidationError(
+            f"Invalid document_id format: {document_id}. Must be a valid UUID.",
+            field="document_id",
+            error_code="FR-VALIDATION-001"
+        )
+
+
+async def _write_document_row(
+    doc_repo: DocumentRepository,
+    session: Any,
+    tenant_uuid: UUID,
+    user_id: UUID,
+    doc_uuid: UUID,
+    explicit_id: bool,
+    title: str,
+    content_hash: str,
+    document_metadata: Dict[str, Any],
+) -> Tuple[UUID, Optional[UUID], bool]:
+    """
+    Create the document row, or version an existing document, in the session.
+    
+    The document is looked up by document_id if the caller chose it, by
+    content hash otherwise. Changed content of an existing document records
+    the previous version and bumps the version number.
+    
+    Args:
+        doc_repo: Document repository of the session
+        session: Database session
+        tenant_uuid: Tenant ID
+        user_id: Ingesting user ID
+        doc_uuid: Requested or generated document ID
+        explicit_id: Whether the caller chose the document ID
+        title: Document title
+        content_hash: sha256 of the stripped content
+        document_metadata: Document metadata
+        
+    Returns:
+        tuple: (document ID, ID of the existing document if the content is a
+        duplicate else None, whether the row was created)
+    """
+    # Check if document already exists (by document_id if provided, or by content_hash)
+    existing_doc = None
+    if explicit_id:
+        existing_doc = await doc_repo.get_by_id(doc_uuid)
     else:
-        doc_uuid = uuid4()
+        existing_doc = await doc_repo.get_by_content_hash(content_hash, tenant_id=tenant_uuid)
+    
+    # If document exists and content hash is different, create new version
+    if existing_doc and existing_doc.content_hash != content_hash:
+        from app.db.repositories.document_version_repository import DocumentVersionRepository
+        from app.db.models.document_version import DocumentVersion
+        
+        # Create version record for previous version
+        version_repo = DocumentVersionRepository(session)
+        await version_repo.create(
+            document_id=existing_doc.document_id,
+            tenant_id=tenant_uuid,
+            version_number=existing_doc.version_number,
+            content_hash=existing_doc.content_hash,
+            created_by=user_id,
+            change_summary=f"Previous version before update",
+            metadata_json=existing_doc.metadata_json,
+        )
+        
+        # Increment version number
+        doc_uuid = existing_doc.document_id  # Use existing document ID
+        await doc_repo.update(
+            doc_uuid,
+            version_number=existing_doc.version_number + 1,
+            content_hash=content_hash,
+            title=title,
+            metadata_json=document_metadata,
+            deleted_at=None,  # Ensure not deleted
+            faiss_id=document_id_to_faiss_id(doc_uuid),
+        )
+        
+        logger.info(
+            "Document updated with new version",
+            tenant_id=str(tenant_uuid),
+            document_id=str(doc_uuid),
+            new_version=existing_doc.version_number,
+        )
+    elif existing_doc and existing_doc.content_hash == content_hash:
+        # Same content hash - duplicate
+        logger.info(
+            "Document with same content hash already exists",
+            tenant_id=str(tenant_uuid),
+            document_id=str(existing_doc.document_id),
+            content_hash=content_hash,
+        )
+        return doc_uuid, existing_doc.document_id, False
+    else:
+        # New document - create it
+        await doc_repo.create(
+            document_id=doc_uuid,
+            tenant_id=tenant_uuid,
+            user_id=user_id,
+            title=title,
+            content_hash=content_hash,
+            metadata_json=document_metadata,
+            version_number=1,  # Start at version 1
+            faiss_id=document_id_to_faiss_id(doc_uuid),
+        )
+        return doc_uuid, None, True
+    
+    return doc_uuid, None, False
+
+
+def _duplicate_result(existing_document_id: UUID) -> Dict[str, Any]:
+    """Ingestion result of content that an existing document already holds."""
+    return {
+        "document_id": str(existing_document_id),
+        "ingestion_status": "duplicate",
+        "indexed_in": [],
+        "processing_metadata": {
+            "message": "Document with same content already exists",
+            "existing_document_id": str(existing_document_id),
+        },
+    }
+
+
+@mcp_server.tool()
+async def rag_ingest(
+    document_content: str,
+    document_metadata: Dict[str, Any],
+    tenant_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Ingest a document into the knowledge base.
+    
+    Processes document content, generates embeddings, and indexes the document
+    in PostgreSQL, MinIO, FAISS, and Meilisearch for searchability.
+    
+    With the ingestion outbox enabled (INGESTION_OUTBOX_ENABLED, the default)
+    the tool returns once the document row is committed, with ingestion_status
+    "queued"; background indexers write MinIO, FAISS and Meilisearch and
+    rag_get_indexing_status reports their progress.
+    
+    Access restricted to Tenant Admin and End User roles.
+    
+    Args:
+        document_content: Document content (text, images, tables) as string
+        document_metadata: Document metadata dictionary containing:
+            - title: Document title (required)
+            - source: Document source (optional)
+            - type: Document type (optional, e.g., "text", "image", "table")
+            - Other custom metadata fields (optional)
+        tenant_id: Tenant UUID (optional, extracted from context if not provided)
+        document_id: Document UUID (optional, auto-generated if not provided)
+        
+    Returns:
+        dict: Ingestion result containing:
+            - document_id: Created document ID
+            - ingestion_status: Status of ingestion ("queued", "success" or "duplicate")
+            - indexed_in: List of indexes where document was indexed
+            - processing_metadata: Processing details (embedding model, dimensions, etc.)
+            
+    Raises:
+        AuthorizationError: If user is not Tenant Admin or End User
+        ValidationError: If document_content or metadata is invalid
+        ValueError: If tenant_id or document_id format is invalid
+    """
+    tenant_uuid, context_user_id = _resolve_ingestion_context(tenant_id)
+    
+    # Validate document_content
+    if not document_content or not document_content.strip():
+        raise ValidationError(
+            "Document content cannot be empty.",
+            field="document_content",
+            error_code="FR-VALIDATION-001"
+        )
+    
+    title = _validate_document_metadata(document_metadata)
+    doc_uuid = _parse_document_id(document_id)
     
     # Extract text content (for MVP, we assume document_content is already text)
     # For Phase 2, this would include OCR for images, table extraction, etc.
@@ -153,118 +425,146 @@ async def rag_ingest(
     # Generate content hash for deduplication
     content_hash = hashlib.sha256(text_content.encode("utf-8")).hexdigest()
     
+    # Inline ingestion: embedding the document's chunks and the MinIO upload
+    # only need the validated content, so they start now and overlap the
+    # database round trips. doc_uuid is final unless the content turns out
+    # to be a duplicate (a versioned document keeps the explicit document_id).
+    timer = StageTimer()
+    embedding_task = upload_task = None
+    chunks = []
+    if not ingestion_settings.outbox_enabled:
+        chunks = chunk_text(text_content)
+        embedding_task = asyncio.ensure_future(timer.run(
+            "embedding",
+            embedding_service.generate_embeddings(
+                [chunk.text for chunk in chunks],
+                str(tenant_uuid),
+                priority=PRIORITY_BULK,
+            ),
+        ))
+        upload_task = asyncio.ensure_future(timer.run(
+            "minio",
+            upload_document_content(
+                tenant_id=tenant_uuid,
+                document_id=doc_uuid,
+                content=text_content.encode("utf-8"),
+                content_type="text/plain",
+            ),
+        ))
+    
+    is_new_document = False
+    written: List[str] = []
     try:
         async for session in get_db_session():
             doc_repo = DocumentRepository(session)
             
-            # Check if document already exists (by document_id if provided, or by content_hash)
-            existing_doc = None
-            if document_id:
-                existing_doc = await doc_repo.get_by_id(doc_uuid)
-            else:
-                existing_doc = await doc_repo.get_by_content_hash(content_hash, tenant_id=tenant_uuid)
+            timer.start("database")
+            doc_uuid, duplicate_of, is_new_document = await _write_document_row(
+                doc_repo,
+                session,
+                tenant_uuid,
+                context_user_id,
+                doc_uuid,
+                bool(document_id),
+                title,
+                content_hash,
+                document_metadata,
+            )
+            if duplicate_of:
+                # An explicit document_id re-uploaded identical content;
+                # otherwise the upload went to an unused document ID
+                await _abandon_inline_stages(
+                    tenant_uuid, doc_uuid, embedding_task, upload_task, delete_upload=not document_id
+                )
+                return _duplicate_result(duplicate_of)
+            
+            # Get the document (either newly created or updated)
+            document = await doc_repo.get_by_id(doc_uuid)
+            timer.stop("database")
             
-            # If document exists and content hash is different, create new version
-            if existing_doc and existing_doc.content_hash != content_hash:
-                from app.db.repositories.document_version_repository import DocumentVersionRepository
-                from app.db.models.document_version import DocumentVersion
-                
-                # Create version record for previous version
-                version_repo = DocumentVersionRepository(session)
-                await version_repo.create(
-                    document_id=existing_doc.document_id,
+            if ingestion_settings.outbox_enabled:
+                # Queue the document in the same transaction; the background
+                # indexer embeds it and writes MinIO, FAISS and Meilisearch
+                outbox_repo = IngestionOutboxRepository(session)
+                await outbox_repo.enqueue(
                     tenant_id=tenant_uuid,
-                    version_number=existing_doc.version_number,
-                    content_hash=existing_doc.content_hash,
-                    created_by=context_user_id,
-                    change_summary=f"Previous version before update",
-                    metadata_json=existing_doc.metadata_json,
-                )
-                
-                # Increment version number
-                doc_uuid = existing_doc.document_id  # Use existing document ID
-                await doc_repo.update(
-                    doc_uuid,
-                    version_number=existing_doc.version_number + 1,
-                    content_hash=content_hash,
+                    document_id=doc_uuid,
                     title=title,
-                    metadata_json=document_metadata,
-                    deleted_at=None,  # Ensure not deleted
+                    content=text_content,
+                    metadata=document_metadata,
+                    document_created_at=document.created_at if document else datetime.now(timezone.utc),
                 )
+                await session.commit()
+                ingestion_indexer.notify()
                 
                 logger.info(
-                    "Document updated with new version",
+                    "Document queued for indexing",
                     tenant_id=str(tenant_uuid),
                     document_id=str(doc_uuid),
-                    new_version=existing_doc.version_number,
-                )
-            elif existing_doc and existing_doc.content_hash == content_hash:
-                # Same content hash - duplicate
-                logger.info(
-                    "Document with same content hash already exists",
-                    tenant_id=str(tenant_uuid),
-                    document_id=str(existing_doc.document_id),
-                    content_hash=content_hash,
+                    title=title,
+                    content_length=len(text_content),
                 )
+                
                 return {
-                    "document_id": str(existing_doc.document_id),
-                    "ingestion_status": "duplicate",
-                    "indexed_in": [],
+                    "document_id": str(doc_uuid),
+                    "ingestion_status": "queued",
+                    "indexed_in": ["PostgreSQL"],
                     "processing_metadata": {
-                        "message": "Document with same content already exists",
-                        "existing_document_id": str(existing_doc.document_id),
+                        "indexing_status": "pending",
+                        "content_length": len(text_content),
+                        "content_hash": content_hash,
                     },
                 }
-            else:
-                # New document - create it
-                await doc_repo.create(
-                    document_id=doc_uuid,
-                    tenant_id=tenant_uuid,
-                    user_id=context_user_id,
-                    title=title,
-                    content_hash=content_hash,
-                    metadata_json=document_metadata,
-                    version_number=1,  # Start at version 1
-                )
             
-            # Get the document (either newly created or updated)
-            document = await doc_repo.get_by_id(doc_uuid)
-            
-            # Generate embedding using tenant-configured model
-            embedding = await embedding_service.generate_embedding(
-                text=text_content,
-                tenant_id=str(tenant_uuid),
+            # Wait for the embedding and the upload started before the
+            # database round trips
+            embeddings, minio_object_name = await asyncio.gather(
+                embedding_task, upload_task, return_exceptions=True
             )
+            if not isinstance(minio_object_name, Exception):
+                written.append("minio")
+            for result in (embeddings, minio_object_name):
+                if isinstance(result, Exception):
+                    raise result
             
-            # Store document content in MinIO (tenant-scoped bucket)
-            content_bytes = text_content.encode("utf-8")
-            minio_object_name = await upload_document_content(
-                tenant_id=tenant_uuid,
-                document_id=doc_uuid,
-                content=content_bytes,
-                content_type="text/plain",
-            )
-            
-            # Index document in FAISS (tenant-scoped index)
-            faiss_manager.add_document(
-                tenant_id=tenant_uuid,
-                document_id=doc_uuid,
-                embedding=embedding,
+            # Index the chunks in FAISS (tenant-scoped index, with the type,
+            # tags and creation time used by filtered searches) and the
+            # document in Meilisearch (tenant-scoped index) concurrently
+            attributes = document_attributes(document_metadata, document.created_at if document else None)
+            faiss_result, meilisearch_result = await asyncio.gather(
+                timer.run("faiss", faiss_executor.run(
+                    faiss_manager.add_documents,
+                    tenant_id=tenant_uuid,
+                    document_ids=[doc_uuid] * len(chunks),
+                    embeddings=embeddings,
+                    attributes=[attributes] * len(chunks),
+                    chunk_numbers=[chunk.chunk_no for chunk in chunks],
+                )),
+                timer.run("meilisearch", add_document_to_index(
+                    tenant_id=str(tenant_uuid),
+                    document_id=str(doc_uuid),
+                    title=title,
+                    content=text_content,
+                    metadata=document_metadata,
+                )),
+                return_exceptions=True,
             )
+            for store, result in (("faiss", faiss_result), ("meilisearch", meilisearch_result)):
+                if not isinstance(result, Exception):
+                    written.append(store)
+            for result in (faiss_result, meilisearch_result):
+                if isinstance(result, Exception):
+                    raise result
             
-            # Index document in Meilisearch (tenant-scoped index)
-            await add_document_to_index(
-                tenant_id=str(tenant_uuid),
-                document_id=str(doc_uuid),
-                title=title,
-                content=text_content,
-                metadata=document_metadata,
-            )
+            # Chunk offsets are committed with the document
+            await doc_repo.replace_chunks([doc_uuid], chunk_rows(tenant_uuid, doc_uuid, chunks))
             
             # Commit transaction
-            await session.commit()
+            await timer.run("commit", session.commit())
+            written.clear()
             
             indexed_in = ["PostgreSQL", "MinIO", "FAISS", "Meilisearch"]
+            stage_timings = timer.to_dict()
             
             logger.info(
                 "Document ingested successfully",
@@ -272,8 +572,10 @@ async def rag_ingest(
                 document_id=str(doc_uuid),
                 title=title,
                 content_length=len(text_content),
-                embedding_dimension=len(embedding),
+                embedding_dimension=embeddings.shape[1],
+                chunk_count=len(chunks),
                 indexed_in=indexed_in,
+                **stage_timings,
             )
             
             return {
@@ -281,14 +583,19 @@ async def rag_ingest(
                 "ingestion_status": "success",
                 "indexed_in": indexed_in,
                 "processing_metadata": {
-                    "embedding_dimension": len(embedding),
+                    "embedding_dimension": embeddings.shape[1],
+                    "chunk_count": len(chunks),
                     "content_length": len(text_content),
                     "minio_object": minio_object_name,
                     "content_hash": content_hash,
+                    "stage_timings_ms": stage_timings,
                 },
             }
             
     except (AuthorizationError, ValidationError) as e:
+        await _undo_inline_ingestion(
+            tenant_uuid, doc_uuid, embedding_task, upload_task, is_new_document, bool(document_id), written
+        )
         logger.error(
             "Error ingesting document",
             error=str(e),
@@ -297,6 +604,9 @@ async def rag_ingest(
         )
         raise
     except Exception as e:
+        await _undo_inline_ingestion(
+            tenant_uuid, doc_uuid, embedding_task, upload_task, is_new_document, bool(document_id), written
+        )
         logger.error(
             "Unexpected error during document ingestion",
             error=str(e),
@@ -305,3 +615,391 @@ async def rag_ingest(
         )
         raise
 
+
+async def _release_backup(
+    tenant_uuid: UUID,
+    doc_uuid: UUID,
+    backup_object: Optional[str],
+    restore: bool,
+) -> None:
+    """
+    Restore or drop the copy of a document's previous content.
+    
+    Failures are logged, not raised, so they do not mask the ingestion
+    outcome.
+    
+    Args:
+        tenant_uuid: Tenant ID
+        doc_uuid: Document ID
+        backup_object: Object name of the copy (None if there was nothing to copy)
+        restore: Put the previous content back instead of keeping the new one
+    """
+    if not backup_object:
+        return
+    try:
+        await restore_document_content(tenant_uuid, doc_uuid, backup_object, restore=restore)
+    except Exception as e:
+        logger.error(
+            "Error releasing previous document content",
+            tenant_id=str(tenant_uuid),
+            document_id=str(doc_uuid),
+            backup_object=backup_object,
+            restore=restore,
+            error=str(e),
+        )
+
+
+async def ingest_document_stream(
+    content: AsyncIterable[bytes],
+    document_metadata: Dict[str, Any],
+    tenant_id: Optional[str] = None,
+    document_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Ingest a document whose content arrives as a byte stream.
+    
+    Backs the streaming upload endpoint (POST /api/documents/stream), for
+    documents too large to pass to rag_ingest as one JSON-RPC string. The
+    content is stripped, hashed and written to MinIO as a multipart upload
+    while it arrives; the document is then deduplicated and versioned like
+    rag_ingest does and handed to indexing as a reference to the MinIO
+    object, which embedding and indexing read back in chunks. With the
+    ingestion outbox enabled the document is queued for the background
+    indexers, otherwise it is indexed before returning.
+    
+    Access restricted to Tenant Admin and End User roles.
+    
+    Args:
+        content: Document content as UTF-8 bytes
+        document_metadata: Document metadata dictionary (title required, see rag_ingest)
+        tenant_id: Tenant UUID (optional, extracted from context if not provided)
+        document_id: Document UUID (optional, auto-generated if not provided)
+        
+    Returns:
+        dict: Ingestion result, as returned by rag_ingest
+        
+    Raises:
+        AuthorizationError: If user is not Tenant Admin or End User
+        ValidationError: If the content (empty, not UTF-8, too large) or metadata is invalid
+    """
+    tenant_uuid, context_user_id = _resolve_ingestion_context(tenant_id)
+    title = _validate_document_metadata(document_metadata)
+    doc_uuid = _parse_document_id(document_id)
+    
+    # An explicit document_id may name an existing document, whose content
+    # is copied aside until the new version is committed (or put back)
+    timer = StageTimer()
+    backup_object = None
+    if document_id:
+        backup_object = await backup_document_content(tenant_uuid, doc_uuid)
+    
+    # The upload completes only once the whole stream was read and validated;
+    # until then an existing object of the document is unchanged
+    stream = TextContentStream(content, max_bytes=ingestion_settings.stream_max_bytes)
+    try:
+        minio_object_name = await timer.run("minio", upload_document_stream(
+            tenant_id=tenant_uuid,
+            document_id=doc_uuid,
+            chunks=stream,
+            content_type="text/plain",
+            part_size=ingestion_settings.stream_part_size_bytes,
+        ))
+    except Exception:
+        await _release_backup(tenant_uuid, doc_uuid, backup_object, restore=False)
+        raise
+    content_hash = stream.content_hash
+    
+    is_new_document = False
+    written: List[str] = ["minio"]
+    try:
+        async for session in get_db_session():
+            doc_repo = DocumentRepository(session)
+            
+            doc_uuid, duplicate_of, is_new_document = await timer.run("database", _write_document_row(
+                doc_repo,
+                session,
+                tenant_uuid,
+                context_user_id,
+                doc_uuid,
+                bool(document_id),
+                title,
+                content_hash,
+                document_metadata,
+            ))
+            if duplicate_of:
+                if backup_object:
+                    await _release_backup(tenant_uuid, doc_uuid, backup_object, restore=True)
+                elif not document_id:
+                    await undo_ingestion(tenant_uuid, [doc_uuid], minio=True)
+                return _duplicate_result(duplicate_of)
+            
+            document = await doc_repo.get_by_id(doc_uuid)
+            created_at = document.created_at if document else datetime.now(timezone.utc)
+            
+            if ingestion_settings.outbox_enabled:
+                outbox_repo = IngestionOutboxRepository(session)
+                await outbox_repo.enqueue(
+                    tenant_id=tenant_uuid,
+                    document_id=doc_uuid,
+                    title=title,
+                    content=None,
+                    metadata=document_metadata,
+                    document_created_at=created_at,
+                    content_object=minio_object_name,
+                )
+                await session.commit()
+                written.clear()
+                await _release_backup(tenant_uuid, doc_uuid, backup_object, restore=False)
+                ingestion_indexer.notify()
+                
+                logger.info(
+                    "Streamed document queued for indexing",
+                    tenant_id=str(tenant_uuid),
+                    document_id=str(doc_uuid),
+                    title=title,
+                    content_bytes=stream.content_bytes,
+                )
+                
+                return {
+                    "document_id": str(doc_uuid),
+                    "ingestion_status": "queued",
+                    "indexed_in": ["PostgreSQL", "MinIO"],
+                    "processing_metadata": {
+                        "indexing_status": "pending",
+                        "content_length": stream.content_length,
+                        "content_hash": content_hash,
+                        "minio_object": minio_object_name,
+                    },
+                }
+            
+            # Inline indexing reads the content back from MinIO
+            item = IngestionItem(0)
+            item.document_id = doc_uuid
+            item.title = title
+            item.metadata = document_metadata
+            item.created_at = created_at
+            item.minio_object = minio_object_name
+            item.text = await timer.run("read", read_text(stream_document_content(
+                tenant_uuid, minio_object_name, ingestion_settings.stream_read_chunk_bytes
+            )))
+            await timer.run("embedding", embed_items(tenant_uuid, [item]))
+            if item.error:
+                raise RuntimeError(item.error)
+            dimension = await timer.run("index", index_items(tenant_uuid, [item], undo_on_failure=True))
+            written.extend(["faiss", "meilisearch"])
+            await write_chunks(doc_repo, tenant_uuid, [item])
+            await timer.run("commit", session.commit())
+            written.clear()
+            await _release_backup(tenant_uuid, doc_uuid, backup_object, restore=False)
+            
+            indexed_in = ["PostgreSQL", "MinIO", "FAISS", "Meilisearch"]
+            stage_timings = timer.to_dict()
+            
+            logger.info(
+                "Streamed document ingested successfully",
+                tenant_id=str(tenant_uuid),
+                document_id=str(doc_uuid),
+                title=title,
+                content_bytes=stream.content_bytes,
+                chunk_count=len(item.chunks),
+                **stage_timings,
+            )
+            
+            return {
+                "document_id": str(doc_uuid),
+                "ingestion_status": "success",
+                "indexed_in": indexed_in,
+                "processing_metadata": {
+                    "embedding_dimension": dimension,
+                    "chunk_count": len(item.chunks),
+                    "content_length": stream.content_length,
+                    "minio_object": minio_object_name,
+                    "content_hash": content_hash,
+                    "stage_timings_ms": stage_timings,
+                },
+            }
+    except Exception as e:
+        # Only new documents are undone, as in rag_ingest; an existing
+        # document gets its previous content back
+        if written and (is_new_document or not document_id):
+            await undo_ingestion(
+                tenant_uuid,
+                [doc_uuid],
+                minio="minio" in written,
+                faiss="faiss" in written,
+                meilisearch="meilisearch" in written,
+            )
+        await _release_backup(tenant_uuid, doc_uuid, backup_object, restore="minio" in written)
+        logger.error(
+            "Error ingesting streamed document",
+            error=str(e),
+            tenant_id=str(tenant_uuid),
+            document_id=str(doc_uuid),
+        )
+        raise
+
+
+@mcp_server.tool()
+async def rag_ingest_batch(
+    documents: List[Dict[str, Any]],
+    tenant_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Ingest a batch of documents into the knowledge base.
+    
+    Bulk counterpart of rag_ingest for loading corpora: the batch is
+    deduplicated with one query, embedded in model-sized requests, inserted
+    with one multi-row INSERT, uploaded to MinIO concurrently and indexed with
+    one FAISS write and one Meilisearch task. Invalid, duplicate or failed
+    documents are reported individually without failing the batch.
+    
+    Access restricted to Tenant Admin and End User roles.
+    
+    Args:
+        documents: Documents to ingest (at most INGESTION_BATCH_MAX_DOCUMENTS), each containing:
+            - document_content: Document content as string (required)
+            - document_metadata: Metadata dictionary with a title (required)
+            - document_id: Document UUID (optional, auto-generated if not provided)
+        tenant_id: Tenant UUID (optional, extracted from context if not provided)
+        
+    Returns:
+        dict: Batch result containing:
+            - ingested / duplicates / failed: Document counts by status
+            - documents: Per-document results in request order (position,
+              document_id, ingestion_status and existing_document_id or error)
+            - processing_metadata: Processing details (embedding dimension)
+            
+    Raises:
+        AuthorizationError: If user is not Tenant Admin or End User
+        ValidationError: If the batch is empty or too large
+        ValueError: If tenant_id format is invalid
+    """
+    tenant_uuid, context_user_id = _resolve_ingestion_context(tenant_id)
+    
+    if not isinstance(documents, list):
+        raise ValidationError(
+            "documents must be a non-empty list.",
+            field="documents",
+            error_code="FR-VALIDATION-001"
+        )
+    
+    try:
+        return await batch_ingestion_service.ingest(tenant_uuid, context_user_id, documents)
+    except (AuthorizationError, ValidationError) as e:
+        logger.error(
+            "Error ingesting document batch",
+            error=str(e),
+            tenant_id=str(tenant_uuid),
+        )
+        raise
+    except Exception as e:
+        logger.error(
+            "Unexpected error during batch document ingestion",
+            error=str(e),
+            tenant_id=str(tenant_uuid),
+            documents=len(documents),
+        )
+        raise
+
+
+@mcp_server.tool()
+async def rag_get_indexing_status(
+    document_ids: List[str],
+    tenant_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Get the background indexing status of ingested documents.
+    
+    Reports the newest queued version of each document: "pending" (waiting
+    or being retried), "processing", "indexed" or "failed". Documents
+    ingested without the outbox have status "unknown".
+    
+    Access available to Tenant Admin and End User roles.
+    
+    Args:
+        document_ids: Document UUIDs (string format)
+        tenant_id: Tenant UUID (optional, extracted from context if not provided)
+        
+    Returns:
+        dict: Status per document containing:
+            - documents: List of {document_id, indexing_status, attempts,
+              last_error, queued_at, indexed_at}
+            
+    Raises:
+        AuthorizationError: If user is not Tenant Admin or End User
+        ValidationError: If document_ids is empty or contains an invalid UUID
+    """
+    # Check authorization - Tenant Admin and End User can read documents
+    current_role = get_role_from_context()
+    if not current_role or current_role not in [UserRole.TENANT_ADMIN, UserRole.USER]:
+        raise AuthorizationError(
+            "Only Tenant Admin and End User can retrieve indexing status.",
+            error_code="FR-AUTH-002"
+        )
+    
+    context_tenant_id = get_tenant_id_from_context()
+    if not context_tenant_id:
+        raise ValidationError(
+            "Tenant ID not found in context. Please ensure tenant context is set.",
+            field="tenant_id",
+            error_code="FR-VALIDATION-001"
+        )
+    
+    if tenant_id:
+        try:
+            tenant_uuid = UUID(tenant_id)
+        except ValueError:
+            raise ValidationError(
+                f"Invalid tenant_id format: {tenant_id}. Must be a valid UUID.",
+                field="tenant_id",
+                error_code="FR-VALIDATION-001"
+            )
+        if tenant_uuid != context_tenant_id:
+            raise AuthorizationError(
+                "Tenant ID mismatch. You can only retrieve documents for your own tenant.",
+                error_code="FR-AUTH-003"
+            )
+    else:
+        tenant_uuid = context_tenant_id
+    
+    if not document_ids or not isinstance(document_ids, list):
+        raise ValidationError(
+            "document_ids must be a non-empty list.",
+            field="document_ids",
+            error_code="FR-VALIDATION-001"
+        )
+    if len(document_ids) > ingestion_settings.batch_max_documents:
+        raise ValidationError(
+            f"At most {ingestion_settings.batch_max_documents} document_ids per call, got {len(document_ids)}.",
+            field="document_ids",
+            error_code="FR-VALIDATION-001"
+        )
+    try:
+        doc_uuids = [UUID(str(document_id)) for document_id in document_ids]
+    except ValueError:
+        raise ValidationError(
+            "document_ids must contain valid UUIDs.",
+            field="document_ids",
+            error_code="FR-VALIDATION-001"
+        )
+    
+    async for session in get_db_session():
+        outbox_repo = IngestionOutboxRepository(session)
+        entries = await outbox_repo.get_latest_by_document_ids(tenant_uuid, doc_uuids)
+    
+    documents = []
+    for doc_uuid in doc_uuids:
+        entry = entries.get(doc_uuid)
+        if entry is None:
+            documents.append({"document_id": str(doc_uuid), "indexing_status": "unknown"})
+            continue
+        documents.append({
+            "document_id": str(doc_uuid),
+            "indexing_status": entry.status,
+            "attempts": entry.attempts,
+            "last_error": entry.last_error,
+            "queued_at": entry.created_at.isoformat() if entry.created_at else None,
+            "indexed_at": entry.indexed_at.isoformat() if entry.indexed_at else None,
+        })
+    
+    return {"documents": documents}
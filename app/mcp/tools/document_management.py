@@ -17,6 +17,7 @@ from app.mcp.middleware.tenant import (
     get_tenant_id_from_context,
     get_user_id_from_context,
 )
+from app.services.faiss_executor import faiss_executor
 from app.services.faiss_manager import faiss_manager
 from app.services.meilisearch_client import remove_document_from_index
 from app.services.minio_client import get_document_content
@@ -143,7 +144,8 @@ async def rag_delete_document(
             
             # Remove from FAISS index (tenant-scoped)
             try:
-                faiss_manager.remove_document(
+                await faiss_executor.run(
+                    faiss_manager.remove_document,
                     tenant_id=tenant_uuid,
                     document_id=doc_uuid,
                 )
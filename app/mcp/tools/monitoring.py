@@ -30,9 +30,13 @@ from app.utils.errors import ValidationError
 from app.mcp.server import mcp_server
 from app.services.minio_client import create_minio_client, get_tenant_bucket
 from app.services.redis_client import get_redis_client
+from app.services.embedding_service import embedding_service
+from app.services.gpu_ai_client import gpu_ai_client
 from app.services.health import check_all_services_health
+from app.services.ingestion_indexer import ingestion_indexer
 from app.services.faiss_manager import faiss_manager, get_tenant_index_path
 from app.services.meilisearch_client import create_meilisearch_client, get_tenant_index_name
+from app.services.tenant_config_cache import tenant_config_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -181,7 +185,14 @@ async def _aggregate_usage_statistics(
             )
             
             # Aggregate document operations (rag_ingest, rag_delete_document, etc.)
-            document_actions = ["rag_ingest", "rag_delete_document", "rag_get_document", "rag_list_documents"]
+            document_actions = [
+                "rag_ingest",
+                "rag_ingest_batch",
+                "rag_get_indexing_status",
+                "rag_delete_document",
+                "rag_get_document",
+                "rag_list_documents",
+            ]
             document_query = select(AuditLog).where(
                 and_(
                     *filters,
@@ -1340,7 +1351,33 @@ async def rag_get_system_health() -> Dict[str, Any]:
                 "minio": {"status": bool, "message": str},
                 "meilisearch": {"status": bool, "message": str},
                 "mem0": {"status": bool, "message": str},
-                "faiss": {"status": bool, "message": str},
+                "faiss": {
+                    "status": bool,
+                    "message": str,
+                    "index_cache": {  # Loaded tenant index cache (when healthy)
+                        "entries": int,
+                        "current_bytes": int,
+                        "max_bytes": int,
+                        "hits": int,
+                        "misses": int,
+                        "hit_rate": float,
+                        "evictions": int,
+                        "loads": int,
+                        "load_time_ms_avg": float,
+                        ...
+                    },
+                    "executor": {  # Thread pool running FAISS searches and index I/O
+                        "max_workers": int,
+                        "omp_threads": int,
+                        "queue_depth": int,
+                        "active": int,
+                        "completed": int,
+                        "failed": int,
+                        "wait_ms_avg": float,
+                        "wait_ms_max": float,
+                        "run_ms_avg": float,
+                    },
+                },
             },
             "performance_metrics": {
                 "average_response_time_ms": float,
@@ -1348,6 +1385,55 @@ async def rag_get_system_health() -> Dict[str, Any]:
                 "p99_response_time_ms": float,
                 "total_requests": int,
                 "requests_per_second": float,
+                "embedding_batching": {  # Coalescing of concurrent embedding requests
+                    "batches": int,
+                    "texts": int,
+                    "failed_batches": int,
+                    "retried_batches": int,  # Halves of batches rejected for one caller's input
+                    "pending_texts": int,
+                    "batch_size": {"buckets": Dict[str, int], "count": int, "avg": float, "max": float},
+                    "wait_ms": {"buckets": Dict[str, int], "count": int, "avg": float, "max": float},
+                    ...
+                },
+                "embedding_cache": {  # Reuse of previously generated embeddings (null if disabled)
+                    "entries": int,
+                    "hits": int,
+                    "redis_hits": int,
+                    "misses": int,
+                    "hit_rate": float,
+                    ...
+                },
+                "embedding_openai": {  # Async OpenAI fallback backend
+                    "requests": int,
+                    "failed_requests": int,
+                    "texts": int,
+                    "in_flight": int,
+                    ...
+                },
+                "embedding_providers": {  # In-process embedding providers by model name
+                    "hashing": {"dimension": int, "requests": int, "failed_requests": int, "texts": int},
+                    ...
+                },
+                "embedding_scheduler": {  # Admission of interactive and bulk embedding traffic
+                    "max_in_flight": int,
+                    "interactive_reserved": int,
+                    "lanes": Dict[str, Dict[str, Any]],  # in_flight, waiting, admitted, wait_ms
+                    "gpu_ai_circuit": {"state": str, "times_opened": int, "rejected_calls": int, ...},
+                },
+                "gpu_ai_tasks": {  # Completion of asynchronous GPU-AI embedding tasks
+                    "outstanding_tasks": int,
+                    "completed_by_push": int,
+                    "completed_by_poll": int,
+                    "status_polls": int,
+                    "timeouts": int,
+                },
+                "tenant_config_cache": {  # Per-worker cache of tenant embedding/model configuration
+                    "entries": int,
+                    "hits": int,
+                    "misses": int,
+                    "invalidations": int,
+                    ...
+                },
             },
             "error_rates": {
                 "total_requests": int,
@@ -1400,6 +1486,19 @@ async def rag_get_system_health() -> Dict[str, Any]:
     async for session in get_db_session():
         try:
             performance_metrics = await _collect_performance_metrics(session, time_window_minutes=5)
+            performance_metrics["embedding_batching"] = embedding_service.batcher.stats()
+            performance_metrics["embedding_cache"] = (
+                embedding_service.cache.stats() if embedding_service.cache is not None else None
+            )
+            performance_metrics["embedding_openai"] = embedding_service.openai_backend.stats()
+            performance_metrics["embedding_providers"] = embedding_service.providers.stats()
+            performance_metrics["embedding_scheduler"] = {
+                **embedding_service.scheduler.stats(),
+                "gpu_ai_circuit": embedding_service.gpu_ai_breaker.stats(),
+            }
+            performance_metrics["gpu_ai_tasks"] = gpu_ai_client.tracker.stats()
+            performance_metrics["tenant_config_cache"] = tenant_config_cache.stats()
+            performance_metrics["ingestion_indexer"] = ingestion_indexer.stats()
             error_rates = await _calculate_error_rates(session, time_window_minutes=5)
             
             # Generate health summary and recommendations
@@ -22,6 +22,8 @@ from app.mcp.middleware.tenant import (
 from app.mcp.server import mcp_server
 from app.services.hybrid_search_service import hybrid_search_service
 from app.services.context_aware_search_service import context_aware_search_service
+from app.services.passage_context import passage_scope
+from app.services.query_embedding_context import query_embedding_scope
 from app.utils.errors import AuthorizationError, ValidationError
 
 logger = structlog.get_logger(__name__)
@@ -88,6 +90,10 @@ async def rag_search(
             - source: Document source (from metadata)
             - timestamp: Document creation timestamp (ISO format)
             - metadata: Full document metadata
+            - passage: Best matching passage of the content, when vector
+              search matched one of the document's chunks: chunk_no,
+              start_offset and end_offset (character offsets, see
+              rag_get_document for the content)
         - total_results: Total number of results found
         - search_mode: "hybrid", "vector_only", "keyword_only", or "failed"
         - fallback_triggered: Whether fallback was used
@@ -156,162 +162,172 @@ async def rag_search(
                 error_code="FR-VALIDATION-001"
             )
     
-    try:
-        # Build filters dictionary for hybrid search
-        filters: Dict[str, Any] = {}
-        if document_type:
-            filters["document_type"] = document_type
-        if tags:
-            filters["tags"] = tags
-        
-        # Perform hybrid search
-        logger.debug(
-            "Performing hybrid search",
-            tenant_id=str(context_tenant_id),
-            user_id=str(context_user_id),
-            query_length=len(search_query),
-            filters=filters,
-            limit=limit,
-        )
-        
-        search_result = await hybrid_search_service.search(
-            tenant_id=context_tenant_id,
-            query_text=search_query,
-            k=limit,
-            filters=filters if filters else None,
-        )
-        
-        # Extract results and metadata
-        search_results = search_result["results"]
-        search_mode = search_result["search_mode"]
-        fallback_triggered = search_result["fallback_triggered"]
-        
-        # Retrieve document metadata from database and apply personalization
-        personalized = False
-        async for session in get_db_session():
-            doc_repo = DocumentRepository(session)
+    # The query is embedded once and shared by vector search and memory search;
+    # vector search records the best matching passage of each document
+    with query_embedding_scope(), passage_scope() as passages:
+        try:
+            # Build filters dictionary for hybrid search. Every filter, including
+            # the date range, is applied inside the search so a full page of
+            # matching documents comes back.
+            filters: Dict[str, Any] = {}
+            if document_type:
+                filters["document_type"] = document_type
+            if tags:
+                filters["tags"] = tags
+            if date_from_dt:
+                filters["date_from"] = date_from_dt
+            if date_to_dt:
+                filters["date_to"] = date_to_dt
             
-            # Pre-fetch metadata for personalization if enabled
-            document_metadata_map: Dict[UUID, Dict[str, Any]] = {}
-            if context_user_id and enable_personalization is not False:
-                for doc_id, _ in search_results:
-                    document = await doc_repo.get_by_id(doc_id)
-                    if document:
-                        metadata = document.metadata_json or {}
-                        document_metadata_map[doc_id] = {
-                            "title": document.title,
-                            "snippet": _generate_snippet(document.title or "", max_length=200),
-                            "metadata": metadata,
-                            "source": metadata.get("source", "unknown"),
-                        }
+            # Perform hybrid search
+            logger.debug(
+                "Performing hybrid search",
+                tenant_id=str(context_tenant_id),
+                user_id=str(context_user_id),
+                query_length=len(search_query),
+                filters=filters,
+                limit=limit,
+            )
+            
+            search_result = await hybrid_search_service.search(
+                tenant_id=context_tenant_id,
+                query_text=search_query,
+                k=limit,
+                filters=filters if filters else None,
+            )
+            
+            # Extract results and metadata
+            search_results = search_result["results"]
+            search_mode = search_result["search_mode"]
+            fallback_triggered = search_result["fallback_triggered"]
+            
+            # Retrieve document metadata from database and apply personalization
+            personalized = False
+            async for session in get_db_session():
+                doc_repo = DocumentRepository(session)
                 
-                # Apply personalization
-                try:
-                    personalized_results = await context_aware_search_service.personalize_search_results(
-                        search_results=search_results,
-                        tenant_id=context_tenant_id,
-                        user_id=UUID(context_user_id),
-                        query_text=search_query,
-                        session_id=session_id,
-                        document_metadata=document_metadata_map,
-                    )
+                # Pre-fetch metadata for personalization if enabled
+                document_metadata_map: Dict[UUID, Dict[str, Any]] = {}
+                if context_user_id and enable_personalization is not False:
+                    for doc_id, _ in search_results:
+                        document = await doc_repo.get_by_id(doc_id)
+                        if document:
+                            metadata = document.metadata_json or {}
+                            document_metadata_map[doc_id] = {
+                                "title": document.title,
+                                "snippet": _generate_snippet(document.title or "", max_length=200),
+                                "metadata": metadata,
+                                "source": metadata.get("source", "unknown"),
+                            }
                     
-                    # Use personalized results if personalization was applied
-                    if personalized_results != search_results:
-                        search_results = personalized_results
-                        personalized = True
-                        logger.debug(
-                            "Search results personalized",
+                    # Apply personalization
+                    try:
+                        personalized_results = await context_aware_search_service.personalize_search_results(
+                            search_results=search_results,
+                            tenant_id=context_tenant_id,
+                            user_id=UUID(context_user_id),
+                            query_text=search_query,
+                            session_id=session_id,
+                            document_metadata=document_metadata_map,
+                        )
+                        
+                        # Use personalized results if personalization was applied
+                        if personalized_results != search_results:
+                            search_results = personalized_results
+                            personalized = True
+                            logger.debug(
+                                "Search results personalized",
+                                tenant_id=str(context_tenant_id),
+                                user_id=str(context_user_id),
+                                session_id=session_id,
+                            )
+                    except Exception as e:
+                        # If personalization fails, continue with original results
+                        logger.warning(
+                            "Personalization failed, using original results",
                             tenant_id=str(context_tenant_id),
                             user_id=str(context_user_id),
-                            session_id=session_id,
+                            error=str(e),
                         )
-                except Exception as e:
-                    # If personalization fails, continue with original results
-                    logger.warning(
-                        "Personalization failed, using original results",
-                        tenant_id=str(context_tenant_id),
-                        user_id=str(context_user_id),
-                        error=str(e),
-                    )
-            
-            # Build list of document results with metadata
-            document_results: List[Dict[str, Any]] = []
-            
-            for doc_id, relevance_score in search_results:
-                # Get document from database
-                document = await doc_repo.get_by_id(doc_id)
-                
-                if not document:
-                    logger.warning(
-                        "Document not found in database",
-                        tenant_id=str(context_tenant_id),
-                        document_id=str(doc_id),
-                    )
-                    continue
                 
-                # Apply date filters (post-search filtering)
-                if date_from_dt and document.created_at < date_from_dt:
-                    continue
-                if date_to_dt and document.created_at > date_to_dt:
-                    continue
+                # Build list of document results with metadata
+                document_results: List[Dict[str, Any]] = []
                 
-                # Extract metadata
-                metadata = document.metadata_json or {}
-                source = metadata.get("source", "unknown")
-                doc_type = metadata.get("type", "text")
+                for doc_id, relevance_score in search_results:
+                    # Get document from database
+                    document = await doc_repo.get_by_id(doc_id)
+                    
+                    if not document:
+                        logger.warning(
+                            "Document not found in database",
+                            tenant_id=str(context_tenant_id),
+                            document_id=str(doc_id),
+                        )
+                        continue
+                    
+                    # Extract metadata
+                    metadata = document.metadata_json or {}
+                    source = metadata.get("source", "unknown")
+                    doc_type = metadata.get("type", "text")
+                    
+                    # Generate snippet from title
+                    # Note: For performance (<200ms target), we use title as snippet
+                    # Full content retrieval from MinIO would be too slow for search results
+                    # Users can use rag_get_document for full content if needed
+                    snippet = _generate_snippet(document.title or "", max_length=200)
+                    
+                    document_result = {
+                        "document_id": str(document.document_id),
+                        "title": document.title,
+                        "snippet": snippet,
+                        "relevance_score": float(relevance_score),
+                        "source": source,
+                        "timestamp": document.created_at.isoformat() if document.created_at else None,
+                        "metadata": metadata,
+                    }
+                    passage = passages.get(doc_id)
+                    if passage is not None:
+                        document_result["passage"] = {
+                            "chunk_no": passage["chunk_no"],
+                            "start_offset": passage["start_offset"],
+                            "end_offset": passage["end_offset"],
+                        }
+                    
+                    document_results.append(document_result)
                 
-                # Generate snippet from title
-                # Note: For performance (<200ms target), we use title as snippet
-                # Full content retrieval from MinIO would be too slow for search results
-                # Users can use rag_get_document for full content if needed
-                snippet = _generate_snippet(document.title or "", max_length=200)
+                logger.info(
+                    "RAG search completed",
+                    tenant_id=str(context_tenant_id),
+                    user_id=str(context_user_id),
+                    query_length=len(search_query),
+                    total_results=len(document_results),
+                    search_mode=search_mode,
+                    fallback_triggered=fallback_triggered,
+                    personalized=personalized,
+                )
                 
-                document_result = {
-                    "document_id": str(document.document_id),
-                    "title": document.title,
-                    "snippet": snippet,
-                    "relevance_score": float(relevance_score),
-                    "source": source,
-                    "timestamp": document.created_at.isoformat() if document.created_at else None,
-                    "metadata": metadata,
+                return {
+                    "results": document_results,
+                    "total_results": len(document_results),
+                    "search_mode": search_mode,
+                    "fallback_triggered": fallback_triggered,
+                    "personalized": personalized,
                 }
                 
-                document_results.append(document_result)
-            
-            logger.info(
-                "RAG search completed",
+        except (AuthorizationError, ValidationError) as e:
+            logger.error(
+                "Error during RAG search",
                 tenant_id=str(context_tenant_id),
                 user_id=str(context_user_id),
-                query_length=len(search_query),
-                total_results=len(document_results),
-                search_mode=search_mode,
-                fallback_triggered=fallback_triggered,
-                personalized=personalized,
+                error=str(e),
             )
-            
-            return {
-                "results": document_results,
-                "total_results": len(document_results),
-                "search_mode": search_mode,
-                "fallback_triggered": fallback_triggered,
-                "personalized": personalized,
-            }
-            
-    except (AuthorizationError, ValidationError) as e:
-        logger.error(
-            "Error during RAG search",
-            tenant_id=str(context_tenant_id),
-            user_id=str(context_user_id),
-            error=str(e),
-        )
-        raise
-    except Exception as e:
-        logger.error(
-            "Unexpected error during RAG search",
-            tenant_id=str(context_tenant_id),
-            user_id=str(context_user_id),
-            error=str(e),
-        )
-        raise
+            raise
+        except Exception as e:
+            logger.error(
+                "Unexpected error during RAG search",
+                tenant_id=str(context_tenant_id),
+                user_id=str(context_user_id),
+                error=str(e),
+            )
+            raise
 
@@ -2,7 +2,7 @@
 Tenant configuration MCP tools for managing tenant-specific settings.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 import structlog
@@ -13,12 +13,94 @@ from app.db.repositories.tenant_config_repository import TenantConfigRepository
 from app.db.repositories.tenant_repository import TenantRepository
 from app.mcp.middleware.rbac import UserRole
 from app.mcp.middleware.tenant import get_role_from_context, get_tenant_id_from_context
+from app.services.faiss_executor import faiss_executor
+from app.services.faiss_manager import faiss_manager, normalize_index_type
+from app.services.faiss_reduction import normalize_reduction_method
 from app.services.model_validator import model_validator
+from app.services.tenant_config_cache import tenant_config_cache
 from app.utils.errors import AuthorizationError, ResourceNotFoundError, ValidationError
 
 logger = structlog.get_logger(__name__)
 
 
+def _validate_faiss_index_config(faiss_index_config: Any) -> Dict[str, Any]:
+    """
+    Validate the custom_configuration.faiss_index section.
+    
+    Args:
+        faiss_index_config: Dictionary with optional index_type, nprobe and ef_search
+        
+    Returns:
+        dict: Validated keyword arguments for FAISSIndexManager.set_tenant_index_config
+        
+    Raises:
+        ValidationError: If the section is malformed
+    """
+    field = "configuration_updates.custom_configuration.faiss_index"
+    if not isinstance(faiss_index_config, dict):
+        raise ValidationError(
+            "faiss_index must be a dictionary.",
+            field=field,
+            error_code="FR-VALIDATION-001",
+        )
+    
+    validated: Dict[str, Any] = {}
+    try:
+        if faiss_index_config.get("index_type") is not None:
+            validated["index_type"] = normalize_index_type(faiss_index_config["index_type"])
+        for key in ("nprobe", "ef_search"):
+            if faiss_index_config.get(key) is not None:
+                value = int(faiss_index_config[key])
+                if value < 1:
+                    raise ValueError(f"{key} must be a positive integer")
+                validated[key] = value
+    except (TypeError, ValueError) as e:
+        raise ValidationError(
+            str(e),
+            field=field,
+            error_code="FR-VALIDATION-001",
+        )
+    
+    return validated
+
+
+def _validate_faiss_reduction_config(faiss_index_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Validate the dimensionality reduction of the custom_configuration.faiss_index section.
+    
+    Args:
+        faiss_index_config: Dictionary with optional reduction ("pca",
+            "truncate"/"matryoshka" or "none") and reduced_dimension
+        
+    Returns:
+        dict: Keyword arguments for FAISSIndexManager.set_tenant_reduction,
+            or None if the section does not set a reduction
+        
+    Raises:
+        ValidationError: If the reduction is malformed
+    """
+    if "reduction" not in faiss_index_config:
+        return None
+    
+    try:
+        method = normalize_reduction_method(faiss_index_config["reduction"])
+        output_dimension = None
+        if method is not None:
+            if faiss_index_config.get("reduced_dimension") is None:
+                raise ValueError("reduced_dimension is required with a reduction")
+            output_dimension = int(faiss_index_config["reduced_dimension"])
+            if output_dimension < 1:
+                raise ValueError("reduced_dimension must be a positive integer")
+    except (TypeError, ValueError) as e:
+        raise ValidationError(
+            str(e),
+            field="configuration_updates.custom_configuration.faiss_index",
+            error_code="FR-VALIDATION-001",
+        )
+    
+    return {"method": method, "output_dimension": output_dimension}
+
+
 @mcp_server.tool()
 async def rag_configure_tenant_models(
     tenant_id: str,
@@ -120,6 +202,7 @@ async def rag_configure_tenant_models(
 
             # Commit transaction
             await session.commit()
+            tenant_config_cache.invalidate(tenant_uuid)
 
             logger.info(
                 "Tenant model configuration updated",
@@ -181,13 +264,20 @@ async def rag_update_tenant_config(
             - rate_limit_config: Optional rate limit configuration updates
             - data_isolation_config: Optional data isolation configuration updates
             - audit_logging_config: Optional audit logging configuration updates
-            - custom_configuration: Optional custom configuration updates
+            - custom_configuration: Optional custom configuration updates. A
+              "faiss_index" entry ({index_type, nprobe, ef_search}) selects the
+              tenant's FAISS index type (IndexFlatL2, IndexFlatIP, IVFFlat,
+              IVFPQ, HNSW, auto) and its search parameters; its reduction
+              ("pca", "truncate" or "none") and reduced_dimension store the
+              tenant's vectors in fewer dimensions
             
     Returns:
         dict: Updated configuration result containing:
             - tenant_id: Tenant ID
             - updated_configuration: Updated configuration sections
             - updated_at: Timestamp of update
+            - faiss_reduction: Applied dimensionality reduction with its
+              measured recall@k (only when faiss_index sets a reduction)
             
     Raises:
         AuthorizationError: If user is not Tenant Admin for the specified tenant
@@ -285,6 +375,8 @@ async def rag_update_tenant_config(
             
             # Track what was updated
             updated_sections = {}
+            faiss_index_updates: Dict[str, Any] = {}
+            faiss_reduction_update: Optional[Dict[str, Any]] = None
             
             # Update model_configuration if provided
             if "model_configuration" in configuration_updates:
@@ -379,6 +471,11 @@ async def rag_update_tenant_config(
                         error_code="FR-VALIDATION-001",
                     )
                 
+                # Validate FAISS index settings (index type, nprobe, ef_search, reduction)
+                if "faiss_index" in custom_config:
+                    faiss_index_updates = _validate_faiss_index_config(custom_config["faiss_index"])
+                    faiss_reduction_update = _validate_faiss_reduction_config(custom_config["faiss_index"])
+                
                 # Merge with existing custom configuration
                 existing_custom = tenant_config.custom_configuration or {}
                 updated_custom = {**existing_custom, **custom_config}
@@ -387,6 +484,27 @@ async def rag_update_tenant_config(
             
             # Commit transaction
             await session.commit()
+            tenant_config_cache.invalidate(tenant_uuid)
+            
+            # Apply FAISS index settings once the configuration is committed
+            if faiss_index_updates:
+                await faiss_executor.run(faiss_manager.set_tenant_index_config, tenant_uuid, **faiss_index_updates)
+            
+            # Reducing dimensions rebuilds the index, so it runs on the FAISS executor
+            faiss_reduction = None
+            if faiss_reduction_update is not None:
+                try:
+                    faiss_reduction = await faiss_executor.run(
+                        faiss_manager.set_tenant_reduction,
+                        tenant_uuid,
+                        **faiss_reduction_update,
+                    )
+                except ValueError as e:
+                    raise ValidationError(
+                        str(e),
+                        field="configuration_updates.custom_configuration.faiss_index",
+                        error_code="FR-VALIDATION-001",
+                    )
             
             logger.info(
                 "Tenant configuration updated",
@@ -394,13 +512,16 @@ async def rag_update_tenant_config(
                 updated_sections=list(updated_sections.keys()),
             )
             
-            return {
+            result = {
                 "tenant_id": str(tenant_uuid),
                 "updated_configuration": updated_sections,
                 "updated_at": tenant_config.updated_at.isoformat()
                 if tenant_config.updated_at
                 else None,
             }
+            if faiss_reduction is not None:
+                result["faiss_reduction"] = faiss_reduction
+            return result
     
     except (AuthorizationError, ResourceNotFoundError, ValidationError) as e:
         logger.error(
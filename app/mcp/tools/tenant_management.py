@@ -24,6 +24,7 @@ from app.services.faiss_manager import faiss_manager, get_tenant_index_path
 from app.services.minio_client import create_minio_client, get_tenant_bucket
 from app.services.meilisearch_client import create_meilisearch_client, get_tenant_index_name
 from app.services.redis_client import get_redis_client
+from app.services.tenant_config_cache import tenant_config_cache
 from app.utils.errors import AuthorizationError, ResourceNotFoundError, ValidationError
 from app.utils.redis_keys import RedisKeyPatterns
 
@@ -247,6 +248,7 @@ async def rag_delete_tenant(
                     if tenant_config:
                         await session.delete(tenant_config)
                         await session.commit()
+                        tenant_config_cache.invalidate(tenant_uuid)
                         deleted_resources.append("tenant_config")
                         logger.info("Tenant configuration deleted", tenant_id=tenant_id)
             except Exception as e:
@@ -397,6 +399,7 @@ async def rag_update_subscription_tier(
             
             # Commit transaction
             await session.commit()
+            tenant_config_cache.invalidate(tenant_uuid)
             
             logger.info(
                 "Subscription tier updated",
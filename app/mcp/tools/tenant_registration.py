@@ -20,9 +20,11 @@ from app.db.models.tenant_config import TenantConfig
 from app.mcp.middleware.rbac import UserRole, check_tool_permission
 from app.mcp.middleware.tenant import get_role_from_context
 from app.mcp.server import mcp_server
+from app.services.faiss_executor import faiss_executor
 from app.services.faiss_manager import faiss_manager
 from app.services.minio_client import get_tenant_bucket
 from app.services.meilisearch_client import create_tenant_index
+from app.services.tenant_config_cache import tenant_config_cache
 from app.utils.errors import AuthorizationError, ResourceNotFoundError, ValidationError
 
 logger = structlog.get_logger(__name__)
@@ -161,7 +163,16 @@ async def rag_register_tenant(
             
             # 1. Create FAISS index
             try:
-                faiss_manager.create_index(tenant_uuid)
+                faiss_index_config = (custom_configuration or {}).get("faiss_index")
+                if isinstance(faiss_index_config, dict):
+                    await faiss_executor.run(
+                        faiss_manager.set_tenant_index_config,
+                        tenant_uuid,
+                        index_type=faiss_index_config.get("index_type"),
+                        nprobe=faiss_index_config.get("nprobe"),
+                        ef_search=faiss_index_config.get("ef_search"),
+                    )
+                await faiss_executor.run(faiss_manager.create_index, tenant_uuid)
                 resources_created.append("FAISS index")
             except Exception as e:
                 logger.error(
@@ -197,6 +208,7 @@ async def rag_register_tenant(
             
             # Commit transaction
             await session.commit()
+            tenant_config_cache.invalidate(tenant_uuid)
             
             logger.info(
                 "Tenant registered successfully",
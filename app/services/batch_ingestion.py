@@ -0,0 +1,567 @@
+"""
+Bulk document ingestion.
+
+rag_ingest costs one round trip to every backing store per document. A batch
+shares them instead: one deduplication query, model-sized embedding requests
+overlapping concurrent MinIO uploads, one multi-row INSERT, then one FAISS
+add_with_ids and one Meilisearch task running side by side. Documents are
+split into token windows (see document_chunker) and every chunk is embedded
+and indexed as its own FAISS vector. Problems with single documents
+(invalid input, duplicates, a failed embedding request or upload) are
+reported per document; the rest of the batch is still ingested.
+
+embed_items, upload_items and index_items are shared with the background
+ingestion indexer, which drains queued documents the same way.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+import numpy as np
+import structlog
+
+from app.config.ingestion import ingestion_settings
+from app.db.connection import get_db_session
+from app.db.repositories.document_repository import DocumentRepository
+from app.services.document_chunker import TextChunk, chunk_text
+from app.services.embedding_scheduler import PRIORITY_BULK
+from app.services.embedding_service import embedding_service
+from app.services.faiss_attribute_store import document_attributes
+from app.services.faiss_executor import faiss_executor
+from app.services.faiss_manager import chunk_faiss_id, document_id_to_faiss_id, faiss_manager
+from app.services.ingestion_stages import StageTimer, undo_ingestion
+from app.services.meilisearch_client import add_documents_to_index
+from app.services.minio_client import upload_document_contents
+from app.utils.errors import ValidationError
+
+logger = structlog.get_logger(__name__)
+
+STATUS_SUCCESS = "success"
+STATUS_DUPLICATE = "duplicate"
+STATUS_FAILED = "failed"
+
+
+class IngestionItem:
+    """One document of a batch and its progress through the stores."""
+
+    def __init__(self, position: int):
+        """
+        Initialize the document.
+
+        Args:
+            position: Position of the document in its batch
+        """
+        self.position = position
+        self.document_id: Optional[UUID] = None
+        self.explicit_id = False
+        self.title: Optional[str] = None
+        self.text: Optional[str] = None
+        self.content_hash: Optional[str] = None
+        self.metadata: Dict[str, Any] = {}
+        self.created_at: Optional[datetime] = None
+        self.chunks: List[TextChunk] = []
+        self.embeddings: Optional[np.ndarray] = None
+        self.minio_object: Optional[str] = None
+        self.status: Optional[str] = None
+        self.error: Optional[str] = None
+        self.existing_document_id: Optional[UUID] = None
+
+    def fail(self, error: str) -> None:
+        """Mark the document as not ingested."""
+        self.status = STATUS_FAILED
+        self.error = error
+
+    def to_result(self) -> Dict[str, Any]:
+        """
+        Describe the document's outcome.
+
+        Returns:
+            dict: position, document_id, ingestion_status and details
+        """
+        result: Dict[str, Any] = {
+            "position": self.position,
+            "document_id": str(self.document_id) if self.document_id else None,
+            "ingestion_status": self.status,
+        }
+        if self.status == STATUS_SUCCESS:
+            result["content_hash"] = self.content_hash
+            result["minio_object"] = self.minio_object
+        elif self.status == STATUS_DUPLICATE:
+            result["existing_document_id"] = str(self.existing_document_id)
+        else:
+            result["error"] = self.error
+        return result
+
+
+def _prepare(position: int, document: Any) -> IngestionItem:
+    """
+    Validate one requested document and derive its text, hash and ID.
+
+    Args:
+        position: Position of the document in the request
+        document: {"document_content", "document_metadata", optional "document_id"}
+
+    Returns:
+        IngestionItem, failed if the request is invalid
+    """
+    item = IngestionItem(position)
+    if not isinstance(document, dict):
+        item.fail("Document must be a dictionary")
+        return item
+
+    content = document.get("document_content")
+    metadata = document.get("document_metadata")
+    if not isinstance(content, str) or not content.strip():
+        item.fail("Document content cannot be empty")
+        return item
+    if not metadata or not isinstance(metadata, dict):
+        item.fail("Document metadata must be a non-empty dictionary")
+        return item
+    title = metadata.get("title")
+    if not isinstance(title, str) or not title.strip():
+        item.fail("Document metadata must include a 'title' field")
+        return item
+
+    if document.get("document_id"):
+        try:
+            item.document_id = UUID(str(document["document_id"]))
+        except ValueError:
+            item.fail(f"Invalid document_id format: {document['document_id']}. Must be a valid UUID.")
+            return item
+        item.explicit_id = True
+    else:
+        item.document_id = uuid4()
+
+    item.title = title
+    item.text = content.strip()
+    item.content_hash = hashlib.sha256(item.text.encode("utf-8")).hexdigest()
+    item.metadata = metadata
+    return item
+
+
+def pending_items(items: List[IngestionItem]) -> List[IngestionItem]:
+    """Get the documents still being ingested."""
+    return [item for item in items if item.status is None]
+
+
+async def embed_items(tenant_id: UUID, items: List[IngestionItem]) -> None:
+    """
+    Chunk documents and embed their chunks in model-sized requests on the
+    bulk priority lane.
+
+    A failed request fails the documents with a chunk in it only.
+
+    Args:
+        tenant_id: Tenant ID
+        items: Documents still being ingested
+    """
+    for item in items:
+        if not item.chunks:
+            item.chunks = chunk_text(item.text)
+
+    size = max(1, ingestion_settings.embedding_batch_size)
+    entries = [(item, chunk) for item in items for chunk in item.chunks]
+    requests = [entries[start:start + size] for start in range(0, len(entries), size)]
+    results = await asyncio.gather(
+        *(
+            embedding_service.generate_embeddings(
+                [chunk.text for _, chunk in request],
+                str(tenant_id),
+                priority=PRIORITY_BULK,
+            )
+            for request in requests
+        ),
+        return_exceptions=True,
+    )
+
+    vectors: Dict[int, Dict[int, np.ndarray]] = {}
+    for request, result in zip(requests, results):
+        if isinstance(result, Exception):
+            failed = {id(item): item for item, _ in request}
+            logger.error(
+                "Error embedding document batch chunk",
+                tenant_id=str(tenant_id),
+                documents=len(failed),
+                chunks=len(request),
+                error=str(result),
+            )
+            for item in failed.values():
+                item.fail(f"Embedding failed: {result}")
+            continue
+        for (item, chunk), embedding in zip(request, result):
+            vectors.setdefault(id(item), {})[chunk.chunk_no] = embedding
+
+    for item in items:
+        if item.status is None:
+            chunk_vectors = vectors[id(item)]
+            item.embeddings = np.vstack([chunk_vectors[chunk.chunk_no] for chunk in item.chunks])
+
+
+def chunk_rows(tenant_id: UUID, document_id: UUID, chunks: List[TextChunk]) -> List[Dict[str, Any]]:
+    """
+    Build the document_chunks rows of a document.
+
+    Args:
+        tenant_id: Tenant ID
+        document_id: Document ID
+        chunks: The document's chunks
+
+    Returns:
+        list: Column values of each chunk, for DocumentRepository.replace_chunks
+    """
+    return [
+        {
+            "document_id": document_id,
+            "chunk_no": chunk.chunk_no,
+            "tenant_id": tenant_id,
+            "faiss_id": chunk_faiss_id(document_id, chunk.chunk_no),
+            "start_offset": chunk.start,
+            "end_offset": chunk.end,
+        }
+        for chunk in chunks
+    ]
+
+
+async def write_chunks(doc_repo: DocumentRepository, tenant_id: UUID, items: List[IngestionItem]) -> None:
+    """
+    Replace the chunk rows of indexed documents in the repository's session.
+
+    Args:
+        doc_repo: Document repository of the session committing the documents
+        tenant_id: Tenant ID
+        items: Chunked documents
+    """
+    await doc_repo.replace_chunks(
+        [item.document_id for item in items],
+        [row for item in items for row in chunk_rows(tenant_id, item.document_id, item.chunks)],
+    )
+
+
+async def upload_items(tenant_id: UUID, items: List[IngestionItem]) -> None:
+    """
+    Upload documents' content to MinIO concurrently.
+
+    A failed upload fails its document only.
+
+    Args:
+        tenant_id: Tenant ID
+        items: Documents still being ingested
+    """
+    if not items:
+        return
+    results = await upload_document_contents(
+        tenant_id,
+        {item.document_id: item.text.encode("utf-8") for item in items},
+        content_type="text/plain",
+        max_concurrency=ingestion_settings.upload_concurrency,
+    )
+    for item in items:
+        result = results[item.document_id]
+        if isinstance(result, Exception):
+            item.fail(f"Content upload failed: {result}")
+        else:
+            item.minio_object = result
+
+
+async def index_items(
+    tenant_id: UUID,
+    items: List[IngestionItem],
+    undo_on_failure: bool = False,
+) -> int:
+    """
+    Index embedded documents with one FAISS add and one Meilisearch task.
+
+    FAISS gets one vector per chunk, Meilisearch the whole document. The
+    two writes run concurrently. Both are idempotent per document ID, so a
+    failed call can be retried with the same documents.
+
+    Args:
+        tenant_id: Tenant ID
+        items: Embedded documents (chunks, embeddings and created_at set)
+        undo_on_failure: If one write fails, remove what the other wrote
+            (for documents that will not be committed)
+
+    Returns:
+        int: Embedding dimension
+
+    Raises:
+        Exception: The error of the first failed write
+    """
+    embeddings = np.vstack([item.embeddings for item in items])
+    faiss_result, meilisearch_result = await asyncio.gather(
+        faiss_executor.run(
+            faiss_manager.add_documents,
+            tenant_id=tenant_id,
+            document_ids=[item.document_id for item in items for _ in item.chunks],
+            embeddings=embeddings,
+            attributes=[
+                attributes
+                for item in items
+                for attributes in [document_attributes(item.metadata, item.created_at)] * len(item.chunks)
+            ],
+            chunk_numbers=[chunk.chunk_no for item in items for chunk in item.chunks],
+        ),
+        add_documents_to_index(
+            str(tenant_id),
+            [
+                {
+                    "id": str(item.document_id),
+                    "title": item.title,
+                    "content": item.text,
+                    "metadata": item.metadata,
+                }
+                for item in items
+            ],
+        ),
+        return_exceptions=True,
+    )
+
+    errors = [result for result in (faiss_result, meilisearch_result) if isinstance(result, Exception)]
+    if errors:
+        if undo_on_failure:
+            await undo_ingestion(
+                tenant_id,
+                [item.document_id for item in items],
+                faiss=not isinstance(faiss_result, Exception),
+                meilisearch=not isinstance(meilisearch_result, Exception),
+            )
+        raise errors[0]
+    return int(embeddings.shape[1])
+
+
+class BatchIngestionService:
+    """Ingests batches of documents with one call per backing store."""
+
+    async def ingest(
+        self,
+        tenant_id: UUID,
+        user_id: UUID,
+        documents: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Ingest a batch of documents into PostgreSQL, MinIO, FAISS and Meilisearch.
+
+        Documents are deduplicated like rag_ingest: by content hash, or by
+        document_id when one is given. Existing documents are not versioned
+        here; updating one is left to rag_ingest.
+
+        Args:
+            tenant_id: Tenant ID
+            user_id: ID of the user owning the new documents
+            documents: Documents, each {"document_content", "document_metadata",
+                optional "document_id"} as taken by rag_ingest
+
+        Returns:
+            dict: Counts by status and one result per document, in request order
+
+        Raises:
+            ValidationError: If the batch is empty or too large
+        """
+        if not documents:
+            raise ValidationError(
+                "documents must be a non-empty list.",
+                field="documents",
+                error_code="FR-VALIDATION-001",
+            )
+        if len(documents) > ingestion_settings.batch_max_documents:
+            raise ValidationError(
+                f"A batch holds at most {ingestion_settings.batch_max_documents} documents, got {len(documents)}.",
+                field="documents",
+                error_code="FR-VALIDATION-001",
+            )
+
+        items = [_prepare(position, document) for position, document in enumerate(documents)]
+        self._dedupe_within_batch(items)
+        embedding_dimension = None
+        timer = StageTimer()
+
+        async for session in get_db_session():
+            doc_repo = DocumentRepository(session)
+
+            # One query finds every existing document the batch collides with
+            await timer.run("dedupe", self._dedupe_existing(doc_repo, tenant_id, pending_items(items)))
+
+            # Embedding and uploads are independent; uploads of documents
+            # whose embedding failed are removed again
+            pending = pending_items(items)
+            await asyncio.gather(
+                timer.run("embedding", embed_items(tenant_id, pending)),
+                timer.run("minio", upload_items(tenant_id, pending)),
+            )
+            await self._undo_failed_uploads(tenant_id, pending)
+
+            pending = pending_items(items)
+            if pending:
+                try:
+                    embedding_dimension = await self._write(
+                        session, doc_repo, tenant_id, user_id, pending, timer
+                    )
+                except Exception:
+                    await undo_ingestion(
+                        tenant_id, [item.document_id for item in pending], minio=True
+                    )
+                    raise
+
+        counts = {
+            status: sum(1 for item in items if item.status == status)
+            for status in (STATUS_SUCCESS, STATUS_DUPLICATE, STATUS_FAILED)
+        }
+        stage_timings = timer.to_dict()
+        logger.info(
+            "Document batch ingested",
+            tenant_id=str(tenant_id),
+            documents=len(items),
+            **counts,
+            **stage_timings,
+        )
+
+        return {
+            "ingested": counts[STATUS_SUCCESS],
+            "duplicates": counts[STATUS_DUPLICATE],
+            "failed": counts[STATUS_FAILED],
+            "documents": [item.to_result() for item in items],
+            "processing_metadata": {
+                "embedding_dimension": embedding_dimension,
+                "stage_timings_ms": stage_timings,
+            },
+        }
+
+    @staticmethod
+    async def _write(
+        session: Any,
+        doc_repo: DocumentRepository,
+        tenant_id: UUID,
+        user_id: UUID,
+        items: List[IngestionItem],
+        timer: StageTimer,
+    ) -> int:
+        """
+        Insert, index and commit the embedded and uploaded documents.
+
+        Args:
+            session: Database session of the batch
+            doc_repo: Document repository of the session
+            tenant_id: Tenant ID
+            user_id: ID of the user owning the documents
+            items: Documents still being ingested
+            timer: Stage timer of the batch
+
+        Returns:
+            int: Embedding dimension
+        """
+        created_at = datetime.now(timezone.utc)
+        for item in items:
+            item.created_at = created_at
+        timer.start("database")
+        await doc_repo.bulk_create([
+            {
+                "document_id": item.document_id,
+                "tenant_id": tenant_id,
+                "user_id": user_id,
+                "title": item.title,
+                "content_hash": item.content_hash,
+                "metadata_json": item.metadata,
+                "version_number": 1,
+                "faiss_id": document_id_to_faiss_id(item.document_id),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+            for item in items
+        ])
+        await write_chunks(doc_repo, tenant_id, items)
+        timer.stop("database")
+
+        embedding_dimension = await timer.run(
+            "index", index_items(tenant_id, items, undo_on_failure=True)
+        )
+        try:
+            await timer.run("commit", session.commit())
+        except Exception:
+            await undo_ingestion(
+                tenant_id, [item.document_id for item in items], faiss=True, meilisearch=True
+            )
+            raise
+
+        for item in items:
+            item.status = STATUS_SUCCESS
+        return embedding_dimension
+
+    @staticmethod
+    async def _undo_failed_uploads(tenant_id: UUID, items: List[IngestionItem]) -> None:
+        """
+        Delete the uploaded content of documents that failed another stage.
+
+        Args:
+            tenant_id: Tenant ID
+            items: Documents that went through embedding and upload
+        """
+        orphaned = [item.document_id for item in items if item.status == STATUS_FAILED and item.minio_object]
+        await undo_ingestion(tenant_id, orphaned, minio=True)
+
+    @staticmethod
+    def _dedupe_within_batch(items: List[IngestionItem]) -> None:
+        """
+        Keep the first of documents repeated within the batch.
+
+        Args:
+            items: Documents of the batch
+        """
+        first_by_hash: Dict[str, IngestionItem] = {}
+        explicit_ids = set()
+        for item in items:
+            if item.status is not None:
+                continue
+            if item.explicit_id:
+                if item.document_id in explicit_ids:
+                    item.fail(f"document_id {item.document_id} appears more than once in the batch")
+                    continue
+                explicit_ids.add(item.document_id)
+                continue
+            first = first_by_hash.setdefault(item.content_hash, item)
+            if first is not item:
+                item.status = STATUS_DUPLICATE
+                item.existing_document_id = first.document_id
+
+    @staticmethod
+    async def _dedupe_existing(
+        doc_repo: DocumentRepository,
+        tenant_id: UUID,
+        items: List[IngestionItem],
+    ) -> None:
+        """
+        Mark documents that already exist in the tenant.
+
+        Args:
+            doc_repo: Document repository of the batch's session
+            tenant_id: Tenant ID
+            items: Documents still being ingested
+        """
+        if not items:
+            return
+        existing = await doc_repo.get_existing(
+            tenant_id,
+            [item.content_hash for item in items if not item.explicit_id],
+            [item.document_id for item in items if item.explicit_id],
+        )
+        hash_by_id = {document_id: content_hash for document_id, content_hash in existing}
+        id_by_hash = {content_hash: document_id for document_id, content_hash in existing}
+
+        for item in items:
+            if item.explicit_id:
+                if item.document_id not in hash_by_id:
+                    continue
+                if hash_by_id[item.document_id] == item.content_hash:
+                    item.status = STATUS_DUPLICATE
+                    item.existing_document_id = item.document_id
+                else:
+                    item.fail("Document already exists; use rag_ingest to ingest a new version")
+            elif item.content_hash in id_by_hash:
+                item.status = STATUS_DUPLICATE
+                item.existing_document_id = id_by_hash[item.content_hash]
+
+
+# Global batch ingestion service instance
+batch_ingestion_service = BatchIngestionService()
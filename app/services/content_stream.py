@@ -0,0 +1,115 @@
+"""
+Document content read from byte streams.
+
+Streamed uploads never hold the whole document: TextContentStream decodes
+the incoming bytes as UTF-8, drops leading and trailing whitespace and
+hashes what it passes on, so the MinIO object and the content hash match
+rag_ingest's (sha256 of the stripped text) without buffering more than the
+trailing whitespace seen so far.
+"""
+
+import codecs
+import hashlib
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from app.utils.errors import ValidationError
+
+
+class TextContentStream:
+    """Stripped UTF-8 text of a byte stream, hashed as it is read."""
+
+    def __init__(self, chunks: AsyncIterable[bytes], max_bytes: Optional[int] = None):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks: Raw document bytes
+            max_bytes: Maximum raw bytes accepted (None for no limit)
+        """
+        self._chunks = chunks
+        self._max_bytes = max_bytes
+        self._hash = hashlib.sha256()
+        self.received_bytes = 0
+        self.content_bytes = 0
+        self.content_length = 0
+
+    @property
+    def content_hash(self) -> str:
+        """sha256 hex digest of the content passed on so far."""
+        return self._hash.hexdigest()
+
+    def _emit(self, text: str) -> bytes:
+        """Hash and encode a piece of the stripped content."""
+        data = text.encode("utf-8")
+        self._hash.update(data)
+        self.content_bytes += len(data)
+        self.content_length += len(text)
+        return data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """
+        Yield the stripped content as UTF-8 bytes.
+
+        Raises:
+            ValidationError: If the content is not UTF-8, exceeds max_bytes or is empty
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        started = False
+        # Whitespace is held back until text follows it, as it may be trailing
+        held = ""
+        final = False
+        chunks = self._chunks.__aiter__()
+        while not final:
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                chunk, final = b"", True
+            self.received_bytes += len(chunk)
+            if self._max_bytes is not None and self.received_bytes > self._max_bytes:
+                raise ValidationError(
+                    f"Document content exceeds {self._max_bytes} bytes.",
+                    field="document_content",
+                    error_code="FR-VALIDATION-001",
+                )
+            try:
+                text = decoder.decode(chunk, final=final)
+            except UnicodeDecodeError as e:
+                raise ValidationError(
+                    f"Document content must be UTF-8 text: {e}",
+                    field="document_content",
+                    error_code="FR-VALIDATION-001",
+                )
+            if not started:
+                text = text.lstrip()
+                started = bool(text)
+            body = text.rstrip()
+            if body:
+                yield self._emit(held + body)
+                held = text[len(body):]
+            else:
+                held += text
+
+        if not self.content_length:
+            raise ValidationError(
+                "Document content cannot be empty.",
+                field="document_content",
+                error_code="FR-VALIDATION-001",
+            )
+
+
+async def read_text(chunks: AsyncIterable[bytes]) -> str:
+    """
+    Decode a UTF-8 byte stream.
+
+    Args:
+        chunks: Encoded text
+
+    Returns:
+        str: Decoded text
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    async for chunk in chunks:
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
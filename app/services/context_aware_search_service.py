@@ -15,10 +15,9 @@ from uuid import UUID
 
 import structlog
 
-from app.db.connection import get_db_session
-from app.db.repositories.tenant_config_repository import TenantConfigRepository
 from app.services.mem0_client import Mem0Client
 from app.services.session_context import get_session_context_service
+from app.services.tenant_config_cache import tenant_config_cache
 from app.utils.errors import ValidationError
 
 logger = structlog.get_logger(__name__)
@@ -64,19 +63,10 @@ class ContextAwareSearchService:
             bool: True if personalization is enabled, False otherwise
         """
         try:
-            async for session in get_db_session():
-                config_repo = TenantConfigRepository(session)
-                tenant_config = await config_repo.get_by_tenant_id(tenant_id)
-                
-                if not tenant_config:
-                    # No config found, default to disabled
-                    return False
-                
-                # Check custom_configuration for personalization setting
-                custom_config = tenant_config.custom_configuration or {}
-                personalization_enabled = custom_config.get("personalization_enabled", False)
-                
-                return bool(personalization_enabled)
+            tenant_config = await tenant_config_cache.get(tenant_id)
+            
+            # No config found, default to disabled
+            return bool(tenant_config and tenant_config.personalization_enabled)
         except Exception as e:
             logger.warning(
                 "Failed to check personalization setting, defaulting to disabled",
@@ -0,0 +1,119 @@
+"""
+Splitting documents into overlapping token windows.
+
+Each chunk is embedded and indexed as its own FAISS vector, so long
+documents are not truncated by the embedding model's input limit and a
+search can point at the passage that matched. Chunks record the character
+offsets of their passage in the document content, which are persisted
+with the chunk for snippet extraction.
+
+Token boundaries come from tiktoken when it is installed; otherwise words
+and punctuation marks approximate tokens.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from app.config.ingestion import ingestion_settings
+
+# Exact token windows when tiktoken is installed, word-level windows otherwise
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+_encoding = None
+
+
+class TextChunk:
+    """One passage of a document."""
+
+    def __init__(self, chunk_no: int, start: int, end: int, text: str):
+        """
+        Initialize the chunk.
+
+        Args:
+            chunk_no: Position of the chunk in its document, from 0
+            start: Offset of the passage's first character in the content
+            end: Offset just past the passage's last character
+            text: Passage text (content[start:end])
+        """
+        self.chunk_no = chunk_no
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"<TextChunk(chunk_no={self.chunk_no}, start={self.start}, end={self.end})>"
+
+
+def _token_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Get the character span of every token of a text.
+
+    Args:
+        text: Document content
+
+    Returns:
+        list: (start, end) offsets, in order
+    """
+    global _encoding
+    if TIKTOKEN_AVAILABLE:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        tokens = _encoding.encode(text, disallowed_special=())
+        decoded, starts = _encoding.decode_with_offsets(tokens)
+        # Offsets index the decoded text, which equals the input for valid UTF-8
+        if decoded == text:
+            ends = starts[1:] + [len(text)]
+            return list(zip(starts, ends))
+    return [match.span() for match in _WORD_PATTERN.finditer(text)]
+
+
+def chunk_text(
+    text: str,
+    size: Optional[int] = None,
+    overlap: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+) -> List[TextChunk]:
+    """
+    Split a text into windows of `size` tokens, consecutive windows sharing
+    `overlap` tokens.
+
+    A text of at most `size` tokens is a single chunk spanning the whole
+    text. Leading and trailing whitespace of each passage is excluded.
+
+    Args:
+        text: Document content
+        size: Tokens per chunk (default: INGESTION_CHUNK_SIZE_TOKENS)
+        overlap: Tokens shared by consecutive chunks (default: INGESTION_CHUNK_OVERLAP_TOKENS)
+        max_chunks: Maximum chunks; the last one runs to the end of the text
+            (default: INGESTION_CHUNK_MAX_PER_DOCUMENT)
+
+    Returns:
+        list: Chunks in document order, numbered from 0
+    """
+    size = max(1, size or ingestion_settings.chunk_size_tokens)
+    overlap = ingestion_settings.chunk_overlap_tokens if overlap is None else overlap
+    overlap = min(max(0, overlap), size - 1)
+    max_chunks = max(1, max_chunks or ingestion_settings.chunk_max_per_document)
+
+    spans = _token_spans(text)
+    if len(spans) <= size:
+        return [TextChunk(0, 0, len(text), text)]
+
+    step = size - overlap
+    chunks: List[TextChunk] = []
+    for first in range(0, len(spans), step):
+        last = min(first + size, len(spans)) - 1
+        if len(chunks) == max_chunks - 1:
+            last = len(spans) - 1
+        start, end = spans[first][0], spans[last][1]
+        while start < end and text[start].isspace():
+            start += 1
+        chunks.append(TextChunk(len(chunks), start, end, text[start:end]))
+        if last == len(spans) - 1:
+            break
+    return chunks
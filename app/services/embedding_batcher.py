@@ -0,0 +1,287 @@
+"""
+Request-coalescing micro-batcher for embedding generation.
+
+Concurrent embedding requests for the same model are collected for a short
+window (EMBEDDING_BATCH_MAX_WAIT_MS) or until EMBEDDING_BATCH_MAX_SIZE texts
+are waiting, sent to the backend as one batched call, and the resulting
+rows are handed back to each waiting caller. Under concurrent load this
+turns N single-text backend round trips into a few batched ones.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Histogram bucket upper bounds
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+WAIT_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+# HTTP statuses with which a backend rejects the request's input
+INPUT_ERROR_STATUSES = frozenset({400, 413, 422})
+
+
+def is_input_error(error: Exception) -> bool:
+    """
+    Check whether an embedding backend rejected a request for its input.
+
+    Only such errors are worth retrying with fewer texts. Timeouts,
+    connection errors and server errors are outages: retrying parts of the
+    batch would multiply the calls to a failing backend.
+
+    Args:
+        error: Exception raised by the backend
+
+    Returns:
+        bool: True if the error carries a 400, 413 or 422 status
+    """
+    if isinstance(error, (asyncio.TimeoutError, OSError)):
+        return False
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in INPUT_ERROR_STATUSES
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values."""
+
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initialize the histogram.
+
+        Args:
+            bounds: Increasing bucket upper bounds (an overflow bucket is added)
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the histogram as a JSON-serializable dict.
+
+        Returns:
+            dict: Per-bucket counts keyed by "<=bound" (plus "+Inf"), count, avg and max
+        """
+        buckets = {f"<={bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "avg": round(self.total / self.count, 2) if self.count else 0.0,
+            "max": round(self.max, 2),
+        }
+
+
+class _PendingBatch:
+    """Texts waiting to be embedded together, with one future per caller."""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.waiters: List[tuple] = []  # (future, start_row, row_count, enqueued_at)
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, texts: Sequence[str], future: asyncio.Future) -> None:
+        self.waiters.append((future, len(self.texts), len(texts), time.monotonic()))
+        self.texts.extend(texts)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched backend calls.
+
+    Requests are grouped by model and caller-supplied group (e.g. priority);
+    each group is flushed when its oldest request has waited max_wait_ms or
+    it holds max_batch_size texts.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[str, List[str]], Awaitable[np.ndarray]],
+        max_wait_ms: float = 5.0,
+        max_batch_size: int = 64,
+        input_error_check: Optional[Callable[[str, Exception], bool]] = None,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            embed_batch: Coroutine function (model, texts) -> embedding matrix
+                with one row per text
+            max_wait_ms: Maximum time a request waits for others to join its batch
+            max_batch_size: Texts that trigger an immediate flush
+            input_error_check: Predicate (model, error) telling whether a failed
+                batch was rejected for its input, so its callers are worth
+                retrying apart (default: is_input_error())
+        """
+        self._embed_batch = embed_batch
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.max_batch_size = max(1, max_batch_size)
+        self._is_input_error = input_error_check or (lambda model, error: is_input_error(error))
+
+        self._pending: Dict[Tuple[str, str], _PendingBatch] = {}
+        self._tasks: set = set()
+
+        self._batches = 0
+        self._texts = 0
+        self._failed_batches = 0
+        self._retried_batches = 0
+        self._batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self._wait_ms_histogram = Histogram(WAIT_MS_BUCKETS)
+
+    async def embed(self, model: str, texts: Sequence[str], group: str = "") -> np.ndarray:
+        """
+        Embed texts as part of the next batch for their model and group.
+
+        Args:
+            model: Embedding model name (batches never mix models)
+            texts: Texts to embed
+            group: Batches never mix groups either, so e.g. query texts never
+                wait inside a large bulk batch
+
+        Returns:
+            np.ndarray: Embedding matrix, shape (len(texts), dimension), in input order
+
+        Raises:
+            Exception: Whatever the backend raised for these texts (callers of
+                a batch rejected for its input are retried in halves first)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        key = (model, group)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch()
+            batch.timer = loop.call_later(self.max_wait_ms / 1000, self._flush, key, batch)
+        batch.add(texts, future)
+
+        if len(batch.texts) >= self.max_batch_size:
+            batch.timer.cancel()
+            self._flush(key, batch)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, str], batch: _PendingBatch) -> None:
+        """Send a pending batch to the backend."""
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        task = asyncio.get_running_loop().create_task(self._run(key[0], batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, model: str, batch: _PendingBatch) -> None:
+        """Embed a batch and fan the rows back out to its waiters."""
+        started_at = time.monotonic()
+        self._batches += 1
+        self._texts += len(batch.texts)
+        self._batch_size_histogram.observe(len(batch.texts))
+        for _, _, _, enqueued_at in batch.waiters:
+            self._wait_ms_histogram.observe((started_at - enqueued_at) * 1000)
+
+        try:
+            embeddings = await self._embed_batch(model, batch.texts)
+        except asyncio.CancelledError:
+            for future, _, _, _ in batch.waiters:
+                future.cancel()
+            raise
+        except Exception as e:
+            self._failed_batches += 1
+            callers = [(future, batch.texts[start:start + count]) for future, start, count, _ in batch.waiters]
+            if len(callers) > 1 and self._is_input_error(model, e):
+                # One caller's bad input must not fail the callers batched
+                # with it: halves are retried until the rejected caller is
+                # isolated (outages are never retried, see is_input_error)
+                logger.warning(
+                    "Embedding batch rejected, bisecting callers",
+                    model=model,
+                    batch_size=len(batch.texts),
+                    callers=len(callers),
+                    error=str(e),
+                )
+                await self._bisect(model, callers)
+                return
+            for future, _ in callers:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, start, count, _ in batch.waiters:
+            if not future.done():
+                future.set_result(embeddings[start:start + count])
+
+        logger.debug(
+            "Embedding batch completed",
+            model=model,
+            batch_size=len(batch.texts),
+            callers=len(batch.waiters),
+            elapsed_ms=round((time.monotonic() - started_at) * 1000, 2),
+        )
+
+    async def _bisect(self, model: str, callers: List[Tuple[asyncio.Future, List[str]]]) -> None:
+        """Embed the two halves of a rejected batch's callers as separate batches."""
+        middle = len(callers) // 2
+        await asyncio.gather(self._retry(model, callers[:middle]), self._retry(model, callers[middle:]))
+
+    async def _retry(self, model: str, callers: List[Tuple[asyncio.Future, List[str]]]) -> None:
+        """Embed some callers of a rejected batch together, bisecting again if rejected."""
+        callers = [(future, texts) for future, texts in callers if not future.done()]
+        if not callers:
+            return
+        self._retried_batches += 1
+        texts = [text for _, caller_texts in callers for text in caller_texts]
+        try:
+            embeddings = await self._embed_batch(model, texts)
+        except asyncio.CancelledError:
+            for future, _ in callers:
+                future.cancel()
+            raise
+        except Exception as e:
+            if len(callers) > 1 and self._is_input_error(model, e):
+                await self._bisect(model, callers)
+                return
+            for future, _ in callers:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for future, caller_texts in callers:
+            if not future.done():
+                future.set_result(embeddings[start:start + len(caller_texts)])
+            start += len(caller_texts)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics.
+
+        Returns:
+            dict: Batch counts plus batch-size and queue-wait histograms
+        """
+        return {
+            "max_wait_ms": self.max_wait_ms,
+            "max_batch_size": self.max_batch_size,
+            "batches": self._batches,
+            "texts": self._texts,
+            "failed_batches": self._failed_batches,
+            "retried_batches": self._retried_batches,
+            "pending_texts": sum(len(batch.texts) for batch in self._pending.values()),
+            "batch_size": self._batch_size_histogram.snapshot(),
+            "wait_ms": self._wait_ms_histogram.snapshot(),
+        }
+
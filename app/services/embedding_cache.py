@@ -0,0 +1,213 @@
+"""
+Two-tier embedding cache keyed by model and content hash.
+
+Embeddings are looked up by (tenant, embedding model, sha256 of the
+normalized text): first in a per-worker LRU, then in Redis, where vectors
+are stored as float16 bytes. Repeated queries, re-ingested duplicates and
+index rebuilds reuse stored vectors instead of calling the embedding
+backend again.
+"""
+
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import structlog
+
+from app.services.redis_client import get_redis_client
+from app.utils.redis_keys import prefix_key
+
+logger = structlog.get_logger(__name__)
+
+# Seconds the Redis tier is skipped after a Redis error
+REDIS_RETRY_SECONDS = 30.0
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keying.
+
+    Applies Unicode NFC, strips the ends and collapses whitespace runs, so
+    texts differing only in formatting share an embedding.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        str: Normalized text
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_cache_key(tenant_id: str, model: str, text: str) -> str:
+    """
+    Get the cache key of a text's embedding.
+
+    Args:
+        tenant_id: Tenant UUID (string format)
+        model: Embedding model name
+        text: Text to embed
+
+    Returns:
+        str: tenant:{tenant_id}:embedding:{model}:{sha256 of normalized text}
+    """
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return prefix_key(f"embedding:{model}:{digest}", tenant_id)
+
+
+class EmbeddingCache:
+    """In-process LRU of float16 embeddings in front of a Redis tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        redis_enabled: bool = True,
+        ttl_seconds: int = 0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Embeddings kept in the in-process LRU (0 disables it)
+            redis_enabled: Whether to use Redis as the second tier
+            ttl_seconds: Lifetime of Redis entries (0 = no expiry)
+        """
+        self.max_entries = max(0, max_entries)
+        self.redis_enabled = redis_enabled
+        self.ttl_seconds = ttl_seconds
+
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._redis_retry_at = 0.0
+
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._redis_errors = 0
+
+    def _lru_put(self, key: str, vector: np.ndarray) -> None:
+        """Insert a float16 vector into the LRU tier, evicting the oldest entries."""
+        if self.max_entries == 0:
+            return
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _redis_available(self) -> bool:
+        """Whether the Redis tier is enabled and not backing off after an error."""
+        return self.redis_enabled and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, operation: str, error: Exception) -> None:
+        """Back off from Redis after an error; the cache degrades to the LRU tier."""
+        self._redis_errors += 1
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning(
+            "Embedding cache Redis tier unavailable",
+            operation=operation,
+            retry_in_seconds=REDIS_RETRY_SECONDS,
+            error=str(error),
+        )
+
+    async def get_many(
+        self,
+        tenant_id: str,
+        model: str,
+        texts: Sequence[str],
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            tenant_id: Tenant UUID (string format)
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            list: float32 embedding per text, or None where not cached
+        """
+        keys = [embedding_cache_key(tenant_id, model, text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            vector = self._lru.get(key)
+            if vector is None:
+                missing.append(i)
+                continue
+            self._lru.move_to_end(key)
+            results[i] = vector.astype(np.float32)
+        self._hits += len(keys) - len(missing)
+
+        if missing and self._redis_available():
+            try:
+                redis = await get_redis_client()
+                values = await redis.mget([keys[i] for i in missing])
+            except Exception as e:
+                self._redis_failed("get", e)
+            else:
+                still_missing = []
+                for i, value in zip(missing, values):
+                    if value is None:
+                        still_missing.append(i)
+                        continue
+                    vector = np.frombuffer(value, dtype="<f2")
+                    self._lru_put(keys[i], vector)
+                    results[i] = vector.astype(np.float32)
+                self._redis_hits += len(missing) - len(still_missing)
+                missing = still_missing
+
+        self._misses += len(missing)
+        return results
+
+    async def put_many(
+        self,
+        tenant_id: str,
+        model: str,
+        texts: Sequence[str],
+        embeddings: np.ndarray,
+    ) -> None:
+        """
+        Store freshly generated embeddings in both tiers.
+
+        Args:
+            tenant_id: Tenant UUID (string format)
+            model: Embedding model name
+            texts: Embedded texts
+            embeddings: Embedding matrix, one row per text
+        """
+        keys = [embedding_cache_key(tenant_id, model, text) for text in texts]
+        vectors = np.asarray(embeddings).astype("<f2")
+        for key, vector in zip(keys, vectors):
+            self._lru_put(key, vector)
+
+        if not self._redis_available():
+            return
+        try:
+            redis = await get_redis_client()
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, vector in zip(keys, vectors):
+                    pipe.set(key, vector.tobytes(), ex=self.ttl_seconds or None)
+                await pipe.execute()
+        except Exception as e:
+            self._redis_failed("put", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: LRU size, hits per tier, misses, hit rate and Redis errors
+        """
+        lookups = self._hits + self._redis_hits + self._misses
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "hit_rate": round((self._hits + self._redis_hits) / lookups, 4) if lookups else 0.0,
+            "redis_errors": self._redis_errors,
+        }
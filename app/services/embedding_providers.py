@@ -0,0 +1,440 @@
+"""
+In-process embedding providers and the registry resolving embedding models.
+
+Besides the remote GPU-AI MCP server and OpenAI, embeddings can be generated
+inside the worker, with no network hop:
+
+- HashingEmbeddingProvider: deterministic feature hashing of words and word
+  pairs. No model weights; meant for tests, benchmarks and offline runs.
+- LocalModelEmbeddingProvider: a sentence-transformers model loaded from a
+  local directory (EMBEDDING_LOCAL_MODEL_PATH), run on a thread or process
+  pool so inference never blocks the event loop.
+
+A tenant selects a provider by setting model_configuration["embedding_model"]
+to its name. The registry also answers the vector dimension of every model,
+remote ones included, so index sizes follow the provider actually used.
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from app.config.embedding import embedding_settings
+from app.services.openai_embedding_backend import OPENAI_MODEL_DIMENSIONS
+
+logger = structlog.get_logger(__name__)
+
+# Local model weights are optional; the hashing provider needs nothing
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+_WORD = re.compile(r"\w+")
+
+
+class EmbeddingProvider:
+    """
+    Base class of in-process embedding providers.
+
+    Subclasses set name and dimension and implement encode(), a blocking
+    call that embed() runs off the event loop.
+    """
+
+    def __init__(self, name: str, dimension: Optional[int] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Model name tenants select the provider by
+            dimension: Vector dimension, if known without loading the model
+        """
+        self.name = name
+        self._dimension = dimension
+
+        self._requests = 0
+        self._failed_requests = 0
+        self._texts = 0
+
+    @property
+    def dimension(self) -> int:
+        """Vector dimension of the embeddings."""
+        if self._dimension is None:
+            raise NotImplementedError
+        return self._dimension
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts, blocking the calling thread.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 matrix, shape (len(texts), dimension)
+        """
+        raise NotImplementedError
+
+    async def _run(self, texts: List[str]) -> np.ndarray:
+        """Run encode() on the default thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.encode, texts)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts without blocking the event loop.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 matrix, shape (len(texts), dimension), in input order
+        """
+        self._requests += 1
+        self._texts += len(texts)
+        try:
+            embeddings = await self._run(list(texts))
+        except Exception:
+            self._failed_requests += 1
+            raise
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get provider statistics.
+
+        Returns:
+            dict: Dimension (if known), requests, failed requests and texts embedded
+        """
+        return {
+            "dimension": self._dimension,
+            "requests": self._requests,
+            "failed_requests": self._failed_requests,
+            "texts": self._texts,
+        }
+
+    def close(self) -> None:
+        """Release worker pools."""
+
+
+@lru_cache(maxsize=65536)
+def _feature_slot(feature: str, dimension: int) -> Tuple[int, float]:
+    """Hash a feature to a (column, sign) pair."""
+    value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return value % dimension, 1.0 if value >> 63 else -1.0
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic embeddings from signed feature hashing of words and word pairs.
+
+    The same text always maps to the same unit vector, in every process and
+    on every machine, and texts sharing words are close in cosine distance.
+    """
+
+    def __init__(self, name: str = "hashing", dimension: int = 384):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Model name tenants select the provider by
+            dimension: Vector dimension
+        """
+        super().__init__(name, max(1, dimension))
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts by feature hashing.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: L2-normalized float32 matrix (all zeros for texts without words)
+        """
+        dimension = self.dimension
+        matrix = np.zeros((len(texts), dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD.findall(text.lower())
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            for feature in features:
+                column, sign = _feature_slot(feature, dimension)
+                matrix[row, column] += sign
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+# Model of a process pool worker, loaded once by its initializer
+_worker_model: Any = None
+
+
+def _load_worker_model(model_path: str) -> None:
+    """Load the local model in a new pool process."""
+    global _worker_model
+    _worker_model = SentenceTransformer(model_path, device="cpu")
+
+
+def _worker_encode(texts: List[str], batch_size: int) -> np.ndarray:
+    """Embed texts with the pool process's model."""
+    return _worker_model.encode(
+        texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True
+    )
+
+
+def _worker_dimension() -> int:
+    """Get the vector dimension of the pool process's model."""
+    return _worker_model.get_sentence_embedding_dimension()
+
+
+class LocalModelEmbeddingProvider(EmbeddingProvider):
+    """
+    sentence-transformers model loaded from a local directory, run on a worker pool.
+
+    With a thread pool the model is loaded once and shared by the threads
+    (inference releases the GIL). With a process pool every process loads
+    its own copy, which scales past the GIL at the cost of memory.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model_path: str,
+        dimension: Optional[int] = None,
+        pool: str = "thread",
+        max_workers: int = 1,
+        batch_size: int = 32,
+    ):
+        """
+        Initialize the provider. The model is loaded on first use.
+
+        Args:
+            name: Model name tenants select the provider by
+            model_path: Directory of a saved sentence-transformers model
+            dimension: Vector dimension (None = read from the model, which loads it)
+            pool: "thread" or "process"
+            max_workers: Worker threads or processes
+            batch_size: Texts per forward pass
+
+        Raises:
+            ValueError: If sentence-transformers is not installed or pool is unknown
+        """
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise ValueError(
+                "Local embedding models require the sentence-transformers package. "
+                "Install it with: pip install sentence-transformers"
+            )
+        if pool not in ("thread", "process"):
+            raise ValueError(f"Unknown local model pool: {pool} (expected 'thread' or 'process')")
+
+        super().__init__(name, dimension)
+        self.model_path = model_path
+        self.pool = pool
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+
+        self._executor: Optional[Executor] = None
+        self._model: Any = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        """Get the worker pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                if self.pool == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=_load_worker_model,
+                        initargs=(self.model_path,),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"embed-{self.name}"
+                    )
+                logger.info(
+                    "Local embedding model pool started",
+                    model=self.name,
+                    model_path=self.model_path,
+                    pool=self.pool,
+                    max_workers=self.max_workers,
+                )
+            return self._executor
+
+    def _get_model(self) -> Any:
+        """Get the shared model of the thread pool, loading it on first use."""
+        with self._lock:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_path, device="cpu")
+            return self._model
+
+    @property
+    def dimension(self) -> int:
+        """Vector dimension of the embeddings (loads the model if not configured)."""
+        if self._dimension is None:
+            if self.pool == "process":
+                self._dimension = self._get_executor().submit(_worker_dimension).result()
+            else:
+                self._dimension = self._get_model().get_sentence_embedding_dimension()
+        return self._dimension
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts with the shared model (thread pool only).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: L2-normalized float32 matrix
+        """
+        return self._get_model().encode(
+            list(texts), batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+
+    async def _run(self, texts: List[str]) -> np.ndarray:
+        """Run inference on the provider's own pool."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if self.pool == "process":
+            return await loop.run_in_executor(executor, _worker_encode, texts, self.batch_size)
+        return await loop.run_in_executor(executor, self.encode, texts)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get provider statistics.
+
+        Returns:
+            dict: Base statistics plus pool type and worker count
+        """
+        return {**super().stats(), "pool": self.pool, "max_workers": self.max_workers}
+
+    def close(self) -> None:
+        """Shut down the worker pool, letting running inference finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class EmbeddingProviderRegistry:
+    """Registry of in-process providers, and vector dimensions of all embedding models."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._providers: Dict[str, EmbeddingProvider] = {}
+
+    def register(self, provider: EmbeddingProvider) -> None:
+        """
+        Register a provider under its model name (case-insensitive).
+
+        Args:
+            provider: Provider to register
+
+        Raises:
+            ValueError: If the name is taken by a GPU-AI or OpenAI model
+        """
+        name = provider.name.lower()
+        if name.startswith("gpu") or name in OPENAI_MODEL_DIMENSIONS:
+            raise ValueError(f"Embedding provider name {provider.name} is reserved for a remote model")
+        self._providers[name] = provider
+
+    def get(self, model: str) -> Optional[EmbeddingProvider]:
+        """
+        Get the in-process provider of a model.
+
+        Args:
+            model: Embedding model name
+
+        Returns:
+            EmbeddingProvider, or None if the model is served remotely
+        """
+        return self._providers.get(model.lower())
+
+    def names(self) -> List[str]:
+        """
+        Get the model names of the registered providers.
+
+        Returns:
+            list: Model names
+        """
+        return list(self._providers)
+
+    def dimension(self, model: str) -> int:
+        """
+        Get the vector dimension of any embedding model.
+
+        Args:
+            model: Embedding model name
+
+        Returns:
+            int: Dimension reported by the in-process provider, the OpenAI
+                model's dimension, or the GPU-AI dimension otherwise
+        """
+        provider = self.get(model)
+        if provider is not None:
+            return provider.dimension
+        return OPENAI_MODEL_DIMENSIONS.get(model.lower(), embedding_settings.gpu_ai_dimension)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of every registered provider.
+
+        Returns:
+            dict: Model name -> provider statistics
+        """
+        return {name: provider.stats() for name, provider in self._providers.items()}
+
+    def close(self) -> None:
+        """Release the worker pools of every provider."""
+        for provider in self._providers.values():
+            provider.close()
+
+
+def create_embedding_provider_registry() -> EmbeddingProviderRegistry:
+    """
+    Create the registry with the providers configured in embedding settings.
+
+    Returns:
+        EmbeddingProviderRegistry: Hashing provider, plus the local model
+            provider if EMBEDDING_LOCAL_MODEL_PATH is set
+    """
+    registry = EmbeddingProviderRegistry()
+    registry.register(
+        HashingEmbeddingProvider(
+            name=embedding_settings.hashing_model_name,
+            dimension=embedding_settings.hashing_dimension,
+        )
+    )
+
+    if embedding_settings.local_model_path:
+        try:
+            registry.register(
+                LocalModelEmbeddingProvider(
+                    name=embedding_settings.local_model_name,
+                    model_path=embedding_settings.local_model_path,
+                    dimension=embedding_settings.local_model_dimension,
+                    pool=embedding_settings.local_model_pool,
+                    max_workers=embedding_settings.local_model_workers,
+                    batch_size=embedding_settings.local_model_batch_size,
+                )
+            )
+        except ValueError as e:
+            logger.warning(
+                "Local embedding model provider not registered",
+                model=embedding_settings.local_model_name,
+                error=str(e),
+            )
+
+    return registry
+
+
+# Global embedding provider registry instance
+embedding_provider_registry = create_embedding_provider_registry()
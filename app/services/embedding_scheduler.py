@@ -0,0 +1,286 @@
+"""
+Admission control for embedding traffic.
+
+EmbeddingScheduler limits how many embedding requests are in flight per
+worker and decides who goes next when the limit is reached:
+
+- interactive requests (query embeddings) are always admitted before bulk
+  requests (ingestion, index rebuilds), and a number of slots are reserved
+  for them, so a rebuild can never occupy the whole worker;
+- within a lane, waiting tenants are served round-robin, so one tenant's
+  burst cannot starve the others.
+
+CircuitBreaker tracks the recent error rate of a backend and, once it
+spikes, rejects calls for a cooldown period so callers fail over to the
+fallback backend immediately instead of waiting on a failing one.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+import structlog
+
+from app.services.embedding_batcher import WAIT_MS_BUCKETS, Histogram
+
+logger = structlog.get_logger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BULK)
+
+
+class _Lane:
+    """Waiting requests of one priority, queued per tenant and served round-robin."""
+
+    def __init__(self):
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+    def __bool__(self) -> bool:
+        return bool(self._queues)
+
+    def push(self, tenant_id: str, future: asyncio.Future) -> None:
+        self._queues.setdefault(tenant_id, deque()).append(future)
+
+    def pop(self) -> Optional[asyncio.Future]:
+        """Take the next live waiter, rotating its tenant to the back of the lane."""
+        while self._queues:
+            tenant_id, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(tenant_id)
+            else:
+                del self._queues[tenant_id]
+            if not future.done():
+                return future
+        return None
+
+    def waiting(self) -> int:
+        return sum(1 for queue in self._queues.values() for future in queue if not future.done())
+
+
+class EmbeddingScheduler:
+    """Global in-flight cap with interactive/bulk lanes and per-tenant fairness."""
+
+    def __init__(self, max_in_flight: int = 16, interactive_reserved: int = 4):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight: Embedding requests in flight at once
+            interactive_reserved: Slots bulk requests may never use
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.interactive_reserved = min(max(0, interactive_reserved), self.max_in_flight - 1)
+
+        self._lanes: Dict[str, _Lane] = {priority: _Lane() for priority in PRIORITIES}
+        self._in_flight: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+
+        self._admitted: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._wait_ms: Dict[str, Histogram] = {priority: Histogram(WAIT_MS_BUCKETS) for priority in PRIORITIES}
+
+    @asynccontextmanager
+    async def slot(self, tenant_id: str, priority: str = PRIORITY_INTERACTIVE) -> AsyncIterator[None]:
+        """
+        Hold an in-flight slot for the duration of the block.
+
+        Args:
+            tenant_id: Tenant the request is made for
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BULK
+        """
+        if priority not in self._lanes:
+            raise ValueError(f"Unknown embedding priority: {priority}")
+
+        await self._acquire(tenant_id, priority)
+        try:
+            yield
+        finally:
+            self._in_flight[priority] -= 1
+            self._dispatch()
+
+    def _can_start(self, priority: str) -> bool:
+        """Whether a request of this priority fits within the caps."""
+        if sum(self._in_flight.values()) >= self.max_in_flight:
+            return False
+        if priority == PRIORITY_BULK:
+            return self._in_flight[PRIORITY_BULK] < self.max_in_flight - self.interactive_reserved
+        return True
+
+    def _start(self, priority: str) -> None:
+        self._in_flight[priority] += 1
+        self._admitted[priority] += 1
+
+    async def _acquire(self, tenant_id: str, priority: str) -> None:
+        """Wait until the request is admitted."""
+        enqueued_at = time.monotonic()
+        lane = self._lanes[priority]
+        if not lane and self._can_start(priority):
+            self._start(priority)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            lane.push(tenant_id, future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Admitted just as the caller was cancelled: give the slot back
+                    self._in_flight[priority] -= 1
+                    self._dispatch()
+                raise
+        self._wait_ms[priority].observe((time.monotonic() - enqueued_at) * 1000)
+
+    def _dispatch(self) -> None:
+        """Admit waiters while slots are free, interactive lane first."""
+        for priority in PRIORITIES:
+            lane = self._lanes[priority]
+            while self._can_start(priority):
+                future = lane.pop()
+                if future is None:
+                    break
+                self._start(priority)
+                future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+
+        Returns:
+            dict: Caps, and per lane the requests in flight, waiting and
+                admitted plus a queue-wait histogram
+        """
+        return {
+            "max_in_flight": self.max_in_flight,
+            "interactive_reserved": self.interactive_reserved,
+            "lanes": {
+                priority: {
+                    "in_flight": self._in_flight[priority],
+                    "waiting": self._lanes[priority].waiting(),
+                    "admitted": self._admitted[priority],
+                    "wait_ms": self._wait_ms[priority].snapshot(),
+                }
+                for priority in PRIORITIES
+            },
+        }
+
+
+class CircuitBreaker:
+    """Opens when a backend's recent error rate spikes; retries after a cooldown."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        error_rate: float = 0.5,
+        min_requests: int = 10,
+        window_seconds: float = 30.0,
+        cooldown_seconds: float = 15.0,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Backend name, for logs
+            error_rate: Failure ratio within the window that opens the breaker
+            min_requests: Calls within the window before the ratio is considered
+            window_seconds: Age of the oldest call outcome considered
+            cooldown_seconds: Time the breaker stays open before a trial call
+        """
+        self.name = name
+        self.error_rate = error_rate
+        self.min_requests = max(1, min_requests)
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+
+        self.state = self.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (time, succeeded)
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+
+        self._rejected = 0
+        self._opened = 0
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go to the backend.
+
+        Returns:
+            bool: False while the breaker is open (use the fallback instead)
+        """
+        if self.state == self.CLOSED:
+            return True
+
+        now = time.monotonic()
+        if self.state == self.OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self.state = self.HALF_OPEN
+            self._trial_started_at = None
+
+        if self.state == self.HALF_OPEN and (
+            # Let one trial call through; retry if it never reported back
+            self._trial_started_at is None or now - self._trial_started_at >= self.cooldown_seconds
+        ):
+            self._trial_started_at = now
+            return True
+
+        self._rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self.state == self.HALF_OPEN:
+            logger.info("Circuit breaker closed", backend=self.name)
+            self.state = self.CLOSED
+            self._outcomes.clear()
+            return
+        self._record(True)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker if the error rate spikes."""
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+        self._record(False)
+
+        failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+        if (
+            self.state == self.CLOSED
+            and len(self._outcomes) >= self.min_requests
+            and failures / len(self._outcomes) >= self.error_rate
+        ):
+            self._open()
+
+    def _record(self, succeeded: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, succeeded))
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._opened += 1
+        self._outcomes.clear()
+        logger.warning(
+            "Circuit breaker opened, failing over to fallback backend",
+            backend=self.name,
+            cooldown_seconds=self.cooldown_seconds,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get breaker statistics.
+
+        Returns:
+            dict: State, recent call outcomes, times opened and calls rejected
+        """
+        return {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": sum(1 for _, succeeded in self._outcomes if not succeeded),
+            "times_opened": self._opened,
+            "rejected_calls": self._rejected,
+        }
@@ -1,29 +1,32 @@
 """
 Embedding service for generating document embeddings using tenant-configured models.
 
-Supports both GPU-AI MCP server (default) and OpenAI (fallback).
+Supports GPU-AI MCP server (default), OpenAI (fallback) and in-process
+providers (hashing, local model) selected per tenant.
 """
 
-import os
-from typing import Optional
+from typing import List, Optional
 
 import numpy as np
 import structlog
 
-from app.db.repositories.tenant_config_repository import TenantConfigRepository
-from app.db.connection import get_db_session
-from app.utils.errors import ValidationError
+from app.config.embedding import embedding_settings
+from app.utils.errors import ResourceNotFoundError, ValidationError
+from app.services.embedding_batcher import EmbeddingBatcher, is_input_error
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_providers import embedding_provider_registry
+from app.services.embedding_scheduler import (
+    PRIORITY_INTERACTIVE,
+    CircuitBreaker,
+    EmbeddingScheduler,
+)
 from app.services.gpu_ai_client import gpu_ai_client
+from app.services.openai_embedding_backend import OPENAI_AVAILABLE, openai_embedding_backend
+from app.services.query_embedding_context import get_query_embeddings
+from app.services.tenant_config_cache import is_gpu_ai_model, tenant_config_cache
 
 logger = structlog.get_logger(__name__)
 
-# Try to import OpenAI for fallback
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
 
 class EmbeddingService:
     """
@@ -35,45 +38,56 @@ class EmbeddingService:
     Supports:
     - GPU-AI MCP server (default) - dimension 384
     - OpenAI embedding models (fallback) - text-embedding-3-large (3072), text-embedding-3-small (1536), ada-002 (1536)
+    - In-process providers registered in embedding_provider_registry ("hashing", a local model)
     
     Uses tenant-specific model configuration from tenant_configs table.
     """
     
     def __init__(self):
         """Initialize embedding service."""
-        self._openai_client: Optional[OpenAI] = None
-        self._use_gpu_ai = True  # Use GPU-AI by default
-        self._default_model = "gpu-ai"  # Default to GPU-AI
-        self._default_dimension = 384  # GPU-AI default dimension
+        # In-process providers, used for the models registered under their names
+        self.providers = embedding_provider_registry
         
-    def _get_openai_client(self) -> OpenAI:
-        """
-        Get or create OpenAI client instance (fallback only).
+        # Async, pooled OpenAI backend for models not served by GPU-AI
+        self.openai_backend = openai_embedding_backend
         
-        Returns:
-            OpenAI: Configured OpenAI client
-            
-        Raises:
-            ValueError: If OPENAI_API_KEY is not configured
-        """
-        if not OPENAI_AVAILABLE:
-            raise ValueError("OpenAI package not available")
-            
-        if self._openai_client is None:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError(
-                    "OPENAI_API_KEY environment variable is not set. "
-                    "Please configure OpenAI API key to generate embeddings."
-                )
-            self._openai_client = OpenAI(api_key=api_key)
-            logger.info("OpenAI client initialized for embedding generation (fallback)")
+        # Caps embedding requests in flight; queries are admitted before bulk work
+        self.scheduler = EmbeddingScheduler(
+            max_in_flight=embedding_settings.scheduler_max_in_flight,
+            interactive_reserved=embedding_settings.scheduler_interactive_reserved,
+        )
+        
+        # Bypasses GPU-AI for the fallback backend while its error rate is high
+        self.gpu_ai_breaker = CircuitBreaker(
+            name="gpu-ai",
+            error_rate=embedding_settings.gpu_ai_breaker_error_rate,
+            min_requests=embedding_settings.gpu_ai_breaker_min_requests,
+            window_seconds=embedding_settings.gpu_ai_breaker_window_seconds,
+            cooldown_seconds=embedding_settings.gpu_ai_breaker_cooldown_seconds,
+        )
         
-        return self._openai_client
+        # Concurrent requests for the same model share one backend call
+        self.batcher = EmbeddingBatcher(
+            embed_batch=self._embed_batch,
+            max_wait_ms=embedding_settings.batch_max_wait_ms,
+            max_batch_size=embedding_settings.batch_max_size,
+            input_error_check=self._is_input_error,
+        )
+        
+        # Previously embedded texts skip the backend entirely
+        self.cache: Optional[EmbeddingCache] = (
+            EmbeddingCache(
+                max_entries=embedding_settings.cache_max_entries,
+                redis_enabled=embedding_settings.cache_redis_enabled,
+                ttl_seconds=embedding_settings.cache_ttl_seconds,
+            )
+            if embedding_settings.cache_enabled
+            else None
+        )
     
     async def _get_tenant_embedding_model(self, tenant_id: str) -> tuple[str, int]:
         """
-        Get tenant's configured embedding model and dimension.
+        Get tenant's configured embedding model and dimension (cached per worker).
         
         Args:
             tenant_id: Tenant UUID (string format)
@@ -85,58 +99,25 @@ class EmbeddingService:
             ResourceNotFoundError: If tenant configuration not found
         """
         from uuid import UUID
-        from app.utils.errors import ResourceNotFoundError
         
-        tenant_uuid = UUID(tenant_id)
+        tenant_config = await tenant_config_cache.get(UUID(tenant_id))
         
-        async for session in get_db_session():
-            config_repo = TenantConfigRepository(session)
-            tenant_config = await config_repo.get_by_tenant_id(tenant_uuid)
-            
-            if not tenant_config:
-                raise ResourceNotFoundError(
-                    f"Tenant configuration not found for tenant ID: {tenant_id}",
-                    resource_type="tenant_config",
-                    resource_id=tenant_id,
-                    error_code="FR-RESOURCE-001"
-                )
-            
-            # Get embedding model from tenant config
-            model_config = tenant_config.model_configuration or {}
-            embedding_model = model_config.get("embedding_model", self._default_model)
-            
-            # Map model to dimension
-            model_dimensions = {
-                "gpu-ai": 384,  # GPU-AI default dimension
-                "text-embedding-3-large": 3072,
-                "text-embedding-3-small": 1536,
-                "text-embedding-ada-002": 1536,
-                "ada-002": 1536,
-            }
-            
-            # Determine if using GPU-AI or OpenAI
-            model_lower = embedding_model.lower()
-            if model_lower == "gpu-ai" or model_lower.startswith("gpu"):
-                self._use_gpu_ai = True
-            else:
-                self._use_gpu_ai = False
-            
-            dimension = model_dimensions.get(model_lower, self._default_dimension)
-            
-            logger.debug(
-                "Retrieved tenant embedding model",
-                tenant_id=tenant_id,
-                model=embedding_model,
-                dimension=dimension
+        if not tenant_config:
+            raise ResourceNotFoundError(
+                f"Tenant configuration not found for tenant ID: {tenant_id}",
+                resource_type="tenant_config",
+                resource_id=tenant_id,
+                error_code="FR-RESOURCE-001"
             )
-            
-            return embedding_model, dimension
+        
+        return tenant_config.embedding_model, tenant_config.embedding_dimension
     
     async def generate_embedding(
         self,
         text: str,
         tenant_id: str,
         model: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE,
     ) -> np.ndarray:
         """
         Generate embedding for text using tenant-configured model.
@@ -145,6 +126,7 @@ class EmbeddingService:
             text: Text to generate embedding for
             tenant_id: Tenant UUID (string format)
             model: Optional model override (uses tenant config if not provided)
+            priority: PRIORITY_INTERACTIVE for queries, PRIORITY_BULK for ingestion and rebuilds
             
         Returns:
             np.ndarray: Embedding vector
@@ -153,7 +135,42 @@ class EmbeddingService:
             ValueError: If text is empty or OpenAI API key not configured
             ResourceNotFoundError: If tenant configuration not found
         """
-        if not text or not text.strip():
+        embeddings = await self.generate_embeddings(
+            texts=[text], tenant_id=tenant_id, model=model, priority=priority
+        )
+        return embeddings[0]
+    
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        tenant_id: str,
+        model: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+    ) -> np.ndarray:
+        """
+        Generate embeddings for a batch of texts.
+        
+        Texts already embedded with the same model earlier in the request
+        (inside query_embedding_scope) or before that (embedding cache) are
+        not embedded again. The rest wait for an in-flight slot in their
+        priority lane, then join the micro-batch of concurrent requests for
+        the same model and priority, so many callers share one backend
+        request.
+        
+        Args:
+            texts: Texts to generate embeddings for
+            tenant_id: Tenant UUID (string format)
+            model: Optional model override (uses tenant config if not provided)
+            priority: PRIORITY_INTERACTIVE for queries, PRIORITY_BULK for ingestion and rebuilds
+            
+        Returns:
+            np.ndarray: Embedding matrix, shape (len(texts), dimension), in input order
+            
+        Raises:
+            ValueError: If a text is empty or OpenAI API key not configured
+            ResourceNotFoundError: If tenant configuration not found
+        """
+        if not texts or any(not text or not text.strip() for text in texts):
             raise ValidationError(
                 "Text cannot be empty for embedding generation",
                 field="text",
@@ -164,48 +181,169 @@ class EmbeddingService:
         if model is None:
             model, _ = await self._get_tenant_embedding_model(tenant_id)
         
-        # Determine which service to use
-        use_gpu_ai = self._use_gpu_ai or model.lower() == "gpu-ai" or model.lower().startswith("gpu")
+        scope = get_query_embeddings()
+        if scope is None:
+            return await self._embed_cached(tenant_id, model, list(texts), priority)
+        
+        # Share vectors with everything else in the request (e.g. Mem0 memory search)
+        vectors = [scope.get(model, text) for text in texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            generated = await self._embed_cached(tenant_id, model, [texts[i] for i in missing], priority)
+            for i, vector in zip(missing, generated):
+                scope.put(model, texts[i], vector)
+                vectors[i] = vector
+        
+        return np.vstack(vectors).astype(np.float32, copy=False)
+    
+    async def _embed_cached(
+        self,
+        tenant_id: str,
+        model: str,
+        texts: List[str],
+        priority: str,
+    ) -> np.ndarray:
+        """
+        Embed texts, serving those embedded before from the embedding cache.
+        
+        Args:
+            tenant_id: Tenant UUID (string format)
+            model: Embedding model name
+            texts: Texts to embed
+            priority: Scheduler lane
+            
+        Returns:
+            np.ndarray: Embedding matrix, shape (len(texts), dimension), in input order
+        """
+        if self.cache is None:
+            return await self._embed_scheduled(tenant_id, model, texts, priority)
+        
+        cached = await self.cache.get_many(tenant_id, model, texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            generated = await self._embed_scheduled(tenant_id, model, missing_texts, priority)
+            await self.cache.put_many(tenant_id, model, missing_texts, generated)
+            for i, vector in zip(missing, generated):
+                cached[i] = vector
+        
+        return np.vstack(cached).astype(np.float32, copy=False)
+    
+    async def _embed_scheduled(
+        self,
+        tenant_id: str,
+        model: str,
+        texts: List[str],
+        priority: str,
+    ) -> np.ndarray:
+        """
+        Embed texts through the batcher once the scheduler admits the request.
+        
+        Args:
+            tenant_id: Tenant UUID (string format)
+            model: Embedding model name
+            texts: Texts to embed
+            priority: Scheduler lane
+            
+        Returns:
+            np.ndarray: Embedding matrix, shape (len(texts), dimension), in input order
+        """
+        async with self.scheduler.slot(tenant_id, priority):
+            return await self.batcher.embed(model, texts, group=priority)
+    
+    def _is_input_error(self, model: str, error: Exception) -> bool:
+        """
+        Check whether the callers of a failed batch are worth retrying apart.
+        
+        Never while the GPU-AI breaker is not closed: every retry would go
+        to the fallback too, undoing the breaker's fail-fast.
+        
+        Args:
+            model: Embedding model name
+            error: Exception raised for the batch
+            
+        Returns:
+            bool: True if the backend rejected the batch for its input
+        """
+        if is_gpu_ai_model(model) and self.gpu_ai_breaker.state != CircuitBreaker.CLOSED:
+            return False
+        return is_input_error(error)
+    
+    async def _embed_batch(self, model: str, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a coalesced batch with one backend request.
+        
+        Args:
+            model: Embedding model name
+            texts: Texts from one or more callers
+            
+        Returns:
+            np.ndarray: Embedding matrix, shape (len(texts), dimension), in input order
+            
+        Raises:
+            ValueError: If OpenAI API key not configured or the backend fails
+        """
+        # Determine which service to use from the model itself, never from shared state
+        provider = self.providers.get(model)
+        if provider is not None:
+            # In-process provider: no network hop and no fallback
+            embedding_matrix = await provider.embed(texts)
+            logger.debug(
+                "Generated embeddings in-process",
+                model=model,
+                text_count=len(texts),
+                embedding_dimension=embedding_matrix.shape[1]
+            )
+            return embedding_matrix
+        
+        use_gpu_ai = is_gpu_ai_model(model)
+        if use_gpu_ai and not self.gpu_ai_breaker.allow():
+            # GPU-AI is failing; go straight to the fallback instead of waiting on it
+            logger.debug("GPU-AI circuit open, using OpenAI fallback", model=model)
+            use_gpu_ai = False
         
         try:
             if use_gpu_ai:
-                # Generate embedding using GPU-AI MCP server
+                # Generate embeddings using GPU-AI MCP server
                 try:
                     embeddings = await gpu_ai_client.generate_embeddings(
-                        texts=[text],
+                        texts=list(texts),
                         normalize=True,
                         use_worker_pool=True,
                     )
                     
-                    if not embeddings or len(embeddings) == 0:
-                        raise ValueError("No embeddings returned from GPU-AI MCP")
+                    if not embeddings or len(embeddings) != len(texts):
+                        raise ValueError(
+                            f"Expected {len(texts)} embeddings from GPU-AI MCP, "
+                            f"got {len(embeddings) if embeddings else 0}"
+                        )
                     
-                    embedding_vector = np.array(embeddings[0], dtype=np.float32)
+                    embedding_matrix = np.asarray(embeddings, dtype=np.float32)
+                    self.gpu_ai_breaker.record_success()
                     
                     logger.debug(
-                        "Generated embedding via GPU-AI MCP",
-                        tenant_id=tenant_id,
+                        "Generated embeddings via GPU-AI MCP",
                         model=model,
-                        text_length=len(text),
-                        embedding_dimension=len(embedding_vector)
+                        text_count=len(texts),
+                        embedding_dimension=embedding_matrix.shape[1]
                     )
                     
-                    return embedding_vector
+                    return embedding_matrix
                     
                 except NotImplementedError:
                     # GPU-AI MCP not configured, fall back to OpenAI
+                    self.gpu_ai_breaker.record_failure()
                     logger.warning(
                         "GPU-AI MCP not configured, falling back to OpenAI",
-                        tenant_id=tenant_id,
                         model=model
                     )
                     use_gpu_ai = False
                     # Fall through to OpenAI implementation
                 except Exception as e:
                     # GPU-AI MCP failed, fall back to OpenAI
+                    self.gpu_ai_breaker.record_failure()
                     logger.warning(
                         "GPU-AI MCP failed, falling back to OpenAI",
-                        tenant_id=tenant_id,
                         model=model,
                         error=str(e)
                     )
@@ -221,33 +359,24 @@ class EmbeddingService:
                         "Please install openai package or configure GPU-AI MCP server."
                     )
                 
-                client = self._get_openai_client()
-                
-                # Generate embedding using OpenAI API
-                response = client.embeddings.create(
-                    model=model,
-                    input=text,
-                )
-                
-                # Extract embedding vector
-                embedding_vector = np.array(response.data[0].embedding, dtype=np.float32)
+                # Token-aware batches, sent concurrently over the shared pool
+                embedding_matrix = await self.openai_backend.embed(model, texts)
                 
                 logger.debug(
-                    "Generated embedding via OpenAI",
-                    tenant_id=tenant_id,
+                    "Generated embeddings via OpenAI",
                     model=model,
-                    text_length=len(text),
-                    embedding_dimension=len(embedding_vector)
+                    text_count=len(texts),
+                    embedding_dimension=embedding_matrix.shape[1]
                 )
             
-            return embedding_vector
+            return embedding_matrix
             
         except Exception as e:
             logger.error(
                 "Error generating embedding",
-                tenant_id=tenant_id,
                 model=model,
                 use_gpu_ai=use_gpu_ai,
+                text_count=len(texts),
                 error=str(e)
             )
             raise
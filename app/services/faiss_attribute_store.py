@@ -0,0 +1,350 @@
+"""
+Per-tenant attribute postings for filtered FAISS search.
+
+For every tenant, keeps the set of FAISS IDs carrying each document type,
+tag and creation day. Metadata filters are resolved against these sets
+into the exact set of allowed IDs, which FAISSIndexManager hands to FAISS
+as an IDSelector, so filtered searches rank only matching vectors instead
+of over-fetching and dropping rows afterwards.
+
+FAISS IDs are 63-bit hashes of document IDs (see document_id_to_faiss_id),
+so postings are hash sets rather than positional bitmaps.
+
+File layout: JSON lines. Each line sets a vector's attributes
+({"id", "type", "tags", "ts"}), deletes them ({"id", "deleted": true}) or
+marks the store as covering every indexed vector ({"complete": true}).
+Lines are appended on every write; the file is rewritten once superseded
+lines outnumber live ones.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Filter keys resolved by the attribute store (see AttributeStore.match)
+FILTER_KEYS = ("document_type", "tags", "date_from", "date_to")
+
+_DAY_FORMAT = "%Y-%m-%d"
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    """
+    Convert a datetime or ISO string to a UTC epoch timestamp.
+
+    Naive datetimes are treated as UTC.
+
+    Args:
+        value: datetime, ISO 8601 string, epoch number or None
+
+    Returns:
+        float: Epoch seconds, or None if value is None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _day(timestamp: float) -> str:
+    """UTC calendar day (YYYY-MM-DD) of an epoch timestamp."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(_DAY_FORMAT)
+
+
+def document_attributes(metadata: Optional[Dict[str, Any]], created_at: Any) -> Dict[str, Any]:
+    """
+    Extract the filterable attributes of a document.
+
+    Uses the same defaults as rag_search: documents without a type are
+    "text", and a single tag string counts as one tag.
+
+    Args:
+        metadata: Document metadata (metadata_json)
+        created_at: Document creation time (datetime or ISO string)
+
+    Returns:
+        dict: {"type": str, "tags": list[str], "ts": float or None}
+    """
+    metadata = metadata or {}
+    tags = metadata.get("tags") or []
+    if isinstance(tags, str):
+        tags = [tags]
+    return {
+        "type": str(metadata.get("type", "text")),
+        "tags": sorted({str(tag) for tag in tags}),
+        "ts": _to_timestamp(created_at),
+    }
+
+
+def has_attribute_filters(filters: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether a filters dict restricts any attribute kept by the store.
+
+    Args:
+        filters: Search filters (document_type, tags, date_from, date_to)
+
+    Returns:
+        bool: True if at least one attribute filter is set
+    """
+    return bool(filters) and any(filters.get(key) for key in FILTER_KEYS)
+
+
+class AttributeStore:
+    """Type, tag and day postings of one tenant's FAISS IDs."""
+
+    def __init__(self, path: Path, fsync: bool = True):
+        """
+        Initialize the attribute store. Call load() to read existing postings.
+
+        Args:
+            path: Attribute log file path
+            fsync: Whether to fsync after every append
+        """
+        self.path = path
+        self.fsync = fsync
+        self.complete = False
+
+        self._lock = threading.Lock()
+        self._attributes: Dict[int, Tuple[str, Tuple[str, ...], Optional[float]]] = {}
+        self._postings: Dict[Tuple[str, str], set] = {}
+        self._log_lines = 0
+
+    def __len__(self) -> int:
+        return len(self._attributes)
+
+    def __contains__(self, faiss_id: int) -> bool:
+        return faiss_id in self._attributes
+
+    def load(self) -> "AttributeStore":
+        """
+        Read the attribute log from disk.
+
+        A torn trailing line (crash mid-append) is ignored.
+
+        Returns:
+            AttributeStore: self
+        """
+        if not self.path.exists():
+            return self
+
+        with self._lock:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning("Ignoring torn FAISS attribute log line", log_file=str(self.path))
+                        continue
+                    self._log_lines += 1
+                    if record.get("complete"):
+                        self.complete = True
+                    elif record.get("deleted"):
+                        self._discard(int(record["id"]))
+                    else:
+                        self._put(int(record["id"]), record)
+        return self
+
+    def _put(self, faiss_id: int, attributes: Dict[str, Any]) -> None:
+        """Set a vector's attributes in memory. Caller holds the lock."""
+        self._discard(faiss_id)
+        entry = (str(attributes["type"]), tuple(attributes.get("tags") or ()), attributes.get("ts"))
+        self._attributes[faiss_id] = entry
+        for key in self._posting_keys(entry):
+            self._postings.setdefault(key, set()).add(faiss_id)
+
+    def _discard(self, faiss_id: int) -> None:
+        """Drop a vector's attributes from memory. Caller holds the lock."""
+        entry = self._attributes.pop(faiss_id, None)
+        if entry is None:
+            return
+        for key in self._posting_keys(entry):
+            posting = self._postings.get(key)
+            if posting is not None:
+                posting.discard(faiss_id)
+                if not posting:
+                    del self._postings[key]
+
+    @staticmethod
+    def _posting_keys(entry: Tuple[str, Tuple[str, ...], Optional[float]]) -> List[Tuple[str, str]]:
+        """Posting list keys of one attribute entry."""
+        doc_type, tags, timestamp = entry
+        keys = [("type", doc_type)]
+        keys.extend(("tag", tag) for tag in tags)
+        if timestamp is not None:
+            keys.append(("day", _day(timestamp)))
+        return keys
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the log, rewriting it once mostly superseded. Caller holds the lock."""
+        if self._log_lines + len(records) > 2 * len(self._attributes) + 1_000:
+            self._rewrite()
+            return
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._log_lines += len(records)
+
+    def _rewrite(self) -> None:
+        """Rewrite the log with one line per live vector. Caller holds the lock."""
+        tmp_file = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            if self.complete:
+                f.write(json.dumps({"complete": True}) + "\n")
+            for faiss_id, (doc_type, tags, timestamp) in self._attributes.items():
+                f.write(json.dumps({"id": faiss_id, "type": doc_type, "tags": list(tags), "ts": timestamp}) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.path)
+        self._log_lines = len(self._attributes) + int(self.complete)
+
+    def put(
+        self,
+        faiss_ids: Sequence[int],
+        attributes: Sequence[Dict[str, Any]],
+        complete: bool = False,
+    ) -> None:
+        """
+        Set (or replace) the attributes of a batch of vectors.
+
+        Args:
+            faiss_ids: FAISS IDs
+            attributes: One document_attributes() dict per FAISS ID
+            complete: Also mark the store as covering every indexed vector
+        """
+        records = [
+            {"id": int(faiss_id), "type": attrs["type"], "tags": list(attrs.get("tags") or ()), "ts": attrs.get("ts")}
+            for faiss_id, attrs in zip(faiss_ids, attributes)
+        ]
+        if complete and not self.complete:
+            records.append({"complete": True})
+        if not records:
+            return
+
+        with self._lock:
+            for record in records:
+                if "id" in record:
+                    self._put(record["id"], record)
+            self.complete = self.complete or complete
+            self._append(records)
+
+    def remove(self, faiss_ids: Iterable[int]) -> None:
+        """
+        Drop the attributes of a batch of vectors.
+
+        Args:
+            faiss_ids: FAISS IDs
+        """
+        with self._lock:
+            removed = [int(faiss_id) for faiss_id in faiss_ids if int(faiss_id) in self._attributes]
+            if not removed:
+                return
+            for faiss_id in removed:
+                self._discard(faiss_id)
+            self._append([{"id": faiss_id, "deleted": True} for faiss_id in removed])
+
+    def mark_complete(self) -> None:
+        """Record that every indexed vector has attributes (new or backfilled tenants)."""
+        if not self.complete:
+            with self._lock:
+                self.complete = True
+                self._append([{"complete": True}])
+
+    def match(self, filters: Optional[Dict[str, Any]]) -> Optional[set]:
+        """
+        Resolve search filters to the set of FAISS IDs allowed to match.
+
+        document_type must equal the vector's type, tags match if the vector
+        carries any of them, and date_from/date_to bound the creation time
+        (inclusive). Only day buckets inside the range are scanned; vectors
+        on the two boundary days are checked against their exact timestamp.
+
+        Args:
+            filters: Search filters (document_type, tags, date_from, date_to)
+
+        Returns:
+            set: Allowed FAISS IDs, or None if filters restrict no attribute
+        """
+        if not has_attribute_filters(filters):
+            return None
+
+        doc_type = filters.get("document_type")
+        tags = filters.get("tags")
+        if isinstance(tags, str):
+            tags = [tags]
+        date_from = _to_timestamp(filters.get("date_from"))
+        date_to = _to_timestamp(filters.get("date_to"))
+
+        with self._lock:
+            candidates: List[set] = []
+            if doc_type:
+                candidates.append(self._postings.get(("type", str(doc_type)), set()))
+            if tags:
+                candidates.append(set().union(*(self._postings.get(("tag", str(tag)), set()) for tag in tags)))
+            if date_from is not None or date_to is not None:
+                candidates.append(self._match_dates(date_from, date_to))
+
+            candidates.sort(key=len)
+            allowed = set(candidates[0])
+            for candidate in candidates[1:]:
+                allowed &= candidate
+            return allowed
+
+    def _match_dates(self, date_from: Optional[float], date_to: Optional[float]) -> set:
+        """FAISS IDs created within [date_from, date_to]. Caller holds the lock."""
+        first_day = _day(date_from) if date_from is not None else None
+        last_day = _day(date_to) if date_to is not None else None
+
+        matched = set()
+        for (kind, day), posting in self._postings.items():
+            if kind != "day":
+                continue
+            if (first_day is not None and day < first_day) or (last_day is not None and day > last_day):
+                continue
+            if day != first_day and day != last_day:
+                matched |= posting
+                continue
+            for faiss_id in posting:
+                timestamp = self._attributes[faiss_id][2]
+                if (date_from is None or timestamp >= date_from) and (date_to is None or timestamp <= date_to):
+                    matched.add(faiss_id)
+        return matched
+
+    def filter(self, faiss_ids: Iterable[int], filters: Optional[Dict[str, Any]]) -> List[int]:
+        """
+        Keep the FAISS IDs whose attributes satisfy the filters.
+
+        Args:
+            faiss_ids: Candidate FAISS IDs
+            filters: Search filters (see match())
+
+        Returns:
+            list: Matching FAISS IDs, in input order
+        """
+        allowed = self.match(filters)
+        if allowed is None:
+            return list(faiss_ids)
+        return [faiss_id for faiss_id in faiss_ids if faiss_id in allowed]
+
+    def clear(self) -> None:
+        """Drop every posting and delete the log."""
+        with self._lock:
+            self._attributes.clear()
+            self._postings.clear()
+            self._log_lines = 0
+            self.complete = False
+            self.path.unlink(missing_ok=True)
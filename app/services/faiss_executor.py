@@ -0,0 +1,191 @@
+"""
+Bounded thread pool for FAISS compute and index I/O.
+
+FAISS searches, index loads and snapshots hold the calling thread for as
+long as they run. Async callers run them here so the asyncio event loop
+keeps serving other requests. Each worker caps FAISS's OpenMP threads so
+that workers x OpenMP threads stays within the available CPUs instead of
+oversubscribing them.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import structlog
+
+from app.config.faiss import faiss_settings
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def available_cpus() -> int:
+    """
+    Get the number of CPUs this process may run on.
+
+    Returns:
+        int: CPU count (respects CPU affinity where supported)
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class FAISSExecutor:
+    """
+    Thread pool running blocking FAISS calls for async code.
+
+    Tracks queue depth and queue wait time so saturation is visible in
+    health checks before it shows up as request latency.
+    """
+
+    def __init__(self, max_workers: int = 0, omp_threads: int = 0):
+        """
+        Initialize the executor. Worker threads are started on first use.
+
+        Args:
+            max_workers: Worker threads (0 = min(4, available CPUs))
+            omp_threads: FAISS OpenMP threads per worker
+                (0 = available CPUs divided by max_workers)
+        """
+        cpus = available_cpus()
+        self.max_workers = max_workers if max_workers > 0 else max(1, min(4, cpus))
+        self.omp_threads = omp_threads if omp_threads > 0 else max(1, cpus // self.max_workers)
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._run_ms_total = 0.0
+
+    def _initialize_worker(self) -> None:
+        """Cap FAISS OpenMP threads in a new worker (the setting is per thread)."""
+        try:
+            import faiss
+        except ImportError:
+            return
+        faiss.omp_set_num_threads(self.omp_threads)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="faiss",
+                    initializer=self._initialize_worker,
+                )
+                logger.info(
+                    "FAISS executor started",
+                    max_workers=self.max_workers,
+                    omp_threads=self.omp_threads,
+                )
+            return self._executor
+
+    def _on_done(self, future: Future) -> None:
+        """Release the queue slot of a call cancelled before it started."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking FAISS call on the executor and await its result.
+
+        The caller's context variables (tenant ID, role, ...) are copied to
+        the worker, so tenant isolation checks behave as on the event loop.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Whatever fn returns (exceptions raised by fn propagate)
+        """
+        context = contextvars.copy_context()
+        submitted_at = time.monotonic()
+
+        def call() -> T:
+            started_at = time.monotonic()
+            wait_ms = (started_at - submitted_at) * 1000
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_ms_total += wait_ms
+                self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+            failed = False
+            try:
+                return context.run(fn, *args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._failed += int(failed)
+                    self._run_ms_total += (time.monotonic() - started_at) * 1000
+
+        executor = self._get_executor()
+        with self._lock:
+            self._queued += 1
+        try:
+            future = executor.submit(call)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            dict: Pool size, queue depth, active calls and wait/run times
+        """
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "omp_threads": self.omp_threads,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "completed": completed,
+                "failed": self._failed,
+                "wait_ms_avg": round(self._wait_ms_total / completed, 2) if completed else 0.0,
+                "wait_ms_max": round(self._wait_ms_max, 2),
+                "run_ms_avg": round(self._run_ms_total / completed, 2) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker threads after running calls finish.
+
+        Called during application shutdown.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Global FAISS executor instance
+faiss_executor = FAISSExecutor(
+    max_workers=faiss_settings.executor_max_workers,
+    omp_threads=faiss_settings.omp_threads_per_worker,
+)
@@ -0,0 +1,314 @@
+"""
+Memory-budgeted cache of loaded tenant FAISS indices.
+
+Keeps at most `max_bytes` of index data resident per worker, evicting the
+least recently used unpinned tenant when the budget is exceeded. Concurrent
+loads of the same cold tenant are collapsed into a single load.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+from uuid import UUID
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def estimate_index_bytes(index: Any) -> int:
+    """
+    Estimate the resident memory of a FAISS index in bytes.
+
+    Covers the index types created by FAISSIndexManager (Flat, IVFFlat,
+    IVFPQ, HNSW, optionally wrapped in IndexIDMap/IndexIDMap2). Objects that
+    are not FAISS indices are counted as 0 bytes.
+
+    Args:
+        index: FAISS index
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    try:
+        import faiss
+    except ImportError:
+        return 0
+
+    if not isinstance(index, faiss.Index):
+        return 0
+
+    ntotal = int(index.ntotal)
+    dimension = int(index.d)
+    total = 0
+
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        # id_map vector, plus the reverse hash map kept by IndexIDMap2
+        total += ntotal * 8
+        if isinstance(index, faiss.IndexIDMap2):
+            total += ntotal * 32
+        index = faiss.downcast_index(index.index)
+
+    if isinstance(index, faiss.IndexIVF):
+        total += int(index.nlist) * dimension * 4  # coarse centroids
+        total += ntotal * (int(index.code_size) + 8)  # codes + list ids
+        if isinstance(index, faiss.IndexIVFPQ):
+            pq = index.pq
+            total += int(pq.M) * int(pq.ksub) * int(pq.dsub) * 4
+    elif isinstance(index, faiss.IndexHNSW):
+        total += ntotal * dimension * 4
+        total += ntotal * int(index.hnsw.nb_neighbors(0)) * 4 * 2
+    else:
+        total += ntotal * dimension * 4
+
+    return total
+
+
+class _PendingLoad:
+    """In-flight load shared by every caller waiting on the same tenant."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.index: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TenantIndexCache(MutableMapping):
+    """
+    LRU cache of tenant FAISS indices bounded by an estimated memory budget.
+
+    Behaves like a dict keyed by tenant_id so existing callers can keep
+    using item access, while get_or_load() adds single-flight loading.
+    Pinned tenants are never evicted.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        pinned_tenants: Optional[set[UUID]] = None,
+        size_estimator: Optional[Callable[[UUID, Any], int]] = None,
+        on_evict: Optional[Callable[[UUID, Any], None]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget in bytes (0 disables eviction)
+            pinned_tenants: Tenants that must stay resident
+            size_estimator: Function of (tenant_id, index) returning its size in
+                bytes (defaults to estimate_index_bytes)
+            on_evict: Callback invoked with (tenant_id, index) after an eviction
+        """
+        self.max_bytes = max_bytes
+        self._pinned: set[UUID] = set(pinned_tenants or ())
+        self._size_estimator = size_estimator or (lambda tenant_id, index: estimate_index_bytes(index))
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[UUID, Any]" = OrderedDict()
+        self._sizes: dict[UUID, int] = {}
+        self._pending: dict[UUID, _PendingLoad] = {}
+        self._lock = threading.RLock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._loads = 0
+        self._load_failures = 0
+        self._load_time_ms_total = 0.0
+        self._load_time_ms_max = 0.0
+
+    # MutableMapping interface
+
+    def __getitem__(self, tenant_id: UUID) -> Any:
+        with self._lock:
+            index = self._entries[tenant_id]
+            self._entries.move_to_end(tenant_id)
+            return index
+
+    def __setitem__(self, tenant_id: UUID, index: Any) -> None:
+        with self._lock:
+            self._entries[tenant_id] = index
+            self._entries.move_to_end(tenant_id)
+            self._sizes[tenant_id] = self._size_estimator(tenant_id, index)
+            self._evict_if_needed()
+
+    def __delitem__(self, tenant_id: UUID) -> None:
+        with self._lock:
+            del self._entries[tenant_id]
+            self._sizes.pop(tenant_id, None)
+
+    def __iter__(self) -> Iterator[UUID]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, tenant_id: object) -> bool:
+        return tenant_id in self._entries
+
+    # Cache operations
+
+    @property
+    def current_bytes(self) -> int:
+        """Total estimated bytes of resident indices."""
+        return sum(self._sizes.values())
+
+    def lookup(self, tenant_id: UUID) -> Optional[Any]:
+        """
+        Return a resident index and record a hit or miss.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            FAISS index or None if not resident
+        """
+        with self._lock:
+            if tenant_id in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(tenant_id)
+                return self._entries[tenant_id]
+            self._misses += 1
+            return None
+
+    def get_or_load(self, tenant_id: UUID, loader: Callable[[], Any]) -> Optional[Any]:
+        """
+        Return a tenant's index, loading it at most once across concurrent callers.
+
+        The first caller for a cold tenant runs `loader`; every other caller
+        arriving while that load is in flight waits for its result instead of
+        reading the index from disk again.
+
+        Args:
+            tenant_id: Tenant ID
+            loader: Callable returning the loaded index (or None if it does not exist)
+
+        Returns:
+            FAISS index or None if the loader found nothing
+        """
+        with self._lock:
+            index = self.lookup(tenant_id)
+            if index is not None:
+                return index
+
+            pending = self._pending.get(tenant_id)
+            is_owner = pending is None
+            if is_owner:
+                pending = _PendingLoad()
+                self._pending[tenant_id] = pending
+
+        if not is_owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.index
+
+        start_time = time.monotonic()
+        try:
+            index = loader()
+            pending.index = index
+            with self._lock:
+                load_time_ms = (time.monotonic() - start_time) * 1000
+                self._loads += 1
+                self._load_time_ms_total += load_time_ms
+                self._load_time_ms_max = max(self._load_time_ms_max, load_time_ms)
+                if index is not None:
+                    self[tenant_id] = index
+            return index
+        except BaseException as e:
+            pending.error = e
+            with self._lock:
+                self._load_failures += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(tenant_id, None)
+            pending.event.set()
+
+    def refresh_size(self, tenant_id: UUID) -> None:
+        """
+        Re-estimate a resident index's size after it was mutated in place.
+
+        Args:
+            tenant_id: Tenant ID
+        """
+        with self._lock:
+            if tenant_id in self._entries:
+                self._sizes[tenant_id] = self._size_estimator(tenant_id, self._entries[tenant_id])
+                self._evict_if_needed()
+
+    def pin(self, tenant_id: UUID) -> None:
+        """Keep a tenant's index resident regardless of the memory budget."""
+        with self._lock:
+            self._pinned.add(tenant_id)
+
+    def unpin(self, tenant_id: UUID) -> None:
+        """Allow a tenant's index to be evicted again."""
+        with self._lock:
+            self._pinned.discard(tenant_id)
+            self._evict_if_needed()
+
+    def is_pinned(self, tenant_id: UUID) -> bool:
+        """Check whether a tenant is pinned."""
+        return tenant_id in self._pinned
+
+    def _evict_if_needed(self) -> None:
+        """Evict least recently used unpinned indices until within budget."""
+        if self.max_bytes <= 0:
+            return
+
+        current_bytes = self.current_bytes
+        for tenant_id in list(self._entries):
+            if current_bytes <= self.max_bytes:
+                break
+            if tenant_id in self._pinned:
+                continue
+            # Never evict the most recently used entry (the one just inserted)
+            if tenant_id == next(reversed(self._entries)):
+                break
+
+            size = self._sizes.pop(tenant_id, 0)
+            index = self._entries.pop(tenant_id)
+            current_bytes -= size
+            self._evictions += 1
+
+            if self._on_evict is not None:
+                try:
+                    self._on_evict(tenant_id, index)
+                except Exception as e:
+                    logger.error("FAISS cache eviction callback failed", tenant_id=str(tenant_id), error=str(e))
+
+            logger.info(
+                "FAISS index evicted from cache",
+                tenant_id=str(tenant_id),
+                index_bytes=size,
+                cache_bytes=current_bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hit/miss/eviction/load counters and memory usage
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "pinned": len(self._pinned),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "loads": self._loads,
+                "load_failures": self._load_failures,
+                "load_time_ms_avg": round(self._load_time_ms_total / self._loads, 2) if self._loads else 0.0,
+                "load_time_ms_max": round(self._load_time_ms_max, 2),
+                "loads_in_flight": len(self._pending),
+            }
@@ -5,8 +5,15 @@ Manages FAISS vector indices with complete tenant isolation.
 Each tenant has a separate FAISS index to prevent cross-tenant data access.
 """
 
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 from uuid import UUID
 
 import numpy as np
@@ -14,10 +21,74 @@ import structlog
 
 from app.config.faiss import faiss_settings
 from app.mcp.middleware.tenant import get_tenant_id_from_context
+from app.services.faiss_attribute_store import AttributeStore
+from app.services.faiss_index_cache import TenantIndexCache, estimate_index_bytes
+from app.services.faiss_reduction import (
+    PCA_REDUCTION,
+    VectorReducer,
+    measure_recall,
+    normalize_reduction_method,
+)
+from app.services.faiss_vector_log import VectorLog
 from app.utils.errors import TenantIsolationError
 
+# Cross-process writer locks where the platform has flock()
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
 logger = structlog.get_logger(__name__)
 
+# Supported index types (canonical names)
+FLAT_INDEX_TYPES = ("IndexFlatL2", "IndexFlatIP")
+IVF_INDEX_TYPES = ("IVFFlat", "IVFPQ")
+APPROXIMATE_INDEX_TYPES = IVF_INDEX_TYPES + ("HNSW",)
+AUTO_INDEX_TYPE = "auto"
+
+# Approximate resident size of one in-memory ID map entry (dict slot, int, UUID)
+ID_MAP_ENTRY_BYTES = 160
+
+_INDEX_TYPE_ALIASES = {
+    "indexflatl2": "IndexFlatL2",
+    "flatl2": "IndexFlatL2",
+    "flat": "IndexFlatL2",
+    "indexflatip": "IndexFlatIP",
+    "flatip": "IndexFlatIP",
+    "ivfflat": "IVFFlat",
+    "ivf-flat": "IVFFlat",
+    "ivf_flat": "IVFFlat",
+    "ivfpq": "IVFPQ",
+    "ivf-pq": "IVFPQ",
+    "ivf_pq": "IVFPQ",
+    "hnsw": "HNSW",
+    "hnswflat": "HNSW",
+    "auto": AUTO_INDEX_TYPE,
+}
+
+
+def normalize_index_type(index_type: str) -> str:
+    """
+    Normalize a configured FAISS index type to its canonical name.
+    
+    Args:
+        index_type: Index type name (e.g. "IndexFlatL2", "IVF-Flat", "ivfpq", "HNSW", "auto")
+        
+    Returns:
+        str: Canonical index type name
+        
+    Raises:
+        ValueError: If the index type is not supported
+    """
+    canonical = _INDEX_TYPE_ALIASES.get(str(index_type).strip().lower())
+    if canonical is None:
+        raise ValueError(
+            f"Unsupported FAISS index type: {index_type}. "
+            f"Supported types: {', '.join(FLAT_INDEX_TYPES + APPROXIMATE_INDEX_TYPES)}, {AUTO_INDEX_TYPE}"
+        )
+    return canonical
+
 
 def get_tenant_index_path(tenant_id: UUID) -> Path:
     """
@@ -60,6 +131,195 @@ def get_tenant_index_path(tenant_id: UUID) -> Path:
     return index_file
 
 
+def get_tenant_id_map_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path for a tenant's FAISS ID map sidecar.
+    
+    The sidecar maps 64-bit FAISS vector IDs back to document UUIDs and is
+    stored next to the tenant's .index file.
+    
+    Args:
+        tenant_id: Tenant ID
+        
+    Returns:
+        Path: File path for the tenant's ID map
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".idmap.json")
+
+
+def get_tenant_params_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path for a tenant's FAISS index parameters sidecar.
+    
+    The sidecar stores the tenant's configured index type and the search
+    parameters (nprobe, efSearch) used for approximate indices.
+    
+    Args:
+        tenant_id: Tenant ID
+        
+    Returns:
+        Path: File path for the tenant's index parameters
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".params.json")
+
+
+def get_tenant_reduction_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path for a tenant's trained dimensionality reduction.
+    
+    Holds the PCA projection applied to the tenant's vectors before they are
+    added or searched (see faiss_reduction).
+    
+    Args:
+        tenant_id: Tenant ID
+        
+    Returns:
+        Path: File path for the tenant's PCA projection
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".pca")
+
+
+def get_tenant_delta_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path for a tenant's writable delta index.
+    
+    When indices are memory-mapped read-only, new vectors are added to a
+    small in-memory delta index persisted here until it is merged into the
+    base index by compact_index().
+    
+    Args:
+        tenant_id: Tenant ID
+        
+    Returns:
+        Path: File path for the tenant's delta index
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".delta.index")
+
+
+def get_tenant_vector_log_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path for a tenant's append-only vector log.
+    
+    The log holds vectors added since the last index snapshot and is
+    replayed when the index is loaded.
+    
+    Args:
+        tenant_id: Tenant ID
+        
+    Returns:
+        Path: File path for the tenant's vector log
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".vlog")
+
+
+def get_tenant_tombstones_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path for a tenant's deleted-vector tombstones.
+    
+    Tombstoned FAISS IDs are excluded from search results until the index
+    is rebuilt without them.
+    
+    Args:
+        tenant_id: Tenant ID
+    
+    Returns:
+        Path: File path for the tenant's tombstones
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".tombstones.json")
+
+
+def get_tenant_attributes_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path for a tenant's filterable attribute log.
+    
+    The log holds the type, tags and creation time of every indexed
+    vector, used to push metadata filters into FAISS searches.
+    
+    Args:
+        tenant_id: Tenant ID
+    
+    Returns:
+        Path: File path for the tenant's attribute log
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".attributes.jsonl")
+
+
+def get_tenant_lock_path(tenant_id: UUID) -> Path:
+    """
+    Get the file path of a tenant's cross-process writer lock.
+    
+    Every process serving the tenant takes an exclusive flock() on it while
+    it writes the tenant's index files, vector log and sidecars.
+    
+    Args:
+        tenant_id: Tenant ID
+    
+    Returns:
+        Path: File path for the tenant's writer lock
+    """
+    return get_tenant_index_path(tenant_id).with_suffix(".lock")
+
+
+def document_id_to_faiss_id(document_id: UUID) -> int:
+    """
+    Convert a document UUID to a deterministic 64-bit FAISS vector ID.
+    
+    Uses the first 8 bytes of the UUID, masked to a positive int64 so the
+    value never collides with FAISS's -1 "no result" sentinel. Unlike
+    hash(), the result is identical across processes, workers and restarts.
+    
+    Args:
+        document_id: Document UUID
+        
+    Returns:
+        int: FAISS vector ID in the range [0, 2**63)
+    """
+    return int.from_bytes(document_id.bytes[:8], "big") & 0x7FFFFFFFFFFFFFFF
+
+
+def chunk_faiss_id(document_id: UUID, chunk_no: int) -> int:
+    """
+    Convert a (document UUID, chunk number) pair to a deterministic FAISS vector ID.
+    
+    Chunk 0 keeps the document's own FAISS ID (document_id_to_faiss_id), so
+    documents indexed before chunking read as single-chunk documents. Later
+    chunks hash the UUID and chunk number into the same positive int64 range.
+    
+    Args:
+        document_id: Document UUID
+        chunk_no: Chunk number, from 0
+        
+    Returns:
+        int: FAISS vector ID in the range [0, 2**63)
+    """
+    if chunk_no == 0:
+        return document_id_to_faiss_id(document_id)
+    digest = hashlib.blake2b(document_id.bytes + chunk_no.to_bytes(4, "big"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFFFFFFFFFFFFFF
+
+
+def parse_pinned_tenants(pinned_tenants: str) -> set[UUID]:
+    """
+    Parse the comma-separated FAISS_PINNED_TENANTS setting.
+    
+    Args:
+        pinned_tenants: Comma-separated tenant IDs
+        
+    Returns:
+        set: Tenant IDs (invalid entries are logged and skipped)
+    """
+    tenant_ids = set()
+    for raw_tenant_id in (pinned_tenants or "").split(","):
+        raw_tenant_id = raw_tenant_id.strip()
+        if not raw_tenant_id:
+            continue
+        try:
+            tenant_ids.add(UUID(raw_tenant_id))
+        except ValueError:
+            logger.warning("Ignoring invalid pinned FAISS tenant ID", tenant_id=raw_tenant_id)
+    return tenant_ids
+
+
 def get_tenant_index_name(tenant_id: UUID) -> str:
     """
     Get the index name for a tenant.
@@ -106,6 +366,86 @@ def validate_tenant_access(
         )
 
 
+class _TenantWriterLock:
+    """
+    Reentrant writer lock of one tenant, exclusive across threads and processes.
+    
+    The outermost acquisition also takes an exclusive flock() on the tenant's
+    lock file, then calls on_acquire; the outermost release calls on_release
+    before unlocking the file.
+    """
+    
+    def __init__(self, path: Path, on_acquire, on_release):
+        self._lock = threading.RLock()
+        self._path = path
+        self._on_acquire = on_acquire
+        self._on_release = on_release
+        self._depth = 0
+        self._file = None
+    
+    def acquire(self) -> None:
+        self._lock.acquire()
+        self._depth += 1
+        if self._depth > 1:
+            return
+        try:
+            if FCNTL_AVAILABLE:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self._path, "a+b")
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            self._on_acquire()
+        except BaseException:
+            self._unlock_file()
+            self._depth -= 1
+            self._lock.release()
+            raise
+    
+    def release(self) -> None:
+        try:
+            if self._depth == 1:
+                try:
+                    self._on_release()
+                finally:
+                    self._unlock_file()
+        finally:
+            self._depth -= 1
+            self._lock.release()
+    
+    def _unlock_file(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self) -> "_TenantWriterLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class _PendingAdd:
+    """Vectors waiting for the tenant's writer to group-commit them."""
+    
+    def __init__(
+        self,
+        document_ids: List[UUID],
+        chunk_numbers: List[int],
+        embeddings: np.ndarray,
+        attributes: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.document_ids = document_ids
+        self.chunk_numbers = chunk_numbers
+        self.faiss_ids = [
+            chunk_faiss_id(document_id, chunk_no)
+            for document_id, chunk_no in zip(document_ids, chunk_numbers)
+        ]
+        self.embeddings = embeddings
+        self.attributes = attributes
+        self.future: Future = Future()
+
+
 class FAISSIndexManager:
     """
     FAISS index manager with tenant-scoped isolation.
@@ -125,10 +465,57 @@ class FAISSIndexManager:
         self.dimension = faiss_settings.dimension
         self.index_type = faiss_settings.index_type
         self.use_mmap = faiss_settings.use_mmap
+        self.metric = faiss_settings.metric
+        self.search_effort = faiss_settings.search_effort
+        
+        # In-memory cache of loaded indices (tenant_id -> index), bounded by
+        # FAISS_CACHE_MAX_BYTES with LRU eviction and single-flight loading
+        self._indices = TenantIndexCache(
+            max_bytes=int(faiss_settings.cache_max_bytes),
+            pinned_tenants=parse_pinned_tenants(faiss_settings.pinned_tenants),
+            size_estimator=self._estimate_resident_bytes,
+            on_evict=self._on_index_evicted,
+        )
+        
+        # Writable delta indices for tenants whose base index is memory-mapped
+        # read-only (tenant_id -> IndexIDMap2). Presence means writes go here.
+        self._deltas: dict[UUID, any] = {}
         
-        # In-memory cache of loaded indices (tenant_id -> index)
-        # Note: In production, consider using a more sophisticated caching strategy
-        self._indices: dict[UUID, any] = {}
+        # Single writer per tenant: pending adds are group-committed by
+        # whichever caller holds the tenant's writer lock. The lock is shared
+        # with other processes through a lock file; a process that finds the
+        # tenant's files changed since it last held the lock reloads them
+        # (tenant_id -> stat signature of the files when last seen)
+        self._writer_locks: dict[UUID, _TenantWriterLock] = {}
+        self._disk_signatures: dict[UUID, tuple] = {}
+        self._pending: dict[UUID, list[_PendingAdd]] = {}
+        self._writer_state_lock = threading.Lock()
+        
+        # Vectors added since the last snapshot (tenant_id -> [count, first_added_at])
+        self._dirty: dict[UUID, list] = {}
+        
+        # Deleted FAISS IDs excluded at search time until the index is rebuilt
+        # (tenant_id -> {faiss_id}), with the IDSelector built from each set
+        self._tombstones: dict[UUID, set[int]] = {}
+        self._tombstone_selectors: dict[UUID, tuple] = {}
+        self._compaction_pending: set[UUID] = set()
+        
+        # Type/tag/day postings of each tenant's FAISS IDs, resolved into an
+        # IDSelector for filtered searches (tenant_id -> AttributeStore)
+        self._attribute_stores: dict[UUID, AttributeStore] = {}
+        
+        # Background thread applying the snapshot time policy and compactions
+        self._maintenance_thread: Optional[threading.Thread] = None
+        self._maintenance_stop = threading.Event()
+        
+        # Persisted FAISS ID -> document ID maps (tenant_id -> {faiss_id: document_id})
+        self._id_maps: dict[UUID, dict[int, UUID]] = {}
+        
+        # Per-tenant index parameters (tenant_id -> {index_type, nprobe, ef_search, ...})
+        self._index_params: dict[UUID, dict[str, Any]] = {}
+        
+        # Loaded dimensionality reductions (tenant_id -> VectorReducer or None)
+        self._reducers: dict[UUID, Optional[VectorReducer]] = {}
         
         logger.info(
             "FAISS index manager initialized",
@@ -228,8 +615,12 @@ class FAISSIndexManager:
         # Validate tenant access
         self.validate_tenant_access(tenant_id)
         
-        # Use provided dimension or fall back to configured dimension
+        # Use provided dimension or fall back to configured dimension. With a
+        # dimensionality reduction the index stores the reduced vectors.
         index_dimension = dimension if dimension is not None else self.dimension
+        reducer = self._get_reducer(tenant_id)
+        if reducer is not None:
+            index_dimension = reducer.output_dimension
         
         # Import FAISS (lazy import to avoid dependency if not installed)
         try:
@@ -239,118 +630,1338 @@ class FAISSIndexManager:
             # Return a placeholder for now
             return None
         
-        # Create index based on configured type
-        if self.index_type == "IndexFlatL2":
-            index = faiss.IndexFlatL2(index_dimension)
-        elif self.index_type == "IndexFlatIP":
-            index = faiss.IndexFlatIP(index_dimension)
-        else:
-            # Default to IndexFlatL2
-            logger.warning(
-                f"Unknown index type {self.index_type}, using IndexFlatL2",
-                index_type=self.index_type,
-            )
-            index = faiss.IndexFlatL2(index_dimension)
+        # Create index based on the tenant's configured type. Types that
+        # need training (IVF, auto) start as Flat and are migrated by
+        # _maybe_upgrade_index once enough vectors exist.
+        index_type = self._target_index_type(tenant_id, ntotal=0)
+        index = self._build_index(index_type, index_dimension)
         
-        # Store in cache
-        self._indices[tenant_id] = index
+        with self._writer_lock(tenant_id):
+            # Store in cache
+            self._deltas.pop(tenant_id, None)
+            self._id_maps[tenant_id] = {}
+            self._indices[tenant_id] = index
+            
+            # Persist the empty index right away so the vector log always
+            # has a snapshot to be replayed onto
+            self._write_index_file(index, self.get_tenant_index_path(tenant_id))
+            self._save_id_map(tenant_id)
+            get_tenant_delta_path(tenant_id).unlink(missing_ok=True)
+            self._clear_vector_log(tenant_id)
+            self._set_tombstones(tenant_id, set())
+            
+            # A new index has no vectors without attributes
+            attribute_store = self._get_attribute_store(tenant_id)
+            attribute_store.clear()
+            attribute_store.mark_complete()
         
         logger.info(
             "FAISS index created for tenant",
             tenant_id=str(tenant_id),
-            index_type=self.index_type,
+            index_type=index_type,
             dimension=index_dimension,
         )
         
         return index
     
-    def load_index(self, tenant_id: UUID) -> Optional[any]:
+    def get_tenant_index_config(self, tenant_id: UUID) -> dict[str, Any]:
         """
-        Load a tenant's FAISS index from disk.
+        Get a tenant's index configuration (index type and search parameters).
+        
+        Values persisted in the tenant's params sidecar override the global
+        FAISS settings.
         
         Args:
             tenant_id: Tenant ID
             
         Returns:
-            FAISS index object or None if not found
+            dict: Configuration with index_type, nprobe and ef_search (plus nlist once trained)
+        """
+        if tenant_id not in self._index_params:
+            params: dict[str, Any] = {}
+            params_file = get_tenant_params_path(tenant_id)
+            if params_file.exists():
+                try:
+                    with open(params_file, "r", encoding="utf-8") as f:
+                        params = json.load(f)
+                except Exception as e:
+                    logger.error(
+                        "Error loading FAISS index parameters",
+                        tenant_id=str(tenant_id),
+                        params_file=str(params_file),
+                        error=str(e),
+                    )
+            self._index_params[tenant_id] = params
+        
+        return {
+            "index_type": self.index_type,
+            "nprobe": faiss_settings.ivf_nprobe,
+            "ef_search": faiss_settings.hnsw_ef_search,
+            **self._index_params[tenant_id],
+        }
+    
+    def set_tenant_index_config(
+        self,
+        tenant_id: UUID,
+        index_type: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Set and persist a tenant's index type and search parameters.
+        
+        Search parameters take effect on the next query. A changed index type
+        takes effect when the index is next optimized or rebuilt.
+        
+        Args:
+            tenant_id: Tenant ID
+            index_type: Index type (IndexFlatL2, IndexFlatIP, IVFFlat, IVFPQ, HNSW, auto)
+            nprobe: Number of IVF lists probed per query
+            ef_search: HNSW efSearch
+            
+        Returns:
+            dict: Updated tenant index configuration
             
         Raises:
             TenantIsolationError: If tenant_id mismatch
+            ValueError: If a parameter is invalid
         """
         # Validate tenant access
         self.validate_tenant_access(tenant_id)
         
-        # Check cache first
-        if tenant_id in self._indices:
-            return self._indices[tenant_id]
+        self.get_tenant_index_config(tenant_id)
+        params = dict(self._index_params[tenant_id])
         
-        # Import FAISS (lazy import)
-        try:
-            import faiss
-        except ImportError:
-            logger.warning("FAISS not installed, index loading will fail at runtime")
-            return None
+        if index_type is not None:
+            params["index_type"] = normalize_index_type(index_type)
+        if nprobe is not None:
+            if int(nprobe) < 1:
+                raise ValueError("nprobe must be a positive integer")
+            params["nprobe"] = int(nprobe)
+        if ef_search is not None:
+            if int(ef_search) < 1:
+                raise ValueError("ef_search must be a positive integer")
+            params["ef_search"] = int(ef_search)
         
-        # Get index file path
-        index_file = self.get_tenant_index_path(tenant_id)
+        self._index_params[tenant_id] = params
+        self._save_index_params(tenant_id)
         
-        if not index_file.exists():
-            logger.debug(
-                "FAISS index file not found for tenant",
-                tenant_id=str(tenant_id),
-                index_file=str(index_file),
-            )
-            return None
+        logger.info(
+            "FAISS index configuration updated for tenant",
+            tenant_id=str(tenant_id),
+            **params,
+        )
         
-        try:
-            # Load index from disk
-            if self.use_mmap:
-                index = faiss.read_index(str(index_file))
-            else:
-                index = faiss.read_index(str(index_file))
+        return self.get_tenant_index_config(tenant_id)
+    
+    def _save_index_params(self, tenant_id: UUID) -> None:
+        """
+        Persist a tenant's index parameters sidecar next to the index file.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        params_file = get_tenant_params_path(tenant_id)
+        tmp_file = params_file.with_name(params_file.name + ".tmp")
+        
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self._index_params.get(tenant_id, {}), f)
+        os.replace(tmp_file, params_file)
+    
+    def _get_reducer(self, tenant_id: UUID) -> Optional[VectorReducer]:
+        """
+        Get a tenant's dimensionality reduction, loading it on first use.
+        
+        Args:
+            tenant_id: Tenant ID
             
-            # Store in cache
-            self._indices[tenant_id] = index
+        Returns:
+            VectorReducer, or None if the tenant stores full-dimension vectors
             
-            logger.info(
-                "FAISS index loaded for tenant",
-                tenant_id=str(tenant_id),
-                index_file=str(index_file),
-            )
+        Raises:
+            ValueError: If the tenant's PCA projection file is missing
+        """
+        if tenant_id not in self._reducers:
+            description = self.get_tenant_index_config(tenant_id).get("reduction")
+            reducer = None
+            if description:
+                reducer = VectorReducer.load(description, get_tenant_reduction_path(tenant_id))
+            self._reducers[tenant_id] = reducer
+        return self._reducers[tenant_id]
+    
+    def _reduce_vectors(self, tenant_id: UUID, vectors: np.ndarray) -> np.ndarray:
+        """
+        Apply a tenant's dimensionality reduction to embeddings or queries.
+        
+        Args:
+            tenant_id: Tenant ID
+            vectors: Full-dimension vectors, shape (n, dimension)
             
-            return index
-        except Exception as e:
-            logger.error(
-                "Error loading FAISS index",
-                tenant_id=str(tenant_id),
-                index_file=str(index_file),
-                error=str(e),
-            )
-            return None
+        Returns:
+            np.ndarray: Vectors in the dimension the tenant's index stores
+            
+        Raises:
+            ValueError: If the vectors don't have the reduction's input dimension
+        """
+        reducer = self._get_reducer(tenant_id)
+        if reducer is None or len(vectors) == 0:
+            return vectors
+        return reducer.apply(vectors)
     
-    def save_index(self, tenant_id: UUID, index: any) -> None:
+    def set_tenant_reduction(
+        self,
+        tenant_id: UUID,
+        method: Optional[str],
+        output_dimension: Optional[int] = None,
+        recall_k: int = 10,
+    ) -> dict[str, Any]:
         """
-        Save a tenant's FAISS index to disk.
+        Set and apply a tenant's dimensionality reduction.
+        
+        "pca" trains a projection on the tenant's live vectors; "truncate"
+        keeps the first output_dimension dimensions (Matryoshka embeddings).
+        The index is rebuilt with the reduced vectors, keeping its type, and
+        recall@k of exact search in the reduced space against the full
+        dimension is measured on the stored vectors and persisted with the
+        reduction. From then on every added vector and every query is reduced
+        the same way, including when the index is rebuilt from documents.
+        
+        Disabling ("none") only drops the reduction: stored vectors stay
+        reduced until the index is rebuilt, which the result reports. An
+        existing reduction of a non-empty index cannot be changed in place,
+        since the full-dimension vectors are no longer stored.
         
         Args:
             tenant_id: Tenant ID
-            index: FAISS index object
+            method: "pca", "truncate" (or "matryoshka"), or None/"none" to disable
+            output_dimension: Dimension of the stored vectors
+            recall_k: Neighbours compared when measuring recall
+            
+        Returns:
+            dict: The reduction (method, input_dimension, output_dimension,
+                recall_at_k, recall_k) plus rebuild_required
             
         Raises:
             TenantIsolationError: If tenant_id mismatch
+            ValueError: If the reduction is invalid or cannot be applied
         """
         # Validate tenant access
         self.validate_tenant_access(tenant_id)
         
-        # Get index file path
-        index_file = self.get_tenant_index_path(tenant_id)
+        method = normalize_reduction_method(method)
         
-        try:
-            # Import FAISS (lazy import)
-            import faiss
+        with self._writer_lock(tenant_id):
+            self.get_tenant_index_config(tenant_id)
+            params = self._index_params[tenant_id]
+            current = self._get_reducer(tenant_id)
             
-            # Save index to disk
-            faiss.write_index(index, str(index_file))
+            # Fold pending, buffered and deleted vectors in first
+            self._drain_pending(tenant_id)
+            index = self.get_index(tenant_id, create_if_missing=False)
+            if index is not None:
+                index = self._compact(tenant_id)
+            ntotal = int(index.ntotal) if index is not None else 0
+            
+            if method is None:
+                if current is None:
+                    return {"method": None, "rebuild_required": False}
+                params.pop("reduction", None)
+                self._save_index_params(tenant_id)
+                get_tenant_reduction_path(tenant_id).unlink(missing_ok=True)
+                self._reducers[tenant_id] = None
+                logger.info(
+                    "FAISS dimensionality reduction disabled for tenant",
+                    tenant_id=str(tenant_id),
+                    rebuild_required=ntotal > 0,
+                )
+                return {"method": None, "rebuild_required": ntotal > 0}
+            
+            if output_dimension is None or int(output_dimension) < 1:
+                raise ValueError("reduced_dimension must be a positive integer")
+            output_dimension = int(output_dimension)
+            if current is not None:
+                if (current.method, current.output_dimension) == (method, output_dimension):
+                    return {**params["reduction"], "rebuild_required": False}
+                if ntotal > 0:
+                    raise ValueError(
+                        "The index already stores reduced vectors; disable the reduction "
+                        "and rebuild the index before changing it"
+                    )
+            
+            recall = None
+            if ntotal > 0:
+                ids, vectors = self._live_vectors(tenant_id, index)
+                reducer = VectorReducer.train(method, vectors, output_dimension)
+                reduced = reducer.apply(vectors)
+                recall = measure_recall(vectors, reduced, index.metric_type, k=recall_k)
+            else:
+                if method == PCA_REDUCTION:
+                    raise ValueError("PCA is trained on the tenant's vectors; add documents before enabling it")
+                input_dimension = int(index.d) if index is not None and current is None else None
+                if input_dimension is not None and output_dimension >= input_dimension:
+                    raise ValueError(
+                        f"Reduced dimension must be between 1 and {input_dimension - 1}, got {output_dimension}"
+                    )
+                reducer = VectorReducer(method, output_dimension, input_dimension)
+            
+            reducer.save(get_tenant_reduction_path(tenant_id))
+            params["reduction"] = {**reducer.to_params(), "recall_at_k": recall, "recall_k": recall_k}
+            self._reducers[tenant_id] = reducer
+            try:
+                if ntotal > 0:
+                    index_type = self._current_index_type(index) or self._target_index_type(tenant_id, len(ids))
+                    self._migrate_index(tenant_id, index, index_type, live=(ids, reduced))
+                else:
+                    self._save_index_params(tenant_id)
+                    if index is not None:
+                        self.create_index(tenant_id)
+            except Exception:
+                params.pop("reduction", None)
+                self._save_index_params(tenant_id)
+                self._reducers.pop(tenant_id, None)
+                get_tenant_reduction_path(tenant_id).unlink(missing_ok=True)
+                raise
+        
+        logger.info(
+            "FAISS dimensionality reduction applied for tenant",
+            tenant_id=str(tenant_id),
+            **params["reduction"],
+        )
+        
+        return {**params["reduction"], "rebuild_required": False}
+    
+    def _flat_index_type(self) -> str:
+        """Get the Flat index type matching the configured metric."""
+        if self.index_type in FLAT_INDEX_TYPES:
+            return self.index_type
+        return "IndexFlatIP" if str(self.metric).upper() == "IP" else "IndexFlatL2"
+    
+    def _faiss_metric(self) -> int:
+        """Get the FAISS metric constant for the configured metric."""
+        import faiss
+        
+        if self._flat_index_type() == "IndexFlatIP":
+            return faiss.METRIC_INNER_PRODUCT
+        return faiss.METRIC_L2
+    
+    @staticmethod
+    def _choose_nlist(ntotal: int) -> int:
+        """Choose the number of IVF lists for a corpus of ntotal vectors (~4*sqrt(n))."""
+        return max(1, min(65536, int(4 * math.sqrt(max(ntotal, 1)))))
+    
+    @staticmethod
+    def _choose_pq_m(dimension: int, max_m: int) -> int:
+        """Choose the largest PQ sub-quantizer count <= max_m that divides dimension."""
+        for m in range(min(max_m, dimension), 0, -1):
+            if dimension % m == 0:
+                return m
+        return 1
+    
+    def _min_train_size(self, index_type: str, nlist: int) -> int:
+        """Minimum number of vectors required to train an index of the given type."""
+        min_points = faiss_settings.ivf_min_train_points_per_list
+        if index_type == "IVFPQ":
+            return max(nlist, 2 ** faiss_settings.pq_nbits) * min_points
+        if index_type == "IVFFlat":
+            return nlist * min_points
+        return 0
+    
+    def _target_index_type(self, tenant_id: UUID, ntotal: int) -> str:
+        """
+        Determine the index type a tenant should use at its current size.
+        
+        "auto" keeps Flat for small tenants and moves to the configured
+        approximate type, then IVFPQ, as ntotal crosses the thresholds.
+        IVF types stay Flat until there are enough vectors to train them.
+        
+        Args:
+            tenant_id: Tenant ID
+            ntotal: Number of vectors in the tenant's index
+            
+        Returns:
+            str: Canonical index type
+        """
+        configured = self.get_tenant_index_config(tenant_id)["index_type"]
+        try:
+            index_type = normalize_index_type(configured)
+        except ValueError:
+            logger.warning(
+                f"Unknown index type {configured}, using IndexFlatL2",
+                index_type=configured,
+            )
+            return "IndexFlatL2"
+        
+        if index_type == AUTO_INDEX_TYPE:
+            if ntotal >= faiss_settings.auto_ivfpq_threshold:
+                index_type = "IVFPQ"
+            elif ntotal >= faiss_settings.auto_ivf_threshold:
+                index_type = normalize_index_type(faiss_settings.auto_approximate_type)
+            else:
+                return self._flat_index_type()
+        
+        if index_type in IVF_INDEX_TYPES and ntotal < self._min_train_size(
+            index_type, self._choose_nlist(ntotal)
+        ):
+            return self._flat_index_type()
+        
+        return index_type
+    
+    @staticmethod
+    def _base_index(index: any) -> any:
+        """Unwrap an IndexIDMap/IndexIDMap2 to its underlying index."""
+        import faiss
+        
+        if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+            return faiss.downcast_index(index.index)
+        return index
+    
+    def _current_index_type(self, index: any) -> Optional[str]:
+        """Get the canonical type of a loaded FAISS index (None if unrecognized)."""
+        import faiss
+        
+        base = self._base_index(index)
+        if isinstance(base, faiss.IndexIVFPQ):
+            return "IVFPQ"
+        if isinstance(base, faiss.IndexIVFFlat):
+            return "IVFFlat"
+        if isinstance(base, faiss.IndexHNSW):
+            return "HNSW"
+        if isinstance(base, faiss.IndexFlat):
+            return "IndexFlatIP" if base.metric_type == faiss.METRIC_INNER_PRODUCT else "IndexFlatL2"
+        return None
+    
+    def _build_index(
+        self,
+        index_type: str,
+        dimension: int,
+        training_vectors: Optional[np.ndarray] = None,
+        metric: Optional[int] = None,
+    ) -> any:
+        """
+        Build an empty, ID-mapped FAISS index of the given type.
+        
+        Args:
+            index_type: Canonical index type
+            dimension: Vector dimension
+            training_vectors: Sample used to train IVF indices (required for IVF types)
+            metric: FAISS metric constant (defaults to the configured metric)
+            
+        Returns:
+            IndexIDMap2 wrapping the requested index type, trained if required
+        """
+        import faiss
+        
+        if metric is None:
+            metric = self._faiss_metric()
+        
+        if index_type in FLAT_INDEX_TYPES:
+            if index_type == "IndexFlatIP":
+                base_index = faiss.IndexFlatIP(dimension)
+            else:
+                base_index = faiss.IndexFlatL2(dimension)
+        elif index_type == "HNSW":
+            base_index = faiss.IndexHNSWFlat(dimension, faiss_settings.hnsw_m, metric)
+            base_index.hnsw.efConstruction = faiss_settings.hnsw_ef_construction
+        elif index_type in IVF_INDEX_TYPES:
+            if training_vectors is None or len(training_vectors) == 0:
+                raise ValueError(f"{index_type} index requires training vectors")
+            nlist = self._choose_nlist(len(training_vectors))
+            if metric == faiss.METRIC_INNER_PRODUCT:
+                quantizer = faiss.IndexFlatIP(dimension)
+            else:
+                quantizer = faiss.IndexFlatL2(dimension)
+            if index_type == "IVFPQ":
+                base_index = faiss.IndexIVFPQ(
+                    quantizer,
+                    dimension,
+                    nlist,
+                    self._choose_pq_m(dimension, faiss_settings.pq_m),
+                    faiss_settings.pq_nbits,
+                    metric,
+                )
+            else:
+                base_index = faiss.IndexIVFFlat(quantizer, dimension, nlist, metric)
+            # Train on a bounded random sample of the stored vectors
+            max_train = nlist * faiss_settings.ivf_max_train_points_per_list
+            sample = training_vectors
+            if len(sample) > max_train:
+                rng = np.random.default_rng(0)
+                sample = sample[rng.choice(len(sample), size=max_train, replace=False)]
+            base_index.train(np.ascontiguousarray(sample, dtype=np.float32))
+        else:
+            raise ValueError(f"Unsupported FAISS index type: {index_type}")
+        
+        # The FAISS Python wrappers keep references to the quantizer and the
+        # wrapped index, so they are not garbage collected underneath us
+        return faiss.IndexIDMap2(base_index)
+    
+    def _extract_vectors(self, index: any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract all (id, vector) pairs stored in an ID-mapped index.
+        
+        Args:
+            index: IndexIDMap/IndexIDMap2
+            
+        Returns:
+            tuple: (ids int64 array, vectors float32 array)
+        """
+        import faiss
+        
+        base = self._base_index(index)
+        ids = faiss.vector_to_array(index.id_map).astype(np.int64)
+        if base.ntotal == 0:
+            return ids, np.empty((0, index.d), dtype=np.float32)
+        if isinstance(base, faiss.IndexIVF):
+            base.make_direct_map()
+        vectors = base.reconstruct_n(0, base.ntotal)
+        return ids, vectors
+    
+    def _live_vectors(self, tenant_id: UUID, index: any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract a tenant's live vectors from its index and delta.
+        
+        Keeps only the newest vector of a re-added ID and drops tombstoned IDs.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Tenant's ID-mapped index (the base, if the tenant has a delta)
+            
+        Returns:
+            tuple: (ids int64 array, vectors float32 array)
+        """
+        ids, vectors = self._extract_vectors(index)
+        delta = self._deltas.get(tenant_id)
+        if delta is not None and delta.ntotal > 0:
+            delta_ids, delta_vectors = self._extract_vectors(delta)
+            ids = np.concatenate([ids, delta_ids])
+            vectors = np.vstack([vectors, delta_vectors])
+        if len(ids) == 0:
+            return ids, vectors
+        
+        _, last_positions = np.unique(ids[::-1], return_index=True)
+        keep = np.sort(len(ids) - 1 - last_positions)
+        ids, vectors = ids[keep], vectors[keep]
+        
+        tombstones = self._get_tombstones(tenant_id)
+        if tombstones:
+            live = ~np.isin(ids, np.fromiter(tombstones, dtype=np.int64, count=len(tombstones)))
+            ids, vectors = ids[live], vectors[live]
+        return ids, vectors
+    
+    def _migrate_index(
+        self,
+        tenant_id: UUID,
+        index: any,
+        index_type: str,
+        live: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> any:
+        """
+        Migrate a tenant's vectors into a new index of the given type.
+        
+        Trains the new index on a sample of the live vectors, re-adds them
+        under their existing IDs, swaps it into the cache and persists it with
+        the tenant's search parameters. Tombstoned vectors are left out.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Current ID-mapped index (the base, if the tenant has a delta)
+            index_type: Target canonical index type
+            live: Optional (ids, vectors) to store instead of the index's live
+                vectors, e.g. the live vectors after a dimensionality reduction
+            
+        Returns:
+            The new FAISS index
+        """
+        start_time = time.monotonic()
+        ids, vectors = live if live is not None else self._live_vectors(tenant_id, index)
+        new_index = self._build_index(
+            index_type,
+            vectors.shape[1],
+            training_vectors=vectors,
+            metric=index.metric_type,
+        )
+        if len(ids) > 0:
+            new_index.add_with_ids(vectors, ids)
+        id_map = self._get_id_map(tenant_id)
+        self._id_maps[tenant_id] = {
+            faiss_id: id_map[faiss_id] for faiss_id in ids.tolist() if faiss_id in id_map
+        }
+        
+        # Persist the tuned search parameters alongside the index
+        self.get_tenant_index_config(tenant_id)
+        params = self._index_params[tenant_id]
+        params.setdefault("nprobe", faiss_settings.ivf_nprobe)
+        params.setdefault("ef_search", faiss_settings.hnsw_ef_search)
+        base = self._base_index(new_index)
+        if index_type in IVF_INDEX_TYPES:
+            params["nlist"] = int(base.nlist)
+        else:
+            params.pop("nlist", None)
+        self._save_index_params(tenant_id)
+        new_index = self._publish_index(tenant_id, new_index)
+        
+        logger.info(
+            "FAISS index migrated for tenant",
+            tenant_id=str(tenant_id),
+            from_index_type=self._current_index_type(index),
+            to_index_type=index_type,
+            ntotal=int(new_index.ntotal),
+            duration_ms=round((time.monotonic() - start_time) * 1000, 1),
+        )
+        
+        return new_index
+    
+    def _maybe_upgrade_index(self, tenant_id: UUID, index: any) -> any:
+        """
+        Migrate a tenant's index if its size calls for a different index type.
+        
+        Never migrates an approximate index back to Flat.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Current FAISS index
+            
+        Returns:
+            The (possibly new) FAISS index
+        """
+        import faiss
+        
+        if not isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+            return index
+        
+        current_type = self._current_index_type(index)
+        target_type = self._target_index_type(tenant_id, int(index.ntotal))
+        if current_type == target_type or target_type in FLAT_INDEX_TYPES:
+            return index
+        
+        return self._migrate_index(tenant_id, index, target_type)
+    
+    def optimize_index(self, tenant_id: UUID, retrain: bool = False) -> Optional[any]:
+        """
+        Move a tenant's index to the type its configuration and size call for.
+        
+        Args:
+            tenant_id: Tenant ID
+            retrain: If True, rebuild an approximate index even if its type is
+                unchanged (re-sizes IVF lists to the current corpus)
+            
+        Returns:
+            The tenant's FAISS index, or None if it does not exist
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        # Validate tenant access
+        self.validate_tenant_access(tenant_id)
+        
+        with self._writer_lock(tenant_id):
+            index = self.get_index(tenant_id, create_if_missing=False)
+            if index is None:
+                return None
+            
+            # Fold buffered writes in and drop deleted vectors first
+            index = self._compact(tenant_id)
+            
+            if retrain:
+                target_type = self._target_index_type(tenant_id, int(index.ntotal))
+                if target_type in APPROXIMATE_INDEX_TYPES:
+                    return self._migrate_index(tenant_id, index, target_type)
+                return index
+            
+            return self._maybe_upgrade_index(tenant_id, index)
+    
+    def _score_metric(self, index: any) -> Optional[str]:
+        """
+        Get the metric used to convert raw search scores to similarities.
+        
+        Args:
+            index: FAISS index
+            
+        Returns:
+            "L2", "IP", or None if scores are used as-is
+        """
+        import faiss
+        
+        if isinstance(index, faiss.Index):
+            return "IP" if index.metric_type == faiss.METRIC_INNER_PRODUCT else "L2"
+        return {"IndexFlatL2": "L2", "IndexFlatIP": "IP"}.get(self.index_type)
+    
+    def _get_search_params(
+        self,
+        tenant_id: UUID,
+        index: any,
+        k: int,
+        search_effort: Optional[float] = None,
+        selector: Optional[any] = None,
+    ) -> Optional[any]:
+        """
+        Build per-query FAISS search parameters.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: FAISS index
+            k: Number of results requested
+            search_effort: Recall/latency multiplier applied to the tenant's
+                nprobe/efSearch (higher = better recall, slower)
+            selector: Optional IDSelector restricting which IDs can be returned
+            
+        Returns:
+            SearchParametersIVF/SearchParametersHNSW for approximate indices,
+            SearchParameters for exact indices with a selector, otherwise None
+        """
+        import faiss
+        
+        if not isinstance(index, faiss.Index):
+            return None
+        
+        base = self._base_index(index)
+        if not isinstance(base, (faiss.IndexIVF, faiss.IndexHNSW)):
+            return faiss.SearchParameters(sel=selector) if selector is not None else None
+        
+        config = self.get_tenant_index_config(tenant_id)
+        effort = search_effort if search_effort is not None else self.search_effort
+        
+        if isinstance(base, faiss.IndexIVF):
+            nprobe = max(1, min(int(base.nlist), int(round(config["nprobe"] * effort))))
+            return faiss.SearchParametersIVF(nprobe=nprobe, sel=selector)
+        
+        ef_search = max(k, int(round(config["ef_search"] * effort)))
+        return faiss.SearchParametersHNSW(efSearch=ef_search, sel=selector)
+    
+    def load_index(self, tenant_id: UUID) -> Optional[any]:
+        """
+        Load a tenant's FAISS index from disk.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            FAISS index object or None if not found
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        # Validate tenant access
+        self.validate_tenant_access(tenant_id)
+        
+        # Serve from cache, or load once even if many requests miss concurrently
+        return self._indices.get_or_load(tenant_id, lambda: self._read_index(tenant_id))
+    
+    def _read_index(self, tenant_id: UUID) -> Optional[any]:
+        """
+        Read a tenant's FAISS index and ID map from disk.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            FAISS index object or None if not found
+        """
+        # Import FAISS (lazy import)
+        try:
+            import faiss
+        except ImportError:
+            logger.warning("FAISS not installed, index loading will fail at runtime")
+            return None
+        
+        # Get index file path
+        index_file = self.get_tenant_index_path(tenant_id)
+        
+        if not index_file.exists():
+            logger.debug(
+                "FAISS index file not found for tenant",
+                tenant_id=str(tenant_id),
+                index_file=str(index_file),
+            )
+            return None
+        
+        # Files written after this point are picked up on the next writer lock
+        self._disk_signatures[tenant_id] = self._disk_signature(tenant_id)
+        
+        try:
+            # Load index from disk. Memory-mapped indices are shared through
+            # the page cache by every worker; writes go to a delta index.
+            index = None
+            if self.use_mmap:
+                index = self._read_mmapped_index(index_file)
+                if not isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+                    # Legacy positional indices cannot be merged with a delta
+                    index = None
+            if index is None:
+                index = faiss.read_index(str(index_file))
+            
+            # The cache stores the index once this returns. Vectors added
+            # after the last snapshot are replayed from the vector log.
+            self._id_maps[tenant_id] = self._load_id_map(tenant_id)
+            self._tombstones[tenant_id] = self._load_tombstones(tenant_id)
+            delta = self._load_delta(tenant_id, index)
+            is_id_mapped = isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2))
+            if self.use_mmap and is_id_mapped:
+                self._deltas[tenant_id] = delta if delta is not None else self._build_delta(index)
+                self._replay_vector_log(tenant_id, index, self._deltas[tenant_id])
+            else:
+                if delta is not None:
+                    # Memory mapping was turned off: fold the leftover delta
+                    # in. The next snapshot, taken under the writer lock,
+                    # writes the merged index and removes the delta file.
+                    ids, vectors = self._extract_vectors(delta)
+                    index.add_with_ids(vectors, ids)
+                    self._mark_dirty(tenant_id, len(ids))
+                if is_id_mapped:
+                    self._replay_vector_log(tenant_id, index, index)
+                tombstones = self._tombstones[tenant_id]
+                if tombstones and self._supports_remove(tenant_id, index):
+                    # Deleted after the last snapshot was written
+                    tombstone_ids = np.fromiter(tombstones, dtype=np.int64, count=len(tombstones))
+                    removed = index.remove_ids(faiss.IDSelectorBatch(tombstone_ids))
+                    if removed:
+                        self._mark_dirty(tenant_id, removed)
+            
+            logger.info(
+                "FAISS index loaded for tenant",
+                tenant_id=str(tenant_id),
+                index_file=str(index_file),
+                mmap=tenant_id in self._deltas,
+                delta_size=int(self._deltas[tenant_id].ntotal) if tenant_id in self._deltas else 0,
+            )
+            
+            return index
+        except Exception as e:
+            logger.error(
+                "Error loading FAISS index",
+                tenant_id=str(tenant_id),
+                index_file=str(index_file),
+                error=str(e),
+            )
+            return None
+    
+    @staticmethod
+    def _read_mmapped_index(index_file: Path) -> any:
+        """
+        Open an index file memory-mapped and read-only.
+        
+        Args:
+            index_file: Path to the .index file
+            
+        Returns:
+            FAISS index backed by the page cache
+        """
+        import faiss
+        
+        return faiss.read_index(str(index_file), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    
+    @staticmethod
+    def _build_delta(index: any) -> any:
+        """
+        Build an empty writable delta index matching a base index.
+        
+        Args:
+            index: Base FAISS index
+            
+        Returns:
+            IndexIDMap2 over a Flat index with the base index's dimension and metric
+        """
+        import faiss
+        
+        return faiss.IndexIDMap2(faiss.IndexFlat(index.d, index.metric_type))
+    
+    def _load_delta(self, tenant_id: UUID, index: any) -> Optional[any]:
+        """
+        Load a tenant's persisted delta index, if any.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Base FAISS index the delta belongs to
+            
+        Returns:
+            Delta index or None if no non-empty, compatible delta exists
+        """
+        import faiss
+        
+        delta_file = get_tenant_delta_path(tenant_id)
+        if not delta_file.exists():
+            return None
+        
+        delta = faiss.read_index(str(delta_file))
+        if delta.ntotal == 0:
+            return None
+        if delta.d != index.d:
+            logger.warning(
+                "Discarding FAISS delta index with mismatched dimension",
+                tenant_id=str(tenant_id),
+                delta_dimension=delta.d,
+                index_dimension=index.d,
+            )
+            delta_file.unlink(missing_ok=True)
+            return None
+        return delta
+    
+    def _write_index_file(self, index: any, index_file: Path) -> None:
+        """
+        Write an index to disk atomically.
+        
+        Writes to a temporary file and renames it over the target, so workers
+        that have the previous file memory-mapped keep reading the old inode
+        instead of a truncated file.
+        
+        Args:
+            index: FAISS index
+            index_file: Destination path
+        """
+        import faiss
+        
+        tmp_file = index_file.with_name(index_file.name + ".tmp")
+        faiss.write_index(index, str(tmp_file))
+        os.replace(tmp_file, index_file)
+    
+    def _vector_log(self, tenant_id: UUID) -> VectorLog:
+        """Get the append-only vector log for a tenant."""
+        return VectorLog(get_tenant_vector_log_path(tenant_id), fsync=faiss_settings.vector_log_fsync)
+    
+    def _clear_vector_log(self, tenant_id: UUID) -> None:
+        """Discard a tenant's vector log once a snapshot holds all its vectors."""
+        self._vector_log(tenant_id).clear()
+        self._dirty.pop(tenant_id, None)
+    
+    def _replay_vector_log(self, tenant_id: UUID, index: any, target: any) -> int:
+        """
+        Re-add vectors logged after the last snapshot.
+        
+        Only the newest record of each ID is replayed. IDs already in the
+        index (snapshot written but log not yet cleared) and tombstoned IDs
+        are skipped.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Loaded base index
+            target: Index receiving the replayed vectors (the base or its delta)
+            
+        Returns:
+            int: Number of log records
+        """
+        import faiss
+        
+        faiss_ids, document_ids, vectors = self._vector_log(tenant_id).read(index.d)
+        if len(faiss_ids) == 0:
+            return 0
+        
+        skip_ids = set(faiss.vector_to_array(index.id_map).tolist())
+        if target is not index:
+            skip_ids.update(faiss.vector_to_array(target.id_map).tolist())
+        skip_ids.update(self._get_tombstones(tenant_id))
+        _, last_positions = np.unique(faiss_ids[::-1], return_index=True)
+        missing = np.zeros(len(faiss_ids), dtype=bool)
+        missing[len(faiss_ids) - 1 - last_positions] = True
+        missing &= np.array([faiss_id not in skip_ids for faiss_id in faiss_ids.tolist()], dtype=bool)
+        if missing.any():
+            target.add_with_ids(vectors[missing], faiss_ids[missing])
+        self._id_maps.setdefault(tenant_id, {}).update(zip(faiss_ids.tolist(), document_ids))
+        
+        # Still not part of a snapshot
+        self._dirty[tenant_id] = [len(faiss_ids), time.monotonic()]
+        self._ensure_maintenance_thread()
+        
+        logger.info(
+            "FAISS vector log replayed",
+            tenant_id=str(tenant_id),
+            log_records=len(faiss_ids),
+            replayed=int(missing.sum()),
+        )
+        return len(faiss_ids)
+    
+    def _writer_lock(self, tenant_id: UUID) -> _TenantWriterLock:
+        """Get the lock serializing index mutations for a tenant across threads and processes."""
+        with self._writer_state_lock:
+            lock = self._writer_locks.get(tenant_id)
+            if lock is None:
+                lock = self._writer_locks[tenant_id] = _TenantWriterLock(
+                    get_tenant_lock_path(tenant_id),
+                    on_acquire=lambda: self._sync_with_disk(tenant_id),
+                    on_release=lambda: self._record_disk_signature(tenant_id),
+                )
+            return lock
+    
+    @staticmethod
+    def _disk_signature(tenant_id: UUID) -> tuple:
+        """Stat signature of the tenant files other processes write."""
+        signature = []
+        for path in (
+            get_tenant_index_path(tenant_id),
+            get_tenant_delta_path(tenant_id),
+            get_tenant_vector_log_path(tenant_id),
+            get_tenant_id_map_path(tenant_id),
+            get_tenant_tombstones_path(tenant_id),
+            get_tenant_attributes_path(tenant_id),
+        ):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def _record_disk_signature(self, tenant_id: UUID) -> None:
+        """Remember the tenant's files as this process left them."""
+        if tenant_id in self._indices:
+            self._disk_signatures[tenant_id] = self._disk_signature(tenant_id)
+    
+    def _sync_with_disk(self, tenant_id: UUID) -> None:
+        """
+        Reload a resident tenant if another process wrote its files.
+        
+        Called on taking the writer lock. Without it, a snapshot written
+        from this process's stale index would overwrite the other process's
+        snapshot and clear a vector log holding records this process never
+        loaded.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        expected = self._disk_signatures.get(tenant_id)
+        if expected is None or tenant_id not in self._indices:
+            return
+        if self._disk_signature(tenant_id) != expected:
+            logger.info(
+                "FAISS index files changed by another process, reloading",
+                tenant_id=str(tenant_id),
+            )
+            self.unload_index(tenant_id)
+    
+    def _mark_dirty(self, tenant_id: UUID, count: int) -> None:
+        """Record vectors that are logged but not yet part of a snapshot."""
+        state = self._dirty.setdefault(tenant_id, [0, time.monotonic()])
+        state[0] += count
+        self._ensure_maintenance_thread()
+    
+    def _snapshot_due(self, tenant_id: UUID, now: Optional[float] = None) -> bool:
+        """Check the snapshot size/time policy for a tenant."""
+        state = self._dirty.get(tenant_id)
+        if state is None:
+            return False
+        if state[0] >= faiss_settings.snapshot_max_pending_vectors:
+            return True
+        interval = faiss_settings.snapshot_interval_seconds
+        return interval > 0 and (now if now is not None else time.monotonic()) - state[1] >= interval
+    
+    def _snapshot(self, tenant_id: UUID) -> None:
+        """
+        Write a tenant's in-memory index to disk and clear its vector log.
+        
+        Only the writable part is written: the delta for memory-mapped
+        indices, the whole index otherwise. The caller must hold the tenant's
+        writer lock; searches are not blocked.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        index = self._indices.get(tenant_id)
+        if index is None:
+            # Evicted: the vector log keeps the vectors until the next load
+            return
+        
+        start_time = time.monotonic()
+        pending_vectors = self._dirty.get(tenant_id, [0])[0]
+        delta = self._deltas.get(tenant_id)
+        if delta is not None:
+            self._write_index_file(delta, get_tenant_delta_path(tenant_id))
+        else:
+            self._write_index_file(index, get_tenant_index_path(tenant_id))
+            # A delta left by memory-mapped loads is now part of the index
+            get_tenant_delta_path(tenant_id).unlink(missing_ok=True)
+        self._save_id_map(tenant_id)
+        self._clear_vector_log(tenant_id)
+        if self._supports_remove(tenant_id, index):
+            # Removed in place, and the snapshot no longer holds them
+            self._clear_tombstones(tenant_id)
+        else:
+            self._maybe_schedule_compaction(tenant_id, index)
+
+        logger.debug(
+            "FAISS index snapshot written",
+            tenant_id=str(tenant_id),
+            pending_vectors=pending_vectors,
+            delta=delta is not None,
+            duration_ms=round((time.monotonic() - start_time) * 1000, 1),
+        )
+    
+    def _ensure_maintenance_thread(self) -> None:
+        """Start the background thread applying the snapshot time policy and compactions."""
+        if faiss_settings.snapshot_interval_seconds <= 0 and not self._compaction_pending:
+            return
+        if self._maintenance_thread is not None and self._maintenance_thread.is_alive():
+            return
+        self._maintenance_stop.clear()
+        self._maintenance_thread = threading.Thread(
+            target=self._maintenance_loop, name="faiss-maintenance", daemon=True
+        )
+        self._maintenance_thread.start()
+    
+    def _maintenance_loop(self) -> None:
+        """Snapshot tenants past the snapshot interval and run scheduled compactions."""
+        interval = faiss_settings.snapshot_interval_seconds
+        while not self._maintenance_stop.wait(min(interval, 1.0) if interval > 0 else 1.0):
+            if interval > 0:
+                self._flush_dirty(due_only=True)
+            self._run_compactions()
+    
+    def _flush_dirty(self, due_only: bool) -> None:
+        """
+        Snapshot dirty tenants.
+        
+        Args:
+            due_only: Only snapshot tenants whose snapshot policy is due
+        """
+        now = time.monotonic()
+        for tenant_id in list(self._dirty):
+            if due_only and not self._snapshot_due(tenant_id, now):
+                continue
+            try:
+                with self._writer_lock(tenant_id):
+                    if tenant_id in self._dirty:
+                        self._snapshot(tenant_id)
+            except Exception as e:
+                logger.error(
+                    "Error writing FAISS index snapshot",
+                    tenant_id=str(tenant_id),
+                    error=str(e),
+                )
+    
+    def close(self) -> None:
+        """
+        Stop the background maintenance thread and snapshot every dirty tenant.
+        
+        Scheduled compactions are dropped; tombstones keep deleted vectors out
+        of search results until the next compaction.
+        
+        Called during application shutdown.
+        """
+        self._maintenance_stop.set()
+        if self._maintenance_thread is not None:
+            self._maintenance_thread.join(timeout=5)
+            self._maintenance_thread = None
+        self._compaction_pending.clear()
+        self._flush_dirty(due_only=False)
+    
+    def _publish_index(self, tenant_id: UUID, index: any) -> any:
+        """
+        Save a rebuilt tenant index and make it the cached index.
+        
+        With memory mapping enabled the saved file is reopened read-only and
+        paired with an empty delta, so this worker does not keep a private
+        copy of the full index.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Rebuilt FAISS index holding every live vector of the tenant
+            
+        Returns:
+            The FAISS index now cached for the tenant
+        """
+        self._save_index(tenant_id, index)
+        get_tenant_delta_path(tenant_id).unlink(missing_ok=True)
+        self._clear_vector_log(tenant_id)
+        self._clear_tombstones(tenant_id)
+
+        if self.use_mmap:
+            index = self._read_mmapped_index(self.get_tenant_index_path(tenant_id))
+            self._deltas[tenant_id] = self._build_delta(index)
+        else:
+            self._deltas.pop(tenant_id, None)
+        
+        self._indices[tenant_id] = index
+        return index
+    
+    def compact_index(self, tenant_id: UUID) -> Optional[any]:
+        """
+        Merge a tenant's delta into its base index and drop deleted vectors.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            The tenant's FAISS index, or None if it does not exist
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        # Validate tenant access
+        self.validate_tenant_access(tenant_id)
+        
+        with self._writer_lock(tenant_id):
+            if self.get_index(tenant_id, create_if_missing=False) is None:
+                return None
+            return self._compact(tenant_id)
+    
+    def _compact(self, tenant_id: UUID) -> Optional[any]:
+        """
+        Compact a resident tenant index. Caller holds the writer lock.
+        
+        A memory-mapped base without tombstones is compacted incrementally:
+        a private writable copy of it takes the delta vectors. Otherwise the
+        index is rebuilt from its live vectors, keeping its type unless its
+        size calls for a bigger one or too few vectors remain to train it.
+        Either way the result is republished (memory-mapped with an empty
+        delta when use_mmap is enabled) and the tenant's tombstones cleared.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            The tenant's FAISS index, or None if it is not resident
+        """
+        import faiss
+        
+        index = self._indices.get(tenant_id)
+        if not isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+            return index
+        
+        delta = self._deltas.get(tenant_id)
+        delta_size = int(delta.ntotal) if delta is not None else 0
+        tombstones = self._hidden_tombstone_count(tenant_id, index)
+        if delta_size == 0 and tombstones == 0:
+            return index
+        
+        start_time = time.monotonic()
+        live_count = max(0, int(index.ntotal) + delta_size - tombstones)
+        current_type = self._current_index_type(index)
+        target_type = self._target_index_type(tenant_id, live_count)
+        if target_type in FLAT_INDEX_TYPES and current_type in APPROXIMATE_INDEX_TYPES:
+            # Never move back to Flat while the current type can still be built
+            if live_count > 0 and live_count >= self._min_train_size(
+                current_type, self._choose_nlist(live_count)
+            ):
+                target_type = current_type
+        
+        if tombstones == 0 and target_type == current_type:
+            merged = faiss.read_index(str(self.get_tenant_index_path(tenant_id)))
+            ids, vectors = self._extract_vectors(delta)
+            if isinstance(self._base_index(merged), faiss.IndexFlat):
+                # Re-added documents replace their previous vector
+                merged.remove_ids(faiss.IDSelectorBatch(ids))
+            merged.add_with_ids(vectors, ids)
+            index = self._publish_index(tenant_id, merged)
+        else:
+            index = self._migrate_index(tenant_id, index, target_type)
+        
+        logger.info(
+            "FAISS index compacted for tenant",
+            tenant_id=str(tenant_id),
+            delta_size=delta_size,
+            tombstones=tombstones,
+            ntotal=int(index.ntotal),
+            duration_ms=round((time.monotonic() - start_time) * 1000, 1),
+        )
+        
+        return index
+    
+    def _maybe_schedule_compaction(self, tenant_id: UUID, index: any) -> None:
+        """
+        Schedule a background rebuild once too much of an index is tombstoned.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Resident FAISS index
+        """
+        ratio = faiss_settings.tombstone_compaction_ratio
+        tombstones = self._hidden_tombstone_count(tenant_id, index)
+        if ratio <= 0 or tombstones == 0:
+            return
+        
+        delta = self._deltas.get(tenant_id)
+        stored = int(index.ntotal) + (int(delta.ntotal) if delta is not None else 0)
+        if tombstones >= ratio * max(stored, 1):
+            self._compaction_pending.add(tenant_id)
+            self._ensure_maintenance_thread()
+    
+    def _run_compactions(self) -> None:
+        """Compact every tenant scheduled by _maybe_schedule_compaction."""
+        for tenant_id in list(self._compaction_pending):
+            self._compaction_pending.discard(tenant_id)
+            try:
+                with self._writer_lock(tenant_id):
+                    self._compact(tenant_id)
+            except Exception as e:
+                logger.error(
+                    "Error compacting FAISS index",
+                    tenant_id=str(tenant_id),
+                    error=str(e),
+                )
+    
+    def get_index_size(self, tenant_id: UUID) -> int:
+        """
+        Get the number of vectors in a tenant's index, including its delta.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            int: Vector count (0 if the index does not exist)
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        index = self.get_index(tenant_id, create_if_missing=False)
+        if index is None:
+            return 0
+        delta = self._deltas.get(tenant_id)
+        return int(index.ntotal) + (int(delta.ntotal) if delta is not None else 0)
+    
+    def unload_index(self, tenant_id: UUID) -> None:
+        """
+        Drop a tenant's index and related state from this worker's memory.
+        
+        The next access reloads everything from disk.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        index = self._indices.pop(tenant_id, None)
+        self._on_index_evicted(tenant_id, index)
+    
+    def save_index(self, tenant_id: UUID, index: any) -> None:
+        """
+        Save a tenant's FAISS index to disk.
+        
+        Writes a full snapshot and clears the tenant's vector log, unless the
+        index is memory-mapped with a delta (whose vectors stay logged).
+        
+        Args:
+            tenant_id: Tenant ID
+            index: FAISS index object
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        # Validate tenant access
+        self.validate_tenant_access(tenant_id)
+        
+        self._save_index(tenant_id, index)
+    
+    def _save_index(self, tenant_id: UUID, index: any) -> None:
+        """
+        Save a tenant's FAISS index to disk without a tenant access check.
+        
+        Used by save_index() and by background maintenance, which runs
+        outside any request's tenant context.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: FAISS index object
+        """
+        # Get index file path
+        index_file = self.get_tenant_index_path(tenant_id)
+        
+        try:
+            # Import FAISS (lazy import)
+            import faiss
+            
+            # Save index to disk
+            self._write_index_file(index, index_file)
+            self._save_id_map(tenant_id)
+            if tenant_id not in self._deltas:
+                self._clear_vector_log(tenant_id)
+                if self._supports_remove(tenant_id, index):
+                    self._clear_tombstones(tenant_id)
             
             logger.info(
                 "FAISS index saved for tenant",
@@ -368,6 +1979,442 @@ class FAISSIndexManager:
             )
             raise
     
+    def _on_index_evicted(self, tenant_id: UUID, index: any) -> None:
+        """
+        Drop per-tenant state held alongside an index evicted from the cache.
+        
+        Every added vector is in the vector log, so nothing needs flushing
+        here; the next load replays the log on top of the last snapshot.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Evicted FAISS index
+        """
+        self._id_maps.pop(tenant_id, None)
+        self._deltas.pop(tenant_id, None)
+        self._dirty.pop(tenant_id, None)
+        self._disk_signatures.pop(tenant_id, None)
+        self._tombstones.pop(tenant_id, None)
+        self._tombstone_selectors.pop(tenant_id, None)
+        self._attribute_stores.pop(tenant_id, None)
+        self._reducers.pop(tenant_id, None)
+        self._compaction_pending.discard(tenant_id)
+    
+    def _estimate_resident_bytes(self, tenant_id: UUID, index: any) -> int:
+        """
+        Estimate the private memory a cached tenant index costs this worker.
+        
+        Memory-mapped base indices live in the shared page cache, so only the
+        writable delta and the ID map are counted for them.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Cached FAISS index
+            
+        Returns:
+            int: Estimated size in bytes
+        """
+        delta = self._deltas.get(tenant_id)
+        index_bytes = estimate_index_bytes(delta if delta is not None else index)
+        return index_bytes + len(self._id_maps.get(tenant_id, ())) * ID_MAP_ENTRY_BYTES
+    
+    def _get_id_map(self, tenant_id: UUID) -> dict[int, UUID]:
+        """
+        Get a tenant's in-memory ID map, reloading it from disk if it was dropped.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            dict: Mutable mapping of FAISS vector ID to document ID
+        """
+        if tenant_id not in self._id_maps:
+            self._id_maps[tenant_id] = self._load_id_map(tenant_id)
+        return self._id_maps[tenant_id]
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get loaded index cache statistics.
+        
+        Returns:
+            dict: Hit/miss/eviction/load counters and memory usage
+        """
+        return self._indices.stats()
+    
+    def pin_tenant(self, tenant_id: UUID) -> None:
+        """
+        Keep a tenant's index resident regardless of the cache memory budget.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        self._indices.pin(tenant_id)
+    
+    def unpin_tenant(self, tenant_id: UUID) -> None:
+        """
+        Allow a pinned tenant's index to be evicted again.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        self._indices.unpin(tenant_id)
+    
+    def _load_id_map(self, tenant_id: UUID) -> dict[int, UUID]:
+        """
+        Load a tenant's FAISS ID map sidecar from disk.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            dict: Mapping of FAISS vector ID to document ID (empty if no sidecar exists)
+        """
+        id_map_file = get_tenant_id_map_path(tenant_id)
+        if not id_map_file.exists():
+            return {}
+        
+        try:
+            with open(id_map_file, "r", encoding="utf-8") as f:
+                raw_map = json.load(f)
+            return {int(faiss_id): UUID(document_id) for faiss_id, document_id in raw_map.items()}
+        except Exception as e:
+            logger.error(
+                "Error loading FAISS ID map",
+                tenant_id=str(tenant_id),
+                id_map_file=str(id_map_file),
+                error=str(e),
+            )
+            return {}
+    
+    def _save_id_map(self, tenant_id: UUID) -> None:
+        """
+        Persist a tenant's FAISS ID map sidecar next to the index file.
+        
+        Writes to a temporary file and renames it so readers never observe a
+        partially written map.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        id_map = self._id_maps.get(tenant_id, {})
+        id_map_file = get_tenant_id_map_path(tenant_id)
+        tmp_file = id_map_file.with_name(id_map_file.name + ".tmp")
+        
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({str(faiss_id): str(document_id) for faiss_id, document_id in id_map.items()}, f)
+        os.replace(tmp_file, id_map_file)
+    
+    def _load_tombstones(self, tenant_id: UUID) -> set[int]:
+        """
+        Load a tenant's tombstones sidecar from disk.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            set: Tombstoned FAISS IDs (empty if no sidecar exists)
+        """
+        tombstones_file = get_tenant_tombstones_path(tenant_id)
+        if not tombstones_file.exists():
+            return set()
+        
+        try:
+            with open(tombstones_file, "r", encoding="utf-8") as f:
+                return {int(faiss_id) for faiss_id in json.load(f)}
+        except Exception as e:
+            logger.error(
+                "Error loading FAISS tombstones",
+                tenant_id=str(tenant_id),
+                tombstones_file=str(tombstones_file),
+                error=str(e),
+            )
+            return set()
+    
+    def _get_tombstones(self, tenant_id: UUID) -> set[int]:
+        """
+        Get a tenant's tombstoned FAISS IDs, loading them from disk if needed.
+        
+        The returned set is never mutated; _set_tombstones() replaces it, so
+        concurrent searches can use it without locking.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            set: Tombstoned FAISS IDs
+        """
+        tombstones = self._tombstones.get(tenant_id)
+        if tombstones is None:
+            tombstones = self._tombstones[tenant_id] = self._load_tombstones(tenant_id)
+        return tombstones
+    
+    def _set_tombstones(self, tenant_id: UUID, tombstones: set[int]) -> None:
+        """
+        Replace and persist a tenant's tombstones. Caller holds the writer lock.
+        
+        Args:
+            tenant_id: Tenant ID
+            tombstones: New set of tombstoned FAISS IDs
+        """
+        tombstones_file = get_tenant_tombstones_path(tenant_id)
+        if tombstones:
+            tmp_file = tombstones_file.with_name(tombstones_file.name + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(sorted(tombstones), f)
+            os.replace(tmp_file, tombstones_file)
+        else:
+            tombstones_file.unlink(missing_ok=True)
+        self._tombstones[tenant_id] = tombstones
+    
+    def _clear_tombstones(self, tenant_id: UUID) -> None:
+        """Discard a tenant's tombstones once no stored vector needs hiding."""
+        if self._get_tombstones(tenant_id):
+            self._set_tombstones(tenant_id, set())
+    
+    def _tombstone_selector(self, tenant_id: UUID) -> Optional[any]:
+        """
+        Get an IDSelector that excludes a tenant's tombstoned IDs.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            faiss.IDSelectorNot over an IDSelectorBatch, or None without tombstones
+        """
+        tombstones = self._get_tombstones(tenant_id)
+        if not tombstones:
+            return None
+        
+        cached = self._tombstone_selectors.get(tenant_id)
+        if cached is not None and cached[0] is tombstones:
+            return cached[1]
+        
+        import faiss
+        
+        ids = np.fromiter(tombstones, dtype=np.int64, count=len(tombstones))
+        selector = faiss.IDSelectorNot(faiss.IDSelectorBatch(ids))
+        self._tombstone_selectors[tenant_id] = (tombstones, selector)
+        return selector
+    
+    def _supports_remove(self, tenant_id: UUID, index: any) -> bool:
+        """
+        Check whether vectors can be removed from a tenant's index in place.
+        
+        Only in-memory Flat indices qualify: memory-mapped bases are
+        read-only, HNSW does not implement remove_ids, and IndexIDMap2 over
+        IVF would mis-map IDs after IVF removes entries without renumbering.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Tenant's FAISS index
+            
+        Returns:
+            bool: True if remove_ids can be used on the index
+        """
+        import faiss
+        
+        return (
+            tenant_id not in self._deltas
+            and isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2))
+            and isinstance(self._base_index(index), faiss.IndexFlat)
+        )
+    
+    def _hidden_tombstone_count(self, tenant_id: UUID, index: any) -> int:
+        """
+        Count tombstoned vectors still stored in a tenant's index.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: Tenant's FAISS index
+            
+        Returns:
+            int: Number of deleted vectors excluded only at search time
+        """
+        tombstones = self._get_tombstones(tenant_id)
+        if not tombstones or self._supports_remove(tenant_id, index):
+            return 0
+        return len(tombstones)
+    
+    def _get_attribute_store(self, tenant_id: UUID) -> AttributeStore:
+        """
+        Get a tenant's attribute store, loading it from disk if needed.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            AttributeStore: Type, tag and day postings of the tenant's FAISS IDs
+        """
+        attribute_store = self._attribute_stores.get(tenant_id)
+        if attribute_store is None:
+            self._ensure_index_path()
+            attribute_store = AttributeStore(
+                get_tenant_attributes_path(tenant_id),
+                fsync=faiss_settings.vector_log_fsync,
+            ).load()
+            attribute_store = self._attribute_stores.setdefault(tenant_id, attribute_store)
+        return attribute_store
+    
+    def has_complete_attributes(self, tenant_id: UUID) -> bool:
+        """
+        Check whether every vector in a tenant's index has filterable attributes.
+        
+        Indices created before attributes were recorded need a one-time
+        backfill (set_document_attributes(..., complete=True)) before
+        filtered searches can see their older documents.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            bool: True if filtered searches cover the whole index
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        self.validate_tenant_access(tenant_id)
+        return self._get_attribute_store(tenant_id).complete
+    
+    def get_unattributed_faiss_ids(self, tenant_id: UUID) -> List[int]:
+        """
+        List the live FAISS IDs of a tenant that have no filterable attributes.
+        
+        Args:
+            tenant_id: Tenant ID
+            
+        Returns:
+            list: FAISS IDs to backfill
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        self.validate_tenant_access(tenant_id)
+        attribute_store = self._get_attribute_store(tenant_id)
+        tombstones = self._get_tombstones(tenant_id)
+        return [
+            faiss_id
+            for faiss_id in list(self._get_id_map(tenant_id))
+            if faiss_id not in attribute_store and faiss_id not in tombstones
+        ]
+    
+    def set_document_attributes(
+        self,
+        tenant_id: UUID,
+        faiss_ids: List[int],
+        attributes: List[Dict[str, Any]],
+        complete: bool = False,
+    ) -> None:
+        """
+        Record the filterable attributes of already indexed vectors.
+        
+        Args:
+            tenant_id: Tenant ID
+            faiss_ids: FAISS IDs
+            attributes: One document_attributes() dict per FAISS ID
+            complete: Mark every vector of the tenant as covered (end of a backfill)
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        self.validate_tenant_access(tenant_id)
+        
+        with self._writer_lock(tenant_id):
+            self._get_attribute_store(tenant_id).put(faiss_ids, attributes, complete=complete)
+        
+        logger.info(
+            "FAISS filter attributes recorded",
+            tenant_id=str(tenant_id),
+            vector_count=len(faiss_ids),
+            complete=complete,
+        )
+    
+    def filter_faiss_ids(
+        self,
+        tenant_id: UUID,
+        faiss_ids: Iterable[int],
+        filters: Optional[Dict[str, Any]],
+    ) -> List[int]:
+        """
+        Keep the FAISS IDs whose document attributes satisfy search filters.
+        
+        Lets results from other retrievers (e.g. keyword search) be filtered
+        with the same in-memory postings as vector search.
+        
+        Args:
+            tenant_id: Tenant ID
+            faiss_ids: Candidate FAISS IDs
+            filters: Search filters (document_type, tags, date_from, date_to)
+            
+        Returns:
+            list: Matching FAISS IDs, in input order
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        self.validate_tenant_access(tenant_id)
+        return self._get_attribute_store(tenant_id).filter(faiss_ids, filters)
+    
+    def _search_selector(
+        self,
+        tenant_id: UUID,
+        filters: Optional[Dict[str, Any]],
+    ) -> Tuple[Optional[any], Optional[int]]:
+        """
+        Build the IDSelector restricting a search to live vectors matching filters.
+        
+        Without attribute filters this is the tombstone selector. With them,
+        the allowed IDs are resolved from the attribute postings, tombstones
+        subtracted, and only those IDs are searchable.
+        
+        Args:
+            tenant_id: Tenant ID
+            filters: Search filters (document_type, tags, date_from, date_to)
+            
+        Returns:
+            tuple: (selector or None, number of allowed IDs or None if unfiltered)
+        """
+        allowed = self._get_attribute_store(tenant_id).match(filters)
+        if allowed is None:
+            return self._tombstone_selector(tenant_id), None
+        
+        import faiss
+        
+        allowed -= self._get_tombstones(tenant_id)
+        ids = np.fromiter(allowed, dtype=np.int64, count=len(allowed))
+        return faiss.IDSelectorBatch(ids), len(allowed)
+    
+    def resolve_document_ids(
+        self,
+        tenant_id: UUID,
+        faiss_ids: Iterable[int],
+    ) -> Dict[int, UUID]:
+        """
+        Resolve FAISS vector IDs to document IDs using the tenant's ID map.
+        
+        Each lookup is O(1) and independent of the worker process, since IDs
+        are derived deterministically and the map is persisted with the index.
+        
+        Args:
+            tenant_id: Tenant ID
+            faiss_ids: FAISS vector IDs returned by search
+            
+        Returns:
+            dict: Mapping of FAISS ID to document ID for every ID that could be resolved
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        # Validate tenant access
+        self.validate_tenant_access(tenant_id)
+        
+        id_map = self._get_id_map(tenant_id)
+        
+        return {
+            faiss_id: id_map[faiss_id]
+            for faiss_id in faiss_ids
+            if faiss_id in id_map
+        }
+    
     def get_index(self, tenant_id: UUID, create_if_missing: bool = False, dimension: Optional[int] = None) -> Optional[any]:
         """
         Get a tenant's FAISS index, loading from disk if needed.
@@ -408,34 +2455,40 @@ class FAISSIndexManager:
         # Validate tenant access
         self.validate_tenant_access(tenant_id)
         
-        # Remove from cache
-        if tenant_id in self._indices:
-            del self._indices[tenant_id]
-        
-        # Delete index file
-        index_file = self.get_tenant_index_path(tenant_id)
-        if index_file.exists():
-            try:
-                index_file.unlink()
-                logger.info(
-                    "FAISS index deleted for tenant",
-                    tenant_id=str(tenant_id),
-                    index_file=str(index_file),
-                )
-            except Exception as e:
-                logger.error(
-                    "Error deleting FAISS index",
-                    tenant_id=str(tenant_id),
-                    index_file=str(index_file),
-                    error=str(e),
-                )
-                raise
+        with self._writer_lock(tenant_id):
+            # Remove from cache
+            self.unload_index(tenant_id)
+            
+            # Delete index file, its delta, vector log, tombstones, attributes and ID map sidecar
+            index_file = self.get_tenant_index_path(tenant_id)
+            get_tenant_id_map_path(tenant_id).unlink(missing_ok=True)
+            get_tenant_delta_path(tenant_id).unlink(missing_ok=True)
+            get_tenant_tombstones_path(tenant_id).unlink(missing_ok=True)
+            get_tenant_attributes_path(tenant_id).unlink(missing_ok=True)
+            self._clear_vector_log(tenant_id)
+            if index_file.exists():
+                try:
+                    index_file.unlink()
+                    logger.info(
+                        "FAISS index deleted for tenant",
+                        tenant_id=str(tenant_id),
+                        index_file=str(index_file),
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Error deleting FAISS index",
+                        tenant_id=str(tenant_id),
+                        index_file=str(index_file),
+                        error=str(e),
+                    )
+                    raise
     
     def add_document(
         self,
         tenant_id: UUID,
         document_id: UUID,
         embedding: np.ndarray,
+        attributes: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Add a document embedding to the tenant's FAISS index.
@@ -444,6 +2497,53 @@ class FAISSIndexManager:
             tenant_id: Tenant ID
             document_id: Document UUID
             embedding: Embedding vector (numpy array)
+            attributes: Optional filterable attributes of the document
+                (see faiss_attribute_store.document_attributes)
+            
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+            ValueError: If embedding dimension doesn't match index dimension
+        """
+        self.add_documents(
+            tenant_id,
+            [document_id],
+            embedding.reshape(1, -1),
+            attributes=[attributes] if attributes is not None else None,
+        )
+    
+    def add_documents(
+        self,
+        tenant_id: UUID,
+        document_ids: List[UUID],
+        embeddings: np.ndarray,
+        attributes: Optional[List[Dict[str, Any]]] = None,
+        chunk_numbers: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Add a batch of document embeddings to the tenant's FAISS index.
+        
+        A document may be indexed as several chunk vectors: document_ids
+        then repeats the document's ID once per chunk and chunk_numbers gives
+        each vector's chunk number (see chunk_faiss_id). Chunks a previous
+        version of a document had beyond its new last chunk are removed.
+        
+        Each tenant has a single writer. Concurrent callers enqueue their
+        vectors and whichever caller holds the tenant's writer lock commits
+        everything pending with one add_with_ids call. Vectors are appended
+        to the tenant's vector log before they become searchable; the index
+        itself is only rewritten on the snapshot policy
+        (FAISS_SNAPSHOT_MAX_PENDING_VECTORS / FAISS_SNAPSHOT_INTERVAL_SECONDS).
+        
+        Args:
+            tenant_id: Tenant ID
+            document_ids: Document UUIDs, one per embedding
+            embeddings: Embedding vectors, shape (n, dimension)
+            attributes: Optional filterable attributes, one dict per embedding.
+                Recorded in the tenant's attribute postings so filtered
+                searches can select the documents inside FAISS.
+            chunk_numbers: Optional chunk number of each embedding. Every
+                chunk of a document must be in the same call. Defaults to
+                one vector (chunk 0) per document.
             
         Raises:
             TenantIsolationError: If tenant_id mismatch
@@ -452,7 +2552,29 @@ class FAISSIndexManager:
         # Validate tenant access
         self.validate_tenant_access(tenant_id)
         
-        embedding_dimension = embedding.shape[0]
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if len(document_ids) != embeddings.shape[0]:
+            raise ValueError(
+                f"Got {len(document_ids)} document IDs for {embeddings.shape[0]} embeddings"
+            )
+        if attributes is not None and len(attributes) != len(document_ids):
+            raise ValueError(
+                f"Got {len(attributes)} attribute sets for {len(document_ids)} document IDs"
+            )
+        if chunk_numbers is None:
+            chunk_numbers = [0] * len(document_ids)
+        elif len(chunk_numbers) != len(document_ids):
+            raise ValueError(
+                f"Got {len(chunk_numbers)} chunk numbers for {len(document_ids)} document IDs"
+            )
+        if not document_ids:
+            return
+        
+        # Store vectors in the tenant's reduced dimension, if it has one
+        embeddings = self._reduce_vectors(tenant_id, embeddings)
+        embedding_dimension = embeddings.shape[1]
         
         # Get or create index with the embedding's dimension
         index = self.get_index(tenant_id, create_if_missing=True, dimension=embedding_dimension)
@@ -462,16 +2584,19 @@ class FAISSIndexManager:
         
         # Check if existing index has wrong dimension - if so, recreate it
         if hasattr(index, 'd') and index.d != embedding_dimension:
-            logger.warning(
-                "FAISS index dimension mismatch, recreating index",
-                tenant_id=str(tenant_id),
-                existing_dimension=index.d,
-                required_dimension=embedding_dimension,
-            )
-            # Delete old index
-            self.delete_index(tenant_id)
-            # Create new index with correct dimension
-            index = self.create_index(tenant_id, dimension=embedding_dimension)
+            with self._writer_lock(tenant_id):
+                index = self.get_index(tenant_id, create_if_missing=True, dimension=embedding_dimension)
+                if hasattr(index, 'd') and index.d != embedding_dimension:
+                    logger.warning(
+                        "FAISS index dimension mismatch, recreating index",
+                        tenant_id=str(tenant_id),
+                        existing_dimension=index.d,
+                        required_dimension=embedding_dimension,
+                    )
+                    # Delete old index
+                    self.delete_index(tenant_id)
+                    # Create new index with correct dimension
+                    index = self.create_index(tenant_id, dimension=embedding_dimension)
         
         # Validate embedding dimension
         if hasattr(index, 'd') and index.d != embedding_dimension:
@@ -479,42 +2604,149 @@ class FAISSIndexManager:
                 f"Embedding dimension {embedding_dimension} doesn't match index dimension {index.d}"
             )
         
-        # Reshape embedding to 2D array (FAISS requires shape [1, dimension])
-        embedding_2d = embedding.reshape(1, -1).astype(np.float32)
+        pending = _PendingAdd(
+            list(document_ids),
+            list(chunk_numbers),
+            embeddings,
+            list(attributes) if attributes is not None else None,
+        )
+        with self._writer_state_lock:
+            self._pending.setdefault(tenant_id, []).append(pending)
         
-        # Add embedding to index
-        # IndexFlatL2 doesn't support add_with_ids, so we use add() instead
-        # In production, you might want to maintain a separate mapping of document_id -> FAISS position
-        import faiss
+        # Commit our batch, or find it already committed by the writer we waited for
+        self._drain_pending(tenant_id)
+        pending.future.result()
         
-        try:
-            # Check if index is wrapped with IndexIDMap (supports add_with_ids)
-            # IndexFlatL2 directly doesn't support add_with_ids
-            faiss_id = None
-            if isinstance(index, faiss.IndexIDMap) or (hasattr(index, 'id_map') and index.id_map is not None):
-                faiss_id = hash(str(document_id)) % (2**31)  # Convert to 32-bit signed integer
-                index.add_with_ids(embedding_2d, np.array([faiss_id], dtype=np.int64))
-            else:
-                # For IndexFlatL2, use add() without IDs
-                index.add(embedding_2d)
-            
-            # Save index to disk
-            self.save_index(tenant_id, index)
+        logger.info(
+            "Documents added to FAISS index",
+            tenant_id=str(tenant_id),
+            document_count=len(set(document_ids)),
+            vector_count=len(document_ids),
+            document_id=str(document_ids[0]) if len(set(document_ids)) == 1 else None,
+        )
+    
+    def _drain_pending(self, tenant_id: UUID) -> None:
+        """
+        Group-commit every pending add for a tenant.
+        
+        Resolves each pending add's future with the commit outcome.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        with self._writer_lock(tenant_id):
+            with self._writer_state_lock:
+                batch = self._pending.pop(tenant_id, [])
+            if not batch:
+                return
             
-            logger.info(
-                "Document added to FAISS index",
-                tenant_id=str(tenant_id),
-                document_id=str(document_id),
-                faiss_id=faiss_id,
-            )
-        except Exception as e:
-            logger.error(
-                "Error adding document to FAISS index",
+            try:
+                self._commit_pending(tenant_id, batch)
+            except Exception as e:
+                logger.error(
+                    "Error adding documents to FAISS index",
+                    tenant_id=str(tenant_id),
+                    document_count=sum(len(pending.document_ids) for pending in batch),
+                    error=str(e),
+                )
+                for pending in batch:
+                    pending.future.set_exception(e)
+            else:
+                for pending in batch:
+                    pending.future.set_result(None)
+    
+    def _commit_pending(self, tenant_id: UUID, batch: List[_PendingAdd]) -> None:
+        """
+        Log and add a batch of pending vectors. Caller holds the writer lock.
+        
+        Args:
+            tenant_id: Tenant ID
+            batch: Pending adds to commit
+        """
+        import faiss
+        
+        document_ids = [document_id for pending in batch for document_id in pending.document_ids]
+        vectors = np.ascontiguousarray(np.vstack([pending.embeddings for pending in batch]), dtype=np.float32)
+        index = self.get_index(tenant_id, create_if_missing=True, dimension=vectors.shape[1])
+        
+        # Indices created by this manager are wrapped in IndexIDMap2 and
+        # carry deterministic document-derived IDs. Legacy bare IndexFlat*
+        # indices on disk only support positional add().
+        if not (isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)) or (hasattr(index, 'id_map') and index.id_map is not None)):
+            logger.warning(
+                "FAISS index is not ID-mapped, document cannot be resolved by ID. "
+                "Rebuild the index to enable stable vector IDs.",
                 tenant_id=str(tenant_id),
-                document_id=str(document_id),
-                error=str(e),
+                document_count=len(document_ids),
             )
-            raise
+            index.add(vectors)
+            self.save_index(tenant_id, index)
+            return
+        
+        faiss_ids = np.array([faiss_id for pending in batch for faiss_id in pending.faiss_ids], dtype=np.int64)
+        
+        # Durable first, then visible to searches
+        self._vector_log(tenant_id).append(faiss_ids, document_ids, vectors)
+        
+        # Attributes go in before the vectors, so filtered searches never
+        # see a new vector without them
+        attributed = [
+            (faiss_id, attributes)
+            for pending in batch if pending.attributes is not None
+            for faiss_id, attributes in zip(pending.faiss_ids, pending.attributes)
+        ]
+        if attributed:
+            attributed_ids, attributes = zip(*attributed)
+            self._get_attribute_store(tenant_id).put(attributed_ids, attributes)
+        
+        # Memory-mapped bases are read-only: buffer in the delta instead
+        delta = self._deltas.get(tenant_id)
+        id_map = self._get_id_map(tenant_id)
+        
+        # Documents re-added with fewer chunks drop their trailing old chunks
+        chunk_counts: Dict[UUID, int] = {}
+        for pending in batch:
+            for document_id, chunk_no in zip(pending.document_ids, pending.chunk_numbers):
+                chunk_counts[document_id] = max(chunk_counts.get(document_id, 0), chunk_no + 1)
+        stale_ids = [
+            faiss_id
+            for document_id, chunk_count in chunk_counts.items()
+            for faiss_id in self._indexed_chunk_ids(id_map, document_id, start=chunk_count)
+        ]
+        if stale_ids:
+            self._hide_ids(tenant_id, index, np.array(stale_ids, dtype=np.int64))
+        
+        # Re-added documents replace their previous vector where it can be
+        # removed in place, and are no longer deleted
+        readded_ids = faiss_ids[np.array([faiss_id in id_map for faiss_id in faiss_ids.tolist()], dtype=bool)]
+        if len(readded_ids) > 0:
+            selector = faiss.IDSelectorBatch(readded_ids)
+            if delta is not None:
+                delta.remove_ids(selector)
+            elif self._supports_remove(tenant_id, index):
+                index.remove_ids(selector)
+            tombstones = self._get_tombstones(tenant_id)
+            if not tombstones.isdisjoint(readded_ids.tolist()):
+                self._set_tombstones(tenant_id, tombstones - set(readded_ids.tolist()))
+        
+        (delta if delta is not None else index).add_with_ids(vectors, faiss_ids)
+        id_map.update(zip(faiss_ids.tolist(), document_ids))
+        self._mark_dirty(tenant_id, len(document_ids))
+        
+        if delta is not None:
+            # Merge the delta into the base once it grows large enough
+            if delta.ntotal >= faiss_settings.mmap_delta_max_vectors:
+                self._compact(tenant_id)
+        else:
+            # Move to an approximate index type once the tenant is large enough
+            # (migration persists the new index and clears the vector log)
+            self._maybe_upgrade_index(tenant_id, index)
+        
+        if self._snapshot_due(tenant_id):
+            self._snapshot(tenant_id)
+        
+        # The index grew in place, so re-check the cache memory budget
+        self._indices.refresh_size(tenant_id)
     
     def remove_document(
         self,
@@ -528,77 +2760,182 @@ class FAISSIndexManager:
             tenant_id: Tenant ID
             document_id: Document UUID
             
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+        """
+        self.remove_documents(tenant_id, [document_id])
+    
+    def remove_documents(
+        self,
+        tenant_id: UUID,
+        document_ids: List[UUID],
+    ) -> int:
+        """
+        Remove a batch of documents from the tenant's FAISS index.
+        
+        Every removed ID is tombstoned on disk first, so a crash before the
+        next snapshot cannot bring it back from the vector log, and searches
+        exclude tombstoned IDs with an IDSelector. In-memory Flat indices
+        also drop the vectors with remove_ids. Other indices keep them until
+        tombstones reach FAISS_TOMBSTONE_COMPACTION_RATIO of the stored
+        vectors and the background compactor rebuilds the index.
+        
+        Args:
+            tenant_id: Tenant ID
+            document_ids: Document UUIDs
+            
+        Returns:
+            int: Number of vectors removed in place
+            
         Raises:
             TenantIsolationError: If tenant_id mismatch
         """
         # Validate tenant access
         self.validate_tenant_access(tenant_id)
         
-        # Get index
-        index = self.get_index(tenant_id, create_if_missing=False)
+        if not document_ids:
+            return 0
         
-        if index is None:
-            logger.warning(
-                "FAISS index not found for tenant, cannot remove document",
-                tenant_id=str(tenant_id),
-                document_id=str(document_id),
-            )
-            return
+        import faiss
         
-        # Calculate FAISS ID from document_id
-        faiss_id = hash(str(document_id)) % (2**31)
+        with self._writer_lock(tenant_id):
+            # Get index
+            index = self.get_index(tenant_id, create_if_missing=False)
+            
+            if index is None:
+                logger.warning(
+                    "FAISS index not found for tenant, cannot remove document",
+                    tenant_id=str(tenant_id),
+                    document_count=len(document_ids),
+                )
+                return 0
+            
+            if not isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+                logger.warning(
+                    "FAISS index is not ID-mapped, document cannot be removed by ID. "
+                    "Rebuild the index to enable stable vector IDs.",
+                    tenant_id=str(tenant_id),
+                    document_count=len(document_ids),
+                )
+                return 0
+            
+            try:
+                # Every chunk vector of the documents, including chunk 0
+                # (the document's own ID) for documents indexed before chunking
+                id_map = self._get_id_map(tenant_id)
+                faiss_ids = np.array(
+                    [
+                        faiss_id
+                        for document_id in document_ids
+                        for faiss_id in (
+                            self._indexed_chunk_ids(id_map, document_id)
+                            or [document_id_to_faiss_id(document_id)]
+                        )
+                    ],
+                    dtype=np.int64,
+                )
+                removed = self._hide_ids(tenant_id, index, faiss_ids)
+                
+                tombstones = self._hidden_tombstone_count(tenant_id, index)
+                self._maybe_schedule_compaction(tenant_id, index)
+            except Exception as e:
+                logger.error(
+                    "Error removing documents from FAISS index",
+                    tenant_id=str(tenant_id),
+                    document_count=len(document_ids),
+                    error=str(e),
+                )
+                raise
         
-        try:
-            # Remove document from index
-            # Note: FAISS IndexFlat* indices don't support removal directly
-            # For production, consider using IndexIDMap wrapper or rebuilding index
-            # For now, we'll log a warning
-            logger.warning(
-                "FAISS IndexFlat indices don't support direct removal. "
-                "Consider rebuilding index or using IndexIDMap wrapper.",
-                tenant_id=str(tenant_id),
-                document_id=str(document_id),
-                faiss_id=faiss_id,
-            )
-            # In a production system, you would:
-            # 1. Use IndexIDMap wrapper around base index
-            # 2. Or rebuild index excluding the document to remove
-            # For MVP, we'll mark embeddings as deprecated in metadata (handled elsewhere)
+        logger.info(
+            "Documents removed from FAISS index",
+            tenant_id=str(tenant_id),
+            document_count=len(document_ids),
+            document_id=str(document_ids[0]) if len(document_ids) == 1 else None,
+            removed=removed,
+            tombstones=tombstones,
+        )
+        
+        return removed
+    
+    @staticmethod
+    def _indexed_chunk_ids(id_map: dict[int, UUID], document_id: UUID, start: int = 0) -> List[int]:
+        """
+        List the FAISS IDs of a document's chunks from chunk `start` on.
+        
+        Chunks are numbered consecutively, so the probe stops at the first
+        chunk number the tenant's ID map has never seen.
+        
+        Args:
+            id_map: The tenant's ID map
+            document_id: Document UUID
+            start: First chunk number to probe
             
-        except Exception as e:
-            logger.error(
-                "Error removing document from FAISS index",
-                tenant_id=str(tenant_id),
-                document_id=str(document_id),
-                error=str(e),
-            )
-            raise
+        Returns:
+            list: FAISS IDs of chunks start, start + 1, ... present in the ID map
+        """
+        faiss_ids = []
+        chunk_no = start
+        while True:
+            faiss_id = chunk_faiss_id(document_id, chunk_no)
+            if id_map.get(faiss_id) != document_id:
+                return faiss_ids
+            faiss_ids.append(faiss_id)
+            chunk_no += 1
     
-    def _faiss_id_to_document_id(self, faiss_id: int) -> Optional[UUID]:
+    def _hide_ids(self, tenant_id: UUID, index: any, faiss_ids: np.ndarray) -> int:
+        """
+        Tombstone vectors and drop them from in-memory indices that support it.
+        
+        Caller holds the writer lock.
+        
+        Args:
+            tenant_id: Tenant ID
+            index: The tenant's index
+            faiss_ids: FAISS IDs to remove
+            
+        Returns:
+            int: Number of vectors removed in place
         """
-        Reverse-map FAISS ID back to document ID.
+        import faiss
+        
+        # Durable first, then hidden from searches
+        self._set_tombstones(tenant_id, self._get_tombstones(tenant_id) | set(faiss_ids.tolist()))
+        self._get_attribute_store(tenant_id).remove(faiss_ids.tolist())
         
-        Since we use hash(document_id) % (2**31) to create FAISS IDs,
-        we need to search through known document IDs to find matches.
-        This is inefficient but necessary for IndexFlat indices.
+        selector = faiss.IDSelectorBatch(faiss_ids)
+        removed = 0
+        delta = self._deltas.get(tenant_id)
+        if delta is not None:
+            removed += delta.remove_ids(selector)
+        if self._supports_remove(tenant_id, index):
+            removed += index.remove_ids(selector)
+        if removed:
+            # The in-memory index no longer matches its snapshot
+            self._mark_dirty(tenant_id, removed)
+            self._indices.refresh_size(tenant_id)
+        return removed
+    
+    def _faiss_id_to_document_id(self, tenant_id: UUID, faiss_id: int) -> Optional[UUID]:
+        """
+        Reverse-map a single FAISS ID back to its document ID.
         
         Args:
+            tenant_id: Tenant ID
             faiss_id: FAISS integer ID
             
         Returns:
             Document UUID if found, None otherwise
         """
-        # This is a limitation of using hash-based IDs with IndexFlat
-        # In production, maintain a reverse mapping (faiss_id -> document_id)
-        # For now, we'll need to query the database to find matching documents
-        # This method will be called from search results
-        return None
+        return self.resolve_document_ids(tenant_id, [faiss_id]).get(faiss_id)
     
     def search(
         self,
         tenant_id: UUID,
         query_embedding: np.ndarray,
         k: int = 10,
+        search_effort: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
     ) -> List[Tuple[int, float]]:
         """
         Search for similar documents in the tenant's FAISS index.
@@ -607,14 +2944,78 @@ class FAISSIndexManager:
             tenant_id: Tenant ID
             query_embedding: Query embedding vector (numpy array)
             k: Number of results to return (default: 10)
+            search_effort: Recall/latency knob for approximate indices. Multiplies
+                the tenant's nprobe (IVF) or efSearch (HNSW); defaults to
+                FAISS_SEARCH_EFFORT. Ignored for Flat indices.
+            filters: Optional metadata filters (document_type, tags, date_from,
+                date_to). Applied inside FAISS with an IDSelector, so up to k
+                matching documents are returned without over-fetching.
             
         Returns:
             List of tuples: [(faiss_id, similarity_score), ...]
             Results are sorted by similarity (highest first)
-            faiss_id is the integer ID stored in FAISS (hash of document_id)
+            faiss_id is the 64-bit ID stored in FAISS (see document_id_to_faiss_id)
             For IndexFlatL2: similarity score is 1 / (1 + distance), higher = more similar
             For IndexFlatIP: similarity score is the inner product, higher = more similar
             
+        Raises:
+            TenantIsolationError: If tenant_id mismatch
+            ValueError: If embedding dimension doesn't match index dimension
+        """
+        return self.search_batch(
+            tenant_id=tenant_id,
+            query_embeddings=query_embedding.reshape(1, -1),
+            k=k,
+            search_effort=search_effort,
+            filters=filters,
+        )[0]
+    
+    @staticmethod
+    def _to_similarities(scores: np.ndarray, score_metric: Optional[str]) -> np.ndarray:
+        """
+        Convert raw FAISS scores to similarities (higher = more similar).
+        
+        Args:
+            scores: Raw distances or inner products, any shape
+            score_metric: "L2", "IP", or None to use scores as-is
+            
+        Returns:
+            np.ndarray: float64 similarities with the same shape
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if score_metric == "L2":
+            # Lower distance = more similar, normalized to [0, 1] as 1 / (1 + distance)
+            return 1.0 / (1.0 + scores)
+        if score_metric == "IP":
+            # Higher is better; sigmoid maps (-inf, +inf) to (0, 1)
+            with np.errstate(over="ignore"):
+                return 1.0 / (1.0 + np.exp(-scores))
+        return scores
+    
+    def search_batch(
+        self,
+        tenant_id: UUID,
+        query_embeddings: np.ndarray,
+        k: int = 10,
+        search_effort: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Search the tenant's FAISS index for many queries with one FAISS call.
+        
+        Score conversion, -1 filtering and ranking are vectorized across all
+        queries, so n queries cost one BLAS-backed search instead of n.
+        
+        Args:
+            tenant_id: Tenant ID
+            query_embeddings: Query embedding matrix, shape (n, dimension)
+            k: Number of results to return per query (default: 10)
+            search_effort: Recall/latency knob for approximate indices (see search())
+            filters: Optional metadata filters applied to every query (see search())
+            
+        Returns:
+            One result list per query, in query order, each formatted like search()
+            
         Raises:
             TenantIsolationError: If tenant_id mismatch
             ValueError: If embedding dimension doesn't match index dimension
@@ -622,6 +3023,11 @@ class FAISSIndexManager:
         # Validate tenant access
         self.validate_tenant_access(tenant_id)
         
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        query_count = queries.shape[0]
+        
         # Get index
         index = self.get_index(tenant_id, create_if_missing=False)
         
@@ -630,81 +3036,108 @@ class FAISSIndexManager:
                 "FAISS index not found for tenant, returning empty results",
                 tenant_id=str(tenant_id),
             )
-            return []
+            return [[] for _ in range(query_count)]
         
-        # Check if index is empty
-        if index.ntotal == 0:
+        # Check if index is empty (including vectors buffered in the delta)
+        delta = self._deltas.get(tenant_id)
+        delta_size = int(delta.ntotal) if delta is not None else 0
+        if index.ntotal == 0 and delta_size == 0:
             logger.debug(
                 "FAISS index is empty for tenant",
                 tenant_id=str(tenant_id),
             )
-            return []
+            return [[] for _ in range(query_count)]
+        
+        # Queries are reduced like the tenant's stored vectors
+        reducer = self._get_reducer(tenant_id)
+        queries = self._reduce_vectors(tenant_id, queries)
         
         # Validate embedding dimension
-        if query_embedding.shape[0] != self.dimension:
+        index_dimension = reducer.output_dimension if reducer is not None else self.dimension
+        if queries.shape[1] != index_dimension:
             raise ValueError(
-                f"Query embedding dimension {query_embedding.shape[0]} doesn't match index dimension {self.dimension}"
+                f"Query embedding dimension {queries.shape[1]} doesn't match index dimension {index_dimension}"
             )
         
-        # Reshape query embedding to 2D array (FAISS requires shape [1, dimension])
-        query_2d = query_embedding.reshape(1, -1).astype(np.float32)
+        if query_count == 0:
+            return []
+        
+        # FAISS requires a C-contiguous float32 matrix of shape [n, dimension]
+        queries = np.ascontiguousarray(queries)
         
         try:
             import faiss
             
             # Perform search
-            # Returns: distances (shape: [1, k]), indices (shape: [1, k])
+            # Returns: distances (shape: [n, k]), indices (shape: [n, k])
             # indices contains the FAISS IDs we stored with add_with_ids
-            distances, indices = index.search(query_2d, min(k, index.ntotal))
-            
-            # Get FAISS IDs and distance scores from search results
-            faiss_ids = indices[0]  # Shape: [k]
-            distance_scores = distances[0]  # Shape: [k]
-            
-            # Filter out invalid indices (-1 means no result found)
-            valid_results = [
-                (int(faiss_id), float(score))
-                for faiss_id, score in zip(faiss_ids, distance_scores)
-                if faiss_id != -1
-            ]
-            
-            # Convert distance to similarity score based on index type
-            # For IndexFlatL2: lower distance = more similar, convert to similarity (1 / (1 + distance))
-            # For IndexFlatIP: higher score = more similar, use score directly
-            if self.index_type == "IndexFlatL2":
-                # Convert L2 distance to similarity score (higher = more similar)
-                # Using 1 / (1 + distance) to normalize to [0, 1]
-                results = [
-                    (faiss_id, 1.0 / (1.0 + distance))
-                    for faiss_id, distance in valid_results
-                ]
-            elif self.index_type == "IndexFlatIP":
-                # For inner product, higher is better
-                # Normalize using sigmoid: 1 / (1 + exp(-score))
-                # This maps (-inf, +inf) to (0, 1)
-                import math
-                results = [
-                    (faiss_id, 1.0 / (1.0 + math.exp(-score)))
-                    for faiss_id, score in valid_results
-                ]
+            # Deleted vectors that are still stored, and vectors not matching
+            # the filters, never take a top-k slot
+            selector, allowed_count = (
+                self._search_selector(tenant_id, filters) if isinstance(index, faiss.Index) else (None, None)
+            )
+            if allowed_count == 0:
+                return [[] for _ in range(query_count)]
+            if allowed_count is not None and index.ntotal > 0:
+                # Approximate indices visit a fixed number of candidates, of
+                # which only allowed_count / ntotal can match: widen the search
+                # so selective filters still fill k results
+                effort = search_effort if search_effort is not None else self.search_effort
+                boost = min(faiss_settings.filter_max_effort_boost, index.ntotal / allowed_count)
+                search_effort = effort * max(1.0, boost)
+            k_search = min(k, index.ntotal)
+            if k_search > 0:
+                search_params = self._get_search_params(tenant_id, index, k_search, search_effort, selector)
+                if search_params is None:
+                    distances, indices = index.search(queries, k_search)
+                else:
+                    distances, indices = index.search(queries, k_search, params=search_params)
             else:
-                # Default: treat as similarity score (already normalized)
-                results = valid_results
+                distances = np.empty((query_count, 0), dtype=np.float32)
+                indices = np.empty((query_count, 0), dtype=np.int64)
+            
+            # Merge in exact results from the writable delta (same metric)
+            if delta_size > 0:
+                delta_params = faiss.SearchParameters(sel=selector) if selector is not None else None
+                delta_distances, delta_indices = delta.search(queries, min(k, delta_size), params=delta_params)
+                distances = np.concatenate([distances, delta_distances], axis=1)
+                indices = np.concatenate([indices, delta_indices], axis=1)
+            
+            # Convert distance to similarity score based on the index metric
+            indices = np.asarray(indices, dtype=np.int64)
+            similarities = self._to_similarities(distances, self._score_metric(index))
+            
+            # Sort each query's hits by similarity (highest first); invalid
+            # indices (-1 means no result found) sort last
+            similarities = np.where(indices == -1, -np.inf, similarities)
+            order = np.argsort(-similarities, axis=1, kind="stable")
+            indices = np.take_along_axis(indices, order, axis=1)
+            similarities = np.take_along_axis(similarities, order, axis=1)
             
-            # Sort by similarity (highest first)
-            results.sort(key=lambda x: x[1], reverse=True)
+            results: List[List[Tuple[int, float]]] = []
+            for row_ids, row_similarities in zip(indices, similarities):
+                valid = row_ids != -1
+                row_ids, row_similarities = row_ids[valid], row_similarities[valid]
+                if delta_size > 0:
+                    # A vector re-added to the delta may still be in the base
+                    _, first_positions = np.unique(row_ids, return_index=True)
+                    keep = np.sort(first_positions)[:k]
+                    row_ids, row_similarities = row_ids[keep], row_similarities[keep]
+                results.append(list(zip(row_ids.tolist(), row_similarities.tolist())))
             
             logger.debug(
                 "FAISS search completed",
                 tenant_id=str(tenant_id),
+                query_count=query_count,
                 k_requested=k,
-                k_returned=len(results),
-                index_type=self.index_type,
+                k_returned=sum(len(row) for row in results),
+                index_type=self._current_index_type(index) if isinstance(index, faiss.Index) else self.index_type,
                 index_size=index.ntotal,
+                delta_size=delta_size,
             )
             
             # Return FAISS IDs with similarity scores
-            # Caller will need to resolve FAISS IDs to document IDs via database query
+            # Caller resolves FAISS IDs to document IDs via resolve_document_ids()
             return results
             
         except ImportError:
@@ -714,6 +3147,7 @@ class FAISSIndexManager:
             logger.error(
                 "Error performing FAISS search",
                 tenant_id=str(tenant_id),
+                query_count=query_count,
                 error=str(e),
             )
             raise
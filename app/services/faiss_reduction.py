@@ -0,0 +1,255 @@
+"""
+Per-tenant dimensionality reduction of FAISS vectors.
+
+Large embedding models make every stored vector expensive: 3072 float32
+dimensions are 12KB per document and a Flat scan touches all of them. A
+tenant can store reduced vectors instead:
+
+- "pca": a PCA projection trained on the tenant's own vectors and persisted
+  next to the index (tenant_{id}.pca);
+- "truncate": Matryoshka prefix truncation, keeping the first dimensions
+  and re-normalizing. Only meaningful for models trained for it, such as
+  text-embedding-3-small/large; needs no training.
+
+FAISSIndexManager applies the tenant's reducer to every vector it adds and
+every query it searches, so stored and query vectors always share a space.
+measure_recall() reports how well the reduced space preserves the
+full-dimension nearest neighbours.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+PCA_REDUCTION = "pca"
+TRUNCATE_REDUCTION = "truncate"
+REDUCTION_METHODS = (PCA_REDUCTION, TRUNCATE_REDUCTION)
+
+
+def normalize_reduction_method(method: Optional[str]) -> Optional[str]:
+    """
+    Normalize a user-supplied reduction method.
+
+    Args:
+        method: "pca", "truncate"/"matryoshka", or None/"none" to disable
+
+    Returns:
+        str: Canonical method, or None if reduction is disabled
+
+    Raises:
+        ValueError: If the method is not recognized
+    """
+    if method is None:
+        return None
+    key = str(method).strip().lower()
+    if key in ("", "none", "off"):
+        return None
+    if key == "matryoshka":
+        return TRUNCATE_REDUCTION
+    if key not in REDUCTION_METHODS:
+        raise ValueError(f"Unknown reduction method: {method} (expected pca, truncate or none)")
+    return key
+
+
+class VectorReducer:
+    """Projection of full-dimension embeddings to a tenant's stored dimension."""
+
+    def __init__(
+        self,
+        method: str,
+        output_dimension: int,
+        input_dimension: Optional[int] = None,
+        pca: Optional[Any] = None,
+    ):
+        """
+        Initialize the reducer.
+
+        Args:
+            method: PCA_REDUCTION or TRUNCATE_REDUCTION
+            output_dimension: Dimension of the reduced vectors
+            input_dimension: Dimension of the full vectors (None = any larger
+                dimension, for truncation configured before any vector exists)
+            pca: Trained faiss.PCAMatrix (PCA only)
+        """
+        self.method = method
+        self.output_dimension = output_dimension
+        self.input_dimension = input_dimension
+        self.pca = pca
+
+    @classmethod
+    def train(cls, method: str, vectors: np.ndarray, output_dimension: int) -> "VectorReducer":
+        """
+        Build a reducer for a tenant's full-dimension vectors.
+
+        Args:
+            method: PCA_REDUCTION or TRUNCATE_REDUCTION
+            vectors: Full-dimension vectors, shape (n, input_dimension)
+            output_dimension: Dimension of the reduced vectors
+
+        Returns:
+            VectorReducer
+
+        Raises:
+            ValueError: If the output dimension is not smaller than the input,
+                or PCA has fewer training vectors than output dimensions
+        """
+        input_dimension = int(vectors.shape[1])
+        if not 0 < output_dimension < input_dimension:
+            raise ValueError(
+                f"Reduced dimension must be between 1 and {input_dimension - 1}, got {output_dimension}"
+            )
+        if method == TRUNCATE_REDUCTION:
+            return cls(method, output_dimension, input_dimension)
+
+        if len(vectors) < output_dimension:
+            raise ValueError(
+                f"PCA to {output_dimension} dimensions needs at least {output_dimension} vectors, "
+                f"the index has {len(vectors)}"
+            )
+        import faiss
+
+        pca = faiss.PCAMatrix(input_dimension, output_dimension)
+        pca.train(np.ascontiguousarray(vectors, dtype=np.float32))
+        return cls(method, output_dimension, input_dimension, pca)
+
+    def apply(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Reduce full-dimension vectors.
+
+        Args:
+            vectors: Vectors, shape (n, input_dimension)
+
+        Returns:
+            np.ndarray: float32 vectors, shape (n, output_dimension)
+
+        Raises:
+            ValueError: If the vectors do not have the reducer's input dimension
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dimension = vectors.shape[1]
+        if (self.input_dimension is not None and dimension != self.input_dimension) or (
+            dimension <= self.output_dimension
+        ):
+            raise ValueError(
+                f"Embedding dimension {dimension} doesn't match the index reduction input dimension "
+                f"{self.input_dimension or f'> {self.output_dimension}'}; disable the reduction and "
+                "rebuild the index after changing embedding models"
+            )
+
+        if self.method == PCA_REDUCTION:
+            return self.pca.apply(np.ascontiguousarray(vectors))
+
+        # Matryoshka shortening: keep the prefix and restore unit length
+        reduced = np.ascontiguousarray(vectors[:, :self.output_dimension])
+        norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+        np.divide(reduced, norms, out=reduced, where=norms > 0)
+        return reduced
+
+    def to_params(self) -> Dict[str, Any]:
+        """
+        Describe the reducer for the tenant's params sidecar.
+
+        Returns:
+            dict: method, input_dimension and output_dimension
+        """
+        return {
+            "method": self.method,
+            "input_dimension": self.input_dimension,
+            "output_dimension": self.output_dimension,
+        }
+
+    def save(self, path: Path) -> None:
+        """
+        Persist the trained projection (PCA only; truncation has no state).
+
+        Args:
+            path: Projection file path
+        """
+        if self.pca is None:
+            path.unlink(missing_ok=True)
+            return
+        import faiss
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        faiss.write_VectorTransform(self.pca, str(tmp_path))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, params: Dict[str, Any], path: Path) -> "VectorReducer":
+        """
+        Load a reducer persisted with to_params() and save().
+
+        Args:
+            params: Reducer description from the params sidecar
+            path: Projection file path
+
+        Returns:
+            VectorReducer
+
+        Raises:
+            ValueError: If a PCA projection file is missing
+        """
+        method = params["method"]
+        pca = None
+        if method == PCA_REDUCTION:
+            if not path.exists():
+                raise ValueError(f"PCA projection file missing: {path}")
+            import faiss
+
+            pca = faiss.read_VectorTransform(str(path))
+        return cls(method, int(params["output_dimension"]), params.get("input_dimension"), pca)
+
+
+def measure_recall(
+    full_vectors: np.ndarray,
+    reduced_vectors: np.ndarray,
+    metric: int,
+    k: int = 10,
+    max_queries: int = 200,
+) -> Optional[float]:
+    """
+    Measure recall@k of exact search in the reduced space against the full space.
+
+    A sample of the stored vectors is used as queries; each query's own
+    vector is excluded from its neighbours.
+
+    Args:
+        full_vectors: Full-dimension vectors, shape (n, input_dimension)
+        reduced_vectors: The same vectors reduced, shape (n, output_dimension)
+        metric: FAISS metric constant of the tenant's index
+        k: Neighbours compared per query
+        max_queries: Queries sampled
+
+    Returns:
+        float: Mean fraction of the full-space top-k found in the reduced
+            top-k, or None with fewer than two vectors
+    """
+    import faiss
+
+    count = len(full_vectors)
+    if count < 2:
+        return None
+    k = min(k, count - 1)
+    rng = np.random.default_rng(0)
+    query_rows = rng.choice(count, size=min(max_queries, count), replace=False)
+
+    def neighbours(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        index = faiss.IndexFlat(vectors.shape[1], metric)
+        index.add(vectors)
+        _, rows = index.search(vectors[query_rows], k + 1)
+        return rows
+
+    full_rows = neighbours(full_vectors)
+    reduced_rows = neighbours(reduced_vectors)
+
+    recalls = []
+    for query_row, full, reduced in zip(query_rows, full_rows, reduced_rows):
+        expected = [row for row in full.tolist() if row != query_row][:k]
+        found = [row for row in reduced.tolist() if row != query_row][:k]
+        recalls.append(len(set(expected) & set(found)) / k)
+    return float(np.mean(recalls))
@@ -0,0 +1,141 @@
+"""
+Append-only vector log for FAISS crash recovery.
+
+Vectors added to a tenant index are appended here before they are added to
+the in-memory index. The log is replayed on load and cleared whenever the
+index is snapshotted to disk, so the full index only needs rewriting on the
+snapshot policy instead of after every document.
+
+File layout: an 8-byte header (magic + int32 dimension) followed by
+fixed-size records of (int64 faiss_id, 16-byte document UUID, float32[d]).
+"""
+
+import os
+import struct
+from pathlib import Path
+from typing import List, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_MAGIC = b"FVL1"
+_HEADER = struct.Struct("<4si")
+
+
+def _record_dtype(dimension: int) -> np.dtype:
+    """Numpy dtype of one log record for the given vector dimension."""
+    return np.dtype([
+        ("faiss_id", "<i8"),
+        ("document_id", "u1", (16,)),
+        ("vector", "<f4", (dimension,)),
+    ])
+
+
+class VectorLog:
+    """Append-only log of (faiss_id, document_id, vector) records for one tenant."""
+
+    def __init__(self, path: Path, fsync: bool = True):
+        """
+        Initialize the vector log.
+
+        Args:
+            path: Log file path
+            fsync: Whether to fsync after every append
+        """
+        self.path = path
+        self.fsync = fsync
+
+    def append(
+        self,
+        faiss_ids: np.ndarray,
+        document_ids: Sequence[UUID],
+        vectors: np.ndarray,
+    ) -> None:
+        """
+        Append a batch of vectors to the log in a single write.
+
+        Args:
+            faiss_ids: int64 FAISS IDs, shape (n,)
+            document_ids: Document UUIDs, one per vector
+            vectors: float32 vectors, shape (n, dimension)
+        """
+        dimension = vectors.shape[1]
+        records = np.empty(len(faiss_ids), dtype=_record_dtype(dimension))
+        records["faiss_id"] = faiss_ids
+        records["document_id"] = np.frombuffer(
+            b"".join(document_id.bytes for document_id in document_ids), dtype=np.uint8
+        ).reshape(-1, 16)
+        records["vector"] = vectors
+
+        payload = records.tobytes()
+        size = self.path.stat().st_size if self.path.exists() else 0
+        # Drop a torn trailing record (or header) left by a crash mid-append;
+        # read() ignores it, but appending after it would misalign every record
+        complete = size
+        if size < _HEADER.size:
+            complete = 0
+        else:
+            complete -= (size - _HEADER.size) % records.dtype.itemsize
+        if complete == 0:
+            payload = _HEADER.pack(_MAGIC, dimension) + payload
+
+        with open(self.path, "ab") as f:
+            if complete != size:
+                logger.warning(
+                    "Truncating torn FAISS vector log record",
+                    log_file=str(self.path),
+                    torn_bytes=size - complete,
+                )
+                f.truncate(complete)
+            f.write(payload)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def read(self, dimension: int) -> Tuple[np.ndarray, List[UUID], np.ndarray]:
+        """
+        Read every complete record from the log.
+
+        A torn trailing record (crash mid-append) is ignored. A log written
+        for a different dimension is treated as empty.
+
+        Args:
+            dimension: Expected vector dimension
+
+        Returns:
+            tuple: (faiss_ids int64 array, document IDs, vectors float32 array)
+        """
+        empty = (np.empty(0, dtype=np.int64), [], np.empty((0, dimension), dtype=np.float32))
+        if not self.path.exists():
+            return empty
+
+        data = self.path.read_bytes()
+        if len(data) < _HEADER.size:
+            return empty
+
+        magic, log_dimension = _HEADER.unpack_from(data)
+        if magic != _MAGIC or log_dimension != dimension:
+            logger.warning(
+                "Ignoring incompatible FAISS vector log",
+                log_file=str(self.path),
+                log_dimension=log_dimension,
+                expected_dimension=dimension,
+            )
+            return empty
+
+        record_dtype = _record_dtype(dimension)
+        count = (len(data) - _HEADER.size) // record_dtype.itemsize
+        records = np.frombuffer(data, dtype=record_dtype, count=count, offset=_HEADER.size)
+
+        return (
+            records["faiss_id"].astype(np.int64),
+            [UUID(bytes=document_id.tobytes()) for document_id in records["document_id"]],
+            np.ascontiguousarray(records["vector"], dtype=np.float32),
+        )
+
+    def clear(self) -> None:
+        """Discard the log once its vectors are part of a snapshot."""
+        self.path.unlink(missing_ok=True)
@@ -11,15 +11,15 @@ This client attempts HTTP POST first (some SSE servers accept POST for tool call
 then falls back to full SSE streaming if needed.
 """
 
-import asyncio
 import os
-import time
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
 import structlog
 
+from app.config.embedding import embedding_settings
 from app.services.gpu_ai_sse_client import gpu_ai_sse_client
+from app.services.gpu_ai_task_tracker import GPUAITaskTracker, get_task_embeddings
 
 logger = structlog.get_logger(__name__)
 
@@ -55,6 +55,14 @@ class GPUAIClient:
         
         self._client: Optional[httpx.AsyncClient] = None
         self._use_sse = False  # Track if we're using SSE
+        
+        # All outstanding tasks share one adaptive status poll loop
+        self.tracker = GPUAITaskTracker(
+            fetch_status=self._get_task_status,
+            initial_poll_ms=embedding_settings.gpu_ai_poll_initial_ms,
+            max_poll_ms=embedding_settings.gpu_ai_poll_max_ms,
+            jitter=embedding_settings.gpu_ai_poll_jitter,
+        )
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
@@ -74,8 +82,9 @@ class GPUAIClient:
         """
         Generate embeddings for texts using GPU-AI MCP server.
         
-        This method calls the GPU-AI MCP server's embeddings_generate tool
-        and waits for the task to complete.
+        This method calls the GPU-AI MCP server's embeddings_generate tool.
+        Embeddings returned inline (synchronous mode) are used directly;
+        otherwise the returned task is awaited through the shared tracker.
         
         Args:
             texts: List of texts to generate embeddings for
@@ -135,11 +144,14 @@ class GPUAIClient:
             if not task_id:
                 task_id = result_data.get("task_id")
             
-            if not task_id:
-                raise RuntimeError(f"No task_id returned from GPU-AI MCP. Response: {result}")
-            
-            # Poll for completion
-            embeddings = await self._wait_for_embeddings(task_id)
+            if task_id:
+                # Wait for completion
+                embeddings = await self._wait_for_embeddings(task_id)
+            else:
+                # Synchronous mode: embeddings returned inline
+                embeddings = get_task_embeddings(result_data.get("data") or result_data)
+                if not embeddings:
+                    raise RuntimeError(f"No task_id or embeddings returned from GPU-AI MCP. Response: {result}")
             
             logger.debug(
                 "Generated embeddings via GPU-AI MCP",
@@ -195,19 +207,66 @@ class GPUAIClient:
             )
             raise
     
+    async def _get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an embedding task's status via the embeddings_get_status tool.
+        
+        Args:
+            task_id: Task ID from embeddings_generate
+            
+        Returns:
+            dict: Tool result, or None after a transient HTTP error
+            
+        Raises:
+            RuntimeError: If the server reports an error
+        """
+        client = await self._get_client()
+        
+        try:
+            # Check task status via MCP protocol
+            response = await client.post(
+                "",  # Use base URL directly
+                json={
+                    "jsonrpc": "2.0",
+                    "method": "tools/call",
+                    "params": {
+                        "name": "embeddings_get_status",
+                        "arguments": {
+                            "task_id": task_id
+                        }
+                    },
+                    "id": 2
+                },
+                headers={"Content-Type": "application/json"}
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(
+                "Error polling GPU-AI MCP task status",
+                task_id=task_id,
+                error=str(e)
+            )
+            return None
+        
+        result = response.json()
+        
+        if "error" in result:
+            error_msg = result["error"].get("message", str(result["error"]))
+            raise RuntimeError(f"GPU-AI MCP error: {error_msg}")
+        
+        return result.get("result", {})
+    
     async def _wait_for_embeddings(
         self,
         task_id: str,
-        max_wait_seconds: int = 60,
-        poll_interval: float = 1.0,
+        max_wait_seconds: Optional[float] = None,
     ) -> List[List[float]]:
         """
         Wait for embedding task to complete and return results.
         
         Args:
             task_id: Task ID from embeddings_generate
-            max_wait_seconds: Maximum time to wait (default: 60)
-            poll_interval: Polling interval in seconds (default: 1.0)
+            max_wait_seconds: Maximum time to wait (default: EMBEDDING_GPU_AI_TASK_TIMEOUT_SECONDS)
             
         Returns:
             List of embedding vectors
@@ -215,72 +274,10 @@ class GPUAIClient:
         Raises:
             RuntimeError: If task fails or times out
         """
-        client = await self._get_client()
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait_seconds:
-            try:
-                # Check task status via MCP protocol
-                response = await client.post(
-                    "",  # Use base URL directly
-                    json={
-                        "jsonrpc": "2.0",
-                        "method": "tools/call",
-                        "params": {
-                            "name": "embeddings_get_status",
-                            "arguments": {
-                                "task_id": task_id
-                            }
-                        },
-                        "id": 2
-                    },
-                    headers={"Content-Type": "application/json"}
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                if "error" in result:
-                    error_msg = result["error"].get("message", str(result["error"]))
-                    raise RuntimeError(f"GPU-AI MCP error: {error_msg}")
-                
-                # Extract status data
-                result_data = result.get("result", {})
-                status_data = result_data.get("data", {})
-                if not status_data:
-                    status_data = result_data
-                
-                status = status_data.get("status")
-                
-                if status == "completed":
-                    # Extract embeddings from result
-                    embeddings = status_data.get("result", {}).get("embeddings", [])
-                    if not embeddings:
-                        embeddings = status_data.get("embeddings", [])
-                    if not embeddings:
-                        embeddings = result_data.get("embeddings", [])
-                    
-                    if not embeddings:
-                        raise RuntimeError(f"No embeddings in completed task result. Status data: {status_data}")
-                    
-                    return embeddings
-                
-                elif status == "failed":
-                    error = status_data.get("error") or status_data.get("message")
-                    raise RuntimeError(f"Embedding generation failed: {error}")
-                
-                # Task still in progress (queued, processing, etc.), wait and retry
-                await asyncio.sleep(poll_interval)
-                
-            except httpx.HTTPError as e:
-                logger.warning(
-                    "Error polling GPU-AI MCP task status",
-                    task_id=task_id,
-                    error=str(e)
-                )
-                await asyncio.sleep(poll_interval)
-        
-        raise RuntimeError(f"Embedding generation timed out after {max_wait_seconds} seconds")
+        return await self.tracker.wait(
+            task_id,
+            timeout=max_wait_seconds or embedding_settings.gpu_ai_task_timeout_seconds,
+        )
     
     async def close(self):
         """Close HTTP client."""
@@ -9,12 +9,15 @@ import asyncio
 import json
 import os
 import re
-import time
 from typing import Dict, List, Optional, Any, AsyncIterator
 
 import httpx
 import structlog
 
+from app.config.embedding import embedding_settings
+from app.services.gpu_ai_task_tracker import GPUAITaskTracker
+from app.services.sse_parser import SSEEvent, SSEParser
+
 logger = structlog.get_logger(__name__)
 
 
@@ -190,6 +193,14 @@ class GPUAISSEClient:
         self._http_client: Optional[httpx.AsyncClient] = None
         self._message_id = 0
         
+        # Outstanding tasks complete from pushed result events or one shared poll loop
+        self.tracker = GPUAITaskTracker(
+            fetch_status=self._get_task_status,
+            initial_poll_ms=embedding_settings.gpu_ai_poll_initial_ms,
+            max_poll_ms=embedding_settings.gpu_ai_poll_max_ms,
+            jitter=embedding_settings.gpu_ai_poll_jitter,
+        )
+        
     async def _get_http_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._http_client is None:
@@ -209,66 +220,47 @@ class GPUAISSEClient:
         
         data: {"jsonrpc": "2.0", "result": {...}, "id": 1}
         
+        Parsing is incremental and byte-level (see SSEParser); each event's
+        data is decoded and parsed as JSON once, when the event is complete.
+        
         Yields parsed JSON objects or event dictionaries from SSE data lines.
         """
-        buffer = ""
-        current_event = None
-        current_data = None
+        parser = SSEParser()
         
         async for chunk in response.aiter_bytes():
-            buffer += chunk.decode('utf-8', errors='ignore')
+            for event in parser.feed(chunk):
+                yield self._event_payload(event)
+        
+        # Yield any event not terminated by a blank line
+        for event in parser.flush():
+            yield self._event_payload(event)
+    
+    @staticmethod
+    def _event_payload(event: SSEEvent) -> Any:
+        """
+        Convert a parsed SSE event to the payload yielded by _parse_sse_stream.
+        
+        Args:
+            event: Parsed SSE event
             
-            # Process complete lines
-            while '\n' in buffer:
-                line, buffer = buffer.split('\n', 1)
-                line = line.strip()
-                
-                if not line:
-                    # Empty line (SSE message separator) - yield accumulated data
-                    if current_event is not None:
-                        yield current_event
-                        current_event = None
-                    elif current_data is not None:
-                        yield current_data
-                        current_data = None
-                elif line.startswith('event: '):
-                    # SSE event type
-                    event_type = line[7:]
-                    if current_event is None:
-                        current_event = {"event": event_type}
-                    else:
-                        current_event["event"] = event_type
-                elif line.startswith('data: '):
-                    # SSE data line
-                    data_str = line[6:]  # Remove "data: " prefix
-                    try:
-                        # Try parsing as JSON
-                        parsed_data = json.loads(data_str)
-                        if current_event is not None:
-                            current_event["data"] = parsed_data
-                        else:
-                            current_data = parsed_data
-                    except json.JSONDecodeError:
-                        # Not JSON, treat as string
-                        if current_event is not None:
-                            current_event["data"] = data_str
-                        else:
-                            current_data = data_str
-                elif line.startswith('id: '):
-                    # SSE event ID (optional)
-                    event_id = line[4:]
-                    if current_event is not None:
-                        current_event["id"] = event_id
-                elif line.startswith('retry: '):
-                    # SSE retry interval (optional)
-                    retry_ms = line[7:]
-                    logger.debug("SSE retry", retry_ms=retry_ms)
-        
-        # Yield any remaining data in buffer
-        if current_event is not None:
-            yield current_event
-        elif current_data is not None:
-            yield current_data
+        Returns:
+            {"event", "data"[, "id"]} for events with an event: field, else the data
+        """
+        try:
+            data = event.json()
+        except json.JSONDecodeError:
+            # Not JSON, treat as string
+            data = event.data
+        
+        if not event.has_event_type:
+            return data
+        
+        payload = {"event": event.event, "data": data}
+        if event.id is not None:
+            payload["id"] = event.id
+        if event.retry is not None:
+            logger.debug("SSE retry", retry_ms=event.retry)
+        return payload
     
     async def generate_embeddings(
         self,
@@ -337,7 +329,8 @@ class GPUAISSEClient:
                 # Parse SSE stream for response
                 if "text/event-stream" in content_type or not content_type:
                     # SSE stream response - parse it
-                    async for event in self._parse_sse_stream(response):
+                    events = self._parse_sse_stream(response)
+                    async for event in events:
                         if event.get("id") == message_id:
                             if "error" in event:
                                 error_msg = event["error"].get("message", str(event["error"]))
@@ -351,8 +344,9 @@ class GPUAISSEClient:
                                 task_id = result_data.get("task_id")
                             
                             if task_id:
-                                logger.debug("Got task_id, polling for completion", task_id=task_id)
-                                return await self._wait_for_embeddings(task_id)
+                                # Keep reading the stream for the task's result event
+                                logger.debug("Got task_id, waiting for completion", task_id=task_id)
+                                return await self._wait_for_embeddings(task_id, events=events)
                             
                             # Direct result (synchronous operation)
                             embeddings = result_data.get("embeddings", [])
@@ -428,116 +422,124 @@ class GPUAISSEClient:
                 )
                 raise RuntimeError(f"Failed to call GPU-AI MCP: {e}")
     
+    async def _get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an embedding task's status via the embeddings_get_status tool.
+        
+        Args:
+            task_id: Task ID from embeddings_generate
+        
+        Returns:
+            dict: Tool result, or None if no usable response arrived
+        
+        Raises:
+            RuntimeError: If the server reports an error
+        """
+        http_client = await self._get_http_client()
+        
+        # Poll status via POST to /mcp endpoint (Streamable HTTP)
+        self._message_id += 1
+        poll_message_id = self._message_id
+        
+        poll_request = {
+            "jsonrpc": "2.0",
+            "method": "tools/call",
+            "params": {
+                "name": "embeddings_get_status",
+                "arguments": {
+                    "task_id": task_id
+                }
+            },
+            "id": poll_message_id
+        }
+        
+        result = None
+        try:
+            async with http_client.stream(
+                "POST",
+                self.mcp_url,
+                json=poll_request,
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "text/event-stream",
+                },
+                timeout=httpx.Timeout(10.0, read=10.0),
+            ) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "").lower()
+                
+                if "text/event-stream" in content_type or not content_type:
+                    # Parse SSE stream for response
+                    async for event in self._parse_sse_stream(response):
+                        if event.get("id") == poll_message_id:
+                            result = event
+                            break
+                else:
+                    # Try parsing as JSON
+                    try:
+                        result_bytes = await response.aread()
+                        result = json.loads(result_bytes.decode('utf-8'))
+                    except json.JSONDecodeError:
+                        return None
+        except httpx.HTTPError as e:
+            logger.warning(
+                "Error polling GPU-AI MCP task status",
+                task_id=task_id,
+                error=str(e)
+            )
+            return None
+        
+        if result is None:
+            return None
+        
+        if "error" in result:
+            error_msg = result["error"].get("message", str(result["error"]))
+            raise RuntimeError(f"GPU-AI MCP error: {error_msg}")
+        
+        return result.get("result", {})
+    
+    async def _forward_events(self, events: AsyncIterator[Dict[str, Any]]) -> None:
+        """
+        Hand events pushed on a request's SSE stream to the task tracker.
+        
+        Args:
+            events: Remaining events of the embeddings_generate response stream
+        """
+        try:
+            async for event in events:
+                self.tracker.handle_event(event)
+        except httpx.HTTPError as e:
+            logger.debug("GPU-AI MCP event stream closed", error=str(e))
+    
     async def _wait_for_embeddings(
         self,
         task_id: str,
-        max_wait_seconds: int = 60,
-        poll_interval: float = 1.0,
+        events: Optional[AsyncIterator[Dict[str, Any]]] = None,
+        max_wait_seconds: Optional[float] = None,
     ) -> List[List[float]]:
         """
         Wait for embedding task to complete.
         
+        Result events pushed on the request's still-open SSE stream complete
+        the task immediately; status polling covers servers that push none.
+        
         Args:
             task_id: Task ID from embeddings_generate
-            max_wait_seconds: Maximum time to wait
-            poll_interval: Polling interval
-            
+            events: Remaining events of the request's SSE stream, if open
+            max_wait_seconds: Maximum time to wait (default: EMBEDDING_GPU_AI_TASK_TIMEOUT_SECONDS)
+        
         Returns:
             List of embedding vectors
         """
-        http_client = await self._get_http_client()
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait_seconds:
-            try:
-                # Poll status via POST to /mcp endpoint (Streamable HTTP)
-                self._message_id += 1
-                poll_message_id = self._message_id
-                
-                poll_request = {
-                    "jsonrpc": "2.0",
-                    "method": "tools/call",
-                    "params": {
-                        "name": "embeddings_get_status",
-                        "arguments": {
-                            "task_id": task_id
-                        }
-                    },
-                    "id": poll_message_id
-                }
-                
-                async with http_client.stream(
-                    "POST",
-                    self.mcp_url,
-                    json=poll_request,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "text/event-stream",
-                    },
-                    timeout=httpx.Timeout(10.0, read=10.0),
-                ) as response:
-                
-                    response.raise_for_status()
-                    content_type = response.headers.get("content-type", "").lower()
-                    
-                    result = None
-                    if "text/event-stream" in content_type or not content_type:
-                        # Parse SSE stream for response
-                        async for event in self._parse_sse_stream(response):
-                            if event.get("id") == poll_message_id:
-                                result = event
-                                break
-                    else:
-                        # Try parsing as JSON
-                        try:
-                            result_bytes = await response.aread()
-                            result = json.loads(result_bytes.decode('utf-8'))
-                        except json.JSONDecodeError:
-                            await asyncio.sleep(poll_interval)
-                            continue
-                    
-                    if result is None:
-                        await asyncio.sleep(poll_interval)
-                        continue
-                    
-                    if "error" in result:
-                        error_msg = result["error"].get("message", str(result["error"]))
-                        raise RuntimeError(f"GPU-AI MCP error: {error_msg}")
-                    
-                    result_data = result.get("result", {})
-                    status_data = result_data.get("data", {})
-                    if not status_data:
-                        status_data = result_data
-                    
-                    status = status_data.get("status")
-                    
-                    if status == "completed":
-                        embeddings = status_data.get("result", {}).get("embeddings", [])
-                        if not embeddings:
-                            embeddings = status_data.get("embeddings", [])
-                        if not embeddings:
-                            embeddings = result_data.get("embeddings", [])
-                        
-                        if not embeddings:
-                            raise RuntimeError(f"No embeddings in result. Status: {status_data}")
-                        
-                        return embeddings
-                    
-                    elif status == "failed":
-                        error = status_data.get("error") or status_data.get("message")
-                        raise RuntimeError(f"Embedding generation failed: {error}")
-                
-                await asyncio.sleep(poll_interval)
-                
-            except httpx.HTTPError as e:
-                logger.warning(
-                    "Error polling GPU-AI MCP task status",
-                    task_id=task_id,
-                    error=str(e)
-                )
-                await asyncio.sleep(poll_interval)
-        
-        raise RuntimeError(f"Embedding generation timed out after {max_wait_seconds} seconds")
+        forwarder = asyncio.create_task(self._forward_events(events)) if events is not None else None
+        try:
+            return await self.tracker.wait(
+                task_id,
+                timeout=max_wait_seconds or embedding_settings.gpu_ai_task_timeout_seconds,
+            )
+        finally:
+            if forwarder is not None:
+                forwarder.cancel()
     
     async def close(self):
         """Close HTTP client."""
@@ -0,0 +1,294 @@
+"""
+Completion tracking for asynchronous GPU-AI embedding tasks.
+
+embeddings_generate may answer with a task_id instead of embeddings. The
+tracker resolves such tasks from whichever signal arrives first:
+
+- a result event pushed on the SSE stream of the originating request
+  (handle_event), or
+- one shared status poll loop serving every outstanding task, polling each
+  task with jittered exponential backoff (10ms, 20ms, 40ms, ... capped),
+  so a 30ms GPU job is picked up within a few milliseconds of finishing
+  instead of after a fixed one-second interval.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def poll_delays(
+    initial_seconds: float,
+    max_seconds: float,
+    jitter: float = 0.2,
+    multiplier: float = 2.0,
+) -> Iterator[float]:
+    """
+    Generate status poll delays with exponential backoff and jitter.
+
+    Args:
+        initial_seconds: First delay
+        max_seconds: Delay cap
+        jitter: Relative random spread of each delay (0.2 = +/-20%)
+        multiplier: Growth factor between delays
+
+    Yields:
+        float: Delay in seconds before the next poll
+    """
+    delay = initial_seconds
+    while True:
+        yield delay * (1 + jitter * (2 * random.random() - 1))
+        delay = min(delay * multiplier, max_seconds)
+
+
+def get_task_status(payload: Any) -> Optional[Dict[str, Any]]:
+    """
+    Extract a task status from a tool result or pushed event.
+
+    Accepts a JSON-RPC result ({"data": {...}} or the status itself), a
+    JSON-RPC message carrying it under "result" or "params", or an SSE event
+    dict carrying it under "data".
+
+    Args:
+        payload: Tool result, JSON-RPC message or SSE event
+
+    Returns:
+        dict: Status with at least "status", or None if payload has none
+    """
+    if not isinstance(payload, dict):
+        return None
+    if "status" in payload:
+        return payload
+
+    for key in ("result", "params"):
+        if isinstance(payload.get(key), dict):
+            return get_task_status(payload[key])
+
+    if isinstance(payload.get("data"), dict):
+        return get_task_status(payload["data"])
+    return None
+
+
+def get_task_embeddings(status_data: Dict[str, Any]) -> List[List[float]]:
+    """
+    Get the embeddings of a completed task.
+
+    Args:
+        status_data: Task status
+
+    Returns:
+        list: Embedding vectors (empty if the status carries none)
+    """
+    result = status_data.get("result")
+    if isinstance(result, dict) and result.get("embeddings"):
+        return result["embeddings"]
+    return status_data.get("embeddings") or []
+
+
+class _TrackedTask:
+    """Completion future and poll schedule of one outstanding task."""
+
+    def __init__(self, future: asyncio.Future, delays: Iterator[float]):
+        self.future = future
+        self.delays = delays
+        self.next_poll_at = time.monotonic() + next(delays)
+
+
+class GPUAITaskTracker:
+    """Resolves GPU-AI embedding tasks from pushed events or a shared poll loop."""
+
+    def __init__(
+        self,
+        fetch_status: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+        initial_poll_ms: float = 10.0,
+        max_poll_ms: float = 250.0,
+        jitter: float = 0.2,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            fetch_status: Coroutine returning a task's embeddings_get_status
+                result, or None after a transient error (retried later);
+                raising fails the task
+            initial_poll_ms: Delay before a task's first status poll
+            max_poll_ms: Cap of the delay between polls of one task
+            jitter: Relative random spread of poll delays
+        """
+        self.fetch_status = fetch_status
+        self.initial_poll_ms = initial_poll_ms
+        self.max_poll_ms = max_poll_ms
+        self.jitter = jitter
+
+        self._tasks: Dict[str, _TrackedTask] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self._pushed = 0
+        self._polled = 0
+        self._polls = 0
+        self._timeouts = 0
+
+    def track(self, task_id: str) -> asyncio.Future:
+        """
+        Start tracking a task.
+
+        Args:
+            task_id: Task ID returned by embeddings_generate
+
+        Returns:
+            asyncio.Future: Resolves to the task's embeddings
+        """
+        tracked = self._tasks.get(task_id)
+        if tracked is None:
+            loop = asyncio.get_running_loop()
+            delays = poll_delays(self.initial_poll_ms / 1000, self.max_poll_ms / 1000, self.jitter)
+            tracked = self._tasks[task_id] = _TrackedTask(loop.create_future(), delays)
+
+            if self._poller is None or self._poller.done() or self._poller.get_loop() is not loop:
+                self._wakeup = asyncio.Event()
+                self._poller = loop.create_task(self._poll_loop())
+            else:
+                # Let the running loop schedule the new task's first poll
+                self._wakeup.set()
+        return tracked.future
+
+    async def wait(self, task_id: str, timeout: float) -> List[List[float]]:
+        """
+        Wait for a task's embeddings.
+
+        Args:
+            task_id: Task ID returned by embeddings_generate
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            List of embedding vectors
+
+        Raises:
+            RuntimeError: If the task fails or times out
+        """
+        future = self.track(task_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise RuntimeError(f"Embedding generation timed out after {timeout} seconds")
+        finally:
+            self._tasks.pop(task_id, None)
+
+    def handle_event(self, payload: Any) -> bool:
+        """
+        Resolve a tracked task from a pushed status event.
+
+        Args:
+            payload: Event from the SSE stream
+
+        Returns:
+            bool: True if the event completed or failed a tracked task
+        """
+        status_data = get_task_status(payload)
+        if status_data is None:
+            return False
+
+        tracked = self._tasks.get(status_data.get("task_id"))
+        if tracked is None or tracked.future.done():
+            return False
+
+        if self._resolve(tracked, status_data):
+            self._pushed += 1
+            return True
+        return False
+
+    def _resolve(self, tracked: _TrackedTask, status_data: Dict[str, Any]) -> bool:
+        """
+        Complete a task's future if its status is final.
+
+        Args:
+            tracked: Tracked task
+            status_data: Task status
+
+        Returns:
+            bool: True if the status was final
+        """
+        status = status_data.get("status")
+
+        if status == "completed":
+            embeddings = get_task_embeddings(status_data)
+            if embeddings:
+                tracked.future.set_result(embeddings)
+            else:
+                tracked.future.set_exception(
+                    RuntimeError(f"No embeddings in completed task result. Status data: {status_data}")
+                )
+            return True
+
+        if status == "failed":
+            error = status_data.get("error") or status_data.get("message")
+            tracked.future.set_exception(RuntimeError(f"Embedding generation failed: {error}"))
+            return True
+
+        # Still queued or processing
+        return False
+
+    async def _poll(self, task_id: str, tracked: _TrackedTask) -> None:
+        """Poll one task's status and schedule its next poll if still running."""
+        self._polls += 1
+        try:
+            result = await self.fetch_status(task_id)
+        except Exception as e:
+            if not tracked.future.done():
+                tracked.future.set_exception(e)
+            return
+
+        if tracked.future.done():
+            # A pushed event resolved the task while the poll was in flight
+            return
+
+        status_data = get_task_status(result)
+        if status_data is not None and self._resolve(tracked, status_data):
+            self._polled += 1
+            return
+
+        tracked.next_poll_at = time.monotonic() + next(tracked.delays)
+
+    async def _poll_loop(self) -> None:
+        """Poll every due task concurrently until no task is outstanding."""
+        while True:
+            pending = {
+                task_id: tracked for task_id, tracked in self._tasks.items() if not tracked.future.done()
+            }
+            if not pending:
+                return
+
+            now = time.monotonic()
+            due = [(task_id, tracked) for task_id, tracked in pending.items() if tracked.next_poll_at <= now]
+            if due:
+                await asyncio.gather(*(self._poll(task_id, tracked) for task_id, tracked in due))
+                continue
+
+            self._wakeup.clear()
+            delay = min(tracked.next_poll_at for tracked in pending.values()) - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get tracker statistics.
+
+        Returns:
+            dict: Outstanding tasks, completions by source, polls and timeouts
+        """
+        return {
+            "outstanding_tasks": len(self._tasks),
+            "completed_by_push": self._pushed,
+            "completed_by_poll": self._polled,
+            "status_polls": self._polls,
+            "timeouts": self._timeouts,
+        }
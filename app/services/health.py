@@ -11,6 +11,7 @@ from app.services.minio_client import check_minio_health
 from app.services.meilisearch_client import check_meilisearch_health
 from app.services.mem0_client import mem0_client
 from app.services.langfuse_client import check_langfuse_health
+from app.services.faiss_executor import faiss_executor
 from app.services.faiss_manager import faiss_manager
 from pathlib import Path
 
@@ -84,6 +85,8 @@ async def check_faiss_health() -> Dict[str, Any]:
             return {
                 "status": True,
                 "message": f"FAISS is operational (Index path: {index_path})",
+                "index_cache": faiss_manager.get_cache_stats(),
+                "executor": faiss_executor.stats(),
             }
         except Exception as e:
             return {
@@ -43,17 +43,21 @@ class HybridSearchService:
         tenant_id: UUID,
         query_text: str,
         k: int,
+        filters: Optional[Dict[str, Any]] = None,
     ) -> Tuple[List[Tuple[UUID, float]], bool]:
         """
         Perform vector search with timeout and error handling.
         
+        Filters are applied inside the FAISS search, so up to k matching
+        documents come back without over-fetching.
+        
         Returns:
             Tuple of (results, success_flag)
         """
         try:
             start_time = time.time()
             results = await asyncio.wait_for(
-                self.vector_service.search(tenant_id, query_text, k),
+                self.vector_service.search(tenant_id, query_text, k, filters),
                 timeout=self.fallback_timeout_ms / 1000.0,
             )
             elapsed_ms = (time.time() - start_time) * 1000
@@ -93,6 +97,9 @@ class HybridSearchService:
         """
         Perform keyword search with timeout and error handling.
         
+        Filters Meilisearch cannot apply (e.g. date ranges) are enforced on
+        its hits with the in-memory FAISS attribute postings.
+        
         Returns:
             Tuple of (results, success_flag)
         """
@@ -102,6 +109,7 @@ class HybridSearchService:
                 self.keyword_service.search(tenant_id, query_text, k, filters),
                 timeout=self.fallback_timeout_ms / 1000.0,
             )
+            results = await self.vector_service.filter_results(tenant_id, results, filters)
             elapsed_ms = (time.time() - start_time) * 1000
             
             if elapsed_ms > self.fallback_timeout_ms:
@@ -224,7 +232,7 @@ class HybridSearchService:
         )
         
         # Perform both searches concurrently
-        vector_task = self._perform_vector_search(tenant_id, query_text, k)
+        vector_task = self._perform_vector_search(tenant_id, query_text, k, filters)
         keyword_task = self._perform_keyword_search(tenant_id, query_text, k, filters)
         
         vector_results, vector_success = await vector_task
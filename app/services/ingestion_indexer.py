@@ -0,0 +1,372 @@
+"""
+Background indexing of queued documents.
+
+rag_ingest commits the document row together with an ingestion_outbox entry
+and returns. IngestionIndexer workers drain the outbox: each worker claims a
+batch of due entries (FOR UPDATE SKIP LOCKED, so the workers of every
+process share one queue), then chunks, embeds, uploads and indexes them per
+tenant with the batch ingestion helpers. Failed entries are retried with
+exponential backoff up to indexer_max_attempts; entries of a worker that
+dies mid-batch are claimed again once their lease expires.
+
+Entries of streamed uploads carry a MinIO object reference instead of the
+content; the indexer reads the object back in chunks and does not upload
+it again.
+
+Delivery is at least once. MinIO, FAISS and Meilisearch writes are keyed by
+document ID, so indexing an entry twice is harmless.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import structlog
+
+from app.config.ingestion import ingestion_settings
+from app.db.connection import get_db_session
+from app.db.models.ingestion_outbox import (
+    OUTBOX_CANCELLED,
+    OUTBOX_FAILED,
+    OUTBOX_INDEXED,
+    OUTBOX_PENDING,
+    OUTBOX_SUPERSEDED,
+    IngestionOutbox,
+)
+from app.db.repositories.document_repository import DocumentRepository
+from app.db.repositories.ingestion_outbox_repository import IngestionOutboxRepository
+from app.mcp.middleware.rbac import UserRole
+from app.mcp.middleware.tenant import tenant_context
+from app.services.batch_ingestion import (
+    STATUS_SUCCESS,
+    IngestionItem,
+    embed_items,
+    index_items,
+    pending_items,
+    upload_items,
+    write_chunks,
+)
+from app.services.content_stream import read_text
+from app.services.faiss_manager import document_id_to_faiss_id
+from app.services.minio_client import stream_document_content
+
+logger = structlog.get_logger(__name__)
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Delay before retrying an entry, doubling per failed attempt.
+
+    Args:
+        attempts: Attempts made so far (1 after the first failure)
+
+    Returns:
+        float: Delay in seconds
+    """
+    delay = ingestion_settings.indexer_retry_base_seconds * (2 ** max(0, attempts - 1))
+    return min(delay, ingestion_settings.indexer_retry_max_seconds)
+
+
+class IngestionIndexer:
+    """Pool of background workers draining the ingestion outbox."""
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+        self._batches = 0
+        self._indexed = 0
+        self._retried = 0
+        self._failed = 0
+        self._skipped = 0
+
+    def start(self) -> None:
+        """Start the workers on the running event loop (no-op if the outbox is disabled)."""
+        if not ingestion_settings.outbox_enabled or self._workers:
+            return
+        loop = asyncio.get_running_loop()
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            loop.create_task(self._worker_loop(worker))
+            for worker in range(max(1, ingestion_settings.indexer_workers))
+        ]
+        logger.info("Ingestion indexer started", workers=len(self._workers))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the workers, letting running batches finish.
+
+        Batches still running after the timeout are cancelled; their entries
+        are retried once their lease expires.
+
+        Args:
+            timeout: Seconds to wait for running batches
+        """
+        if not self._workers:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+        logger.info("Ingestion indexer stopped")
+
+    def notify(self) -> None:
+        """Wake idle workers after a document was queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get indexer statistics.
+
+        Returns:
+            dict: Running workers and entry counts since start
+        """
+        return {
+            "enabled": ingestion_settings.outbox_enabled,
+            "workers": sum(1 for task in self._workers if not task.done()),
+            "batches": self._batches,
+            "indexed": self._indexed,
+            "retried": self._retried,
+            "failed": self._failed,
+            "skipped": self._skipped,
+        }
+
+    async def _worker_loop(self, worker: int) -> None:
+        """Drain due entries, then wait for a new document or the poll interval."""
+        while not self._stopping:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error("Ingestion indexer batch failed", worker=worker, error=str(e))
+                claimed = 0
+
+            # A full batch suggests more entries are due
+            if claimed >= ingestion_settings.indexer_batch_size or self._stopping:
+                continue
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    ingestion_settings.indexer_poll_interval_seconds,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_once(self) -> int:
+        """
+        Claim one batch of due entries and index it.
+
+        Returns:
+            int: Entries claimed
+        """
+        entries = await self._claim()
+        if not entries:
+            return 0
+        self._batches += 1
+
+        by_tenant: Dict[UUID, List[IngestionOutbox]] = {}
+        for entry in entries:
+            by_tenant.setdefault(entry.tenant_id, []).append(entry)
+
+        for tenant_id, tenant_entries in by_tenant.items():
+            try:
+                await self._index_tenant(tenant_id, tenant_entries)
+            except Exception as e:
+                # Left processing: retried once the lease expires
+                logger.error(
+                    "Error indexing queued documents",
+                    tenant_id=str(tenant_id),
+                    entries=len(tenant_entries),
+                    error=str(e),
+                )
+        return len(entries)
+
+    async def _claim(self) -> List[IngestionOutbox]:
+        """Claim due entries of every tenant, bypassing tenant RLS."""
+        with tenant_context(role=UserRole.UBER_ADMIN.value):
+            async for session in get_db_session():
+                entries = await IngestionOutboxRepository(session).claim(
+                    ingestion_settings.indexer_batch_size,
+                    ingestion_settings.indexer_lease_seconds,
+                )
+                await session.commit()
+                return entries
+        return []
+
+    async def _index_tenant(self, tenant_id: UUID, entries: List[IngestionOutbox]) -> None:
+        """
+        Index one tenant's claimed entries and record their outcome.
+
+        Args:
+            tenant_id: Tenant ID
+            entries: Claimed entries of the tenant
+        """
+        with tenant_context(tenant_id=tenant_id):
+            async for session in get_db_session():
+                outbox_repo = IngestionOutboxRepository(session)
+                doc_repo = DocumentRepository(session)
+                entries = await self._current_entries(outbox_repo, doc_repo, tenant_id, entries)
+
+                items = [self._to_item(position, entry) for position, entry in enumerate(entries)]
+                await self._read_contents(tenant_id, items)
+                await self._index_items(tenant_id, items)
+                await write_chunks(
+                    doc_repo, tenant_id, [item for item in items if item.status == STATUS_SUCCESS]
+                )
+                await self._record(outbox_repo, entries, items)
+                await session.commit()
+
+    async def _current_entries(
+        self,
+        outbox_repo: IngestionOutboxRepository,
+        doc_repo: DocumentRepository,
+        tenant_id: UUID,
+        entries: List[IngestionOutbox],
+    ) -> List[IngestionOutbox]:
+        """
+        Drop entries of deleted documents and of superseded versions.
+
+        Args:
+            outbox_repo: Outbox repository of the tenant's session
+            doc_repo: Document repository of the tenant's session
+            tenant_id: Tenant ID
+            entries: Claimed entries of the tenant
+
+        Returns:
+            Entries holding the newest version of a live document
+        """
+        document_ids = list({entry.document_id for entry in entries})
+        live = set((await doc_repo.get_document_ids_by_faiss_ids(
+            tenant_id, [document_id_to_faiss_id(document_id) for document_id in document_ids]
+        )).values())
+        latest = await outbox_repo.get_latest_by_document_ids(tenant_id, document_ids)
+
+        current, cancelled, superseded = [], [], []
+        for entry in entries:
+            if entry.document_id not in live:
+                cancelled.append(entry.outbox_id)
+            elif latest[entry.document_id].outbox_id != entry.outbox_id:
+                superseded.append(entry.outbox_id)
+            else:
+                current.append(entry)
+
+        await outbox_repo.set_status(cancelled, OUTBOX_CANCELLED)
+        await outbox_repo.set_status(superseded, OUTBOX_SUPERSEDED)
+        self._skipped += len(cancelled) + len(superseded)
+        return current
+
+    @staticmethod
+    def _to_item(position: int, entry: IngestionOutbox) -> IngestionItem:
+        """Build the batch ingestion item of an entry."""
+        item = IngestionItem(position)
+        item.document_id = entry.document_id
+        item.title = entry.title
+        item.text = entry.content
+        if entry.content is None:
+            item.minio_object = entry.content_object
+        item.metadata = entry.metadata_json or {}
+        item.created_at = entry.document_created_at
+        return item
+
+    @staticmethod
+    async def _read_contents(tenant_id: UUID, items: List[IngestionItem]) -> None:
+        """
+        Read the content of streamed uploads back from MinIO.
+
+        A failed read fails its item only.
+
+        Args:
+            tenant_id: Tenant ID
+            items: Items of the tenant's current entries
+        """
+        for item in items:
+            if item.text is not None:
+                continue
+            if not item.minio_object:
+                item.fail("Queued document has no content")
+                continue
+            try:
+                item.text = await read_text(stream_document_content(
+                    tenant_id, item.minio_object, ingestion_settings.stream_read_chunk_bytes
+                ))
+            except Exception as e:
+                item.fail(f"Content read failed: {e}")
+
+    @staticmethod
+    async def _index_items(tenant_id: UUID, items: List[IngestionItem]) -> None:
+        """
+        Embed, upload and index items; failures fail the affected items.
+
+        Args:
+            tenant_id: Tenant ID
+            items: Items of the tenant's current entries
+        """
+        pending = pending_items(items)
+        await asyncio.gather(
+            embed_items(tenant_id, pending),
+            upload_items(tenant_id, [item for item in pending if item.minio_object is None]),
+        )
+
+        pending = pending_items(items)
+        if not pending:
+            return
+        try:
+            await index_items(tenant_id, pending)
+        except Exception as e:
+            for item in pending:
+                item.fail(f"Indexing failed: {e}")
+            return
+        for item in pending:
+            item.status = STATUS_SUCCESS
+
+    async def _record(
+        self,
+        outbox_repo: IngestionOutboxRepository,
+        entries: List[IngestionOutbox],
+        items: List[IngestionItem],
+    ) -> None:
+        """
+        Mark indexed entries and reschedule or fail the others.
+
+        Args:
+            outbox_repo: Outbox repository of the tenant's session
+            entries: Indexed entries
+            items: Items of the entries, in the same order
+        """
+        indexed = []
+        now = datetime.now(timezone.utc)
+        for entry, item in zip(entries, items):
+            if item.status == STATUS_SUCCESS:
+                indexed.append(entry.outbox_id)
+            elif entry.attempts >= ingestion_settings.indexer_max_attempts:
+                self._failed += 1
+                logger.error(
+                    "Queued document could not be indexed",
+                    tenant_id=str(entry.tenant_id),
+                    document_id=str(entry.document_id),
+                    attempts=entry.attempts,
+                    error=item.error,
+                )
+                await outbox_repo.set_status([entry.outbox_id], OUTBOX_FAILED, error=item.error)
+            else:
+                self._retried += 1
+                await outbox_repo.set_status(
+                    [entry.outbox_id],
+                    OUTBOX_PENDING,
+                    error=item.error,
+                    retry_at=now + timedelta(seconds=retry_delay(entry.attempts)),
+                )
+
+        await outbox_repo.set_status(indexed, OUTBOX_INDEXED)
+        self._indexed += len(indexed)
+
+
+# Global ingestion indexer instance
+ingestion_indexer = IngestionIndexer()
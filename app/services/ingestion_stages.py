@@ -0,0 +1,129 @@
+"""
+Stage timing and compensation for document ingestion.
+
+Ingestion writes to several stores that share no transaction. rag_ingest
+and rag_ingest_batch run the independent stages concurrently:
+
+    validate ──┬── embed ─────────┬── FAISS add ────────┬── commit
+               ├── MinIO upload ──┤                     │
+               └── dedupe/create ─┘── Meilisearch add ──┘
+
+so a document's latency approaches its slowest stage rather than the sum
+of all of them. StageTimer records each stage's wall time. When a stage
+fails, undo_ingestion() removes what the other stages already wrote for
+new documents before the database transaction rolls back.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, TypeVar
+from uuid import UUID
+
+import structlog
+
+from app.services.faiss_executor import faiss_executor
+from app.services.faiss_manager import faiss_manager
+from app.services.meilisearch_client import remove_documents_from_index
+from app.services.minio_client import delete_document_contents
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """Wall times of the stages of one ingestion."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._running: Dict[str, float] = {}
+        self._timings: Dict[str, float] = {}
+
+    def start(self, stage: str) -> None:
+        """Mark the start of a stage."""
+        self._running[stage] = time.perf_counter()
+
+    def stop(self, stage: str) -> None:
+        """Record the wall time of a started stage."""
+        started = self._running.pop(stage, None)
+        if started is not None:
+            self._timings[stage] = (time.perf_counter() - started) * 1000
+
+    async def run(self, stage: str, awaitable: Awaitable[T]) -> T:
+        """
+        Await a stage, recording its wall time even if it fails.
+
+        Args:
+            stage: Stage name
+            awaitable: Stage coroutine
+
+        Returns:
+            The stage's result
+        """
+        self.start(stage)
+        try:
+            return await awaitable
+        finally:
+            self.stop(stage)
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Get the recorded timings.
+
+        Returns:
+            dict: Milliseconds per stage, plus total_ms since the timer started
+        """
+        timings = {f"{stage}_ms": round(elapsed, 2) for stage, elapsed in self._timings.items()}
+        timings["total_ms"] = round((time.perf_counter() - self._started) * 1000, 2)
+        return timings
+
+
+async def undo_ingestion(
+    tenant_id: UUID,
+    document_ids: List[UUID],
+    minio: bool = False,
+    faiss: bool = False,
+    meilisearch: bool = False,
+) -> None:
+    """
+    Remove what completed stages wrote for documents whose ingestion failed.
+
+    Best effort: a failed removal is logged, not raised, so the original
+    error reaches the caller.
+
+    Args:
+        tenant_id: Tenant ID
+        document_ids: New documents that will not be committed
+        minio: Delete the uploaded content
+        faiss: Remove the FAISS vectors
+        meilisearch: Remove the Meilisearch documents
+    """
+    if not document_ids:
+        return
+
+    undo: Dict[str, Awaitable[Any]] = {}
+    if minio:
+        undo["minio"] = delete_document_contents(tenant_id, document_ids)
+    if faiss:
+        undo["faiss"] = faiss_executor.run(faiss_manager.remove_documents, tenant_id, document_ids)
+    if meilisearch:
+        undo["meilisearch"] = remove_documents_from_index(
+            str(tenant_id), [str(document_id) for document_id in document_ids]
+        )
+
+    results = await asyncio.gather(*undo.values(), return_exceptions=True)
+    for store, result in zip(undo, results):
+        if isinstance(result, Exception):
+            logger.error(
+                "Error undoing failed ingestion",
+                tenant_id=str(tenant_id),
+                store=store,
+                documents=len(document_ids),
+                error=str(result),
+            )
+    logger.warning(
+        "Failed ingestion undone",
+        tenant_id=str(tenant_id),
+        documents=len(document_ids),
+        stores=list(undo),
+    )
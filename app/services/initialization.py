@@ -3,10 +3,15 @@ Service initialization and cleanup functions.
 """
 
 from app.db.connection import close_database_connections
+from app.services.embedding_providers import embedding_provider_registry
+from app.services.faiss_executor import faiss_executor
+from app.services.faiss_manager import faiss_manager
+from app.services.ingestion_indexer import ingestion_indexer
 from app.services.langfuse_client import create_langfuse_client
 from app.services.meilisearch_client import create_meilisearch_client
 from app.services.mem0_client import mem0_client
 from app.services.minio_client import create_minio_client, initialize_minio_buckets
+from app.services.openai_embedding_backend import openai_embedding_backend
 from app.services.redis_client import close_redis_connections, get_redis_client
 
 
@@ -30,6 +35,9 @@ async def initialize_all_services():
     
     # Initialize Langfuse
     create_langfuse_client()
+    
+    # Start background indexers draining the ingestion outbox
+    ingestion_indexer.start()
 
 
 async def cleanup_all_services():
@@ -37,6 +45,9 @@ async def cleanup_all_services():
     Cleanup all infrastructure service connections.
     Called during application shutdown.
     """
+    # Stop background indexers before the connections they use
+    await ingestion_indexer.stop()
+    
     # Close database connections
     await close_database_connections()
     
@@ -45,5 +56,16 @@ async def cleanup_all_services():
     
     # Close Mem0 connections
     await mem0_client.close()
+    
+    # Close the OpenAI embedding connection pool
+    await openai_embedding_backend.close()
+    
+    # Stop in-process embedding model pools
+    embedding_provider_registry.close()
+    
+    # Let running FAISS calls finish, then snapshot indices with vectors
+    # still only in the vector log
+    faiss_executor.shutdown()
+    faiss_manager.close()
 
 
@@ -151,6 +151,60 @@ async def add_document_to_index(
         raise
 
 
+async def add_documents_to_index(tenant_id: str, documents: List[Dict[str, Any]]) -> None:
+    """
+    Add many documents to the tenant's Meilisearch index with one task.
+    
+    Args:
+        tenant_id: Tenant ID (UUID string)
+        documents: Documents with id, title, content and optional metadata
+        
+    Raises:
+        MeilisearchError: If document addition fails
+    """
+    if not documents:
+        return
+    
+    client = create_meilisearch_client()
+    index_name = await get_tenant_index_name(tenant_id)
+    
+    try:
+        # Get or create index
+        try:
+            index = client.get_index(index_name)
+        except MeilisearchError:
+            # Index doesn't exist, create it
+            await create_tenant_index(tenant_id)
+            index = client.get_index(index_name)
+        
+        index.add_documents([
+            {
+                "id": document["id"],
+                "tenant_id": tenant_id,
+                "title": document["title"],
+                "content": document["content"],
+                "metadata": document.get("metadata") or {},
+            }
+            for document in documents
+        ])
+        
+        logger.info(
+            "Documents added to Meilisearch index",
+            tenant_id=tenant_id,
+            document_count=len(documents),
+            index_name=index_name,
+        )
+        
+    except MeilisearchError as e:
+        logger.error(
+            "Error adding documents to Meilisearch index",
+            tenant_id=tenant_id,
+            document_count=len(documents),
+            error=str(e),
+        )
+        raise
+
+
 async def remove_document_from_index(
     tenant_id: str,
     document_id: str,
@@ -201,6 +255,43 @@ async def remove_document_from_index(
             raise
 
 
+async def remove_documents_from_index(tenant_id: str, document_ids: List[str]) -> None:
+    """
+    Remove many documents from the tenant's Meilisearch index with one task.
+    
+    Args:
+        tenant_id: Tenant ID (UUID string)
+        document_ids: Document IDs (UUID strings)
+        
+    Raises:
+        MeilisearchError: If document removal fails
+    """
+    if not document_ids:
+        return
+    
+    client = create_meilisearch_client()
+    index_name = await get_tenant_index_name(tenant_id)
+    
+    try:
+        client.get_index(index_name).delete_documents(list(document_ids))
+        
+        logger.info(
+            "Documents removed from Meilisearch index",
+            tenant_id=tenant_id,
+            document_count=len(document_ids),
+            index_name=index_name,
+        )
+        
+    except MeilisearchError as e:
+        logger.error(
+            "Error removing documents from Meilisearch index",
+            tenant_id=tenant_id,
+            document_count=len(document_ids),
+            error=str(e),
+        )
+        raise
+
+
 async def search_documents(
     tenant_id: str,
     query: str,
@@ -22,6 +22,7 @@ from mem0 import Memory
 from mem0 import MemoryClient
 
 from app.config.mem0 import mem0_settings
+from app.services.query_embedding_context import ScopedEmbedder
 from app.services.redis_client import get_redis_client
 from app.utils.redis_keys import RedisKeyPatterns, prefix_memory_key
 from app.mcp.middleware.tenant import get_tenant_id_from_context, get_user_id_from_context, get_role_from_context
@@ -103,6 +104,8 @@ class Mem0Client:
                 
                 self.client = Memory()
                 self._is_platform = False
+                # Reuse the request's query vector when Mem0 embeds the same query with the same model
+                self.client.embedding_model = ScopedEmbedder(self.client.embedding_model)
                 logger.info("Mem0 Open Source client initialized (local/self-hosted)")
             
             # Test connection with a lightweight operation
@@ -2,12 +2,14 @@
 MinIO (S3-compatible) client setup with tenant-scoped bucket configuration.
 """
 
-from typing import Optional
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Union
 from uuid import UUID
 
 import structlog
 from minio import Minio
 from minio.error import S3Error
+from minio.helpers import MIN_PART_SIZE
 
 from app.config.minio import minio_settings
 from app.utils.minio_buckets import (
@@ -155,14 +157,17 @@ async def upload_document_content(
     # Object name: documents/{document_id}
     object_name = f"documents/{document_id}"
     
-    # Upload content
-    content_stream = BytesIO(content)
-    client.put_object(
-        bucket_name,
-        object_name,
-        content_stream,
-        length=len(content),
-        content_type=content_type,
+    # Upload content on the default thread pool: the MinIO client is
+    # blocking, and ingestion embeds concurrently with the upload
+    await asyncio.get_running_loop().run_in_executor(
+        None,
+        lambda: client.put_object(
+            bucket_name,
+            object_name,
+            BytesIO(content),
+            length=len(content),
+            content_type=content_type,
+        ),
     )
     
     logger.info(
@@ -177,6 +182,303 @@ async def upload_document_content(
     return object_name
 
 
+class _AsyncIterableReader:
+    """
+    Blocking file-like reader over an async byte stream.
+    
+    Lets the blocking MinIO client consume a stream produced on the event
+    loop: read() runs on a worker thread and waits for the loop to produce
+    the next chunk, buffering no more than the requested size plus one chunk.
+    """
+    
+    def __init__(self, chunks: AsyncIterable[bytes], loop: asyncio.AbstractEventLoop):
+        self._chunks = chunks.__aiter__()
+        self._loop = loop
+        self._buffer = bytearray()
+        self._exhausted = False
+    
+    async def _next_chunk(self) -> Optional[bytes]:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+    
+    def read(self, size: int = -1) -> bytes:
+        while not self._exhausted and (size < 0 or len(self._buffer) < size):
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if chunk is None:
+                self._exhausted = True
+            else:
+                self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+async def upload_document_stream(
+    tenant_id: UUID,
+    document_id: UUID,
+    chunks: AsyncIterable[bytes],
+    content_type: str = "text/plain",
+    part_size: int = MIN_PART_SIZE,
+) -> str:
+    """
+    Upload document content to tenant-scoped MinIO bucket as it is produced.
+    
+    The content is sent as a multipart upload of part_size parts (a single
+    PUT if it fits in one), so at most one part is held in memory. If the
+    stream raises, the multipart upload is aborted and an existing object
+    of the document is left unchanged.
+    
+    Args:
+        tenant_id: Tenant ID
+        document_id: Document ID
+        chunks: Document content as an async byte stream
+        content_type: MIME type of the content (default: text/plain)
+        part_size: Multipart part size in bytes (at least 5 MiB)
+        
+    Returns:
+        str: Object name/path in bucket
+        
+    Raises:
+        TenantIsolationError: If tenant_id is not available
+        S3Error: If upload fails
+    """
+    bucket_name = await get_tenant_bucket(tenant_id, create_if_missing=True)
+    client = create_minio_client()
+    
+    # Validate bucket access
+    await validate_bucket_access(bucket_name, tenant_id)
+    
+    # Object name: documents/{document_id}
+    object_name = f"documents/{document_id}"
+    
+    loop = asyncio.get_running_loop()
+    reader = _AsyncIterableReader(chunks, loop)
+    await loop.run_in_executor(
+        None,
+        lambda: client.put_object(
+            bucket_name,
+            object_name,
+            reader,
+            length=-1,
+            part_size=max(part_size, MIN_PART_SIZE),
+            content_type=content_type,
+        ),
+    )
+    
+    logger.info(
+        "Document content streamed to MinIO",
+        tenant_id=str(tenant_id),
+        document_id=str(document_id),
+        bucket_name=bucket_name,
+        object_name=object_name,
+    )
+    
+    return object_name
+
+
+async def backup_document_content(tenant_id: UUID, document_id: UUID) -> Optional[str]:
+    """
+    Copy a document's current content aside before it is overwritten.
+    
+    The copy is made by the MinIO server; nothing is read by this process.
+    
+    Args:
+        tenant_id: Tenant ID
+        document_id: Document ID
+        
+    Returns:
+        str: Object name of the copy, or None if the document has no content yet
+        
+    Raises:
+        TenantIsolationError: If tenant_id is not available
+        S3Error: If the copy fails
+    """
+    from minio.commonconfig import CopySource
+    
+    bucket_name = await get_tenant_bucket(tenant_id, create_if_missing=True)
+    client = create_minio_client()
+    
+    # Validate bucket access
+    await validate_bucket_access(bucket_name, tenant_id)
+    
+    object_name = f"documents/{document_id}"
+    backup_name = f"{object_name}.previous"
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            None, client.copy_object, bucket_name, backup_name, CopySource(bucket_name, object_name)
+        )
+    except S3Error as e:
+        if e.code == "NoSuchKey":
+            return None
+        raise
+    
+    return backup_name
+
+
+async def restore_document_content(
+    tenant_id: UUID,
+    document_id: UUID,
+    backup_name: str,
+    restore: bool = True,
+) -> None:
+    """
+    Put back, or drop, a copy made by backup_document_content().
+    
+    Args:
+        tenant_id: Tenant ID
+        document_id: Document ID
+        backup_name: Object name returned by backup_document_content()
+        restore: Copy the backup over the document's content before deleting
+            it (False only deletes the backup, once the new content is kept)
+        
+    Raises:
+        TenantIsolationError: If tenant_id is not available
+        S3Error: If the copy or deletion fails
+    """
+    from minio.commonconfig import CopySource
+    
+    bucket_name = await get_tenant_bucket(tenant_id, create_if_missing=False)
+    client = create_minio_client()
+    
+    # Validate bucket access
+    await validate_bucket_access(bucket_name, tenant_id)
+    
+    loop = asyncio.get_running_loop()
+    if restore:
+        await loop.run_in_executor(
+            None,
+            client.copy_object,
+            bucket_name,
+            f"documents/{document_id}",
+            CopySource(bucket_name, backup_name),
+        )
+        logger.info(
+            "Document content restored in MinIO",
+            tenant_id=str(tenant_id),
+            document_id=str(document_id),
+            bucket_name=bucket_name,
+        )
+    await loop.run_in_executor(None, client.remove_object, bucket_name, backup_name)
+
+
+async def upload_document_contents(
+    tenant_id: UUID,
+    contents: Dict[UUID, bytes],
+    content_type: str = "text/plain",
+    max_concurrency: int = 8,
+) -> Dict[UUID, Union[str, Exception]]:
+    """
+    Upload many documents' content to the tenant-scoped MinIO bucket concurrently.
+    
+    The bucket is resolved and validated once. The MinIO client is blocking,
+    so up to max_concurrency uploads run on the default thread pool at a time.
+    
+    Args:
+        tenant_id: Tenant ID
+        contents: Content bytes by document ID
+        content_type: MIME type of the contents (default: text/plain)
+        max_concurrency: Uploads in flight at a time
+        
+    Returns:
+        dict: Object name by document ID, or the exception of a failed upload
+        
+    Raises:
+        TenantIsolationError: If tenant_id is not available
+    """
+    from io import BytesIO
+    
+    bucket_name = await get_tenant_bucket(tenant_id, create_if_missing=True)
+    client = create_minio_client()
+    
+    # Validate bucket access
+    await validate_bucket_access(bucket_name, tenant_id)
+    
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def upload(document_id: UUID, content: bytes) -> str:
+        object_name = f"documents/{document_id}"
+        async with semaphore:
+            await loop.run_in_executor(
+                None,
+                lambda: client.put_object(
+                    bucket_name,
+                    object_name,
+                    BytesIO(content),
+                    length=len(content),
+                    content_type=content_type,
+                ),
+            )
+        return object_name
+    
+    document_ids = list(contents)
+    results = await asyncio.gather(
+        *(upload(document_id, contents[document_id]) for document_id in document_ids),
+        return_exceptions=True,
+    )
+    
+    failed = sum(1 for result in results if isinstance(result, Exception))
+    logger.info(
+        "Document contents uploaded to MinIO",
+        tenant_id=str(tenant_id),
+        bucket_name=bucket_name,
+        document_count=len(document_ids),
+        failed=failed,
+    )
+    
+    return dict(zip(document_ids, results))
+
+
+async def delete_document_contents(tenant_id: UUID, document_ids: List[UUID]) -> None:
+    """
+    Delete documents' content from the tenant-scoped MinIO bucket.
+    
+    Used to undo uploads of documents whose ingestion failed.
+    
+    Args:
+        tenant_id: Tenant ID
+        document_ids: Document IDs
+        
+    Raises:
+        TenantIsolationError: If tenant_id is not available
+        RuntimeError: If an object cannot be deleted
+    """
+    from minio.deleteobjects import DeleteObject
+    
+    if not document_ids:
+        return
+    
+    bucket_name = await get_tenant_bucket(tenant_id, create_if_missing=False)
+    client = create_minio_client()
+    
+    # Validate bucket access
+    await validate_bucket_access(bucket_name, tenant_id)
+    
+    def delete() -> list:
+        # remove_objects is lazy: iterating it performs the deletion
+        return list(client.remove_objects(
+            bucket_name,
+            [DeleteObject(f"documents/{document_id}") for document_id in document_ids],
+        ))
+    
+    errors = await asyncio.get_running_loop().run_in_executor(None, delete)
+    if errors:
+        raise RuntimeError(
+            f"Deleting {errors[0].name} failed: {errors[0].code} {errors[0].message}"
+        )
+    
+    logger.info(
+        "Document contents deleted from MinIO",
+        tenant_id=str(tenant_id),
+        bucket_name=bucket_name,
+        document_count=len(document_ids),
+    )
+
+
 async def get_document_content(
     tenant_id: UUID,
     document_id: UUID,
@@ -224,6 +526,45 @@ async def get_document_content(
     return content
 
 
+async def stream_document_content(
+    tenant_id: UUID,
+    object_name: str,
+    chunk_size: int = 1024 * 1024,
+) -> AsyncIterator[bytes]:
+    """
+    Read an object of the tenant-scoped MinIO bucket in chunks.
+    
+    Args:
+        tenant_id: Tenant ID
+        object_name: Object name/path in bucket
+        chunk_size: Bytes per read
+        
+    Yields:
+        bytes: Consecutive chunks of the object
+        
+    Raises:
+        TenantIsolationError: If tenant_id is not available
+        S3Error: If retrieval fails
+    """
+    bucket_name = await get_tenant_bucket(tenant_id, create_if_missing=False)
+    client = create_minio_client()
+    
+    # Validate bucket access
+    await validate_bucket_access(bucket_name, tenant_id)
+    
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(None, client.get_object, bucket_name, object_name)
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, response.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        response.close()
+        response.release_conn()
+
+
 async def check_minio_health() -> dict[str, bool | str]:
     """
     Check MinIO connectivity and health.
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional
 
 import structlog
 
+from app.services.embedding_providers import embedding_provider_registry
 from app.utils.errors import ValidationError
 
 logger = structlog.get_logger(__name__)
@@ -66,20 +67,21 @@ class ModelValidator:
 
         model_name_lower = model_name.lower().strip()
 
-        # Check if model is supported
-        if model_name_lower in [m.lower() for m in SUPPORTED_EMBEDDING_MODELS]:
+        # Check if model is supported (remote models and in-process providers)
+        supported_models = SUPPORTED_EMBEDDING_MODELS + embedding_provider_registry.names()
+        if model_name_lower in [m.lower() for m in supported_models]:
             return {"valid": True, "model": model_name_lower}
 
         # Find similar models (fuzzy matching)
         suggestions = ModelValidator._find_similar_models(
-            model_name_lower, SUPPORTED_EMBEDDING_MODELS
+            model_name_lower, supported_models
         )
 
         raise ValidationError(
             f"Unsupported embedding model: {model_name}",
             field="embedding_model",
             error_code="FR-VALIDATION-001",
-            details={"provided_model": model_name, "supported_models": SUPPORTED_EMBEDDING_MODELS},
+            details={"provided_model": model_name, "supported_models": supported_models},
             recovery_suggestions=suggestions,
         )
 
@@ -0,0 +1,320 @@
+"""
+Async OpenAI embedding backend used as the GPU-AI fallback.
+
+Requests go through one AsyncOpenAI client on a shared httpx connection
+pool, so an embeddings call never blocks the event loop. A batch is split
+into requests that respect the provider's input-count and token limits, and
+at most EMBEDDING_OPENAI_MAX_CONCURRENCY requests run at once per worker.
+EMBEDDING_OPENAI_BASE_URL (or OPENAI_BASE_URL) can point the backend at any
+OpenAI-compatible server, such as a local stub for tests.
+"""
+
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+import structlog
+
+from app.config.embedding import embedding_settings
+
+logger = structlog.get_logger(__name__)
+
+# Try to import OpenAI for fallback
+try:
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+# Exact token counts when tiktoken is installed, a conservative estimate otherwise
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# OpenAI embedding model -> vector dimension
+OPENAI_MODEL_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+    "ada-002": 1536,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without a tokenizer.
+
+    Assumes 3 UTF-8 bytes per token. Typical text averages about 4, so the
+    estimate errs towards smaller requests.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        int: Estimated token count (at least 1)
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def get_token_counter(model: str) -> Callable[[str], int]:
+    """
+    Get a token counting function for an embedding model.
+
+    Args:
+        model: Embedding model name
+
+    Returns:
+        Callable: Function returning the token count of a text
+    """
+    if TIKTOKEN_AVAILABLE:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    return estimate_tokens
+
+
+def split_batches(
+    texts: Sequence[str],
+    max_inputs: int,
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+) -> List[List[int]]:
+    """
+    Split texts into request batches within the provider's limits.
+
+    Batches keep input order and are filled greedily. A single text over
+    max_tokens gets a batch of its own; the provider rejects it unless it is
+    within the per-input limit.
+
+    Args:
+        texts: Texts to embed
+        max_inputs: Maximum texts per request
+        max_tokens: Maximum total tokens per request
+        count_tokens: Token counting function
+
+    Returns:
+        list: Batches as lists of indices into texts
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = count_tokens(text)
+        if current and (len(current) >= max_inputs or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class OpenAIEmbeddingBackend:
+    """Pooled async client sending token-aware batched embeddings requests."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_batch_inputs: int = 2048,
+        max_batch_tokens: int = 300_000,
+        max_concurrency: int = 4,
+        max_connections: int = 16,
+        timeout_seconds: float = 30.0,
+        max_retries: int = 2,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Initialize the backend. The client is created on first use.
+
+        Args:
+            base_url: OpenAI-compatible API base URL (defaults to OPENAI_BASE_URL)
+            max_batch_inputs: Maximum inputs per request
+            max_batch_tokens: Maximum estimated tokens per request
+            max_concurrency: Requests in flight at once
+            max_connections: Connections in the shared HTTP pool
+            timeout_seconds: Timeout of one request
+            max_retries: Retries of a failed request
+            http_client: HTTP client to use instead of a pool built from the limits
+        """
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
+        self.max_batch_inputs = max(1, max_batch_inputs)
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_connections = max(1, max_connections)
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+
+        self._http_client = http_client
+        self._client: Optional["AsyncOpenAI"] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._token_counters: Dict[str, Callable[[str], int]] = {}
+
+        self._requests = 0
+        self._failed_requests = 0
+        self._texts = 0
+        self._in_flight = 0
+
+    def _get_client(self) -> "AsyncOpenAI":
+        """
+        Get or create the AsyncOpenAI client and its connection pool.
+
+        Returns:
+            AsyncOpenAI: Configured client
+
+        Raises:
+            ValueError: If the openai package or OPENAI_API_KEY is missing
+        """
+        if not OPENAI_AVAILABLE:
+            raise ValueError("OpenAI package not available")
+
+        if self._client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError(
+                    "OPENAI_API_KEY environment variable is not set. "
+                    "Please configure OpenAI API key to generate embeddings."
+                )
+            http_client = self._http_client or httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout_seconds,
+            )
+            self._client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=self.base_url,
+                http_client=http_client,
+                max_retries=self.max_retries,
+            )
+            logger.info(
+                "OpenAI client initialized for embedding generation (fallback)",
+                base_url=str(self._client.base_url),
+                max_connections=self.max_connections,
+                max_concurrency=self.max_concurrency,
+            )
+
+        return self._client
+
+    def _count_tokens(self, model: str) -> Callable[[str], int]:
+        """Get the cached token counter of a model."""
+        counter = self._token_counters.get(model)
+        if counter is None:
+            counter = self._token_counters[model] = get_token_counter(model)
+        return counter
+
+    async def embed(self, model: str, texts: Sequence[str]) -> np.ndarray:
+        """
+        Generate embeddings, splitting the texts into concurrent requests.
+
+        Args:
+            model: OpenAI embedding model name
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: Embedding matrix, shape (len(texts), dimension), in input order
+
+        Raises:
+            ValueError: If the client cannot be configured
+            openai.OpenAIError: If a request fails after retries
+        """
+        client = self._get_client()
+        batches = split_batches(
+            texts,
+            max_inputs=self.max_batch_inputs,
+            max_tokens=self.max_batch_tokens,
+            count_tokens=self._count_tokens(model),
+        )
+
+        results = await asyncio.gather(
+            *(self._embed_request(client, model, [texts[i] for i in batch]) for batch in batches)
+        )
+
+        if len(results) == 1:
+            return results[0]
+        return np.vstack(results)
+
+    async def _embed_request(self, client: "AsyncOpenAI", model: str, texts: List[str]) -> np.ndarray:
+        """
+        Send one embeddings request once a concurrency slot is free.
+
+        Args:
+            client: AsyncOpenAI client
+            model: OpenAI embedding model name
+            texts: Texts within the request limits
+
+        Returns:
+            np.ndarray: Embedding matrix for the request's texts, in input order
+        """
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                response = await client.embeddings.create(
+                    model=model,
+                    input=texts,
+                    encoding_format="float",
+                )
+            except Exception:
+                self._failed_requests += 1
+                raise
+            finally:
+                self._in_flight -= 1
+                self._requests += 1
+
+        self._texts += len(texts)
+        data = sorted(response.data, key=lambda item: item.index)
+        if len(data) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings from OpenAI, got {len(data)}")
+        return np.asarray([item.embedding for item in data], dtype=np.float32)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get backend statistics.
+
+        Returns:
+            dict: Request, failure and text counts and requests in flight
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "requests": self._requests,
+            "failed_requests": self._failed_requests,
+            "texts": self._texts,
+            "in_flight": self._in_flight,
+        }
+
+    async def close(self) -> None:
+        """Close the client and its connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+def create_openai_embedding_backend() -> OpenAIEmbeddingBackend:
+    """
+    Create an OpenAI embedding backend from the embedding settings.
+
+    Returns:
+        OpenAIEmbeddingBackend: Configured backend
+    """
+    return OpenAIEmbeddingBackend(
+        base_url=embedding_settings.openai_base_url,
+        max_batch_inputs=embedding_settings.openai_max_batch_inputs,
+        max_batch_tokens=embedding_settings.openai_max_batch_tokens,
+        max_concurrency=embedding_settings.openai_max_concurrency,
+        max_connections=embedding_settings.openai_max_connections,
+        timeout_seconds=embedding_settings.openai_timeout_seconds,
+        max_retries=embedding_settings.openai_max_retries,
+    )
+
+
+# Global OpenAI embedding backend instance
+openai_embedding_backend = create_openai_embedding_backend()
@@ -0,0 +1,90 @@
+"""
+Request-scoped best passages of vector search hits.
+
+Documents are indexed as chunk vectors, and vector search aggregates the
+chunk hits of each document into one document score. Inside
+passage_scope(), VectorSearchService records the best matching chunk of
+every document it returns, so callers that only see (document_id, score)
+results, such as rag_search behind hybrid search, can still point at the
+passage that matched.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from uuid import UUID
+
+
+class MatchedPassages:
+    """Best matching chunk per document within one request."""
+
+    def __init__(self):
+        """Initialize an empty scope."""
+        self._passages: Dict[UUID, Dict[str, Any]] = {}
+
+    def record(self, document_id: UUID, chunk_no: int, start_offset: int, end_offset: int, score: float) -> None:
+        """
+        Record a matching chunk, keeping the best scoring one per document.
+
+        Args:
+            document_id: Document ID
+            chunk_no: Chunk number
+            start_offset: Offset of the passage's first character in the content
+            end_offset: Offset just past the passage's last character
+            score: Similarity of the chunk to the query
+        """
+        current = self._passages.get(document_id)
+        if current is None or score > current["score"]:
+            self._passages[document_id] = {
+                "chunk_no": chunk_no,
+                "start_offset": start_offset,
+                "end_offset": end_offset,
+                "score": score,
+            }
+
+    def get(self, document_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Get the best matching passage of a document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            dict: chunk_no, start_offset, end_offset and score, or None if no
+            chunk of the document was matched (or it predates chunking)
+        """
+        return self._passages.get(document_id)
+
+
+_matched_passages_context: ContextVar[Optional[MatchedPassages]] = ContextVar("matched_passages", default=None)
+
+
+def get_matched_passages() -> Optional[MatchedPassages]:
+    """
+    Get the matched passages of the current request.
+
+    Returns:
+        MatchedPassages, or None outside passage_scope()
+    """
+    return _matched_passages_context.get()
+
+
+@contextmanager
+def passage_scope() -> Iterator[MatchedPassages]:
+    """
+    Collect the best passages of every vector search the block runs (nested scopes reuse the outer one).
+
+    Yields:
+        MatchedPassages: The request's matched passages
+    """
+    scope = _matched_passages_context.get()
+    if scope is not None:
+        yield scope
+        return
+
+    scope = MatchedPassages()
+    token = _matched_passages_context.set(scope)
+    try:
+        yield scope
+    finally:
+        _matched_passages_context.reset(token)
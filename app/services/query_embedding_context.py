@@ -0,0 +1,146 @@
+"""
+Request-scoped sharing of query embeddings.
+
+One search request can need the same query vector several times: FAISS
+search embeds the query through EmbeddingService, and personalization
+searches the user's memories, which embeds the query again inside Mem0.
+Inside query_embedding_scope(), every query vector computed is recorded by
+(model, text), and later consumers in the same request reuse it.
+
+Vectors are only shared between identical models; a vector from another
+model lives in a different space and is never substituted.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class QueryEmbeddings:
+    """Query vectors computed within one request, by model and text."""
+
+    def __init__(self):
+        """Initialize an empty scope."""
+        self._vectors: Dict[Tuple[str, str], np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        """
+        Get the vector of a text embedded earlier in the request.
+
+        Args:
+            model: Embedding model name
+            text: Embedded text
+
+        Returns:
+            np.ndarray, or None if not embedded with this model yet
+        """
+        vector = self._vectors.get((model.lower(), text))
+        if vector is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return vector
+
+    def put(self, model: str, text: str, vector: Any) -> None:
+        """
+        Record the vector of a text for the rest of the request.
+
+        Args:
+            model: Embedding model name
+            text: Embedded text
+            vector: Embedding vector (array or list of floats)
+        """
+        self._vectors[(model.lower(), text)] = np.asarray(vector, dtype=np.float32)
+
+
+_query_embeddings_context: ContextVar[Optional[QueryEmbeddings]] = ContextVar("query_embeddings", default=None)
+
+
+def get_query_embeddings() -> Optional[QueryEmbeddings]:
+    """
+    Get the query embeddings of the current request.
+
+    Returns:
+        QueryEmbeddings, or None outside query_embedding_scope()
+    """
+    return _query_embeddings_context.get()
+
+
+@contextmanager
+def query_embedding_scope() -> Iterator[QueryEmbeddings]:
+    """
+    Share query vectors between everything the block runs (nested scopes reuse the outer one).
+
+    Yields:
+        QueryEmbeddings: The request's query vectors
+    """
+    scope = _query_embeddings_context.get()
+    if scope is not None:
+        yield scope
+        return
+
+    scope = QueryEmbeddings()
+    token = _query_embeddings_context.set(scope)
+    try:
+        yield scope
+    finally:
+        _query_embeddings_context.reset(token)
+        if scope.hits:
+            logger.debug("Reused query embeddings within request", reused=scope.hits)
+
+
+class ScopedEmbedder:
+    """
+    Wrapper of a Mem0 embedder reusing the request's query vectors for searches.
+
+    Mem0 embeds the search query with its own embedder. When the request
+    already embedded the same query with the same model and dimension, that
+    vector is returned instead of calling the embedder again; otherwise the
+    embedder's vector is recorded for later consumers.
+    """
+
+    def __init__(self, embedder: Any):
+        """
+        Initialize the wrapper.
+
+        Args:
+            embedder: Mem0 embedder (has config.model and embed(text, memory_action))
+        """
+        self._embedder = embedder
+        config = getattr(embedder, "config", None)
+        self.model: Optional[str] = getattr(config, "model", None)
+        self.dimension: Optional[int] = getattr(config, "embedding_dims", None)
+
+    def embed(self, text: str, memory_action: Optional[str] = None) -> Any:
+        """
+        Embed a text, reusing the request's vector for search queries.
+
+        Args:
+            text: Text to embed
+            memory_action: "add", "search" or "update"
+
+        Returns:
+            list: Embedding vector
+        """
+        scope = get_query_embeddings()
+        if memory_action != "search" or scope is None or not isinstance(self.model, str):
+            return self._embedder.embed(text, memory_action)
+
+        vector = scope.get(self.model, text)
+        if vector is not None and (not self.dimension or len(vector) == self.dimension):
+            return vector.tolist()
+
+        embedding = self._embedder.embed(text, memory_action)
+        scope.put(self.model, text, embedding)
+        return embedding
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else (embed_batch, config, ...) to the embedder."""
+        return getattr(self._embedder, name)
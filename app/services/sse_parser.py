@@ -0,0 +1,182 @@
+"""
+Incremental Server-Sent Events parser.
+
+Parses a text/event-stream at the byte level as chunks arrive, following the
+WHATWG event stream format:
+
+- lines end in CRLF, LF or CR, including terminators split across chunks
+- consecutive data: lines of one event are joined with newlines
+- a single space after the field colon is stripped; comment lines are ignored
+- an event is dispatched on a blank line, and dropped if it has no data
+
+Bytes are only decoded once an event is complete, so multi-byte UTF-8
+characters split across chunks decode correctly. Each byte is scanned a
+constant number of times, keeping parsing linear in the stream size even
+for multi-megabyte embedding payloads.
+"""
+
+import json
+import re
+from typing import Any, List, Optional
+
+_LINE_END = re.compile(rb"\r\n|\r|\n")
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+class SSEEvent:
+    """One dispatched server-sent event."""
+
+    def __init__(
+        self,
+        data: str,
+        event: str = "message",
+        id: Optional[str] = None,
+        retry: Optional[int] = None,
+        has_event_type: bool = False,
+    ):
+        """
+        Initialize the event.
+
+        Args:
+            data: Event data, data: lines joined with newlines
+            event: Event type ("message" unless an event: field was sent)
+            id: Last event ID seen on the stream
+            retry: Reconnection time in milliseconds from a retry: field
+            has_event_type: Whether the event carried an explicit event: field
+        """
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+        self.has_event_type = has_event_type
+
+    def json(self) -> Any:
+        """
+        Decode the event data as JSON.
+
+        Returns:
+            Decoded JSON value
+
+        Raises:
+            json.JSONDecodeError: If the data is not JSON
+        """
+        return json.loads(self.data)
+
+
+class SSEParser:
+    """Incremental, byte-level event stream parser."""
+
+    def __init__(self):
+        """Initialize the parser state."""
+        self._buffer = bytearray()
+        self._scan_from = 0
+        self._started = False
+
+        self._data_lines: List[bytes] = []
+        self._event_type: Optional[str] = None
+        self._last_event_id: Optional[str] = None
+        self._retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """
+        Parse a chunk of the stream.
+
+        Args:
+            chunk: Next bytes of the stream
+
+        Returns:
+            list: Events completed by this chunk
+        """
+        buffer = self._buffer
+        buffer.extend(chunk)
+
+        if not self._started:
+            if len(buffer) < len(_UTF8_BOM) and _UTF8_BOM.startswith(bytes(buffer)):
+                return []
+            if buffer.startswith(_UTF8_BOM):
+                del buffer[:len(_UTF8_BOM)]
+            self._started = True
+
+        events: List[SSEEvent] = []
+        start = 0  # Start of the current line
+        pos = self._scan_from  # Bytes before pos hold no line terminator
+        while True:
+            match = _LINE_END.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            if match.group() == b"\r" and match.end() == len(buffer):
+                # A CR at the end of the buffer may be the first half of a CRLF
+                pos = match.start()
+                break
+
+            event = self._process_line(bytes(buffer[start:match.start()]))
+            if event is not None:
+                events.append(event)
+            start = pos = match.end()
+
+        del buffer[:start]
+        self._scan_from = pos - start
+        return events
+
+    def flush(self) -> List[SSEEvent]:
+        """
+        Finish the stream, dispatching an event left without a trailing blank line.
+
+        The spec discards such events; servers that omit the final blank line
+        are common enough that they are dispatched instead.
+
+        Returns:
+            list: Remaining events
+        """
+        events: List[SSEEvent] = []
+        if self._buffer:
+            line = bytes(self._buffer).rstrip(b"\r")
+            self._buffer.clear()
+            self._scan_from = 0
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _process_line(self, line: bytes) -> Optional[SSEEvent]:
+        """Apply one line to the pending event, returning the event on a blank line."""
+        if not line:
+            return self._dispatch()
+        if line.startswith(b":"):
+            # Comment (often a keep-alive)
+            return None
+
+        field, colon, value = line.partition(b":")
+        if colon and value.startswith(b" "):
+            value = value[1:]
+
+        if field == b"data":
+            self._data_lines.append(value)
+        elif field == b"event":
+            self._event_type = value.decode("utf-8", errors="replace")
+        elif field == b"id":
+            if b"\0" not in value:
+                self._last_event_id = value.decode("utf-8", errors="replace")
+        elif field == b"retry":
+            if value.isdigit():
+                self._retry = int(value)
+        return None
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        """Complete the pending event and reset the per-event state."""
+        data_lines, self._data_lines = self._data_lines, []
+        event_type, self._event_type = self._event_type, None
+        if not data_lines:
+            return None
+
+        return SSEEvent(
+            data=b"\n".join(data_lines).decode("utf-8", errors="replace"),
+            event=event_type or "message",
+            id=self._last_event_id,
+            retry=self._retry,
+            has_event_type=event_type is not None,
+        )
@@ -0,0 +1,208 @@
+"""
+Per-worker cache of the tenant configuration read on hot paths.
+
+Embedding generation and search personalization need a few fields of a
+tenant's TenantConfig (embedding model, personalization flag) on every
+request. This cache serves them from memory for up to
+TENANT_CONFIG_CACHE_TTL_SECONDS; the tools that write tenant configuration
+invalidate the tenant's entry right after committing, so this worker sees
+changes immediately and other workers within the TTL.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+import structlog
+
+from app.config.settings import settings
+from app.db.connection import get_db_session
+from app.db.repositories.tenant_config_repository import TenantConfigRepository
+from app.services.embedding_providers import embedding_provider_registry
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "gpu-ai"
+
+
+def is_gpu_ai_model(model: str) -> bool:
+    """
+    Check whether an embedding model is served by the GPU-AI MCP server.
+
+    Args:
+        model: Embedding model name
+
+    Returns:
+        bool: True for "gpu-ai" and other "gpu*" models, False for OpenAI models
+    """
+    return model.lower().startswith("gpu")
+
+
+class TenantConfigSnapshot:
+    """
+    Read-only view of the tenant configuration fields used on hot paths.
+
+    Snapshots are shared between concurrent requests and must not be mutated;
+    invalidate the cache instead.
+    """
+
+    def __init__(
+        self,
+        tenant_id: UUID,
+        version: int,
+        updated_at: Optional[datetime],
+        embedding_model: str,
+        embedding_dimension: int,
+        personalization_enabled: bool,
+    ):
+        """
+        Initialize the snapshot.
+
+        Args:
+            tenant_id: Tenant ID
+            version: Cache generation the snapshot was loaded under
+            updated_at: TenantConfig.updated_at at load time
+            embedding_model: Configured embedding model
+            embedding_dimension: Vector dimension of the embedding model
+            personalization_enabled: Whether context-aware search is enabled
+        """
+        self.tenant_id = tenant_id
+        self.version = version
+        self.updated_at = updated_at
+        self.embedding_model = embedding_model
+        self.embedding_dimension = embedding_dimension
+        self.personalization_enabled = personalization_enabled
+
+    @property
+    def use_gpu_ai(self) -> bool:
+        """Whether the tenant's embedding model is served by GPU-AI."""
+        return is_gpu_ai_model(self.embedding_model)
+
+
+class TenantConfigCache:
+    """
+    TTL cache of TenantConfigSnapshot per tenant, with explicit invalidation.
+
+    Each tenant has a generation counter that invalidate() bumps. A load
+    only stores its result if the generation did not change while it read
+    the database, so a write racing with a load can never leave the old
+    configuration cached.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Maximum age of a cached snapshot (0 disables caching)
+        """
+        self.ttl_seconds = ttl_seconds
+
+        # tenant_id -> (snapshot or None if the tenant has no config, expires_at)
+        self._entries: Dict[UUID, Tuple[Optional[TenantConfigSnapshot], float]] = {}
+        self._generations: Dict[UUID, int] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    async def get(self, tenant_id: UUID) -> Optional[TenantConfigSnapshot]:
+        """
+        Get a tenant's configuration snapshot, loading it on a miss.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            TenantConfigSnapshot, or None if the tenant has no configuration
+        """
+        entry = self._entries.get(tenant_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self._hits += 1
+            return entry[0]
+
+        self._misses += 1
+        generation = self._generations.get(tenant_id, 0)
+        snapshot = await self._load(tenant_id, generation)
+
+        if self.ttl_seconds > 0 and self._generations.get(tenant_id, 0) == generation:
+            self._entries[tenant_id] = (snapshot, time.monotonic() + self.ttl_seconds)
+        return snapshot
+
+    async def _load(self, tenant_id: UUID, generation: int) -> Optional[TenantConfigSnapshot]:
+        """
+        Read a tenant's configuration from the database.
+
+        Args:
+            tenant_id: Tenant ID
+            generation: Cache generation at the start of the load
+
+        Returns:
+            TenantConfigSnapshot, or None if the tenant has no configuration
+        """
+        async for session in get_db_session():
+            config_repo = TenantConfigRepository(session)
+            tenant_config = await config_repo.get_by_tenant_id(tenant_id)
+
+            if not tenant_config:
+                return None
+
+            model_config = tenant_config.model_configuration or {}
+            custom_config = tenant_config.custom_configuration or {}
+            embedding_model = model_config.get("embedding_model", DEFAULT_EMBEDDING_MODEL)
+
+            snapshot = TenantConfigSnapshot(
+                tenant_id=tenant_id,
+                version=generation,
+                updated_at=tenant_config.updated_at,
+                embedding_model=embedding_model,
+                embedding_dimension=embedding_provider_registry.dimension(embedding_model),
+                personalization_enabled=bool(custom_config.get("personalization_enabled", False)),
+            )
+
+            logger.debug(
+                "Loaded tenant configuration into cache",
+                tenant_id=str(tenant_id),
+                version=generation,
+                embedding_model=embedding_model,
+            )
+
+            return snapshot
+
+    def invalidate(self, tenant_id: UUID) -> None:
+        """
+        Drop a tenant's cached configuration.
+
+        Call after committing any change to the tenant's TenantConfig.
+
+        Args:
+            tenant_id: Tenant ID
+        """
+        self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+        self._entries.pop(tenant_id, None)
+        self._invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached configuration."""
+        for tenant_id in list(self._entries):
+            self.invalidate(tenant_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, hits, misses and invalidations
+        """
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+        }
+
+
+# Global tenant configuration cache instance
+tenant_config_cache = TenantConfigCache(ttl_seconds=settings.tenant_config_cache_ttl_seconds)
@@ -4,20 +4,25 @@ Vector search service for FAISS-based semantic search.
 Provides high-level interface for vector search that handles:
 - Query embedding generation
 - FAISS index search
-- FAISS ID to document ID resolution
+- FAISS chunk ID to document ID resolution
+- Aggregation of chunk hits into document results
 - Result ranking and filtering
 """
 
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from uuid import UUID
 
 import numpy as np
 import structlog
 
+from app.config.ingestion import ingestion_settings
 from app.db.connection import get_db_session
 from app.db.repositories.document_repository import DocumentRepository
 from app.services.embedding_service import embedding_service
-from app.services.faiss_manager import faiss_manager
+from app.services.faiss_attribute_store import document_attributes, has_attribute_filters
+from app.services.faiss_executor import faiss_executor
+from app.services.faiss_manager import document_id_to_faiss_id, faiss_manager
+from app.services.passage_context import get_matched_passages
 from app.utils.errors import ValidationError, ResourceNotFoundError
 
 logger = structlog.get_logger(__name__)
@@ -27,7 +32,7 @@ def _document_id_to_faiss_id(document_id: UUID) -> int:
     """
     Convert document UUID to FAISS ID.
     
-    Uses the same hash function as FAISSIndexManager.add_document.
+    Uses the same deterministic mapping as FAISSIndexManager.add_document.
     
     Args:
         document_id: Document UUID
@@ -35,7 +40,92 @@ def _document_id_to_faiss_id(document_id: UUID) -> int:
     Returns:
         FAISS integer ID
     """
-    return hash(str(document_id)) % (2**31)
+    return document_id_to_faiss_id(document_id)
+
+
+async def _resolve_chunk_hits(
+    doc_repo: DocumentRepository,
+    tenant_id: UUID,
+    faiss_ids: List[int],
+) -> Dict[int, Tuple[UUID, Optional[Tuple[int, int, int]]]]:
+    """
+    Resolve FAISS chunk IDs to live documents and their passages.
+    
+    Chunk rows are looked up first; IDs without one (documents indexed
+    before chunking, whose single vector carries the document's own FAISS
+    ID) fall back to the documents table. Both lookups are single indexed
+    ``faiss_id = ANY(:ids)`` queries, so the cost depends on k rather than
+    on the tenant's corpus size. Soft-deleted documents are excluded.
+    
+    Args:
+        doc_repo: Document repository
+        tenant_id: Tenant ID
+        faiss_ids: FAISS vector IDs returned by search
+        
+    Returns:
+        Dict mapping faiss_id to (document_id, (chunk_no, start_offset,
+        end_offset)), with None as passage for documents without chunk rows
+    """
+    passages = await doc_repo.get_passages_by_faiss_ids(
+        tenant_id=tenant_id,
+        faiss_ids=faiss_ids,
+    )
+    hits: Dict[int, Tuple[UUID, Optional[Tuple[int, int, int]]]] = {
+        faiss_id: (document_id, (chunk_no, start_offset, end_offset))
+        for faiss_id, (document_id, chunk_no, start_offset, end_offset) in passages.items()
+    }
+    
+    unchunked = [faiss_id for faiss_id in faiss_ids if faiss_id not in hits]
+    if unchunked:
+        id_map = await doc_repo.get_document_ids_by_faiss_ids(
+            tenant_id=tenant_id,
+            faiss_ids=unchunked,
+        )
+        hits.update({faiss_id: (document_id, None) for faiss_id, document_id in id_map.items()})
+    return hits
+
+
+def _aggregate_chunk_hits(
+    faiss_results: List[Tuple[int, float]],
+    hits: Dict[int, Tuple[UUID, Optional[Tuple[int, int, int]]]],
+) -> List[Tuple[UUID, float]]:
+    """
+    Combine the chunk hits of each document into one document score.
+    
+    With INGESTION_CHUNK_AGGREGATION "max" a document scores as its best
+    chunk. With "sum" its matching chunks' similarities add up, rewarding
+    documents that match in several places; scores are then rescaled so
+    the best document scores at most 1. Inside passage_scope() the best
+    chunk of every document is recorded.
+    
+    Args:
+        faiss_results: List of (faiss_id, similarity_score) tuples
+        hits: Resolved chunk hits (see _resolve_chunk_hits)
+        
+    Returns:
+        List of (document_id, score) tuples, sorted by score (highest first)
+    """
+    use_sum = ingestion_settings.chunk_aggregation.lower() == "sum"
+    scores: Dict[UUID, float] = {}
+    passages = get_matched_passages()
+    
+    for faiss_id, score in faiss_results:
+        if faiss_id not in hits:
+            continue
+        document_id, passage = hits[faiss_id]
+        if use_sum:
+            scores[document_id] = scores.get(document_id, 0.0) + score
+        else:
+            scores[document_id] = max(scores.get(document_id, score), score)
+        if passages is not None and passage is not None:
+            passages.record(document_id, *passage, score=score)
+    
+    if use_sum and scores:
+        top = max(scores.values())
+        if top > 1.0:
+            scores = {document_id: score / top for document_id, score in scores.items()}
+    
+    return sorted(scores.items(), key=lambda result: result[1], reverse=True)
 
 
 async def _resolve_faiss_ids_to_document_ids(
@@ -43,11 +133,10 @@ async def _resolve_faiss_ids_to_document_ids(
     faiss_results: List[Tuple[int, float]],
 ) -> List[Tuple[UUID, float]]:
     """
-    Resolve FAISS IDs to document IDs by querying the database.
+    Resolve FAISS chunk hits to documents by querying the database.
     
-    Since we use hash(document_id) % (2**31) to create FAISS IDs,
-    we need to query all documents for the tenant and check which ones
-    hash to the returned FAISS IDs.
+    Hits on several chunks of a document are aggregated into one result
+    (see _aggregate_chunk_hits).
     
     Args:
         tenant_id: Tenant ID
@@ -59,43 +148,43 @@ async def _resolve_faiss_ids_to_document_ids(
     if not faiss_results:
         return []
     
-    # Extract FAISS IDs
-    faiss_ids = {faiss_id for faiss_id, _ in faiss_results}
-    
-    # Create a mapping of faiss_id -> similarity_score
-    faiss_score_map = {faiss_id: score for faiss_id, score in faiss_results}
-    
-    # Query all documents for the tenant (excluding deleted)
-    # Note: This is inefficient for large document sets
-    # In production, maintain a reverse mapping table (faiss_id -> document_id)
-    from app.db.models.document import Document
-    from sqlalchemy import select
-    
     async for session in get_db_session():
         doc_repo = DocumentRepository(session)
-        
-        # Get all non-deleted documents for tenant
-        query = select(Document).where(
-            Document.tenant_id == tenant_id,
-            Document.deleted_at.is_(None),
+        hits = await _resolve_chunk_hits(
+            doc_repo,
+            tenant_id,
+            list(dict.fromkeys(faiss_id for faiss_id, _ in faiss_results)),
         )
         
-        result = await session.execute(query)
-        documents = list(result.scalars().all())
-        
-        # Build mapping of faiss_id -> document_id
-        resolved_results: List[Tuple[UUID, float]] = []
-        
-        for doc in documents:
-            doc_faiss_id = _document_id_to_faiss_id(doc.document_id)
-            if doc_faiss_id in faiss_ids:
-                similarity_score = faiss_score_map[doc_faiss_id]
-                resolved_results.append((doc.document_id, similarity_score))
+        # Sorted by similarity (highest first) to maintain ranking
+        return _aggregate_chunk_hits(faiss_results, hits)
+
+
+async def _resolve_faiss_result_batches(
+    tenant_id: UUID,
+    faiss_result_batches: List[List[Tuple[int, float]]],
+) -> List[List[Tuple[UUID, float]]]:
+    """
+    Resolve the FAISS results of many queries with a single database lookup.
+    
+    Args:
+        tenant_id: Tenant ID
+        faiss_result_batches: One list of (faiss_id, similarity_score) tuples per query
         
-        # Sort by similarity (highest first) to maintain ranking
-        resolved_results.sort(key=lambda x: x[1], reverse=True)
+    Returns:
+        One list of (document_id, similarity_score) tuples per query, sorted
+        by similarity (highest first)
+    """
+    faiss_ids = list({faiss_id for results in faiss_result_batches for faiss_id, _ in results})
+    if not faiss_ids:
+        return [[] for _ in faiss_result_batches]
+    
+    async for session in get_db_session():
+        doc_repo = DocumentRepository(session)
+        hits = await _resolve_chunk_hits(doc_repo, tenant_id, faiss_ids)
         
-        return resolved_results
+        # Soft-deleted documents drop out
+        return [_aggregate_chunk_hits(results, hits) for results in faiss_result_batches]
 
 
 class VectorSearchService:
@@ -104,8 +193,8 @@ class VectorSearchService:
     
     Handles the complete vector search workflow:
     1. Generate query embedding
-    2. Search FAISS index
-    3. Resolve FAISS IDs to document IDs
+    2. Search FAISS index for matching chunks
+    3. Resolve chunk IDs to documents, aggregating chunk scores per document
     4. Return ranked results
     """
     
@@ -114,11 +203,76 @@ class VectorSearchService:
         self.embedding_service = embedding_service
         self.faiss_manager = faiss_manager
     
+    async def ensure_filter_attributes(self, tenant_id: UUID) -> None:
+        """
+        Backfill FAISS filter attributes for documents indexed without them.
+        
+        Runs once per tenant index: every live vector lacking attributes is
+        looked up with a single database query, after which filtered
+        searches are resolved entirely from FAISS's in-memory postings.
+        
+        Args:
+            tenant_id: Tenant ID
+        """
+        # Off the event loop: both may load the tenant index from disk
+        if await faiss_executor.run(self.faiss_manager.has_complete_attributes, tenant_id):
+            return
+        
+        faiss_ids = await faiss_executor.run(self.faiss_manager.get_unattributed_faiss_ids, tenant_id)
+        attributes_by_id: Dict[int, Tuple[Optional[Dict[str, Any]], Any]] = {}
+        if faiss_ids:
+            async for session in get_db_session():
+                doc_repo = DocumentRepository(session)
+                attributes_by_id = await doc_repo.get_filter_attributes_by_faiss_ids(
+                    tenant_id=tenant_id,
+                    faiss_ids=faiss_ids,
+                )
+        
+        await faiss_executor.run(
+            self.faiss_manager.set_document_attributes,
+            tenant_id=tenant_id,
+            faiss_ids=list(attributes_by_id),
+            attributes=[
+                document_attributes(metadata, created_at)
+                for metadata, created_at in attributes_by_id.values()
+            ],
+            complete=True,
+        )
+    
+    async def filter_results(
+        self,
+        tenant_id: UUID,
+        results: List[Tuple[UUID, float]],
+        filters: Optional[Dict[str, Any]],
+    ) -> List[Tuple[UUID, float]]:
+        """
+        Drop results whose documents do not satisfy metadata filters.
+        
+        Uses the same in-memory attribute postings as filtered vector search,
+        so results from other retrievers need no database round-trip.
+        
+        Args:
+            tenant_id: Tenant ID
+            results: List of (document_id, score) tuples
+            filters: Search filters (document_type, tags, date_from, date_to)
+            
+        Returns:
+            The matching (document_id, score) tuples, in input order
+        """
+        if not results or not has_attribute_filters(filters):
+            return results
+        
+        await self.ensure_filter_attributes(tenant_id)
+        faiss_ids = [_document_id_to_faiss_id(document_id) for document_id, _ in results]
+        allowed = set(await faiss_executor.run(self.faiss_manager.filter_faiss_ids, tenant_id, faiss_ids, filters))
+        return [result for result, faiss_id in zip(results, faiss_ids) if faiss_id in allowed]
+    
     async def search(
         self,
         tenant_id: UUID,
         query_text: str,
         k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
     ) -> List[Tuple[UUID, float]]:
         """
         Perform vector search for a text query.
@@ -127,11 +281,15 @@ class VectorSearchService:
             tenant_id: Tenant ID
             query_text: Search query text
             k: Number of results to return (default: 10)
+            filters: Optional metadata filters (document_type, tags, date_from,
+                date_to), applied inside the FAISS search
             
         Returns:
             List of tuples: [(document_id, similarity_score), ...]
             Results are sorted by similarity (highest first)
             Similarity scores are normalized to [0, 1] range
+            Inside passage_scope(), the best passage of each document is
+            recorded (see passage_context)
             
         Raises:
             ValidationError: If query_text is empty
@@ -166,30 +324,48 @@ class VectorSearchService:
                 embedding_dimension=len(query_embedding),
             )
             
-            faiss_results = self.faiss_manager.search(
-                tenant_id=tenant_id,
-                query_embedding=query_embedding,
-                k=k,
-            )
+            if has_attribute_filters(filters):
+                await self.ensure_filter_attributes(tenant_id)
             
-            if not faiss_results:
-                logger.info(
-                    "No FAISS search results found",
+            # Several chunks of a document can crowd the top k; a full page
+            # of hits that resolves to fewer than k documents is fetched
+            # again with k * INGESTION_CHUNK_SEARCH_OVERSAMPLE hits
+            fetch_k = k
+            max_fetch_k = k * max(1, ingestion_settings.chunk_search_oversample)
+            while True:
+                # Off the event loop: brute-force searches and index loads block
+                faiss_results = await faiss_executor.run(
+                    self.faiss_manager.search,
+                    tenant_id=tenant_id,
+                    query_embedding=query_embedding,
+                    k=fetch_k,
+                    filters=filters,
+                )
+                
+                if not faiss_results:
+                    logger.info(
+                        "No FAISS search results found",
+                        tenant_id=str(tenant_id),
+                    )
+                    return []
+                
+                # Step 3: Resolve FAISS chunk IDs to documents
+                logger.debug(
+                    "Resolving FAISS IDs to document IDs",
                     tenant_id=str(tenant_id),
+                    faiss_results_count=len(faiss_results),
                 )
-                return []
-            
-            # Step 3: Resolve FAISS IDs to document IDs
-            logger.debug(
-                "Resolving FAISS IDs to document IDs",
-                tenant_id=str(tenant_id),
-                faiss_results_count=len(faiss_results),
-            )
+                
+                resolved_results = await _resolve_faiss_ids_to_document_ids(
+                    tenant_id=tenant_id,
+                    faiss_results=faiss_results,
+                )
+                
+                if len(resolved_results) >= k or len(faiss_results) < fetch_k or fetch_k >= max_fetch_k:
+                    break
+                fetch_k = max_fetch_k
             
-            resolved_results = await _resolve_faiss_ids_to_document_ids(
-                tenant_id=tenant_id,
-                faiss_results=faiss_results,
-            )
+            resolved_results = resolved_results[:k]
             
             logger.info(
                 "Vector search completed",
@@ -210,6 +386,105 @@ class VectorSearchService:
                 error=str(e),
             )
             raise
+    
+    async def search_batch(
+        self,
+        tenant_id: UUID,
+        query_texts: List[str],
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Tuple[UUID, float]]]:
+        """
+        Perform vector search for many text queries at once.
+        
+        Embeds every query in one embedding request, searches FAISS with one
+        call for all query vectors and resolves all hits with one database
+        lookup (one more search and lookup for the queries whose chunk hits
+        resolve to fewer than k documents). Intended for multi-query
+        workloads such as query expansion, evaluation runs and batch tools.
+        
+        Args:
+            tenant_id: Tenant ID
+            query_texts: Search query texts
+            k: Number of results to return per query (default: 10)
+            filters: Optional metadata filters applied to every query (see search())
+            
+        Returns:
+            One list of (document_id, similarity_score) tuples per query, in
+            query order, each sorted by similarity (highest first)
+            
+        Raises:
+            ValidationError: If any query text is empty
+            TenantIsolationError: If tenant_id mismatch
+            ValueError: If embedding generation or search fails
+        """
+        if not query_texts:
+            return []
+        if any(not query_text or not query_text.strip() for query_text in query_texts):
+            raise ValidationError(
+                "Query text cannot be empty",
+                field="query_texts",
+                error_code="FR-VALIDATION-001"
+            )
+        
+        try:
+            query_embeddings = await self.embedding_service.generate_embeddings(
+                texts=query_texts,
+                tenant_id=str(tenant_id),
+            )
+            
+            if has_attribute_filters(filters):
+                await self.ensure_filter_attributes(tenant_id)
+            
+            # As in search(): queries whose full page of chunk hits resolves
+            # to fewer than k documents are fetched again, together, with
+            # k * INGESTION_CHUNK_SEARCH_OVERSAMPLE hits
+            fetch_k = k
+            max_fetch_k = k * max(1, ingestion_settings.chunk_search_oversample)
+            resolved_batches: List[List[Tuple[UUID, float]]] = [[] for _ in query_texts]
+            rows = list(range(len(query_texts)))
+            while rows:
+                faiss_result_batches = await faiss_executor.run(
+                    self.faiss_manager.search_batch,
+                    tenant_id=tenant_id,
+                    query_embeddings=[query_embeddings[row] for row in rows],
+                    k=fetch_k,
+                    filters=filters,
+                )
+                
+                resolved = await _resolve_faiss_result_batches(
+                    tenant_id=tenant_id,
+                    faiss_result_batches=faiss_result_batches,
+                )
+                
+                refetch = []
+                for row, faiss_results, results in zip(rows, faiss_result_batches, resolved):
+                    resolved_batches[row] = results[:k]
+                    if len(results) < k and len(faiss_results) >= fetch_k and fetch_k < max_fetch_k:
+                        refetch.append(row)
+                rows = refetch
+                fetch_k = max_fetch_k
+            
+            logger.info(
+                "Batch vector search completed",
+                tenant_id=str(tenant_id),
+                query_count=len(query_texts),
+                k_requested=k,
+                k_returned=sum(len(results) for results in resolved_batches),
+            )
+            
+            return resolved_batches
+            
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Error performing batch vector search",
+                tenant_id=str(tenant_id),
+                query_count=len(query_texts),
+                error=str(e),
+            )
+            raise
 
 
 # Global vector search service instance
@@ -12,6 +12,9 @@ from app.services.mcp_client import mcp_client
 
 router = APIRouter(prefix="/api/v1/documents", tags=["documents"])
 
+# Bytes read from an uploaded file per streamed chunk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class DocumentListResponse(BaseModel):
     """Response model for document list."""
@@ -80,26 +83,30 @@ async def upload_document(
     """
     Upload a document.
     
-    Calls rag_ingest MCP tool.
+    Streams the file to the MCP server's streaming ingest endpoint in
+    UPLOAD_CHUNK_SIZE reads, so the file is never held in memory as a whole.
     """
+    async def file_chunks():
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    
     try:
-        # Read file content
-        content = await file.read()
-        content_text = content.decode("utf-8") if isinstance(content, bytes) else str(content)
-        
-        # Prepare MCP tool arguments
-        arguments = {
+        params = {
             "tenant_id": tenant_id,
-            "document_content": content_text,
-            "document_metadata": {
-                "title": document_title or file.filename,
-                "type": file.content_type or "text/plain",
-                "filename": file.filename,
-            },
+            "title": document_title or file.filename,
+            "filename": file.filename,
+            "document_type": file.content_type or "text/plain",
         }
         
-        # Call MCP tool
-        result = await mcp_client.call_tool("rag_ingest", arguments, headers=headers)
+        result = await mcp_client.stream_document(
+            file_chunks(),
+            params,
+            content_type=file.content_type or "text/plain",
+            headers=headers,
+        )
         
         return {
             "document_id": result.get("document_id"),
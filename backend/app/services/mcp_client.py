@@ -7,7 +7,7 @@ It translates REST API requests to MCP protocol calls.
 
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 import httpx
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,8 @@ class MCPClient:
             mcp_base_url: Base URL for MCP server (defaults to localhost)
         """
         self.mcp_base_url = mcp_base_url.rstrip("/")
+        # The MCP server's REST API is mounted next to /mcp
+        self.api_base_url = self.mcp_base_url.rsplit("/mcp", 1)[0] + "/api"
         self._client: Optional[httpx.AsyncClient] = None
         self._message_id = 0
     
@@ -129,6 +131,65 @@ class MCPClient:
             )
             raise ValueError(f"Invalid JSON response: {str(e)}")
     
+    async def stream_document(
+        self,
+        chunks: AsyncIterator[bytes],
+        params: Dict[str, Any],
+        content_type: str = "text/plain",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload a document to the MCP server's streaming ingest endpoint.
+        
+        The chunks are sent as a chunked request body as they are produced,
+        so the document is never held in memory as a whole.
+        
+        Args:
+            chunks: Document content
+            params: Query parameters (title, tenant_id, document_id, filename, ...)
+            content_type: MIME type of the content
+            headers: Optional HTTP headers (for auth, etc.)
+            
+        Returns:
+            Ingestion result as dictionary
+            
+        Raises:
+            httpx.HTTPError: If the upload fails to reach the server
+            ValueError: If the server rejects the document
+        """
+        client = await self._get_client()
+        
+        request_headers = {
+            "Content-Type": content_type,
+            "Accept": "application/json",
+        }
+        if headers:
+            request_headers.update(headers)
+        
+        try:
+            response = await client.post(
+                f"{self.api_base_url}/documents/stream",
+                params={key: value for key, value in params.items() if value is not None},
+                content=chunks,
+                headers=request_headers,
+                # Reading the response waits for the whole upload to be stored
+                timeout=httpx.Timeout(30.0, read=None),
+            )
+            result = response.json()
+            if response.is_error:
+                message = result.get("error", {}).get("message", "Unknown error")
+                logger.error(
+                    f"Streamed document upload rejected: status={response.status_code}, message={message}"
+                )
+                raise ValueError(f"Document upload failed: {message}")
+            return result
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error streaming document: error={str(e)}", exc_info=True)
+            raise
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON response to streamed document: error={str(e)}", exc_info=True)
+            raise ValueError(f"Invalid JSON response: {str(e)}")
+    
     async def list_tools(self, headers: Optional[Dict[str, str]] = None) -> list[Dict[str, Any]]:
         """
         List all available MCP tools.
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the incremental SSE parser.
+
+Streams multi-megabyte embedding results (e.g. 64 x 3072 floats as JSON)
+through SSEParser and through the previous string-buffer parser, in chunks
+the size httpx typically yields, and reports throughput.
+
+Usage:
+    python scripts/benchmark_sse_parser.py [--texts 64] [--dimension 3072]
+        [--events 4] [--chunk-size 16384] [--repeat 3]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.sse_parser import SSEParser
+
+
+def build_stream(texts: int, dimension: int, events: int) -> bytes:
+    """Build an event stream of JSON-RPC embedding results."""
+    rng = random.Random(0)
+    parts = []
+    for message_id in range(events):
+        embeddings = [[rng.uniform(-1, 1) for _ in range(dimension)] for _ in range(texts)]
+        message = {"jsonrpc": "2.0", "id": message_id, "result": {"embeddings": embeddings}}
+        parts.append(f"event: message\ndata: {json.dumps(message)}\n\n")
+    return "".join(parts).encode("utf-8")
+
+
+def parse_incremental(chunks: List[bytes]) -> List[Any]:
+    """Parse with SSEParser, decoding each event's JSON once."""
+    parser = SSEParser()
+    results = []
+    for chunk in chunks:
+        results.extend(event.json() for event in parser.feed(chunk))
+    results.extend(event.json() for event in parser.flush())
+    return results
+
+
+def parse_string_buffer(chunks: List[bytes]) -> List[Any]:
+    """Parse the way GPUAISSEClient did before SSEParser (buffer += / split)."""
+    buffer = ""
+    results = []
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8", errors="ignore")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line = line.strip()
+            if line.startswith("data: "):
+                results.append(json.loads(line[6:]))
+    return results
+
+
+def bench(name: str, parse: Callable[[List[bytes]], List[Any]], chunks: List[bytes], size: int, repeat: int) -> float:
+    """Time a parser and print its best run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(chunks)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<16} {best * 1000:9.1f} ms  {size / best / 1e6:8.1f} MB/s")
+    return best
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark SSE parsing of embedding payloads")
+    parser.add_argument("--texts", type=int, default=64, help="Embeddings per event")
+    parser.add_argument("--dimension", type=int, default=3072, help="Embedding dimension")
+    parser.add_argument("--events", type=int, default=4, help="Events in the stream")
+    parser.add_argument("--chunk-size", type=int, default=16384, help="Bytes per network chunk")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser (best is reported)")
+    args = parser.parse_args()
+
+    stream = build_stream(args.texts, args.dimension, args.events)
+    chunks = [stream[i:i + args.chunk_size] for i in range(0, len(stream), args.chunk_size)]
+    print(
+        f"{args.events} events x {args.texts} x {args.dimension} floats: "
+        f"{len(stream) / 1e6:.1f} MB in {len(chunks)} chunks of {args.chunk_size} bytes"
+    )
+
+    assert parse_incremental(chunks) == parse_string_buffer(chunks)
+
+    incremental = bench("SSEParser", parse_incremental, chunks, len(stream), args.repeat)
+    string_buffer = bench("string buffer", parse_string_buffer, chunks, len(stream), args.repeat)
+    print(f"speedup          {string_buffer / incremental:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
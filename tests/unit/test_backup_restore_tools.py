@@ -99,12 +99,13 @@ class TestRagRebuildIndex:
         mock_doc2.title = "Test Doc 2"
         mock_doc2.metadata = {"source": "test"}
 
-        # Mock embedding
-        mock_embedding = np.random.rand(384).astype(np.float32)
+        # Mock embedding (one chunk per document)
+        mock_embedding = np.random.rand(1, 384).astype(np.float32)
 
         # Mock repositories
         mock_doc_repo = MagicMock()
         mock_doc_repo.get_by_tenant = AsyncMock(return_value=[mock_doc1, mock_doc2])
+        mock_doc_repo.replace_chunks = AsyncMock()
 
         mock_session = MagicMock()
         mock_session.commit = AsyncMock()
@@ -122,7 +123,7 @@ class TestRagRebuildIndex:
                 with patch("app.mcp.tools.backup_restore.DocumentRepository", return_value=mock_doc_repo):
                     with patch("app.mcp.tools.backup_restore.TenantRepository") as mock_tenant_repo_class:
                         with patch("app.mcp.tools.backup_restore.get_document_content") as mock_get_content:
-                            with patch("app.mcp.tools.backup_restore.embedding_service.generate_embedding") as mock_embed:
+                            with patch("app.mcp.tools.backup_restore.embedding_service.generate_embeddings") as mock_embed:
                                 with patch("app.mcp.tools.backup_restore.faiss_manager") as mock_faiss_mgr:
                                     with patch("app.mcp.tools.backup_restore._get_tenant_embedding_dimension") as mock_dim:
                                         with patch("app.mcp.tools.backup_restore._validate_index_integrity") as mock_validate:
@@ -147,7 +148,7 @@ class TestRagRebuildIndex:
                                                 mock_faiss_mgr.create_index = MagicMock()
                                                 mock_faiss_mgr.remove_index_from_cache = MagicMock()
                                                 mock_faiss_mgr.save_index = MagicMock()
-                                                mock_faiss_mgr.add_document = MagicMock()
+                                                mock_faiss_mgr.add_documents = MagicMock()
 
                                         result = await rag_rebuild_index(
                                             tenant_id=str(tenant_id),
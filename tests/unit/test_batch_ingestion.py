@@ -0,0 +1,166 @@
+"""
+Unit tests for bulk document ingestion.
+
+Tests cover:
+- One deduplication query, INSERT, FAISS add and Meilisearch task per batch
+- Duplicates within the batch and against existing documents
+- Invalid documents, failed embedding chunks and failed uploads reported per document
+- Batch size limits
+- Stores written by a failed batch undone
+"""
+
+import hashlib
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+
+from app.services.batch_ingestion import BatchIngestionService
+from app.utils.errors import ValidationError
+
+
+def _document(content, title="Doc", document_id=None):
+    """Batch entry as taken by rag_ingest_batch."""
+    document = {"document_content": content, "document_metadata": {"title": title, "type": "text"}}
+    if document_id:
+        document["document_id"] = str(document_id)
+    return document
+
+
+def _content_hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _stores(existing=(), embed=None, uploads=None):
+    """Patch every backing store of the batch ingestion service."""
+    doc_repo = MagicMock()
+    doc_repo.get_existing = AsyncMock(return_value=list(existing))
+    doc_repo.bulk_create = AsyncMock()
+    doc_repo.replace_chunks = AsyncMock()
+    session = MagicMock()
+    session.commit = AsyncMock()
+
+    async def fake_session():
+        yield session
+
+    async def fake_embed(texts, tenant_id, priority):
+        return np.ones((len(texts), 8), dtype=np.float32)
+
+    async def fake_upload(tenant_id, contents, content_type, max_concurrency):
+        return {
+            document_id: (uploads or {}).get(document_id, f"documents/{document_id}")
+            for document_id in contents
+        }
+
+    with patch("app.services.batch_ingestion.get_db_session", fake_session), \
+         patch("app.services.batch_ingestion.DocumentRepository", return_value=doc_repo), \
+         patch("app.services.batch_ingestion.embedding_service.generate_embeddings",
+               AsyncMock(side_effect=embed or fake_embed)) as generate, \
+         patch("app.services.batch_ingestion.upload_document_contents",
+               AsyncMock(side_effect=fake_upload)) as upload, \
+         patch("app.services.batch_ingestion.faiss_manager.add_documents") as faiss_add, \
+         patch("app.services.batch_ingestion.add_documents_to_index", AsyncMock()) as meilisearch_add, \
+         patch("app.services.batch_ingestion.undo_ingestion", AsyncMock()) as undo:
+        yield MagicMock(
+            doc_repo=doc_repo,
+            session=session,
+            generate=generate,
+            upload=upload,
+            faiss_add=faiss_add,
+            meilisearch_add=meilisearch_add,
+            undo=undo,
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_each_store_once():
+    """New documents share one query, INSERT, FAISS add and Meilisearch task."""
+    tenant_id, user_id = uuid4(), uuid4()
+    existing_id, versioned_id = uuid4(), uuid4()
+    documents = [
+        _document("alpha"),
+        _document("beta"),
+        _document("alpha"),
+        _document("known content"),
+        _document("new content", document_id=versioned_id),
+        _document("gamma", title=""),
+    ]
+
+    with _stores(existing=[(existing_id, _content_hash("known content")), (versioned_id, "other")]) as stores:
+        result = await BatchIngestionService().ingest(tenant_id, user_id, documents)
+
+    statuses = [document["ingestion_status"] for document in result["documents"]]
+    assert statuses == ["success", "success", "duplicate", "duplicate", "failed", "failed"]
+    assert (result["ingested"], result["duplicates"], result["failed"]) == (2, 2, 2)
+    assert result["documents"][2]["existing_document_id"] == result["documents"][0]["document_id"]
+    assert result["documents"][3]["existing_document_id"] == str(existing_id)
+    assert "rag_ingest" in result["documents"][4]["error"]
+    assert "title" in result["documents"][5]["error"]
+
+    stores.doc_repo.get_existing.assert_awaited_once()
+    stores.generate.assert_awaited_once()
+    rows = stores.doc_repo.bulk_create.await_args.args[0]
+    assert [row["title"] for row in rows] == ["Doc", "Doc"]
+    assert all(row["tenant_id"] == tenant_id and row["user_id"] == user_id for row in rows)
+    stores.faiss_add.assert_called_once()
+    assert stores.faiss_add.call_args.kwargs["embeddings"].shape == (2, 8)
+    assert len(stores.meilisearch_add.await_args.args[1]) == 2
+    stores.session.commit.assert_awaited_once()
+    assert result["processing_metadata"]["embedding_dimension"] == 8
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_and_uploads_fail_their_documents_only():
+    """An embedding chunk or upload failure leaves the rest of the batch ingested."""
+    failed_upload_id = uuid4()
+    documents = [_document(f"text {i}") for i in range(4)] + [_document("upload", document_id=failed_upload_id)]
+
+    async def embed(texts, tenant_id, priority):
+        if "text 0" in texts:
+            raise RuntimeError("backend unavailable")
+        return np.ones((len(texts), 8), dtype=np.float32)
+
+    with patch("app.services.batch_ingestion.ingestion_settings.embedding_batch_size", 2), \
+         _stores(embed=embed, uploads={failed_upload_id: OSError("connection reset")}) as stores:
+        result = await BatchIngestionService().ingest(uuid4(), uuid4(), documents)
+
+    statuses = [document["ingestion_status"] for document in result["documents"]]
+    assert statuses == ["failed", "failed", "success", "success", "failed"]
+    assert "backend unavailable" in result["documents"][0]["error"]
+    assert "connection reset" in result["documents"][4]["error"]
+    assert stores.generate.await_count == 3
+    assert len(stores.doc_repo.bulk_create.await_args.args[0]) == 2
+
+    # Content uploaded for documents whose embedding failed is deleted again
+    orphaned = stores.undo.await_args_list[0]
+    assert orphaned.args[1] == [UUID(result["documents"][i]["document_id"]) for i in (0, 1)]
+    assert orphaned.kwargs == {"minio": True}
+
+
+@pytest.mark.asyncio
+async def test_failed_index_write_is_undone():
+    """A failed Meilisearch task removes the batch's vectors and content, and nothing is committed."""
+    with _stores() as stores:
+        stores.meilisearch_add.side_effect = RuntimeError("meilisearch down")
+        with pytest.raises(RuntimeError, match="meilisearch down"):
+            await BatchIngestionService().ingest(uuid4(), uuid4(), [_document("a"), _document("b")])
+
+    stores.session.commit.assert_not_awaited()
+    undone = [call.kwargs for call in stores.undo.await_args_list]
+    assert {"faiss": True, "meilisearch": False} in undone
+    assert {"minio": True} in undone
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_limited():
+    """Empty and oversized batches are rejected before touching any store."""
+    service = BatchIngestionService()
+
+    with patch("app.services.batch_ingestion.ingestion_settings.batch_max_documents", 2):
+        with pytest.raises(ValidationError, match="at most 2"):
+            await service.ingest(uuid4(), uuid4(), [_document("a"), _document("b"), _document("c")])
+    with pytest.raises(ValidationError, match="non-empty"):
+        await service.ingest(uuid4(), uuid4(), [])
@@ -0,0 +1,49 @@
+"""
+Unit tests for splitting documents into token windows.
+
+Tests cover:
+- Short documents kept as a single chunk
+- Overlapping windows with offsets into the content
+- The chunk limit per document
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services.document_chunker import chunk_text
+
+
+@pytest.fixture(autouse=True)
+def word_tokens():
+    """Use word-level tokens so windows do not depend on tiktoken being installed."""
+    with patch("app.services.document_chunker.TIKTOKEN_AVAILABLE", False):
+        yield
+
+
+def test_short_text_is_one_chunk():
+    """A text within the window is a single chunk spanning all of it."""
+    chunks = chunk_text("A short document.", size=10, overlap=2)
+
+    assert [(chunk.chunk_no, chunk.start, chunk.end) for chunk in chunks] == [(0, 0, 17)]
+
+
+def test_windows_overlap_and_point_into_content():
+    """Consecutive chunks share `overlap` tokens and their offsets slice the content."""
+    text = " ".join(f"w{i}" for i in range(10))
+
+    chunks = chunk_text(text, size=4, overlap=1)
+
+    assert [chunk.text for chunk in chunks] == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+    assert all(text[chunk.start:chunk.end] == chunk.text for chunk in chunks)
+    assert [chunk.chunk_no for chunk in chunks] == [0, 1, 2]
+
+
+def test_last_chunk_takes_the_remainder_past_the_limit():
+    """Beyond max_chunks, the last chunk runs to the end of the content."""
+    text = " ".join(f"w{i}" for i in range(20))
+
+    chunks = chunk_text(text, size=4, overlap=0, max_chunks=2)
+
+    assert len(chunks) == 2
+    assert chunks[1].text == " ".join(f"w{i}" for i in range(4, 20))
@@ -33,6 +33,7 @@ def get_tool_func(tool_name: str):
 
 
 rag_ingest = get_tool_func("rag_ingest")
+rag_ingest_batch = get_tool_func("rag_ingest_batch")
 
 
 class TestRagIngest:
@@ -73,24 +74,26 @@ class TestRagIngest:
         _tenant_id_context.set(tenant_id)
         _user_id_context.set(user_id)
 
-        # Mock embedding
-        mock_embedding = np.random.rand(3072).astype(np.float32)
+        # Mock embedding (one chunk)
+        mock_embedding = np.random.rand(1, 3072).astype(np.float32)
 
         # Mock repositories
         mock_doc_repo = MagicMock()
         mock_doc_repo.get_by_id = AsyncMock(return_value=None)  # Document doesn't exist yet
         mock_doc_repo.get_by_content_hash = AsyncMock(return_value=None)  # No duplicate
         mock_doc_repo.create = AsyncMock(return_value=MagicMock(document_id=document_id))
+        mock_doc_repo.replace_chunks = AsyncMock()
 
         mock_session = MagicMock()
         mock_session.commit = AsyncMock()
 
-        with patch("app.mcp.tools.document_ingestion.get_db_session") as mock_get_session:
+        with patch("app.mcp.tools.document_ingestion.get_db_session") as mock_get_session, \
+             patch("app.mcp.tools.document_ingestion.ingestion_settings.outbox_enabled", False):
             mock_get_session.return_value.__aiter__.return_value = [mock_session]
             with patch("app.mcp.tools.document_ingestion.DocumentRepository", return_value=mock_doc_repo):
-                with patch("app.mcp.tools.document_ingestion.embedding_service.generate_embedding") as mock_embed:
+                with patch("app.mcp.tools.document_ingestion.embedding_service.generate_embeddings") as mock_embed:
                     with patch("app.mcp.tools.document_ingestion.upload_document_content") as mock_minio:
-                        with patch("app.mcp.tools.document_ingestion.faiss_manager.add_document") as mock_faiss:
+                        with patch("app.mcp.tools.document_ingestion.faiss_manager.add_documents") as mock_faiss:
                             with patch("app.mcp.tools.document_ingestion.add_document_to_index") as mock_meilisearch:
                                 mock_embed.return_value = mock_embedding
                                 mock_minio.return_value = f"documents/{document_id}"
@@ -109,7 +112,10 @@ class TestRagIngest:
                                 mock_embed.assert_called_once()
                                 mock_minio.assert_called_once()
                                 mock_faiss.assert_called_once()
+                                assert mock_faiss.call_args.kwargs["chunk_numbers"] == [0]
                                 mock_meilisearch.assert_called_once()
+                                chunk_rows = mock_doc_repo.replace_chunks.await_args.args[1]
+                                assert [(row["start_offset"], row["end_offset"]) for row in chunk_rows] == [(0, 21)]
                                 mock_session.commit.assert_called_once()
 
                                 assert result["document_id"] == str(document_id)
@@ -118,6 +124,98 @@ class TestRagIngest:
                                 assert "MinIO" in result["indexed_in"]
                                 assert "FAISS" in result["indexed_in"]
                                 assert "Meilisearch" in result["indexed_in"]
+                                timings = result["processing_metadata"]["stage_timings_ms"]
+                                assert {"embedding_ms", "minio_ms", "faiss_ms", "meilisearch_ms"} <= set(timings)
+
+    @pytest.mark.asyncio
+    async def test_ingest_queued_for_indexing(self):
+        """With the outbox enabled, ingestion commits the row and an outbox entry only."""
+        if not rag_ingest:
+            pytest.skip("rag_ingest not registered")
+
+        tenant_id = uuid4()
+        document_id = uuid4()
+
+        _role_context.set(UserRole.TENANT_ADMIN)
+        _tenant_id_context.set(tenant_id)
+        _user_id_context.set(uuid4())
+
+        mock_doc_repo = MagicMock()
+        mock_doc_repo.get_by_id = AsyncMock(return_value=None)
+        mock_doc_repo.create = AsyncMock()
+        mock_outbox_repo = MagicMock()
+        mock_outbox_repo.enqueue = AsyncMock()
+
+        mock_session = MagicMock()
+        mock_session.commit = AsyncMock()
+
+        with patch("app.mcp.tools.document_ingestion.get_db_session") as mock_get_session, \
+             patch("app.mcp.tools.document_ingestion.ingestion_settings.outbox_enabled", True), \
+             patch("app.mcp.tools.document_ingestion.DocumentRepository", return_value=mock_doc_repo), \
+             patch("app.mcp.tools.document_ingestion.IngestionOutboxRepository", return_value=mock_outbox_repo), \
+             patch("app.mcp.tools.document_ingestion.ingestion_indexer.notify") as mock_notify, \
+             patch("app.mcp.tools.document_ingestion.embedding_service.generate_embeddings") as mock_embed, \
+             patch("app.mcp.tools.document_ingestion.add_document_to_index") as mock_meilisearch:
+            mock_get_session.return_value.__aiter__.return_value = [mock_session]
+
+            result = await rag_ingest(
+                document_content="Queued content",
+                document_metadata={"title": "Queued"},
+                document_id=str(document_id),
+            )
+
+        enqueued = mock_outbox_repo.enqueue.call_args.kwargs
+        assert (enqueued["document_id"], enqueued["content"]) == (document_id, "Queued content")
+        mock_session.commit.assert_awaited_once()
+        mock_notify.assert_called_once()
+        mock_embed.assert_not_called()
+        mock_meilisearch.assert_not_called()
+        assert result["ingestion_status"] == "queued"
+        assert result["indexed_in"] == ["PostgreSQL"]
+        assert result["processing_metadata"]["indexing_status"] == "pending"
+
+    @pytest.mark.asyncio
+    async def test_ingest_inline_failure_undoes_written_stores(self):
+        """A failed Meilisearch write removes the new document's vector and content."""
+        if not rag_ingest:
+            pytest.skip("rag_ingest not registered")
+
+        tenant_id = uuid4()
+        _role_context.set(UserRole.TENANT_ADMIN)
+        _tenant_id_context.set(tenant_id)
+        _user_id_context.set(uuid4())
+
+        mock_doc_repo = MagicMock()
+        mock_doc_repo.get_by_content_hash = AsyncMock(return_value=None)
+        mock_doc_repo.create = AsyncMock()
+        mock_doc_repo.get_by_id = AsyncMock(return_value=None)
+        mock_doc_repo.replace_chunks = AsyncMock()
+        mock_session = MagicMock()
+        mock_session.commit = AsyncMock()
+
+        with patch("app.mcp.tools.document_ingestion.get_db_session") as mock_get_session, \
+             patch("app.mcp.tools.document_ingestion.ingestion_settings.outbox_enabled", False), \
+             patch("app.mcp.tools.document_ingestion.DocumentRepository", return_value=mock_doc_repo), \
+             patch("app.mcp.tools.document_ingestion.embedding_service.generate_embeddings",
+                   AsyncMock(return_value=np.ones((1, 8), dtype=np.float32))), \
+             patch("app.mcp.tools.document_ingestion.upload_document_content",
+                   AsyncMock(return_value="documents/x")) as mock_minio, \
+             patch("app.mcp.tools.document_ingestion.faiss_manager.add_documents") as mock_faiss, \
+             patch("app.mcp.tools.document_ingestion.add_document_to_index",
+                   AsyncMock(side_effect=RuntimeError("meilisearch down"))), \
+             patch("app.mcp.tools.document_ingestion.undo_ingestion", AsyncMock()) as mock_undo:
+            mock_get_session.return_value.__aiter__.return_value = [mock_session]
+
+            with pytest.raises(RuntimeError, match="meilisearch down"):
+                await rag_ingest(
+                    document_content="Inline content",
+                    document_metadata={"title": "Inline"},
+                )
+
+        document_id = mock_minio.call_args.kwargs["document_id"]
+        mock_faiss.assert_called_once()
+        mock_session.commit.assert_not_called()
+        mock_undo.assert_awaited_once_with(tenant_id, [document_id], minio=True, faiss=True, meilisearch=False)
 
     @pytest.mark.asyncio
     async def test_ingest_duplicate_content(self):
@@ -206,6 +304,7 @@ class TestRagIngest:
             content_hash=new_hash,
         ))
         mock_doc_repo.get_by_content_hash = AsyncMock(return_value=None)
+        mock_doc_repo.replace_chunks = AsyncMock()
 
         mock_version_repo = MagicMock()
         mock_version_repo.create = AsyncMock(return_value=MagicMock(
@@ -216,13 +315,14 @@ class TestRagIngest:
         mock_session = MagicMock()
         mock_session.commit = AsyncMock()
 
-        with patch("app.mcp.tools.document_ingestion.get_db_session") as mock_get_session:
+        with patch("app.mcp.tools.document_ingestion.get_db_session") as mock_get_session, \
+             patch("app.mcp.tools.document_ingestion.ingestion_settings.outbox_enabled", False):
             mock_get_session.return_value.__aiter__.return_value = [mock_session]
             with patch("app.mcp.tools.document_ingestion.DocumentRepository", return_value=mock_doc_repo):
                 with patch("app.db.repositories.document_version_repository.DocumentVersionRepository", return_value=mock_version_repo):
-                    with patch("app.mcp.tools.document_ingestion.embedding_service.generate_embedding", AsyncMock(return_value=np.random.rand(768).tolist())):
+                    with patch("app.mcp.tools.document_ingestion.embedding_service.generate_embeddings", AsyncMock(return_value=np.random.rand(1, 768))):
                         with patch("app.mcp.tools.document_ingestion.upload_document_content", AsyncMock(return_value="minio/object/name")):
-                            with patch("app.mcp.tools.document_ingestion.faiss_manager.add_document", MagicMock()):
+                            with patch("app.mcp.tools.document_ingestion.faiss_manager.add_documents", MagicMock()):
                                 with patch("app.mcp.tools.document_ingestion.add_document_to_index", AsyncMock()):
                                     result = await rag_ingest(
                                         document_content=new_content,
@@ -318,3 +418,37 @@ class TestRagIngest:
                 tenant_id=str(tenant_id_2),
             )
 
+
+class TestRagIngestBatch:
+    """Tests for rag_ingest_batch MCP tool."""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        # Reset context variables before each test
+        _role_context.set(None)
+        _tenant_id_context.set(None)
+        _user_id_context.set(None)
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch_checks_access_and_delegates(self):
+        """Test that batch ingestion applies rag_ingest's access rules, then ingests in bulk."""
+        if not rag_ingest_batch:
+            pytest.skip("rag_ingest_batch not registered")
+
+        documents = [{"document_content": "Test content", "document_metadata": {"title": "Test"}}]
+        _role_context.set(UserRole.UBER_ADMIN)  # Not allowed
+        with pytest.raises(AuthorizationError, match="Only Tenant Admin and End User can ingest documents"):
+            await rag_ingest_batch(documents=documents)
+
+        tenant_id = uuid4()
+        user_id = uuid4()
+        _role_context.set(UserRole.TENANT_ADMIN)
+        _tenant_id_context.set(tenant_id)
+        _user_id_context.set(user_id)
+
+        with patch("app.mcp.tools.document_ingestion.batch_ingestion_service.ingest", new_callable=AsyncMock) as mock_ingest:
+            mock_ingest.return_value = {"ingested": 1, "duplicates": 0, "failed": 0, "documents": []}
+            result = await rag_ingest_batch(documents=documents)
+
+        mock_ingest.assert_awaited_once_with(tenant_id, user_id, documents)
+        assert result["ingested"] == 1
@@ -0,0 +1,165 @@
+"""
+Unit tests for the embedding micro-batcher.
+
+Tests cover:
+- Coalescing concurrent requests into one backend call
+- Grouping batches by model
+- Flushing full batches without waiting
+- Propagating backend failures to every caller
+- Bisecting batches rejected for one caller's input, never outages
+- Batch-size and wait-time histograms
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.embedding_batcher import EmbeddingBatcher, is_input_error
+
+
+class RejectedInput(Exception):
+    """Backend error for a request whose input the backend refuses."""
+
+    status_code = 400
+
+
+class FakeBackend:
+    """Embedding backend recording every batched call."""
+
+    def __init__(self, fail: bool = False, reject: str = None):
+        self.calls = []
+        self.fail = fail
+        self.reject = reject
+
+    async def __call__(self, model, texts):
+        self.calls.append((model, list(texts)))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ValueError("backend down")
+        if self.reject in texts:
+            raise RejectedInput(f"cannot embed {self.reject!r}")
+        # Encode each text's length so callers can check they got their own rows
+        return np.array([[len(text), i] for i, text in enumerate(texts)], dtype=np.float32)
+
+
+class TestEmbeddingBatcher:
+    """Tests for EmbeddingBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self):
+        """Concurrent callers are served by a single backend call, each with its own rows."""
+        backend = FakeBackend()
+        batcher = EmbeddingBatcher(backend, max_wait_ms=20, max_batch_size=64)
+
+        texts = ["a" * n for n in range(1, 21)]
+        results = await asyncio.gather(*(batcher.embed("gpu-ai", [text]) for text in texts))
+
+        assert len(backend.calls) == 1
+        assert [int(result[0, 0]) for result in results] == list(range(1, 21))
+        assert all(result.shape == (1, 2) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_batches_grouped_by_model(self):
+        """Requests for different models never share a batch."""
+        backend = FakeBackend()
+        batcher = EmbeddingBatcher(backend, max_wait_ms=20, max_batch_size=64)
+
+        await asyncio.gather(
+            batcher.embed("gpu-ai", ["x"]),
+            batcher.embed("text-embedding-3-small", ["y"]),
+            batcher.embed("gpu-ai", ["z", "w"]),
+        )
+
+        assert sorted(backend.calls) == [("gpu-ai", ["x", "z", "w"]), ("text-embedding-3-small", ["y"])]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushed_without_waiting(self):
+        """Reaching max_batch_size sends the batch before the wait window ends."""
+        backend = FakeBackend()
+        batcher = EmbeddingBatcher(backend, max_wait_ms=10_000, max_batch_size=4)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.embed("gpu-ai", [str(i)]) for i in range(8))),
+            timeout=1,
+        )
+
+        assert len(results) == 8
+        assert [len(texts) for _, texts in backend.calls] == [4, 4]
+
+        stats = batcher.stats()
+        assert stats["batches"] == 2
+        assert stats["texts"] == 8
+        assert stats["batch_size"]["buckets"]["<=4"] == 2
+        assert stats["wait_ms"]["count"] == 8
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_reaches_every_caller(self):
+        """A failed batch raises the backend error in each waiting caller."""
+        backend = FakeBackend(fail=True)
+        batcher = EmbeddingBatcher(backend, max_wait_ms=5, max_batch_size=64)
+
+        results = await asyncio.gather(
+            batcher.embed("gpu-ai", ["a"]),
+            batcher.embed("gpu-ai", ["b"]),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert batcher.stats()["failed_batches"] == 1
+        # An outage is not retried per caller
+        assert len(backend.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_bisected(self):
+        """Only the caller whose texts the backend rejects gets the error."""
+        backend = FakeBackend(reject="bad")
+        batcher = EmbeddingBatcher(backend, max_wait_ms=5, max_batch_size=64)
+
+        results = await asyncio.gather(
+            batcher.embed("gpu-ai", ["aa", "aaa"]),
+            batcher.embed("gpu-ai", ["bad"]),
+            batcher.embed("gpu-ai", ["a"]),
+            batcher.embed("gpu-ai", ["aaaa"]),
+            return_exceptions=True,
+        )
+
+        good, bad, other, last = results
+        assert [int(row[0]) for row in good] == [2, 3]
+        assert isinstance(bad, RejectedInput)
+        assert [int(row[0]) for row in other] == [1]
+        assert [int(row[0]) for row in last] == [4]
+        # Batch, its two halves, then the rejected half's two halves
+        assert [texts for _, texts in backend.calls] == [
+            ["aa", "aaa", "bad", "a", "aaaa"],
+            ["aa", "aaa", "bad"],
+            ["a", "aaaa"],
+            ["aa", "aaa"],
+            ["bad"],
+        ]
+        stats = batcher.stats()
+        assert (stats["failed_batches"], stats["retried_batches"]) == (1, 4)
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_not_bisected_when_check_refuses(self):
+        """The input error check (e.g. an open circuit breaker) can rule out retries."""
+        backend = FakeBackend(reject="bad")
+        batcher = EmbeddingBatcher(
+            backend, max_wait_ms=5, max_batch_size=64, input_error_check=lambda model, error: False
+        )
+
+        results = await asyncio.gather(
+            batcher.embed("gpu-ai", ["a"]),
+            batcher.embed("gpu-ai", ["bad"]),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RejectedInput) for result in results)
+        assert len(backend.calls) == 1
+
+    def test_only_input_rejections_are_input_errors(self):
+        """Status 400/413/422 errors are input errors; timeouts and connection errors are not."""
+        assert is_input_error(RejectedInput())
+        assert not is_input_error(ValueError("backend down"))
+        assert not is_input_error(asyncio.TimeoutError())
+        assert not is_input_error(ConnectionError("reset"))
@@ -0,0 +1,130 @@
+"""
+Unit tests for the two-tier embedding cache.
+
+Tests cover:
+- Cache keys scoped by tenant and model, insensitive to whitespace
+- LRU hits, Redis hits and float16 storage
+- Degrading to the LRU tier when Redis fails
+- EmbeddingService skipping the backend for cached texts
+"""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.embedding_cache import EmbeddingCache, embedding_cache_key
+
+
+class FakePipeline:
+    """Minimal async Redis pipeline collecting SET commands."""
+
+    def __init__(self, store):
+        self.store = store
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value))
+
+    async def execute(self):
+        self.store.update(self.commands)
+
+
+class FakeRedis:
+    """Minimal async Redis client backed by a dict."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.store)
+
+
+@pytest.fixture
+def fake_redis():
+    """Patch the cache's Redis client with an in-memory fake."""
+    redis = FakeRedis()
+    with patch("app.services.embedding_cache.get_redis_client", AsyncMock(return_value=redis)):
+        yield redis
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    def test_keys_scoped_and_normalized(self):
+        """Keys ignore whitespace differences but never cross tenants or models."""
+        tenant_a, tenant_b = str(uuid4()), str(uuid4())
+
+        key = embedding_cache_key(tenant_a, "gpu-ai", "hello   world\n")
+
+        assert key == embedding_cache_key(tenant_a, "gpu-ai", " hello world")
+        assert key.startswith(f"tenant:{tenant_a}:embedding:gpu-ai:")
+        assert key != embedding_cache_key(tenant_b, "gpu-ai", "hello world")
+        assert key != embedding_cache_key(tenant_a, "text-embedding-3-small", "hello world")
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_serves_other_workers(self, fake_redis):
+        """A vector stored by one worker is found in Redis by another, as float16."""
+        tenant_id = str(uuid4())
+        vectors = np.random.default_rng(0).random((2, 4), dtype=np.float32)
+        writer = EmbeddingCache(max_entries=10)
+        await writer.put_many(tenant_id, "gpu-ai", ["a", "b"], vectors)
+
+        reader = EmbeddingCache(max_entries=10)
+        results = await reader.get_many(tenant_id, "gpu-ai", ["a", "c", "b"])
+
+        assert results[1] is None
+        np.testing.assert_allclose(results[0], vectors[0], rtol=1e-3)
+        np.testing.assert_allclose(results[2], vectors[1], rtol=1e-3)
+        assert results[0].dtype == np.float32
+        assert all(len(value) == 4 * 2 for value in fake_redis.store.values())
+
+        await reader.get_many(tenant_id, "gpu-ai", ["a"])
+        stats = reader.stats()
+        assert (stats["hits"], stats["redis_hits"], stats["misses"]) == (1, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_lru(self):
+        """Redis errors turn into misses and pause the Redis tier."""
+        tenant_id = str(uuid4())
+        failing = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache = EmbeddingCache(max_entries=10)
+
+        with patch("app.services.embedding_cache.get_redis_client", failing):
+            await cache.put_many(tenant_id, "gpu-ai", ["a"], np.ones((1, 4), dtype=np.float32))
+            results = await cache.get_many(tenant_id, "gpu-ai", ["a", "b"])
+
+        assert results[0] is not None and results[1] is None
+        assert failing.await_count == 1
+        assert cache.stats()["redis_errors"] == 1
+
+
+class TestEmbeddingServiceCache:
+    """Tests for EmbeddingService with the embedding cache."""
+
+    @pytest.mark.asyncio
+    async def test_cached_texts_skip_backend(self, fake_redis):
+        """Only texts not embedded before reach the backend."""
+        from app.services.embedding_service import EmbeddingService
+
+        tenant_id = str(uuid4())
+        service = EmbeddingService()
+        service.cache = EmbeddingCache(max_entries=10)
+        backend = AsyncMock(side_effect=lambda model, texts: np.ones((len(texts), 4), dtype=np.float32))
+        service.batcher._embed_batch = backend
+
+        await service.generate_embeddings(["query one", "query two"], tenant_id, model="gpu-ai")
+        embeddings = await service.generate_embeddings(["query two", "query three"], tenant_id, model="gpu-ai")
+
+        assert embeddings.shape == (2, 4)
+        assert [call.args[1] for call in backend.await_args_list] == [["query one", "query two"], ["query three"]]
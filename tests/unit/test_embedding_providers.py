@@ -0,0 +1,109 @@
+"""
+Unit tests for in-process embedding providers.
+
+Tests cover:
+- Deterministic, normalized feature-hashing embeddings
+- Model dimensions resolved through the provider registry
+- Reserved remote model names
+- EmbeddingService serving a provider's model without GPU-AI or OpenAI
+- Tenants selecting a provider through model_configuration
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.embedding_providers import EmbeddingProviderRegistry, HashingEmbeddingProvider
+from app.services.model_validator import model_validator
+
+
+class TestHashingEmbeddingProvider:
+    """Tests for HashingEmbeddingProvider."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_unit_vectors(self):
+        """The same text always gives the same unit vector; related texts are closer."""
+        provider = HashingEmbeddingProvider(dimension=256)
+        texts = ["Quarterly revenue report", "quarterly revenue REPORT", "revenue report draft", "cat photos"]
+
+        first = await provider.embed(texts)
+        second = HashingEmbeddingProvider(dimension=256).encode(texts)
+
+        assert first.shape == (4, 256)
+        assert first.dtype == np.float32
+        np.testing.assert_array_equal(first, second)
+        np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-6)
+        np.testing.assert_array_equal(first[0], first[1])
+        assert first[0] @ first[2] > first[0] @ first[3]
+        assert provider.stats()["texts"] == 4
+
+    def test_text_without_words_is_zero(self):
+        """Punctuation-only text embeds to the zero vector instead of NaNs."""
+        assert not HashingEmbeddingProvider(dimension=8).encode(["?!"]).any()
+
+
+class TestEmbeddingProviderRegistry:
+    """Tests for EmbeddingProviderRegistry."""
+
+    def test_dimensions_come_from_providers(self):
+        """Registered models report their provider's dimension; remote models keep theirs."""
+        registry = EmbeddingProviderRegistry()
+        registry.register(HashingEmbeddingProvider(name="Hashing-64", dimension=64))
+
+        assert registry.get("hashing-64") is not None
+        assert registry.dimension("HASHING-64") == 64
+        assert registry.dimension("text-embedding-3-large") == 3072
+        assert registry.dimension("gpu-ai") == 384
+        assert registry.names() == ["hashing-64"]
+
+    def test_remote_model_names_reserved(self):
+        """A provider cannot shadow a GPU-AI or OpenAI model."""
+        registry = EmbeddingProviderRegistry()
+
+        for name in ("gpu-ai", "text-embedding-3-small"):
+            with pytest.raises(ValueError, match="reserved"):
+                registry.register(HashingEmbeddingProvider(name=name))
+
+
+def test_registered_provider_is_a_valid_embedding_model():
+    """Tenants may configure the default hashing provider."""
+    assert model_validator.validate_embedding_model("Hashing") == {"valid": True, "model": "hashing"}
+
+
+@pytest.mark.asyncio
+async def test_tenant_selects_in_process_provider(monkeypatch):
+    """A tenant configured for "hashing" is embedded in-process with the provider's dimension."""
+    from app.services import embedding_service as embedding_service_module
+    from app.services.embedding_service import EmbeddingService
+    from app.services.tenant_config_cache import TenantConfigCache
+
+    gpu_ai = AsyncMock()
+    monkeypatch.setattr(embedding_service_module.gpu_ai_client, "generate_embeddings", gpu_ai)
+
+    tenant_config = MagicMock()
+    tenant_config.model_configuration = {"embedding_model": "hashing"}
+    tenant_config.custom_configuration = {}
+    repo = MagicMock()
+    repo.get_by_tenant_id = AsyncMock(return_value=tenant_config)
+
+    async def fake_session():
+        yield MagicMock()
+
+    cache = TenantConfigCache(ttl_seconds=60)
+    monkeypatch.setattr(embedding_service_module, "tenant_config_cache", cache)
+
+    service = EmbeddingService()
+    service.cache = None
+    service.openai_backend = AsyncMock()
+
+    with patch("app.services.tenant_config_cache.get_db_session", fake_session), \
+         patch("app.services.tenant_config_cache.TenantConfigRepository", return_value=repo):
+        model, dimension = await service._get_tenant_embedding_model(str(uuid4()))
+        embeddings = await service.generate_embeddings(["hello world", "offline"], str(uuid4()))
+
+    assert (model, dimension) == ("hashing", 384)
+    assert embeddings.shape == (2, 384)
+    gpu_ai.assert_not_awaited()
+    service.openai_backend.embed.assert_not_awaited()
@@ -0,0 +1,183 @@
+"""
+Unit tests for embedding admission control.
+
+Tests cover:
+- Interactive requests admitted before waiting bulk requests
+- Slots reserved for interactive traffic under a bulk backlog
+- Round-robin admission across tenants
+- Circuit breaker opening, rejecting, and closing after a trial call
+- EmbeddingService failing over to OpenAI while the GPU-AI circuit is open
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from app.services.embedding_scheduler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    CircuitBreaker,
+    EmbeddingScheduler,
+)
+
+
+async def hold_slot(scheduler, tenant_id, priority, order, release):
+    """Record the admission order and keep the slot until released."""
+    async with scheduler.slot(tenant_id, priority):
+        order.append((tenant_id, priority))
+        await release.wait()
+
+
+async def settle():
+    """Let queued tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestEmbeddingScheduler:
+    """Tests for EmbeddingScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_admitted_before_bulk(self):
+        """A query arriving behind a bulk backlog gets the next free slot."""
+        scheduler = EmbeddingScheduler(max_in_flight=1, interactive_reserved=0)
+        order, release = [], asyncio.Event()
+
+        first = asyncio.create_task(hold_slot(scheduler, "a", PRIORITY_BULK, order, release))
+        await settle()
+        bulk = [asyncio.create_task(hold_slot(scheduler, "a", PRIORITY_BULK, order, release)) for _ in range(3)]
+        await settle()
+        query = asyncio.create_task(hold_slot(scheduler, "b", PRIORITY_INTERACTIVE, order, release))
+        await settle()
+
+        assert scheduler.stats()["lanes"][PRIORITY_BULK]["waiting"] == 3
+        release.set()
+        await asyncio.gather(first, query, *bulk)
+
+        assert order[:2] == [("a", PRIORITY_BULK), ("b", PRIORITY_INTERACTIVE)]
+
+    @pytest.mark.asyncio
+    async def test_bulk_leaves_reserved_slots_free(self):
+        """Bulk work never occupies the slots reserved for interactive requests."""
+        scheduler = EmbeddingScheduler(max_in_flight=4, interactive_reserved=1)
+        order, release = [], asyncio.Event()
+
+        bulk = [asyncio.create_task(hold_slot(scheduler, "a", PRIORITY_BULK, order, release)) for _ in range(6)]
+        await settle()
+        lanes = scheduler.stats()["lanes"]
+        assert lanes[PRIORITY_BULK]["in_flight"] == 3
+        assert lanes[PRIORITY_BULK]["waiting"] == 3
+
+        query = asyncio.create_task(hold_slot(scheduler, "b", PRIORITY_INTERACTIVE, order, release))
+        await settle()
+        assert ("b", PRIORITY_INTERACTIVE) in order
+
+        release.set()
+        await asyncio.gather(query, *bulk)
+        assert scheduler.stats()["lanes"][PRIORITY_BULK]["admitted"] == 6
+
+    @pytest.mark.asyncio
+    async def test_tenants_served_round_robin(self):
+        """A tenant's burst does not delay other tenants' requests behind it."""
+        scheduler = EmbeddingScheduler(max_in_flight=1, interactive_reserved=0)
+        order = []
+
+        async def embed(tenant_id):
+            async with scheduler.slot(tenant_id, PRIORITY_BULK):
+                order.append(tenant_id)
+                await asyncio.sleep(0)
+
+        blocker_release = asyncio.Event()
+        blocker = asyncio.create_task(hold_slot(scheduler, "x", PRIORITY_BULK, [], blocker_release))
+        await settle()
+        tasks = [asyncio.create_task(embed("a")) for _ in range(3)]
+        await settle()
+        tasks += [asyncio.create_task(embed("b")), asyncio.create_task(embed("c"))]
+        await settle()
+
+        blocker_release.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert order == ["a", "b", "c", "a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_nothing(self):
+        """A caller cancelled while queued neither holds nor leaks a slot."""
+        scheduler = EmbeddingScheduler(max_in_flight=1, interactive_reserved=0)
+        release = asyncio.Event()
+
+        holder = asyncio.create_task(hold_slot(scheduler, "a", PRIORITY_BULK, [], release))
+        await settle()
+        waiter = asyncio.create_task(hold_slot(scheduler, "b", PRIORITY_BULK, [], release))
+        await settle()
+        waiter.cancel()
+        release.set()
+        await holder
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.stats()["lanes"][PRIORITY_BULK]["in_flight"] == 0
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_on_error_rate_and_closes_after_trial(self):
+        """The breaker rejects calls while open and closes once a trial call succeeds."""
+        breaker = CircuitBreaker("gpu-ai", error_rate=0.5, min_requests=4, cooldown_seconds=0.05)
+
+        for _ in range(2):
+            breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is False
+
+        breaker._opened_at -= 0.05
+        assert breaker.allow() is True  # The trial call
+        assert breaker.allow() is False  # Only one at a time
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow() is True
+        assert breaker.stats()["times_opened"] == 1
+        assert breaker.stats()["rejected_calls"] == 2
+
+    def test_failed_trial_reopens(self):
+        """A failing trial call keeps the breaker open for another cooldown."""
+        breaker = CircuitBreaker("gpu-ai", min_requests=1, cooldown_seconds=0.05)
+        breaker.record_failure()
+
+        breaker._opened_at -= 0.05
+        assert breaker.allow() is True
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is False
+
+
+@pytest.mark.asyncio
+async def test_open_gpu_ai_circuit_fails_over(monkeypatch):
+    """With the GPU-AI circuit open, batches go straight to OpenAI."""
+    from app.services import embedding_service as embedding_service_module
+    from app.services.embedding_service import EmbeddingService
+
+    gpu_ai = AsyncMock(side_effect=RuntimeError("GPU-AI down"))
+    monkeypatch.setattr(embedding_service_module.gpu_ai_client, "generate_embeddings", gpu_ai)
+    monkeypatch.setattr(embedding_service_module, "OPENAI_AVAILABLE", True)
+
+    service = EmbeddingService()
+    service.gpu_ai_breaker = CircuitBreaker("gpu-ai", min_requests=2, cooldown_seconds=60)
+    service.openai_backend = AsyncMock()
+    service.openai_backend.embed.side_effect = lambda model, texts: np.ones((len(texts), 4), dtype=np.float32)
+
+    for _ in range(3):
+        embeddings = await service._embed_batch("gpu-ai", ["hello"])
+        assert embeddings.shape == (1, 4)
+
+    assert gpu_ai.await_count == 2
+    assert service.openai_backend.embed.await_count == 3
+    assert service.gpu_ai_breaker.state == CircuitBreaker.OPEN
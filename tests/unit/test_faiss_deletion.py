@@ -0,0 +1,195 @@
+"""
+Unit tests for FAISS document removal.
+
+Tests cover:
+- In-place removal from in-memory Flat indices
+- Tombstones for indices that cannot remove in place (HNSW, memory-mapped)
+- Removed documents staying deleted after vector log replay
+- Background compaction once tombstones exceed the configured ratio
+- Re-adding a removed document
+- Removing every chunk of a chunked document, and stale chunks on re-add
+"""
+
+import pytest
+from unittest.mock import patch
+from uuid import uuid4
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from app.config.faiss import FAISSSettings
+from app.services.faiss_manager import FAISSIndexManager, chunk_faiss_id, get_tenant_tombstones_path
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+DIMENSION = 8
+
+
+@pytest.fixture
+def mock_tenant_id():
+    """Fixture for tenant ID."""
+    return uuid4()
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory fixture for FAISSIndexManager instances with setting overrides."""
+    created = []
+
+    def factory(**overrides):
+        overrides.setdefault("use_mmap", False)
+        settings = FAISSSettings(
+            index_path=str(tmp_path),
+            dimension=DIMENSION,
+            vector_log_fsync=False,
+            snapshot_interval_seconds=0,
+            **overrides,
+        )
+        patcher = patch("app.services.faiss_manager.faiss_settings", settings)
+        patcher.start()
+        manager = FAISSIndexManager()
+        created.append((manager, patcher))
+        return manager
+
+    yield factory
+
+    for manager, patcher in reversed(created):
+        manager.close()
+        patcher.stop()
+
+
+def _add_documents(manager, tenant_id, embeddings):
+    """Add one document per embedding and return their document IDs."""
+    document_ids = [uuid4() for _ in embeddings]
+    manager.add_documents(tenant_id, document_ids, embeddings)
+    return document_ids
+
+
+def _found_documents(manager, tenant_id, embeddings, k=10):
+    """Return the document IDs found by searching for each embedding."""
+    found = set()
+    for embedding in embeddings:
+        results = manager.search(tenant_id, embedding, k=k)
+        found.update(manager.resolve_document_ids(tenant_id, [faiss_id for faiss_id, _ in results]).values())
+    return found
+
+
+class TestRemoveDocuments:
+    """Tests for FAISSIndexManager.remove_documents()."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    def test_flat_index_removes_in_place(self, make_manager, mock_tenant_id):
+        """Flat indices drop removed vectors and need no tombstones after a snapshot."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(0).random((4, DIMENSION), dtype=np.float32)
+        manager = make_manager()
+        document_ids = _add_documents(manager, mock_tenant_id, embeddings)
+
+        removed = manager.remove_documents(mock_tenant_id, document_ids[:2])
+
+        assert removed == 2
+        assert manager.get_index(mock_tenant_id).ntotal == 2
+        assert _found_documents(manager, mock_tenant_id, embeddings) == set(document_ids[2:])
+
+        manager.close()
+        assert not get_tenant_tombstones_path(mock_tenant_id).exists()
+
+    def test_removed_vectors_not_replayed_after_crash(self, make_manager, mock_tenant_id):
+        """Vectors still in the vector log stay deleted when the log is replayed."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(1).random((3, DIMENSION), dtype=np.float32)
+        manager = make_manager()
+        document_ids = _add_documents(manager, mock_tenant_id, embeddings)
+        manager.remove_document(tenant_id=mock_tenant_id, document_id=document_ids[0])
+
+        # Simulate a crash: nothing is flushed, a new worker loads from disk
+        restarted = make_manager()
+
+        assert restarted.get_index(mock_tenant_id).ntotal == 2
+        assert _found_documents(restarted, mock_tenant_id, embeddings) == set(document_ids[1:])
+
+    def test_hnsw_index_uses_tombstones(self, make_manager, mock_tenant_id):
+        """HNSW keeps removed vectors stored but never returns them."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(2).random((10, DIMENSION), dtype=np.float32)
+        manager = make_manager(index_type="HNSW", tombstone_compaction_ratio=0)
+        document_ids = _add_documents(manager, mock_tenant_id, embeddings)
+
+        removed = manager.remove_documents(mock_tenant_id, document_ids[:3])
+
+        assert removed == 0
+        assert manager.get_index(mock_tenant_id).ntotal == 10
+        assert get_tenant_tombstones_path(mock_tenant_id).exists()
+        assert _found_documents(manager, mock_tenant_id, embeddings, k=5) == set(document_ids[3:])
+
+        manager.close()
+        restarted = make_manager(index_type="HNSW", tombstone_compaction_ratio=0)
+        assert _found_documents(restarted, mock_tenant_id, embeddings, k=5) == set(document_ids[3:])
+
+    def test_mmapped_index_compacted_past_ratio(self, make_manager, mock_tenant_id):
+        """Tombstones past the ratio schedule a rebuild that drops the deleted vectors."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(3).random((8, DIMENSION), dtype=np.float32)
+        writer = make_manager(use_mmap=True)
+        document_ids = _add_documents(writer, mock_tenant_id, embeddings)
+        writer.close()
+
+        manager = make_manager(use_mmap=True, tombstone_compaction_ratio=0.25)
+        manager._ensure_maintenance_thread = lambda: None  # drive the compactor by hand
+        manager.remove_documents(mock_tenant_id, document_ids[:1])
+        assert manager._compaction_pending == set()
+
+        manager.remove_documents(mock_tenant_id, document_ids[1:2])
+        assert manager._compaction_pending == {mock_tenant_id}
+
+        manager._run_compactions()
+
+        assert manager.get_index_size(mock_tenant_id) == 6
+        assert not get_tenant_tombstones_path(mock_tenant_id).exists()
+        assert set(manager._id_maps[mock_tenant_id].values()) == set(document_ids[2:])
+        assert _found_documents(manager, mock_tenant_id, embeddings) == set(document_ids[2:])
+
+    def test_readded_document_is_searchable(self, make_manager, mock_tenant_id):
+        """Adding a removed document again lifts its tombstone."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(4).random((3, DIMENSION), dtype=np.float32)
+        manager = make_manager(index_type="HNSW", tombstone_compaction_ratio=0)
+        document_ids = _add_documents(manager, mock_tenant_id, embeddings)
+        manager.remove_document(tenant_id=mock_tenant_id, document_id=document_ids[0])
+
+        manager.add_document(tenant_id=mock_tenant_id, document_id=document_ids[0], embedding=embeddings[0])
+
+        assert not get_tenant_tombstones_path(mock_tenant_id).exists()
+        assert _found_documents(manager, mock_tenant_id, embeddings[:1], k=1) == {document_ids[0]}
+
+    def test_chunked_document_removed_with_all_chunks(self, make_manager, mock_tenant_id):
+        """Removing a document removes every one of its chunk vectors."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(5).random((4, DIMENSION), dtype=np.float32)
+        manager = make_manager()
+        chunked, other = uuid4(), uuid4()
+        manager.add_documents(
+            mock_tenant_id, [chunked, chunked, chunked, other], embeddings, chunk_numbers=[0, 1, 2, 0]
+        )
+        assert _found_documents(manager, mock_tenant_id, embeddings) == {chunked, other}
+
+        removed = manager.remove_documents(mock_tenant_id, [chunked])
+
+        assert removed == 3
+        assert _found_documents(manager, mock_tenant_id, embeddings) == {other}
+
+    def test_readded_document_drops_stale_chunks(self, make_manager, mock_tenant_id):
+        """A new version with fewer chunks leaves no vector of the old trailing chunks."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(6).random((3, DIMENSION), dtype=np.float32)
+        manager = make_manager(index_type="HNSW", tombstone_compaction_ratio=0)
+        document_id = uuid4()
+        manager.add_documents(mock_tenant_id, [document_id] * 3, embeddings, chunk_numbers=[0, 1, 2])
+
+        manager.add_documents(mock_tenant_id, [document_id], embeddings[:1], chunk_numbers=[0])
+
+        hits = {faiss_id for embedding in embeddings for faiss_id, _ in manager.search(mock_tenant_id, embedding, k=3)}
+        assert hits == {chunk_faiss_id(document_id, 0)}
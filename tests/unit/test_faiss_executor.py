@@ -0,0 +1,107 @@
+"""
+Unit tests for the FAISS executor.
+
+Tests cover:
+- Running blocking calls without stalling the event loop
+- Propagating context variables (tenant context) to workers
+- Queue depth, wait time and failure statistics
+- Capping FAISS OpenMP threads per worker
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from uuid import uuid4
+
+from app.services.faiss_executor import FAISSExecutor
+from app.mcp.middleware.tenant import _tenant_id_context, get_tenant_id_from_context
+
+
+@pytest.fixture
+def executor():
+    """Fixture for a two-worker FAISSExecutor."""
+    faiss_executor = FAISSExecutor(max_workers=2, omp_threads=1)
+    yield faiss_executor
+    faiss_executor.shutdown()
+
+
+class TestFAISSExecutor:
+    """Tests for FAISSExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self, executor):
+        """The event loop keeps running while a blocking call executes."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        result = await executor.run(lambda: time.sleep(0.2) or "done")
+        ticker_task.cancel()
+
+        assert result == "done"
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_context_propagated_to_worker(self, executor):
+        """Tenant context set on the event loop is visible in the worker thread."""
+        tenant_id = uuid4()
+        _tenant_id_context.set(tenant_id)
+        try:
+            seen = await executor.run(lambda: (get_tenant_id_from_context(), threading.current_thread().name))
+        finally:
+            _tenant_id_context.set(None)
+
+        assert seen[0] == tenant_id
+        assert seen[1].startswith("faiss")
+
+    @pytest.mark.asyncio
+    async def test_stats_track_queue_and_failures(self):
+        """Calls waiting for a busy worker show up in queue_depth and wait time."""
+        executor = FAISSExecutor(max_workers=1, omp_threads=1)
+        release = threading.Event()
+        try:
+            blocking = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+            await asyncio.sleep(0.05)
+
+            stats = executor.stats()
+            assert stats["active"] == 1
+            assert stats["queue_depth"] == 1
+
+            release.set()
+            assert await queued == "queued"
+            await blocking
+
+            with pytest.raises(ValueError):
+                await executor.run(int, "not a number")
+
+            stats = executor.stats()
+            assert stats["queue_depth"] == 0
+            assert stats["completed"] == 3
+            assert stats["failed"] == 1
+            assert stats["wait_ms_max"] >= 40
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_workers_cap_openmp_threads(self, executor):
+        """Each worker runs FAISS with the configured number of OpenMP threads."""
+        faiss = pytest.importorskip("faiss")
+
+        assert await executor.run(faiss.omp_get_max_threads) == 1
+
+    def test_default_sizes_fit_available_cpus(self):
+        """Auto sizing keeps workers x OpenMP threads within the CPU count."""
+        from app.services.faiss_executor import available_cpus
+
+        executor = FAISSExecutor()
+
+        assert 1 <= executor.max_workers <= 4
+        assert executor.max_workers * executor.omp_threads <= max(available_cpus(), executor.max_workers)
@@ -0,0 +1,188 @@
+"""
+Unit tests for metadata-filtered FAISS search.
+
+Tests cover:
+- Attribute postings for type, tags and creation date
+- Filters pushed into FAISS returning a full page of matching documents
+- Attributes persisted across restarts and dropped on removal
+- One-time backfill of tenants indexed without attributes
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from app.config.faiss import FAISSSettings
+from app.services.faiss_attribute_store import AttributeStore, document_attributes
+from app.services.faiss_manager import FAISSIndexManager, document_id_to_faiss_id
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+DIMENSION = 8
+
+
+@pytest.fixture
+def mock_tenant_id():
+    """Fixture for tenant ID."""
+    return uuid4()
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory fixture for FAISSIndexManager instances with setting overrides."""
+    created = []
+
+    def factory(**overrides):
+        overrides.setdefault("use_mmap", False)
+        settings = FAISSSettings(
+            index_path=str(tmp_path),
+            dimension=DIMENSION,
+            vector_log_fsync=False,
+            snapshot_interval_seconds=0,
+            **overrides,
+        )
+        patcher = patch("app.services.faiss_manager.faiss_settings", settings)
+        patcher.start()
+        manager = FAISSIndexManager()
+        created.append((manager, patcher))
+        return manager
+
+    yield factory
+
+    for manager, patcher in reversed(created):
+        manager.close()
+        patcher.stop()
+
+
+def _attributes(doc_type, tags, day):
+    """Filterable attributes of a document created at noon UTC on the given day."""
+    created_at = datetime(2025, 1, day, 12, tzinfo=timezone.utc)
+    return document_attributes({"type": doc_type, "tags": tags}, created_at)
+
+
+def _found_documents(manager, tenant_id, query, k, filters=None):
+    """Return the document IDs found for a query, in rank order."""
+    results = manager.search(tenant_id, query, k=k, filters=filters)
+    document_ids = manager.resolve_document_ids(tenant_id, [faiss_id for faiss_id, _ in results])
+    return [document_ids[faiss_id] for faiss_id, _ in results]
+
+
+class TestAttributeStore:
+    """Tests for AttributeStore."""
+
+    def test_match_combines_type_tags_and_dates(self, tmp_path):
+        """Type must match, any tag matches, and the date range is inclusive to the second."""
+        store = AttributeStore(tmp_path / "attributes.jsonl", fsync=False)
+        store.put(
+            [1, 2, 3, 4],
+            [
+                _attributes("pdf", ["a"], 1),
+                _attributes("pdf", ["b"], 2),
+                _attributes("text", ["a"], 2),
+                _attributes("pdf", ["a", "c"], 3),
+            ],
+        )
+
+        assert store.match(None) is None
+        assert store.match({"document_type": "pdf"}) == {1, 2, 4}
+        assert store.match({"document_type": "pdf", "tags": ["b", "c"]}) == {2, 4}
+        assert store.match({
+            "date_from": datetime(2025, 1, 1, 13),
+            "date_to": "2025-01-03T11:00:00",
+        }) == {2, 3}
+
+        store.remove([2])
+        reloaded = AttributeStore(tmp_path / "attributes.jsonl").load()
+        assert reloaded.match({"document_type": "pdf"}) == {1, 4}
+        assert reloaded.complete is False
+
+
+class TestFilteredSearch:
+    """Tests for FAISSIndexManager.search() with filters."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    @pytest.mark.parametrize("index_type", ["IndexFlatL2", "HNSW"])
+    def test_filtered_search_returns_full_page(self, make_manager, mock_tenant_id, index_type):
+        """A filter matching a small fraction of the index still fills k results."""
+        _tenant_id_context.set(mock_tenant_id)
+        rng = np.random.default_rng(0)
+        embeddings = rng.random((200, DIMENSION), dtype=np.float32)
+        document_ids = [uuid4() for _ in embeddings]
+        attributes = [_attributes("pdf" if i % 20 == 0 else "text", [], 1 + i % 28) for i in range(200)]
+        manager = make_manager(index_type=index_type)
+        manager.add_documents(mock_tenant_id, document_ids, embeddings, attributes=attributes)
+
+        found = _found_documents(manager, mock_tenant_id, embeddings[1], k=5, filters={"document_type": "pdf"})
+
+        pdf_ids = {document_ids[i] for i in range(0, 200, 20)}
+        assert len(found) == 5
+        assert set(found) <= pdf_ids
+
+    def test_removed_and_restarted(self, make_manager, mock_tenant_id):
+        """Removed documents leave the postings; attributes survive a restart."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(1).random((4, DIMENSION), dtype=np.float32)
+        document_ids = [uuid4() for _ in embeddings]
+        manager = make_manager()
+        manager.add_documents(
+            mock_tenant_id,
+            document_ids,
+            embeddings,
+            attributes=[_attributes("pdf", ["x"], day) for day in (1, 2, 3, 4)],
+        )
+        manager.remove_document(tenant_id=mock_tenant_id, document_id=document_ids[0])
+
+        restarted = make_manager()
+        filters = {"tags": ["x"], "date_to": datetime(2025, 1, 3, 23, 59)}
+
+        assert restarted.has_complete_attributes(mock_tenant_id)
+        assert set(_found_documents(restarted, mock_tenant_id, embeddings[0], k=10, filters=filters)) == set(document_ids[1:3])
+        assert _found_documents(restarted, mock_tenant_id, embeddings[0], k=10, filters={"tags": ["y"]}) == []
+
+
+class TestFilterAttributeBackfill:
+    """Tests for VectorSearchService.ensure_filter_attributes()."""
+
+    @pytest.mark.asyncio
+    async def test_backfills_once_from_database(self, make_manager, mock_tenant_id, tmp_path):
+        """Vectors indexed without attributes are backfilled with one lookup."""
+        from app.services.vector_search_service import VectorSearchService
+
+        _tenant_id_context.set(mock_tenant_id)
+        try:
+            embeddings = np.random.default_rng(2).random((2, DIMENSION), dtype=np.float32)
+            document_ids = [uuid4() for _ in embeddings]
+            manager = make_manager()
+            manager.add_documents(mock_tenant_id, document_ids, embeddings)
+            # Simulate an index created before attributes were recorded
+            manager._get_attribute_store(mock_tenant_id).clear()
+
+            service = VectorSearchService()
+            service.faiss_manager = manager
+            rows = {
+                document_id_to_faiss_id(document_ids[0]): ({"type": "pdf"}, datetime(2025, 1, 1, tzinfo=timezone.utc)),
+                document_id_to_faiss_id(document_ids[1]): ({"type": "text"}, datetime(2025, 1, 2, tzinfo=timezone.utc)),
+            }
+            mock_repo = MagicMock()
+            mock_repo.get_filter_attributes_by_faiss_ids = AsyncMock(return_value=rows)
+            mock_session = AsyncMock()
+
+            with patch("app.services.vector_search_service.get_db_session") as mock_db_session, \
+                 patch("app.services.vector_search_service.DocumentRepository", return_value=mock_repo):
+                mock_db_session.return_value.__aiter__.return_value = [mock_session]
+
+                await service.ensure_filter_attributes(mock_tenant_id)
+                await service.ensure_filter_attributes(mock_tenant_id)
+
+            mock_repo.get_filter_attributes_by_faiss_ids.assert_called_once()
+            assert manager.has_complete_attributes(mock_tenant_id)
+            assert _found_documents(manager, mock_tenant_id, embeddings[1], k=2, filters={"document_type": "pdf"}) == [document_ids[0]]
+        finally:
+            _tenant_id_context.set(None)
@@ -0,0 +1,264 @@
+"""
+Unit tests for the FAISS group-commit writer and vector log.
+
+Tests cover:
+- Adds appended to the vector log instead of rewriting the index file
+- Crash recovery by replaying the vector log on load
+- Snapshot size and time policies
+- Concurrent adds group-committed into a single add_with_ids call
+- Vector log round trip and torn trailing records
+- Writers in several processes sharing the tenant files
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+from uuid import UUID, uuid4
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from app.config.faiss import FAISSSettings
+from app.services.faiss_manager import (
+    FAISSIndexManager,
+    get_tenant_index_path,
+    get_tenant_vector_log_path,
+)
+from app.services.faiss_vector_log import VectorLog
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+DIMENSION = 8
+
+
+@pytest.fixture
+def mock_tenant_id():
+    """Fixture for tenant ID."""
+    return uuid4()
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory fixture for FAISSIndexManager instances with setting overrides."""
+    created = []
+
+    def factory(**overrides):
+        settings = FAISSSettings(
+            index_path=str(tmp_path),
+            dimension=DIMENSION,
+            use_mmap=False,
+            vector_log_fsync=False,
+            **overrides,
+        )
+        patcher = patch("app.services.faiss_manager.faiss_settings", settings)
+        patcher.start()
+        manager = FAISSIndexManager()
+        created.append((manager, patcher))
+        return manager
+
+    yield factory
+
+    for manager, patcher in reversed(created):
+        manager.close()
+        patcher.stop()
+
+
+def _embeddings(count, seed=0):
+    """Random float32 embeddings."""
+    return np.random.default_rng(seed).random((count, DIMENSION), dtype=np.float32)
+
+
+class TestVectorLog:
+    """Tests for VectorLog."""
+
+    def test_round_trip_ignores_torn_record(self, tmp_path):
+        """Complete records are read back; a partial trailing record is dropped."""
+        log = VectorLog(tmp_path / "tenant.vlog", fsync=False)
+        document_ids = [UUID(int=1), uuid4(), uuid4()]
+        vectors = _embeddings(3)
+
+        log.append(np.array([1, 2], dtype=np.int64), document_ids[:2], vectors[:2])
+        log.append(np.array([3], dtype=np.int64), document_ids[2:], vectors[2:])
+        with open(log.path, "ab") as f:
+            f.write(b"\x00" * 5)
+
+        faiss_ids, read_document_ids, read_vectors = log.read(DIMENSION)
+
+        assert faiss_ids.tolist() == [1, 2, 3]
+        assert read_document_ids == document_ids
+        np.testing.assert_array_equal(read_vectors, vectors)
+
+    def test_append_after_torn_record(self, tmp_path):
+        """An append after a crash mid-append replaces the torn record instead of following it."""
+        log = VectorLog(tmp_path / "tenant.vlog", fsync=False)
+        document_ids = [uuid4(), uuid4()]
+        vectors = _embeddings(2)
+
+        log.append(np.array([1], dtype=np.int64), document_ids[:1], vectors[:1])
+        with open(log.path, "ab") as f:
+            f.write(b"\x01" * 7)
+        log.append(np.array([2], dtype=np.int64), document_ids[1:], vectors[1:])
+
+        faiss_ids, read_document_ids, read_vectors = log.read(DIMENSION)
+
+        assert faiss_ids.tolist() == [1, 2]
+        assert read_document_ids == document_ids
+        np.testing.assert_array_equal(read_vectors, vectors)
+
+    def test_append_after_torn_header(self, tmp_path):
+        """A log whose header was torn is started over."""
+        log = VectorLog(tmp_path / "tenant.vlog", fsync=False)
+        log.path.write_bytes(b"FV")
+        document_id = uuid4()
+
+        log.append(np.array([5], dtype=np.int64), [document_id], _embeddings(1))
+
+        faiss_ids, read_document_ids, _ = log.read(DIMENSION)
+        assert faiss_ids.tolist() == [5]
+        assert read_document_ids == [document_id]
+
+    def test_dimension_mismatch_reads_empty(self, tmp_path):
+        """A log written for another dimension is ignored."""
+        log = VectorLog(tmp_path / "tenant.vlog", fsync=False)
+        log.append(np.array([1], dtype=np.int64), [uuid4()], _embeddings(1))
+
+        faiss_ids, _, _ = log.read(DIMENSION * 2)
+
+        assert len(faiss_ids) == 0
+
+
+class TestGroupCommitWriter:
+    """Tests for FAISSIndexManager group commit, snapshots and recovery."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    def test_adds_do_not_rewrite_index(self, make_manager, mock_tenant_id):
+        """Below the snapshot threshold adds only append to the vector log."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager()
+        manager.create_index(mock_tenant_id)
+
+        with patch.object(manager, "_write_index_file", wraps=manager._write_index_file) as write_index:
+            for embedding in _embeddings(5):
+                manager.add_document(tenant_id=mock_tenant_id, document_id=uuid4(), embedding=embedding)
+
+        write_index.assert_not_called()
+        faiss_ids, _, _ = VectorLog(get_tenant_vector_log_path(mock_tenant_id)).read(DIMENSION)
+        assert len(faiss_ids) == 5
+        assert manager.get_index(mock_tenant_id).ntotal == 5
+
+    def test_vector_log_replayed_after_crash(self, make_manager, mock_tenant_id):
+        """Vectors never snapshotted are recovered from the vector log."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = _embeddings(4)
+        document_ids = [uuid4() for _ in embeddings]
+        manager = make_manager()
+        manager.add_documents(mock_tenant_id, document_ids, embeddings)
+
+        # Simulate a crash: nothing is flushed, a new worker loads from disk
+        restarted = make_manager()
+        results = restarted.search(mock_tenant_id, embeddings[2], k=1)
+        resolved = restarted.resolve_document_ids(mock_tenant_id, [results[0][0]])
+
+        assert restarted.get_index(mock_tenant_id).ntotal == 4
+        assert list(resolved.values()) == [document_ids[2]]
+
+    def test_replay_skips_vectors_already_snapshotted(self, make_manager, mock_tenant_id):
+        """A log left behind after a snapshot does not duplicate vectors."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = _embeddings(3)
+        manager = make_manager()
+        manager.add_documents(mock_tenant_id, [uuid4() for _ in embeddings], embeddings)
+        log_bytes = get_tenant_vector_log_path(mock_tenant_id).read_bytes()
+        manager.close()
+        get_tenant_vector_log_path(mock_tenant_id).write_bytes(log_bytes)
+
+        assert make_manager().get_index(mock_tenant_id).ntotal == 3
+
+    def test_snapshot_at_size_threshold(self, make_manager, mock_tenant_id):
+        """Reaching snapshot_max_pending_vectors writes the index and clears the log."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager(snapshot_max_pending_vectors=3)
+
+        for embedding in _embeddings(3):
+            manager.add_document(tenant_id=mock_tenant_id, document_id=uuid4(), embedding=embedding)
+
+        assert not get_tenant_vector_log_path(mock_tenant_id).exists()
+        assert faiss.read_index(str(get_tenant_index_path(mock_tenant_id))).ntotal == 3
+
+    def test_snapshot_at_time_threshold(self, make_manager, mock_tenant_id):
+        """Dirty tenants older than snapshot_interval_seconds are snapshotted."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager(snapshot_interval_seconds=0.01)
+        manager._ensure_maintenance_thread = lambda: None  # drive the policy by hand
+        manager.add_document(tenant_id=mock_tenant_id, document_id=uuid4(), embedding=_embeddings(1)[0])
+        assert get_tenant_vector_log_path(mock_tenant_id).exists()
+
+        time.sleep(0.02)
+        manager._flush_dirty(due_only=True)
+
+        assert not get_tenant_vector_log_path(mock_tenant_id).exists()
+        assert faiss.read_index(str(get_tenant_index_path(mock_tenant_id))).ntotal == 1
+
+    def test_concurrent_adds_group_committed(self, make_manager, mock_tenant_id):
+        """Adds queued while a commit is running are committed together."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager()
+        manager.create_index(mock_tenant_id)
+        embeddings = _embeddings(4)
+        commit_sizes = []
+        errors = []
+        commit_pending = manager._commit_pending
+
+        def slow_commit(tenant_id, batch):
+            commit_sizes.append(len(batch))
+            if len(commit_sizes) == 1:
+                # Hold the writer until every other add is queued behind it
+                deadline = time.monotonic() + 5
+                while len(batch) + len(manager._pending.get(tenant_id, [])) < 4 and time.monotonic() < deadline:
+                    time.sleep(0.005)
+            commit_pending(tenant_id, batch)
+
+        def add(embedding):
+            _tenant_id_context.set(mock_tenant_id)
+            try:
+                manager.add_document(tenant_id=mock_tenant_id, document_id=uuid4(), embedding=embedding)
+            except Exception as e:
+                errors.append(e)
+
+        with patch.object(manager, "_commit_pending", side_effect=slow_commit):
+            threads = [threading.Thread(target=add, args=(embedding,)) for embedding in embeddings]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []
+        assert sum(commit_sizes) == 4
+        assert len(commit_sizes) == 2
+        assert manager.get_index(mock_tenant_id).ntotal == 4
+
+    def test_snapshots_from_two_processes_keep_both_adds(self, make_manager, mock_tenant_id):
+        """A writer reloads files another process changed before snapshotting over them."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = _embeddings(2)
+        document_ids = [uuid4(), uuid4()]
+        first, second = make_manager(), make_manager()
+        first.create_index(mock_tenant_id)
+        second.get_index(mock_tenant_id)
+
+        first.add_documents(mock_tenant_id, document_ids[:1], embeddings[:1])
+        second.add_documents(mock_tenant_id, document_ids[1:], embeddings[1:])
+        second._flush_dirty(due_only=False)
+        first._flush_dirty(due_only=False)
+
+        restarted = make_manager()
+        resolved = restarted.resolve_document_ids(mock_tenant_id, [
+            restarted.search(mock_tenant_id, embedding, k=1)[0][0] for embedding in embeddings
+        ])
+        assert restarted.get_index(mock_tenant_id).ntotal == 2
+        assert sorted(resolved.values()) == sorted(document_ids)
@@ -0,0 +1,157 @@
+"""
+Unit tests for FAISSIndexManager stable vector IDs and the persisted ID map.
+
+Tests cover:
+- Deterministic 64-bit FAISS IDs derived from document UUIDs and chunk numbers
+- New indices wrapped in IndexIDMap2
+- ID map sidecar persisted next to the index and reloaded from disk
+- O(1) FAISS ID to document ID resolution
+- ID map removal on index deletion
+"""
+
+import pytest
+from unittest.mock import patch
+from uuid import UUID, uuid4
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from app.config.faiss import FAISSSettings
+from app.services.faiss_manager import (
+    FAISSIndexManager,
+    chunk_faiss_id,
+    document_id_to_faiss_id,
+    get_tenant_id_map_path,
+)
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+@pytest.fixture
+def mock_tenant_id():
+    """Fixture for tenant ID."""
+    return uuid4()
+
+
+@pytest.fixture
+def faiss_manager(tmp_path):
+    """Fixture for FAISSIndexManager instance backed by a temporary directory."""
+    settings = FAISSSettings(index_path=str(tmp_path), dimension=8, index_type="IndexFlatL2", use_mmap=False)
+    with patch("app.services.faiss_manager.faiss_settings", settings):
+        manager = FAISSIndexManager()
+        yield manager
+        manager.close()
+
+
+class TestDocumentIdToFaissId:
+    """Tests for document_id_to_faiss_id()."""
+
+    def test_is_deterministic(self):
+        """Same UUID always maps to the same FAISS ID."""
+        document_id = UUID("12345678-1234-5678-1234-567812345678")
+        assert document_id_to_faiss_id(document_id) == document_id_to_faiss_id(
+            UUID(str(document_id))
+        )
+        assert document_id_to_faiss_id(document_id) == 0x1234567812345678
+
+    def test_is_positive_int64(self):
+        """FAISS IDs fit in a positive int64 and never equal the -1 sentinel."""
+        document_id = UUID("ffffffff-ffff-4fff-bfff-ffffffffffff")
+        faiss_id = document_id_to_faiss_id(document_id)
+        assert 0 <= faiss_id < 2**63
+        np.array([faiss_id], dtype=np.int64)
+
+    def test_chunk_ids_extend_document_id(self):
+        """Chunk 0 keeps the document's FAISS ID; later chunks get distinct positive IDs."""
+        document_id = uuid4()
+        faiss_ids = [chunk_faiss_id(document_id, chunk_no) for chunk_no in range(50)]
+        assert faiss_ids[0] == document_id_to_faiss_id(document_id)
+        assert len(set(faiss_ids)) == 50
+        assert all(0 <= faiss_id < 2**63 for faiss_id in faiss_ids)
+        assert chunk_faiss_id(document_id, 7) == chunk_faiss_id(UUID(str(document_id)), 7)
+
+
+class TestFAISSIdMap:
+    """Tests for FAISSIndexManager ID map persistence and resolution."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    def test_create_index_wraps_in_id_map(self, faiss_manager, mock_tenant_id):
+        """New indices are IndexIDMap2 so add_with_ids is used."""
+        _tenant_id_context.set(mock_tenant_id)
+
+        index = faiss_manager.create_index(mock_tenant_id)
+
+        assert isinstance(index, faiss.IndexIDMap2)
+        assert index.d == 8
+
+    def test_add_document_uses_stable_ids(self, faiss_manager, mock_tenant_id):
+        """Vectors are stored under the deterministic document-derived ID."""
+        _tenant_id_context.set(mock_tenant_id)
+        document_id = uuid4()
+
+        faiss_manager.add_document(
+            tenant_id=mock_tenant_id,
+            document_id=document_id,
+            embedding=np.random.rand(8).astype(np.float32),
+        )
+
+        index = faiss_manager.get_index(mock_tenant_id)
+        stored_ids = faiss.vector_to_array(index.id_map)
+        assert list(stored_ids) == [document_id_to_faiss_id(document_id)]
+
+    def test_id_map_survives_reload(self, faiss_manager, mock_tenant_id):
+        """ID map is persisted and reloaded alongside the .index file."""
+        _tenant_id_context.set(mock_tenant_id)
+        document_ids = [uuid4() for _ in range(3)]
+        embeddings = np.random.rand(3, 8).astype(np.float32)
+
+        for document_id, embedding in zip(document_ids, embeddings):
+            faiss_manager.add_document(
+                tenant_id=mock_tenant_id,
+                document_id=document_id,
+                embedding=embedding,
+            )
+
+        assert get_tenant_id_map_path(mock_tenant_id).exists()
+
+        # Simulate a restart / different worker
+        faiss_manager._indices.clear()
+        faiss_manager._id_maps.clear()
+
+        results = faiss_manager.search(mock_tenant_id, embeddings[1], k=1)
+        resolved = faiss_manager.resolve_document_ids(
+            mock_tenant_id, [faiss_id for faiss_id, _ in results]
+        )
+
+        assert list(resolved.values()) == [document_ids[1]]
+
+    def test_resolve_document_ids_skips_unknown(self, faiss_manager, mock_tenant_id):
+        """Unknown FAISS IDs are omitted from the resolved mapping."""
+        _tenant_id_context.set(mock_tenant_id)
+        document_id = uuid4()
+        faiss_manager.add_document(
+            tenant_id=mock_tenant_id,
+            document_id=document_id,
+            embedding=np.random.rand(8).astype(np.float32),
+        )
+
+        faiss_id = document_id_to_faiss_id(document_id)
+        resolved = faiss_manager.resolve_document_ids(mock_tenant_id, [faiss_id, 42])
+
+        assert resolved == {faiss_id: document_id}
+
+    def test_delete_index_removes_id_map(self, faiss_manager, mock_tenant_id):
+        """Deleting an index also removes its ID map sidecar."""
+        _tenant_id_context.set(mock_tenant_id)
+        faiss_manager.add_document(
+            tenant_id=mock_tenant_id,
+            document_id=uuid4(),
+            embedding=np.random.rand(8).astype(np.float32),
+        )
+
+        faiss_manager.delete_index(mock_tenant_id)
+
+        assert not get_tenant_id_map_path(mock_tenant_id).exists()
+        assert mock_tenant_id not in faiss_manager._id_maps
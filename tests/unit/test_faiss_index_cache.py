@@ -0,0 +1,191 @@
+"""
+Unit tests for the memory-budgeted FAISS index cache.
+
+Tests cover:
+- LRU eviction once the memory budget is exceeded
+- Pinned tenants never being evicted
+- Single-flight loading of a cold tenant under concurrency
+- Cache statistics
+- Index size estimation for real FAISS indices
+- FAISSIndexManager reloading evicted indices and ID maps from disk
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+from uuid import uuid4
+import numpy as np
+
+from app.services.faiss_index_cache import TenantIndexCache, estimate_index_bytes
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+def _fixed_size(size):
+    """Size estimator that reports every index as `size` bytes."""
+    return lambda tenant_id, index: size
+
+
+class TestTenantIndexCache:
+    """Tests for TenantIndexCache."""
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used tenant is evicted when over budget."""
+        evicted = []
+        cache = TenantIndexCache(
+            max_bytes=200,
+            size_estimator=_fixed_size(100),
+            on_evict=lambda tenant_id, index: evicted.append(tenant_id),
+        )
+        first, second, third = uuid4(), uuid4(), uuid4()
+
+        cache[first] = "first"
+        cache[second] = "second"
+        assert cache.lookup(first) == "first"  # first is now most recent
+        cache[third] = "third"
+
+        assert second not in cache
+        assert first in cache and third in cache
+        assert evicted == [second]
+        assert cache.stats()["evictions"] == 1
+
+    def test_pinned_tenant_not_evicted(self):
+        """Pinned tenants stay resident even when they are least recently used."""
+        pinned = uuid4()
+        cache = TenantIndexCache(max_bytes=100, pinned_tenants={pinned}, size_estimator=_fixed_size(100))
+        other = uuid4()
+
+        cache[pinned] = "pinned"
+        cache[other] = "other"
+        cache[uuid4()] = "newest"
+
+        assert pinned in cache
+        assert other not in cache
+
+    def test_zero_budget_disables_eviction(self):
+        """max_bytes=0 keeps every index resident."""
+        cache = TenantIndexCache(max_bytes=0, size_estimator=_fixed_size(10**9))
+        for _ in range(5):
+            cache[uuid4()] = object()
+
+        assert len(cache) == 5
+
+    def test_single_flight_load(self):
+        """Concurrent misses for the same tenant trigger exactly one load."""
+        cache = TenantIndexCache(max_bytes=0)
+        tenant_id = uuid4()
+        load_calls = []
+        sentinel = object()
+
+        def loader():
+            load_calls.append(1)
+            time.sleep(0.05)
+            return sentinel
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load(tenant_id, loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(load_calls) == 1
+        assert results == [sentinel] * 8
+        assert cache.stats()["loads"] == 1
+
+    def test_failed_load_propagates_and_is_not_cached(self):
+        """Loader errors reach the caller and the next call retries."""
+        cache = TenantIndexCache(max_bytes=0)
+        tenant_id = uuid4()
+
+        def failing_loader():
+            raise OSError("disk error")
+
+        with pytest.raises(OSError):
+            cache.get_or_load(tenant_id, failing_loader)
+
+        assert tenant_id not in cache
+        assert cache.get_or_load(tenant_id, lambda: "index") == "index"
+        assert cache.stats()["load_failures"] == 1
+
+    def test_missing_index_not_cached(self):
+        """A loader returning None leaves nothing in the cache."""
+        cache = TenantIndexCache(max_bytes=0)
+        tenant_id = uuid4()
+
+        assert cache.get_or_load(tenant_id, lambda: None) is None
+        assert tenant_id not in cache
+
+    def test_stats_hit_rate(self):
+        """Hits and misses are counted by get_or_load."""
+        cache = TenantIndexCache(max_bytes=0)
+        tenant_id = uuid4()
+
+        cache.get_or_load(tenant_id, lambda: "index")
+        cache.get_or_load(tenant_id, lambda: "index")
+        cache.get_or_load(tenant_id, lambda: "index")
+
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert stats["hit_rate"] == pytest.approx(2 / 3, rel=1e-3)
+
+
+class TestEstimateIndexBytes:
+    """Tests for estimate_index_bytes()."""
+
+    def test_non_faiss_objects_are_free(self):
+        """Mocks and other objects do not count against the budget."""
+        assert estimate_index_bytes(object()) == 0
+
+    def test_flat_index_grows_with_vectors(self):
+        """Flat index size tracks ntotal * dimension * 4 bytes."""
+        faiss = pytest.importorskip("faiss")
+        index = faiss.IndexIDMap2(faiss.IndexFlatL2(8))
+        empty_size = estimate_index_bytes(index)
+
+        index.add_with_ids(np.random.rand(10, 8).astype(np.float32), np.arange(10, dtype=np.int64))
+
+        assert estimate_index_bytes(index) >= empty_size + 10 * 8 * 4
+
+
+class TestFAISSIndexManagerCache:
+    """Tests for FAISSIndexManager integration with the index cache."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    def test_evicted_index_reloads_from_disk(self, tmp_path):
+        """An evicted tenant's index and ID map are reloaded on next access."""
+        faiss = pytest.importorskip("faiss")
+        from app.config.faiss import FAISSSettings
+        from app.services.faiss_manager import FAISSIndexManager
+
+        settings = FAISSSettings(index_path=str(tmp_path), dimension=8, use_mmap=False, cache_max_bytes=1)
+        with patch("app.services.faiss_manager.faiss_settings", settings):
+            manager = FAISSIndexManager()
+            first, second = uuid4(), uuid4()
+            document_id = uuid4()
+            embedding = np.random.rand(8).astype(np.float32)
+
+            _tenant_id_context.set(first)
+            manager.add_document(tenant_id=first, document_id=document_id, embedding=embedding)
+            _tenant_id_context.set(second)
+            manager.add_document(tenant_id=second, document_id=uuid4(), embedding=embedding)
+
+            assert first not in manager._indices
+            assert first not in manager._id_maps
+
+            _tenant_id_context.set(first)
+            results = manager.search(first, embedding, k=1)
+            resolved = manager.resolve_document_ids(first, [faiss_id for faiss_id, _ in results])
+
+            assert list(resolved.values()) == [document_id]
+            assert isinstance(manager.get_index(first), faiss.IndexIDMap2)
+            assert manager.get_cache_stats()["evictions"] >= 1
+            manager.close()
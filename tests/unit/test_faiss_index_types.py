@@ -0,0 +1,202 @@
+"""
+Unit tests for FAISSIndexManager approximate index types.
+
+Tests cover:
+- Index type normalization (IVF-Flat, IVF-PQ, HNSW, auto)
+- Per-tenant index configuration persisted in the params sidecar
+- HNSW index creation
+- "auto" policy migrating Flat -> IVF once ntotal crosses the threshold
+- IVF types staying Flat until there are enough training vectors
+- search_effort knob mapping to nprobe / efSearch
+"""
+
+import json
+
+import pytest
+from unittest.mock import patch
+from uuid import uuid4
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from app.config.faiss import FAISSSettings
+from app.services.faiss_manager import (
+    FAISSIndexManager,
+    get_tenant_params_path,
+    normalize_index_type,
+)
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+DIMENSION = 16
+
+
+@pytest.fixture
+def mock_tenant_id():
+    """Fixture for tenant ID."""
+    return uuid4()
+
+
+def _make_manager(tmp_path, **overrides):
+    """Build a FAISSIndexManager with real settings rooted at tmp_path."""
+    settings = FAISSSettings(
+        index_path=str(tmp_path),
+        dimension=DIMENSION,
+        use_mmap=False,
+        ivf_min_train_points_per_list=2,
+        **overrides,
+    )
+    patcher = patch("app.services.faiss_manager.faiss_settings", settings)
+    patcher.start()
+    return FAISSIndexManager(), patcher
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory fixture for FAISSIndexManager instances with setting overrides."""
+    created = []
+
+    def factory(**overrides):
+        manager, patcher = _make_manager(tmp_path, **overrides)
+        created.append((manager, patcher))
+        return manager
+
+    yield factory
+
+    for manager, patcher in reversed(created):
+        manager.close()
+        patcher.stop()
+
+
+def _add_documents(manager, tenant_id, count):
+    """Add count random documents and return their embeddings."""
+    embeddings = np.random.default_rng(42).random((count, DIMENSION), dtype=np.float32)
+    for embedding in embeddings:
+        manager.add_document(tenant_id=tenant_id, document_id=uuid4(), embedding=embedding)
+    return embeddings
+
+
+class TestNormalizeIndexType:
+    """Tests for normalize_index_type()."""
+
+    @pytest.mark.parametrize(
+        "raw,expected",
+        [
+            ("IndexFlatL2", "IndexFlatL2"),
+            ("IndexFlatIP", "IndexFlatIP"),
+            ("IVF-Flat", "IVFFlat"),
+            ("ivf_pq", "IVFPQ"),
+            ("HNSW", "HNSW"),
+            ("AUTO", "auto"),
+        ],
+    )
+    def test_aliases(self, raw, expected):
+        """Aliases map to canonical index type names."""
+        assert normalize_index_type(raw) == expected
+
+    def test_unknown_type_raises(self):
+        """Unsupported index types are rejected."""
+        with pytest.raises(ValueError, match="Unsupported FAISS index type"):
+            normalize_index_type("LSH")
+
+
+class TestApproximateIndexTypes:
+    """Tests for approximate index creation, migration and search."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    def test_hnsw_index_created_directly(self, make_manager, mock_tenant_id):
+        """HNSW needs no training, so it is used from the first vector."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager(index_type="HNSW")
+
+        index = manager.create_index(mock_tenant_id)
+
+        assert isinstance(index, faiss.IndexIDMap2)
+        assert isinstance(faiss.downcast_index(index.index), faiss.IndexHNSW)
+
+    def test_tenant_config_persisted(self, make_manager, mock_tenant_id):
+        """Per-tenant index type and search parameters survive a restart."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager()
+
+        manager.set_tenant_index_config(mock_tenant_id, index_type="hnsw", ef_search=128)
+
+        with open(get_tenant_params_path(mock_tenant_id)) as f:
+            assert json.load(f) == {"index_type": "HNSW", "ef_search": 128}
+
+        restarted = make_manager()
+        config = restarted.get_tenant_index_config(mock_tenant_id)
+        assert config["index_type"] == "HNSW"
+        assert config["ef_search"] == 128
+
+    def test_tenant_config_rejects_invalid_values(self, make_manager, mock_tenant_id):
+        """Invalid index types and parameters are rejected."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager()
+
+        with pytest.raises(ValueError):
+            manager.set_tenant_index_config(mock_tenant_id, index_type="LSH")
+        with pytest.raises(ValueError):
+            manager.set_tenant_index_config(mock_tenant_id, nprobe=0)
+
+    def test_auto_policy_keeps_flat_below_threshold(self, make_manager, mock_tenant_id):
+        """Small tenants stay on exact Flat search under "auto"."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager(index_type="auto", auto_ivf_threshold=100)
+
+        _add_documents(manager, mock_tenant_id, 50)
+
+        index = manager.get_index(mock_tenant_id)
+        assert isinstance(faiss.downcast_index(index.index), faiss.IndexFlat)
+
+    def test_auto_policy_migrates_to_ivf(self, make_manager, mock_tenant_id):
+        """Crossing the threshold trains an IVF index and persists nprobe/nlist."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager(index_type="auto", auto_ivf_threshold=100)
+
+        embeddings = _add_documents(manager, mock_tenant_id, 100)
+
+        index = manager.get_index(mock_tenant_id)
+        base = faiss.downcast_index(index.index)
+        assert isinstance(base, faiss.IndexIVFFlat)
+        assert index.ntotal == 100
+
+        config = manager.get_tenant_index_config(mock_tenant_id)
+        assert config["nlist"] == base.nlist
+        with open(get_tenant_params_path(mock_tenant_id)) as f:
+            persisted = json.load(f)
+        assert persisted["nlist"] == base.nlist
+        assert persisted["nprobe"] == 16
+
+        # Every vector keeps its ID and is still findable with a full probe
+        results = manager.search(mock_tenant_id, embeddings[7], k=1, search_effort=1000)
+        resolved = manager.resolve_document_ids(mock_tenant_id, [results[0][0]])
+        assert len(resolved) == 1
+
+    def test_ivf_stays_flat_until_trainable(self, make_manager, mock_tenant_id):
+        """Explicit IVF types wait for enough vectors before training."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager(index_type="IVFPQ", pq_nbits=4)
+
+        _add_documents(manager, mock_tenant_id, 10)
+
+        index = manager.get_index(mock_tenant_id)
+        assert isinstance(faiss.downcast_index(index.index), faiss.IndexFlat)
+
+    def test_search_effort_scales_nprobe_and_ef_search(self, make_manager, mock_tenant_id):
+        """search_effort multiplies the tenant's nprobe / efSearch."""
+        _tenant_id_context.set(mock_tenant_id)
+        manager = make_manager(index_type="auto", auto_ivf_threshold=100, ivf_nprobe=4)
+        _add_documents(manager, mock_tenant_id, 100)
+        index = manager.get_index(mock_tenant_id)
+
+        assert manager._get_search_params(mock_tenant_id, index, 10).nprobe == 4
+        assert manager._get_search_params(mock_tenant_id, index, 10, search_effort=2.0).nprobe == 8
+
+        manager.set_tenant_index_config(mock_tenant_id, ef_search=32)
+        hnsw_index = manager._build_index("HNSW", DIMENSION)
+        params = manager._get_search_params(mock_tenant_id, hnsw_index, 10, search_effort=0.5)
+        assert params.efSearch == 16
@@ -0,0 +1,158 @@
+"""
+Unit tests for memory-mapped FAISS indices with a writable delta.
+
+Tests cover:
+- Loading indices memory-mapped read-only when use_mmap is enabled
+- New vectors buffered in the delta and found by search
+- Delta compaction into the base index
+- Folding a leftover delta in when memory mapping is disabled
+- Cache accounting only counting the delta for memory-mapped indices
+"""
+
+import pytest
+from unittest.mock import patch
+from uuid import uuid4
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from app.config.faiss import FAISSSettings
+from app.services.faiss_manager import FAISSIndexManager, get_tenant_delta_path
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+DIMENSION = 8
+
+
+@pytest.fixture
+def mock_tenant_id():
+    """Fixture for tenant ID."""
+    return uuid4()
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory fixture for FAISSIndexManager instances with setting overrides."""
+    created = []
+
+    def factory(**overrides):
+        settings = FAISSSettings(index_path=str(tmp_path), dimension=DIMENSION, **overrides)
+        patcher = patch("app.services.faiss_manager.faiss_settings", settings)
+        patcher.start()
+        manager = FAISSIndexManager()
+        created.append((manager, patcher))
+        return manager
+
+    yield factory
+
+    for manager, patcher in reversed(created):
+        manager.close()
+        patcher.stop()
+
+
+def _add_documents(manager, tenant_id, embeddings):
+    """Add one document per embedding and return their document IDs."""
+    document_ids = [uuid4() for _ in embeddings]
+    for document_id, embedding in zip(document_ids, embeddings):
+        manager.add_document(tenant_id=tenant_id, document_id=document_id, embedding=embedding)
+    return document_ids
+
+
+def _top_document(manager, tenant_id, embedding):
+    """Return the document ID of the best search hit."""
+    results = manager.search(tenant_id, embedding, k=1)
+    return list(manager.resolve_document_ids(tenant_id, [results[0][0]]).values())[0]
+
+
+class TestMmapIndex:
+    """Tests for memory-mapped base indices and the write delta."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    def test_writes_go_to_delta_after_mmap_load(self, make_manager, mock_tenant_id):
+        """A memory-mapped base stays unchanged while the delta takes new vectors."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(0).random((6, DIMENSION), dtype=np.float32)
+        writer = make_manager(use_mmap=True)
+        document_ids = _add_documents(writer, mock_tenant_id, embeddings[:4])
+        writer.close()
+
+        manager = make_manager(use_mmap=True)
+        with patch.object(
+            FAISSIndexManager, "_read_mmapped_index", wraps=FAISSIndexManager._read_mmapped_index
+        ) as read_mmapped:
+            base = manager.get_index(mock_tenant_id)
+        read_mmapped.assert_called_once()
+
+        document_ids += _add_documents(manager, mock_tenant_id, embeddings[4:])
+
+        assert base.ntotal == 4
+        assert manager._deltas[mock_tenant_id].ntotal == 2
+        assert manager.get_index_size(mock_tenant_id) == 6
+        assert _top_document(manager, mock_tenant_id, embeddings[1]) == document_ids[1]
+        assert _top_document(manager, mock_tenant_id, embeddings[5]) == document_ids[5]
+
+        # Another worker sees the logged and snapshotted delta too
+        assert make_manager(use_mmap=True).get_index_size(mock_tenant_id) == 6
+        manager.close()
+        assert get_tenant_delta_path(mock_tenant_id).exists()
+        assert make_manager(use_mmap=True).get_index_size(mock_tenant_id) == 6
+
+    def test_delta_compacted_at_threshold(self, make_manager, mock_tenant_id):
+        """Reaching mmap_delta_max_vectors merges the delta into the base."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(1).random((5, DIMENSION), dtype=np.float32)
+        writer = make_manager(use_mmap=True)
+        _add_documents(writer, mock_tenant_id, embeddings[:2])
+        writer.close()
+
+        manager = make_manager(use_mmap=True, mmap_delta_max_vectors=3)
+        document_ids = _add_documents(manager, mock_tenant_id, embeddings[2:])
+
+        assert manager.get_index(mock_tenant_id).ntotal == 5
+        assert manager._deltas[mock_tenant_id].ntotal == 0
+        assert not get_tenant_delta_path(mock_tenant_id).exists()
+        assert _top_document(manager, mock_tenant_id, embeddings[4]) == document_ids[2]
+
+    def test_leftover_delta_folded_in_without_mmap(self, make_manager, mock_tenant_id):
+        """Disabling memory mapping merges a persisted delta on load and drops it at the next snapshot."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(2).random((3, DIMENSION), dtype=np.float32)
+        writer = make_manager(use_mmap=True)
+        _add_documents(writer, mock_tenant_id, embeddings[:2])
+        writer.close()
+        mmap_manager = make_manager(use_mmap=True)
+        _add_documents(mmap_manager, mock_tenant_id, embeddings[2:])
+        mmap_manager.close()
+        assert get_tenant_delta_path(mock_tenant_id).exists()
+
+        manager = make_manager(use_mmap=False)
+
+        assert manager.get_index(mock_tenant_id).ntotal == 3
+        assert mock_tenant_id not in manager._deltas
+        # Loading writes nothing: files change only under the writer lock
+        assert get_tenant_delta_path(mock_tenant_id).exists()
+
+        manager.close()
+        assert not get_tenant_delta_path(mock_tenant_id).exists()
+        assert make_manager(use_mmap=False).get_index(mock_tenant_id).ntotal == 3
+
+    def test_cache_counts_only_delta_for_mmapped_index(self, make_manager, mock_tenant_id):
+        """Memory-mapped bases do not count against the worker's cache budget."""
+        _tenant_id_context.set(mock_tenant_id)
+        embeddings = np.random.default_rng(3).random((50, DIMENSION), dtype=np.float32)
+        writer = make_manager(use_mmap=False)
+        _add_documents(writer, mock_tenant_id, embeddings)
+        writer.close()
+
+        heap_manager = make_manager(use_mmap=False)
+        heap_manager.get_index(mock_tenant_id)
+        mmap_manager = make_manager(use_mmap=True)
+        mmap_manager.get_index(mock_tenant_id)
+
+        heap_bytes = heap_manager.get_cache_stats()["current_bytes"]
+        mmap_bytes = mmap_manager.get_cache_stats()["current_bytes"]
+        assert mmap_bytes < heap_bytes
+        assert heap_bytes - mmap_bytes >= 50 * DIMENSION * 4
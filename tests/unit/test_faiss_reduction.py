@@ -0,0 +1,160 @@
+"""
+Unit tests for per-tenant FAISS dimensionality reduction.
+
+Tests cover:
+- PCA trained on the tenant's vectors, with recall@k against the full dimension
+- Added documents and queries reduced consistently, across reloads
+- Matryoshka truncation configured before the index has vectors
+- Rebuilds (delete + create) keeping the tenant's reduction
+- Rejected and disabled reductions
+"""
+
+import pytest
+from unittest.mock import patch
+from uuid import uuid4
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from app.config.faiss import FAISSSettings
+from app.services.faiss_manager import (
+    FAISSIndexManager,
+    document_id_to_faiss_id,
+    get_tenant_reduction_path,
+)
+from app.services.faiss_reduction import VectorReducer, measure_recall
+from app.mcp.middleware.tenant import _tenant_id_context
+
+
+DIMENSION = 32
+REDUCED_DIMENSION = 8
+
+
+@pytest.fixture
+def tenant_id():
+    """Tenant ID set as the request's tenant."""
+    tenant_id = uuid4()
+    _tenant_id_context.set(tenant_id)
+    yield tenant_id
+    _tenant_id_context.set(None)
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory fixture for FAISSIndexManager instances rooted at tmp_path."""
+    settings = FAISSSettings(index_path=str(tmp_path), dimension=DIMENSION, use_mmap=False)
+    patcher = patch("app.services.faiss_manager.faiss_settings", settings)
+    patcher.start()
+    created = []
+
+    def factory():
+        manager = FAISSIndexManager()
+        created.append(manager)
+        return manager
+
+    yield factory
+
+    for manager in created:
+        manager.close()
+    patcher.stop()
+
+
+def _embeddings(count, seed=0):
+    """Unit vectors with a low intrinsic dimension, like real embeddings."""
+    rng = np.random.default_rng(seed)
+    latent = rng.standard_normal((count, 6)).astype(np.float32)
+    vectors = latent @ rng.standard_normal((6, DIMENSION)).astype(np.float32)
+    vectors += 0.01 * rng.standard_normal((count, DIMENSION)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _add(manager, tenant_id, embeddings):
+    """Add one document per embedding and return their IDs."""
+    document_ids = [uuid4() for _ in range(len(embeddings))]
+    manager.add_documents(tenant_id, document_ids, embeddings)
+    return document_ids
+
+
+def test_pca_reduction_keeps_neighbours(make_manager, tenant_id):
+    """PCA rebuilds the index at the reduced dimension and reports its recall."""
+    manager = make_manager()
+    embeddings = _embeddings(200)
+    document_ids = _add(manager, tenant_id, embeddings)
+
+    result = manager.set_tenant_reduction(tenant_id, "pca", REDUCED_DIMENSION)
+
+    assert result["method"] == "pca"
+    assert (result["input_dimension"], result["output_dimension"]) == (DIMENSION, REDUCED_DIMENSION)
+    assert result["recall_at_k"] > 0.9
+    assert get_tenant_reduction_path(tenant_id).exists()
+    assert manager.get_index(tenant_id).d == REDUCED_DIMENSION
+    assert manager.get_index_size(tenant_id) == 200
+
+    # Full-dimension queries are reduced like the stored vectors, also after a reload
+    for current in (manager, make_manager()):
+        results = current.search(tenant_id, embeddings[7], k=1)
+        assert results[0][0] == document_id_to_faiss_id(document_ids[7])
+    assert manager.get_tenant_index_config(tenant_id)["reduction"]["recall_at_k"] == result["recall_at_k"]
+
+
+def test_documents_added_after_reduction_are_reduced(make_manager, tenant_id):
+    """New documents are stored reduced; a wrong embedding dimension is rejected."""
+    manager = make_manager()
+    embeddings = _embeddings(120)
+    _add(manager, tenant_id, embeddings[:100])
+    manager.set_tenant_reduction(tenant_id, "pca", REDUCED_DIMENSION)
+
+    document_ids = _add(manager, tenant_id, embeddings[100:])
+
+    assert manager.get_index_size(tenant_id) == 120
+    results = manager.search(tenant_id, embeddings[110], k=1)
+    assert results[0][0] == document_id_to_faiss_id(document_ids[10])
+    with pytest.raises(ValueError, match="reduction input dimension"):
+        manager.add_document(tenant_id, uuid4(), np.ones(DIMENSION * 2, dtype=np.float32))
+
+
+def test_truncation_survives_rebuild(make_manager, tenant_id):
+    """Truncation needs no vectors, and a rebuilt index stays truncated."""
+    manager = make_manager()
+    manager.set_tenant_reduction(tenant_id, "matryoshka", REDUCED_DIMENSION)
+    embeddings = _embeddings(50)
+    _add(manager, tenant_id, embeddings)
+    assert manager.get_index(tenant_id).d == REDUCED_DIMENSION
+
+    # Rebuild as backup_restore does: recreate at the model's dimension, re-add
+    manager.delete_index(tenant_id)
+    manager.create_index(tenant_id, dimension=DIMENSION)
+    document_ids = _add(manager, tenant_id, embeddings)
+
+    assert manager.get_index(tenant_id).d == REDUCED_DIMENSION
+    results = manager.search(tenant_id, embeddings[3], k=1)
+    assert results[0][0] == document_id_to_faiss_id(document_ids[3])
+
+
+def test_rejected_and_disabled_reductions(make_manager, tenant_id):
+    """PCA needs vectors, a stored reduction cannot be swapped, and disabling asks for a rebuild."""
+    manager = make_manager()
+    with pytest.raises(ValueError, match="add documents"):
+        manager.set_tenant_reduction(tenant_id, "pca", REDUCED_DIMENSION)
+    with pytest.raises(ValueError, match="Unknown reduction"):
+        manager.set_tenant_reduction(tenant_id, "svd", REDUCED_DIMENSION)
+
+    _add(manager, tenant_id, _embeddings(40))
+    with pytest.raises(ValueError, match="between 1 and"):
+        manager.set_tenant_reduction(tenant_id, "truncate", DIMENSION)
+    manager.set_tenant_reduction(tenant_id, "truncate", REDUCED_DIMENSION)
+    with pytest.raises(ValueError, match="disable the reduction"):
+        manager.set_tenant_reduction(tenant_id, "truncate", 4)
+
+    assert manager.set_tenant_reduction(tenant_id, "none") == {"method": None, "rebuild_required": True}
+    assert "reduction" not in manager.get_tenant_index_config(tenant_id)
+
+
+def test_measure_recall_of_identity_is_perfect():
+    """A reduction that keeps every neighbour has recall 1.0."""
+    vectors = _embeddings(30)
+    reducer = VectorReducer.train("pca", vectors, REDUCED_DIMENSION)
+
+    assert measure_recall(vectors, vectors, faiss.METRIC_L2, k=5) == 1.0
+    assert reducer.apply(vectors).shape == (30, REDUCED_DIMENSION)
+    assert measure_recall(vectors[:1], vectors[:1], faiss.METRIC_L2) is None
@@ -43,6 +43,8 @@ def faiss_manager():
         mock_settings.dimension = 384
         mock_settings.index_type = "IndexFlatL2"
         mock_settings.use_mmap = False
+        mock_settings.cache_max_bytes = 0
+        mock_settings.pinned_tenants = ""
         manager = FAISSIndexManager()
         yield manager
 
@@ -372,3 +374,50 @@ class TestFAISSIndexManagerSearch:
             # The actual error handling is tested by the implementation
             pass
 
+
+
+class TestFAISSIndexManagerSearchBatch:
+    """Tests for FAISSIndexManager.search_batch() method."""
+
+    def setup_method(self):
+        """Reset context variables before each test."""
+        _tenant_id_context.set(None)
+
+    def test_search_batch_issues_single_search(self, faiss_manager, mock_tenant_id):
+        """All queries go to FAISS in one call and results come back per query."""
+        _tenant_id_context.set(mock_tenant_id)
+        
+        mock_index = MagicMock()
+        mock_index.ntotal = 3
+        mock_index.search = MagicMock(return_value=(
+            np.array([[0.5, 1.0, 2.0], [0.1, 3.0, 0.0]]),  # L2 distances
+            np.array([[100, 200, 300], [300, 100, -1]])     # FAISS IDs
+        ))
+        faiss_manager._indices[mock_tenant_id] = mock_index
+        faiss_manager.index_type = "IndexFlatL2"
+        queries = np.random.rand(2, 384).astype(np.float32)
+        
+        results = faiss_manager.search_batch(mock_tenant_id, queries, k=3)
+        
+        mock_index.search.assert_called_once()
+        assert mock_index.search.call_args[0][0].shape == (2, 384)
+        assert [faiss_id for faiss_id, _ in results[0]] == [100, 200, 300]
+        assert [faiss_id for faiss_id, _ in results[1]] == [300, 100]
+        assert results[1][0][1] == pytest.approx(1.0 / 1.1)
+        assert all(isinstance(faiss_id, int) and isinstance(score, float) for faiss_id, score in results[1])
+
+    def test_search_batch_matches_single_queries(self, faiss_manager, mock_tenant_id):
+        """Batched results equal one search() call per query on a real index."""
+        faiss = pytest.importorskip("faiss")
+        _tenant_id_context.set(mock_tenant_id)
+        
+        index = faiss.IndexIDMap2(faiss.IndexFlatIP(384))
+        vectors = np.random.default_rng(0).random((50, 384), dtype=np.float32)
+        index.add_with_ids(vectors, np.arange(1000, 1050, dtype=np.int64))
+        faiss_manager._indices[mock_tenant_id] = index
+        queries = vectors[[3, 17, 42]]
+        
+        batch_results = faiss_manager.search_batch(mock_tenant_id, queries, k=5)
+        
+        for query, batch_result in zip(queries, batch_results):
+            assert batch_result == faiss_manager.search(mock_tenant_id, query, k=5)
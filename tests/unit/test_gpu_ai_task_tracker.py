@@ -0,0 +1,151 @@
+"""
+Unit tests for GPU-AI embedding task completion.
+
+Tests cover:
+- Jittered exponential poll backoff
+- One shared poll loop resolving many outstanding tasks
+- Completion from pushed SSE result events
+- Failed and timed-out tasks
+- GPUAIClient completing a short task well under a second
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.services.gpu_ai_client import GPUAIClient
+from app.services.gpu_ai_task_tracker import GPUAITaskTracker, poll_delays
+
+
+class FakeStatusServer:
+    """embeddings_get_status stand-in completing each task after a number of polls."""
+
+    def __init__(self, polls_until_done: int = 2, status: str = "completed"):
+        self.polls_until_done = polls_until_done
+        self.status = status
+        self.polls = {}
+
+    async def __call__(self, task_id):
+        self.polls[task_id] = self.polls.get(task_id, 0) + 1
+        if self.polls[task_id] < self.polls_until_done:
+            return {"data": {"task_id": task_id, "status": "processing"}}
+        return {
+            "data": {
+                "task_id": task_id,
+                "status": self.status,
+                "error": "GPU out of memory",
+                "result": {"embeddings": [[float(len(task_id))]]},
+            }
+        }
+
+
+def test_poll_delays_double_up_to_cap():
+    """Delays start small, double and stay at the cap."""
+    delays = poll_delays(0.01, 0.08, jitter=0)
+
+    assert [round(next(delays), 3) for _ in range(6)] == [0.01, 0.02, 0.04, 0.08, 0.08, 0.08]
+
+    jittered = poll_delays(0.01, 0.08, jitter=0.5)
+    assert 0.005 <= next(jittered) <= 0.015
+
+
+class TestGPUAITaskTracker:
+    """Tests for GPUAITaskTracker."""
+
+    @pytest.mark.asyncio
+    async def test_outstanding_tasks_share_one_poll_loop(self):
+        """Concurrent tasks are resolved by a single poller within milliseconds."""
+        server = FakeStatusServer(polls_until_done=3)
+        tracker = GPUAITaskTracker(server, initial_poll_ms=5, max_poll_ms=20)
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(tracker.wait("t" * n, timeout=5) for n in range(1, 6)))
+
+        assert time.monotonic() - start < 0.5
+        assert results == [[[float(n)]] for n in range(1, 6)]
+        assert all(count == 3 for count in server.polls.values())
+        assert tracker.stats()["completed_by_poll"] == 5
+        assert tracker.stats()["outstanding_tasks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_pushed_result_event_completes_task(self):
+        """A result event on the SSE stream resolves the task without further polling."""
+        server = FakeStatusServer(polls_until_done=1000)
+        tracker = GPUAITaskTracker(server, initial_poll_ms=50, max_poll_ms=50)
+
+        waiter = asyncio.create_task(tracker.wait("task-1", timeout=5))
+        await asyncio.sleep(0)
+
+        event = {
+            "event": "message",
+            "data": {
+                "jsonrpc": "2.0",
+                "method": "notifications/message",
+                "params": {"task_id": "task-1", "status": "completed", "embeddings": [[0.5, 0.5]]},
+            },
+        }
+        assert tracker.handle_event(event) is True
+        assert await waiter == [[0.5, 0.5]]
+        assert tracker.stats()["completed_by_push"] == 1
+        assert tracker.handle_event(event) is False
+
+    @pytest.mark.asyncio
+    async def test_failed_and_timed_out_tasks_raise(self):
+        """Failed tasks raise the server's error; slow tasks time out."""
+        tracker = GPUAITaskTracker(FakeStatusServer(polls_until_done=1, status="failed"), initial_poll_ms=1)
+        with pytest.raises(RuntimeError, match="GPU out of memory"):
+            await tracker.wait("task-1", timeout=5)
+
+        slow = GPUAITaskTracker(FakeStatusServer(polls_until_done=1000), initial_poll_ms=1, max_poll_ms=5)
+        with pytest.raises(RuntimeError, match="timed out"):
+            await slow.wait("task-2", timeout=0.05)
+        assert slow.stats()["timeouts"] == 1
+
+
+class TestGPUAIClientCompletion:
+    """Tests for GPUAIClient task completion."""
+
+    @pytest.mark.asyncio
+    async def test_short_task_completes_well_under_a_second(self):
+        """A task finishing after ~30ms is returned long before a one-second poll."""
+        submitted_at = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            arguments = body["params"]["arguments"]
+            if body["params"]["name"] == "embeddings_generate":
+                submitted_at["time"] = time.monotonic()
+                return httpx.Response(200, json={"result": {"data": {"task_id": "task-1"}}})
+
+            done = time.monotonic() - submitted_at["time"] >= 0.03
+            status = {"task_id": arguments["task_id"], "status": "completed" if done else "processing"}
+            if done:
+                status["result"] = {"embeddings": [[0.1, 0.2, 0.3]]}
+            return httpx.Response(200, json={"result": {"data": status}})
+
+        client = GPUAIClient(base_url="http://gpu-ai.test/mcp")
+        client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+
+        start = time.monotonic()
+        embeddings = await client.generate_embeddings(["hello"])
+        elapsed = time.monotonic() - start
+        await client.close()
+
+        assert embeddings == [[0.1, 0.2, 0.3]]
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_inline_embeddings_used_without_task(self):
+        """Servers answering synchronously need no status polling."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["params"]["name"] == "embeddings_generate"
+            return httpx.Response(200, json={"result": {"data": {"embeddings": [[1.0, 0.0]]}}})
+
+        client = GPUAIClient(base_url="http://gpu-ai.test/mcp")
+        client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+
+        assert await client.generate_embeddings(["hello"]) == [[1.0, 0.0]]
+        await client.close()
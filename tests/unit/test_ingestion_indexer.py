@@ -0,0 +1,209 @@
+"""
+Unit tests for the background ingestion indexer.
+
+Tests cover:
+- Claimed entries indexed per tenant and marked indexed
+- Failed documents retried with backoff, then marked failed
+- Entries of deleted documents and superseded versions skipped
+- Streamed uploads read back from MinIO instead of uploaded again
+- Workers woken by notify() and stopped cleanly
+"""
+
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.db.models.ingestion_outbox import (
+    OUTBOX_CANCELLED,
+    OUTBOX_FAILED,
+    OUTBOX_INDEXED,
+    OUTBOX_PENDING,
+    OUTBOX_SUPERSEDED,
+)
+from app.mcp.middleware.tenant import get_tenant_id_from_context
+from app.services.faiss_manager import document_id_to_faiss_id
+from app.services.ingestion_indexer import IngestionIndexer, retry_delay
+
+
+def _entry(tenant_id, content="text", attempts=1, document_id=None, content_object=None):
+    """Claimed outbox entry."""
+    return MagicMock(
+        outbox_id=uuid4(),
+        tenant_id=tenant_id,
+        document_id=document_id or uuid4(),
+        title="Doc",
+        content=content,
+        content_object=content_object,
+        metadata_json={"type": "text"},
+        document_created_at=datetime.now(timezone.utc),
+        attempts=attempts,
+    )
+
+
+@contextmanager
+def _outbox(entries, live=None, latest=None, embed=None):
+    """Patch the outbox, documents and stores of the indexer."""
+    outbox_repo = MagicMock()
+    outbox_repo.claim = AsyncMock(side_effect=[list(entries), []])
+    outbox_repo.set_status = AsyncMock()
+    outbox_repo.get_latest_by_document_ids = AsyncMock(
+        return_value=latest if latest is not None else {entry.document_id: entry for entry in entries}
+    )
+    doc_repo = MagicMock()
+    live_ids = [entry.document_id for entry in entries] if live is None else live
+    doc_repo.get_document_ids_by_faiss_ids = AsyncMock(
+        return_value={document_id_to_faiss_id(document_id): document_id for document_id in live_ids}
+    )
+    doc_repo.replace_chunks = AsyncMock()
+    session = MagicMock()
+    session.commit = AsyncMock()
+    tenants = []
+
+    async def fake_session():
+        tenants.append(get_tenant_id_from_context())
+        yield session
+
+    async def fake_embed(texts, tenant_id, priority):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    async def fake_upload(tenant_id, contents, content_type, max_concurrency):
+        return {document_id: f"documents/{document_id}" for document_id in contents}
+
+    async def fake_read(tenant_id, object_name, chunk_size):
+        yield f"content of {object_name}".encode("utf-8")
+
+    with patch("app.services.ingestion_indexer.get_db_session", fake_session), \
+         patch("app.services.ingestion_indexer.stream_document_content", fake_read), \
+         patch("app.services.ingestion_indexer.IngestionOutboxRepository", return_value=outbox_repo), \
+         patch("app.services.ingestion_indexer.DocumentRepository", return_value=doc_repo), \
+         patch("app.services.batch_ingestion.embedding_service.generate_embeddings",
+               AsyncMock(side_effect=embed or fake_embed)), \
+         patch("app.services.batch_ingestion.upload_document_contents",
+               AsyncMock(side_effect=fake_upload)) as upload, \
+         patch("app.services.batch_ingestion.faiss_manager.add_documents") as faiss_add, \
+         patch("app.services.batch_ingestion.add_documents_to_index", AsyncMock()) as meilisearch_add:
+        yield MagicMock(
+            outbox_repo=outbox_repo,
+            faiss_add=faiss_add,
+            meilisearch_add=meilisearch_add,
+            upload=upload,
+            tenants=tenants,
+        )
+
+
+def _statuses(outbox_repo):
+    """Map each outbox_id to the status recorded for it."""
+    statuses = {}
+    for call in outbox_repo.set_status.await_args_list:
+        for outbox_id in call.args[0]:
+            statuses[outbox_id] = (call.args[1], call.kwargs)
+    return statuses
+
+
+@pytest.mark.asyncio
+async def test_claimed_entries_indexed_per_tenant():
+    """Each tenant's entries share one FAISS add and one Meilisearch task."""
+    tenant_a, tenant_b = uuid4(), uuid4()
+    entries = [_entry(tenant_a), _entry(tenant_b), _entry(tenant_a)]
+    indexer = IngestionIndexer()
+
+    with _outbox(entries) as stores:
+        assert await indexer.run_once() == 3
+
+    assert stores.faiss_add.call_count == 2
+    assert len(stores.faiss_add.call_args_list[0].kwargs["document_ids"]) == 2
+    assert stores.tenants[1:] == [tenant_a, tenant_b]
+    statuses = _statuses(stores.outbox_repo)
+    assert {statuses[entry.outbox_id][0] for entry in entries} == {OUTBOX_INDEXED}
+    assert indexer.stats()["indexed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_entries_retried_then_failed():
+    """Failures back off until the last attempt, which marks the entry failed."""
+    tenant_id = uuid4()
+    retried, exhausted = _entry(tenant_id, content="fail", attempts=1), _entry(tenant_id, content="fail", attempts=5)
+
+    async def embed(texts, tenant_id, priority):
+        raise RuntimeError("backend unavailable")
+
+    with patch("app.services.ingestion_indexer.ingestion_settings.indexer_max_attempts", 5), \
+         _outbox([retried, exhausted], embed=embed) as stores:
+        await IngestionIndexer().run_once()
+
+    statuses = _statuses(stores.outbox_repo)
+    status, kwargs = statuses[retried.outbox_id]
+    assert status == OUTBOX_PENDING
+    assert "backend unavailable" in kwargs["error"]
+    assert kwargs["retry_at"] > datetime.now(timezone.utc)
+    assert statuses[exhausted.outbox_id][0] == OUTBOX_FAILED
+    stores.meilisearch_add.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_deleted_and_superseded_entries_skipped():
+    """Deleted documents and older versions are not indexed."""
+    tenant_id = uuid4()
+    deleted, current = _entry(tenant_id), _entry(tenant_id)
+    older = _entry(tenant_id, document_id=current.document_id)
+
+    with _outbox(
+        [deleted, older, current],
+        live=[current.document_id],
+        latest={current.document_id: current},
+    ) as stores:
+        await IngestionIndexer().run_once()
+
+    statuses = _statuses(stores.outbox_repo)
+    assert statuses[deleted.outbox_id][0] == OUTBOX_CANCELLED
+    assert statuses[older.outbox_id][0] == OUTBOX_SUPERSEDED
+    assert statuses[current.outbox_id][0] == OUTBOX_INDEXED
+    assert stores.faiss_add.call_args.kwargs["document_ids"] == [current.document_id]
+
+
+@pytest.mark.asyncio
+async def test_streamed_entries_read_back_from_minio():
+    """Entries referencing an uploaded object are indexed from it and not uploaded again."""
+    tenant_id = uuid4()
+    streamed = _entry(tenant_id, content=None, content_object="documents/streamed")
+    inline = _entry(tenant_id)
+
+    with _outbox([streamed, inline]) as stores:
+        await IngestionIndexer().run_once()
+
+    statuses = _statuses(stores.outbox_repo)
+    assert {statuses[entry.outbox_id][0] for entry in (streamed, inline)} == {OUTBOX_INDEXED}
+    assert list(stores.upload.await_args.args[1]) == [inline.document_id]
+    indexed = {document["id"]: document["content"] for document in stores.meilisearch_add.await_args.args[1]}
+    assert indexed[str(streamed.document_id)] == "content of documents/streamed"
+
+
+def test_retry_delay_doubles_up_to_cap():
+    """Retry delays grow exponentially and are capped."""
+    with patch("app.services.ingestion_indexer.ingestion_settings.indexer_retry_base_seconds", 2.0), \
+         patch("app.services.ingestion_indexer.ingestion_settings.indexer_retry_max_seconds", 10.0):
+        assert [retry_delay(attempts) for attempts in (1, 2, 3, 4)] == [2.0, 4.0, 8.0, 10.0]
+
+
+@pytest.mark.asyncio
+async def test_notify_wakes_idle_workers():
+    """An idle worker polls again as soon as a document is queued."""
+    indexer = IngestionIndexer()
+    indexer.run_once = AsyncMock(return_value=0)
+
+    with patch("app.services.ingestion_indexer.ingestion_settings.outbox_enabled", True), \
+         patch("app.services.ingestion_indexer.ingestion_settings.indexer_workers", 1), \
+         patch("app.services.ingestion_indexer.ingestion_settings.indexer_poll_interval_seconds", 60.0):
+        indexer.start()
+        await asyncio.sleep(0.01)
+        indexer.notify()
+        await asyncio.sleep(0.01)
+        await indexer.stop(timeout=1.0)
+
+    assert indexer.run_once.await_count >= 2
+    assert indexer.stats()["workers"] == 0
@@ -0,0 +1,124 @@
+"""
+Unit tests for the async OpenAI embedding backend.
+
+Tests run the backend against a local OpenAI-compatible stub server.
+
+Tests cover:
+- Token-aware and input-count batch splitting
+- Input order across concurrent requests
+- Bounded request concurrency
+- Error propagation
+"""
+
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.openai_embedding_backend import OpenAIEmbeddingBackend, split_batches
+
+
+class StubEmbeddingsServer:
+    """OpenAI-compatible /v1/embeddings stub recording request batches."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = delay
+        self.fail = fail
+        self.app = FastAPI()
+        self.app.post("/v1/embeddings")(self.embeddings)
+
+    async def embeddings(self, request: Request):
+        body = await request.json()
+        self.batches.append(body["input"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if self.fail:
+            return JSONResponse({"error": {"message": "overloaded", "type": "server_error"}}, status_code=400)
+
+        # Return rows out of order; each embedding encodes its text's length
+        data = [
+            {"object": "embedding", "index": i, "embedding": [float(len(text)), float(i)]}
+            for i, text in enumerate(body["input"])
+        ]
+        return {
+            "object": "list",
+            "model": body["model"],
+            "data": list(reversed(data)),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    def backend(self, **kwargs) -> OpenAIEmbeddingBackend:
+        """Create a backend talking to this stub."""
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app))
+        return OpenAIEmbeddingBackend(
+            base_url="http://stub/v1", http_client=http_client, max_retries=0, **kwargs
+        )
+
+
+@pytest.fixture(autouse=True)
+def openai_api_key(monkeypatch):
+    """Any key works against the stub."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+def test_split_batches_respects_inputs_and_tokens():
+    """Batches stay in order and within both the input and token limits."""
+    texts = ["a" * 30, "b" * 30, "c" * 30, "d" * 300, "e"]
+
+    batches = split_batches(texts, max_inputs=2, max_tokens=25, count_tokens=lambda text: len(text) // 3)
+
+    assert batches == [[0, 1], [2], [3], [4]]
+
+
+class TestOpenAIEmbeddingBackend:
+    """Tests for OpenAIEmbeddingBackend."""
+
+    @pytest.mark.asyncio
+    async def test_split_requests_keep_input_order(self):
+        """Rows come back in input order even when split across requests."""
+        stub = StubEmbeddingsServer()
+        backend = stub.backend(max_batch_inputs=3)
+        texts = ["x" * n for n in range(1, 9)]
+
+        embeddings = await backend.embed("text-embedding-3-small", texts)
+        await backend.close()
+
+        assert sorted(len(batch) for batch in stub.batches) == [2, 3, 3]
+        assert embeddings.dtype == np.float32
+        assert embeddings[:, 0].tolist() == [float(n) for n in range(1, 9)]
+        assert backend.stats()["requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self):
+        """No more than max_concurrency requests reach the server at once."""
+        stub = StubEmbeddingsServer(delay=0.02)
+        backend = stub.backend(max_batch_inputs=1, max_concurrency=2)
+
+        await backend.embed("text-embedding-3-small", [f"text {i}" for i in range(6)])
+        await backend.close()
+
+        assert len(stub.batches) == 6
+        assert stub.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_server_error_raised(self):
+        """A failed request raises and is counted."""
+        stub = StubEmbeddingsServer(fail=True)
+        backend = stub.backend()
+
+        with pytest.raises(Exception, match="overloaded"):
+            await backend.embed("text-embedding-3-small", ["hello"])
+        await backend.close()
+
+        assert backend.stats()["failed_requests"] == 1
@@ -0,0 +1,86 @@
+"""
+Unit tests for request-scoped query embedding sharing.
+
+Tests cover:
+- EmbeddingService embedding a query once per request
+- Mem0 memory search reusing the vector computed for FAISS search
+- No reuse across models, dimensions, non-search embeds or requests
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.services.query_embedding_context import (
+    ScopedEmbedder,
+    get_query_embeddings,
+    query_embedding_scope,
+)
+
+
+def make_mem0_embedder(model: str = "text-embedding-3-small", dimension: int = 4):
+    """Mem0-style embedder returning a fixed vector."""
+    embedder = MagicMock()
+    embedder.config.model = model
+    embedder.config.embedding_dims = dimension
+    embedder.embed.return_value = [0.5] * dimension
+    return embedder
+
+
+@pytest.fixture
+def service():
+    """EmbeddingService with a stub backend counting embedded texts."""
+    from app.services.embedding_service import EmbeddingService
+
+    service = EmbeddingService()
+    service.cache = None
+    service.batcher._embed_batch = AsyncMock(
+        side_effect=lambda model, texts: np.full((len(texts), 4), 0.25, dtype=np.float32)
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_query_embedded_once_per_request(service):
+    """Repeated embeddings of a query within a scope reach the backend once."""
+    with query_embedding_scope():
+        first = await service.generate_embedding("quarterly report", "tenant", model="text-embedding-3-small")
+        second = await service.generate_embedding("quarterly report", "tenant", model="text-embedding-3-small")
+    await service.generate_embedding("quarterly report", "tenant", model="text-embedding-3-small")
+
+    np.testing.assert_array_equal(first, second)
+    assert service.batcher._embed_batch.await_count == 2
+    assert get_query_embeddings() is None
+
+
+@pytest.mark.asyncio
+async def test_memory_search_reuses_search_vector(service):
+    """Mem0 searching with the tenant's model gets the FAISS query vector."""
+    embedder = ScopedEmbedder(make_mem0_embedder())
+
+    with query_embedding_scope() as scope:
+        query_vector = await service.generate_embedding("quarterly report", "tenant", model="text-embedding-3-small")
+        memory_vector = embedder.embed("quarterly report", "search")
+
+    assert memory_vector == query_vector.tolist()
+    embedder._embedder.embed.assert_not_called()
+    assert scope.hits == 1
+
+
+def test_embedder_falls_through_when_vector_not_shareable():
+    """Other models, dimensions, actions and requests call Mem0's embedder."""
+    other_model = ScopedEmbedder(make_mem0_embedder(model="text-embedding-3-large"))
+    other_dimension = ScopedEmbedder(make_mem0_embedder(dimension=8))
+    same_model = ScopedEmbedder(make_mem0_embedder())
+
+    with query_embedding_scope() as scope:
+        scope.put("text-embedding-3-small", "query", np.ones(4))
+        other_model.embed("query", "search")
+        other_dimension.embed("query", "search")
+        same_model.embed("query", "add")
+    same_model.embed("query", "search")
+
+    for embedder in (other_model, other_dimension):
+        embedder._embedder.embed.assert_called_once_with("query", "search")
+    assert same_model._embedder.embed.call_count == 2
@@ -220,6 +220,8 @@ class TestRagSearch:
             call_kwargs = mock_hybrid.search.call_args[1]
             assert call_kwargs["filters"]["document_type"] == document_type
             assert call_kwargs["filters"]["tags"] == tags
+            assert call_kwargs["filters"]["date_from"] == datetime(2025, 1, 1)
+            assert call_kwargs["filters"]["date_to"] == datetime(2025, 12, 31)
 
     @pytest.mark.asyncio
     async def test_search_unauthorized_access(self, mock_tenant_id, mock_user_id):
@@ -0,0 +1,98 @@
+"""
+Unit tests for the incremental SSE parser.
+
+Tests cover:
+- Multi-line data fields, comments and event/id/retry fields
+- Line terminators and UTF-8 characters split across chunks
+- Identical results for any chunking of the stream
+- GPUAISSEClient stream payloads
+"""
+
+import json
+
+import pytest
+
+from app.services.gpu_ai_sse_client import GPUAISSEClient
+from app.services.sse_parser import SSEParser
+
+
+def parse_chunks(chunks):
+    """Feed chunks to a fresh parser and return all events."""
+    parser = SSEParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events + parser.flush()
+
+
+class TestSSEParser:
+    """Tests for SSEParser."""
+
+    def test_fields_per_spec(self):
+        """Data lines join with newlines; comments and data-less events are dropped."""
+        stream = (
+            b": keep-alive\n"
+            b"event: endpoint\n"
+            b"id: 7\n"
+            b"retry: 1500\n"
+            b"data: first\n"
+            b"data:second\n"
+            b"\n"
+            b"event: empty\n"
+            b"\n"
+            b"data: {\"a\": 1}\n"
+            b"\n"
+        )
+
+        events = parse_chunks([stream])
+
+        assert [(e.event, e.data, e.id, e.has_event_type) for e in events] == [
+            ("endpoint", "first\nsecond", "7", True),
+            ("message", '{"a": 1}', "7", False),
+        ]
+        assert events[0].retry == 1500
+        assert events[1].json() == {"a": 1}
+
+    def test_any_chunking_gives_same_events(self):
+        """CRLF, CR and multi-byte characters split across chunks parse identically."""
+        stream = "data: héllo wörld ✓\r\ndata: 日本\r\rdata: x\n\n".encode("utf-8")
+        expected = [(e.event, e.data) for e in parse_chunks([stream])]
+
+        assert expected == [("message", "héllo wörld ✓\n日本"), ("message", "x")]
+        for size in (1, 2, 3, 5):
+            chunks = [stream[i:i + size] for i in range(0, len(stream), size)]
+            assert [(e.event, e.data) for e in parse_chunks(chunks)] == expected
+
+    def test_unterminated_event_flushed(self):
+        """An event without a trailing blank line is dispatched at the end of the stream."""
+        parser = SSEParser()
+
+        assert parser.feed(b"\xef\xbb\xbfdata: last") == []
+        assert [e.data for e in parser.flush()] == ["last"]
+
+
+class FakeStreamResponse:
+    """Minimal httpx streaming response yielding fixed chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def aiter_bytes(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_client_stream_payloads():
+    """JSON-RPC messages are yielded decoded; typed events keep their envelope."""
+    message = json.dumps({"jsonrpc": "2.0", "id": 1, "result": {"embeddings": [[0.5] * 3072] * 4}})
+    stream = f"event: endpoint\ndata: /mcp/messages/?session_id=abc\n\ndata: {message}\n\n".encode()
+    chunks = [stream[i:i + 1000] for i in range(0, len(stream), 1000)]
+
+    payloads = [p async for p in GPUAISSEClient(sse_url="http://gpu-ai.test/mcp")._parse_sse_stream(
+        FakeStreamResponse(chunks)
+    )]
+
+    assert payloads[0] == {"event": "endpoint", "data": "/mcp/messages/?session_id=abc"}
+    assert payloads[1]["id"] == 1
+    assert len(payloads[1]["result"]["embeddings"]) == 4
@@ -0,0 +1,327 @@
+"""
+Unit tests for streamed document ingestion.
+
+Tests cover:
+- Streamed content stripped and hashed like rag_ingest content
+- Empty, non-UTF-8 and oversized streams rejected
+- Streams uploaded to MinIO in parts without buffering the whole content
+- Streamed documents queued with a MinIO object reference
+- Duplicate streamed content removed from MinIO again
+- Previous content of an updated document restored if the update fails
+- Client IPs taken from X-Forwarded-For only behind trusted proxies
+- Streamed uploads rate limited and audited like tool calls
+"""
+
+import hashlib
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from starlette.requests import Request
+
+from app.api.documents import _client_ip, stream_document
+from app.mcp.middleware.context import MCPContext
+from app.mcp.middleware.rbac import UserRole
+from app.mcp.middleware.tenant import get_tenant_id_from_context, tenant_context
+from app.mcp.tools.document_ingestion import ingest_document_stream
+from app.services.content_stream import TextContentStream, read_text
+from app.services.minio_client import upload_document_stream
+from app.utils.errors import RateLimitExceededError, ValidationError
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _consume(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_stream_matches_stripped_content_hash():
+    """Chunk boundaries, multi-byte characters and surrounding whitespace do not change the result."""
+    text = "\n  Grüße, 世界!\n\n  second\tline   \n"
+    data = text.encode("utf-8")
+    splits = [data[i:i + 3] for i in range(0, len(data), 3)]
+
+    stream = TextContentStream(_chunks(*splits))
+    content = await _consume(stream)
+
+    assert content.decode("utf-8") == text.strip()
+    assert stream.content_hash == hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+    assert stream.content_length == len(text.strip())
+    assert stream.received_bytes == len(data)
+    assert await read_text(_chunks(*splits)) == text
+
+
+@pytest.mark.asyncio
+async def test_invalid_streams_rejected():
+    """Whitespace-only, non-UTF-8 and oversized content fail validation."""
+    with pytest.raises(ValidationError, match="empty"):
+        await _consume(TextContentStream(_chunks(b"  \n", b"\t")))
+    with pytest.raises(ValidationError, match="UTF-8"):
+        await _consume(TextContentStream(_chunks(b"text \xff\xfe")))
+    with pytest.raises(ValidationError, match="exceeds 8 bytes"):
+        await _consume(TextContentStream(_chunks(b"12345", b"67890"), max_bytes=8))
+
+
+@pytest.mark.asyncio
+async def test_upload_reads_stream_in_parts():
+    """put_object consumes the stream part by part from a worker thread."""
+    reads = []
+    stored = {}
+
+    def put_object(bucket_name, object_name, data, length, part_size, content_type):
+        parts = []
+        while True:
+            part = data.read(part_size)
+            reads.append(len(part))
+            if not part:
+                break
+            parts.append(part)
+        stored[object_name] = (b"".join(parts), length, part_size)
+
+    client = MagicMock()
+    client.put_object.side_effect = put_object
+    document_id = uuid4()
+    chunk = b"x" * (1024 * 1024)
+
+    with patch("app.services.minio_client.get_tenant_bucket", AsyncMock(return_value="tenant-bucket")), \
+         patch("app.services.minio_client.validate_bucket_access", AsyncMock()), \
+         patch("app.services.minio_client.create_minio_client", return_value=client):
+        object_name = await upload_document_stream(uuid4(), document_id, _chunks(*[chunk] * 12), part_size=1)
+
+    assert object_name == f"documents/{document_id}"
+    content, length, part_size = stored[object_name]
+    assert (len(content), length, part_size) == (12 * len(chunk), -1, 5 * 1024 * 1024)
+    assert reads == [part_size, part_size, 2 * len(chunk), 0]
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_errors_propagate():
+    """A failing stream fails the upload (MinIO aborts the multipart upload)."""
+    async def failing():
+        yield b"partial"
+        raise ValidationError("Document content must be UTF-8 text.")
+
+    client = MagicMock()
+    client.put_object.side_effect = lambda bucket_name, object_name, data, **kwargs: data.read(16)
+
+    with patch("app.services.minio_client.get_tenant_bucket", AsyncMock(return_value="tenant-bucket")), \
+         patch("app.services.minio_client.validate_bucket_access", AsyncMock()), \
+         patch("app.services.minio_client.create_minio_client", return_value=client):
+        with pytest.raises(ValidationError, match="UTF-8"):
+            await upload_document_stream(uuid4(), uuid4(), failing())
+
+
+class TestIngestDocumentStream:
+    """Tests for ingest_document_stream."""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.tenant_id = uuid4()
+        self.uploaded = {}
+        with tenant_context(self.tenant_id, uuid4(), UserRole.USER):
+            yield
+
+    async def _upload(self, tenant_id, document_id, chunks, content_type, part_size):
+        self.uploaded[document_id] = await _consume(chunks)
+        return f"documents/{document_id}"
+
+    def _patches(self, doc_repo, outbox_repo, session):
+        get_session = MagicMock()
+        get_session.return_value.__aiter__.return_value = [session]
+        return (
+            patch("app.mcp.tools.document_ingestion.get_db_session", get_session),
+            patch("app.mcp.tools.document_ingestion.ingestion_settings.outbox_enabled", True),
+            patch("app.mcp.tools.document_ingestion.DocumentRepository", return_value=doc_repo),
+            patch("app.mcp.tools.document_ingestion.IngestionOutboxRepository", return_value=outbox_repo),
+            patch("app.mcp.tools.document_ingestion.ingestion_indexer.notify"),
+            patch("app.mcp.tools.document_ingestion.upload_document_stream", AsyncMock(side_effect=self._upload)),
+            patch("app.mcp.tools.document_ingestion.undo_ingestion", AsyncMock()),
+        )
+
+    @pytest.mark.asyncio
+    async def test_streamed_document_queued_with_object_reference(self):
+        """The outbox entry references the uploaded object instead of carrying the content."""
+        doc_repo = MagicMock()
+        doc_repo.get_by_content_hash = AsyncMock(return_value=None)
+        doc_repo.create = AsyncMock()
+        doc_repo.get_by_id = AsyncMock(return_value=None)
+        outbox_repo = MagicMock()
+        outbox_repo.enqueue = AsyncMock()
+        session = MagicMock()
+        session.commit = AsyncMock()
+
+        patches = self._patches(doc_repo, outbox_repo, session)
+        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5], patches[6] as undo:
+            result = await ingest_document_stream(
+                _chunks(b"  streamed ", b"content\n"), {"title": "Streamed"}
+            )
+
+        document_id = doc_repo.create.await_args.kwargs["document_id"]
+        assert self.uploaded[document_id] == b"streamed content"
+        assert doc_repo.create.await_args.kwargs["content_hash"] == hashlib.sha256(b"streamed content").hexdigest()
+        enqueued = outbox_repo.enqueue.await_args.kwargs
+        assert enqueued["content"] is None
+        assert enqueued["content_object"] == f"documents/{document_id}"
+        session.commit.assert_awaited_once()
+        undo.assert_not_awaited()
+        assert result["ingestion_status"] == "queued"
+        assert result["document_id"] == str(document_id)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_stream_removed_from_minio(self):
+        """Content an existing document holds is deleted again and reported as a duplicate."""
+        existing_id = uuid4()
+        doc_repo = MagicMock()
+        doc_repo.get_by_content_hash = AsyncMock(return_value=MagicMock(
+            document_id=existing_id, content_hash=hashlib.sha256(b"known").hexdigest()
+        ))
+        outbox_repo = MagicMock()
+        outbox_repo.enqueue = AsyncMock()
+        session = MagicMock()
+        session.commit = AsyncMock()
+
+        patches = self._patches(doc_repo, outbox_repo, session)
+        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5], patches[6] as undo:
+            result = await ingest_document_stream(_chunks(b"known"), {"title": "Again"})
+
+        (uploaded_id,) = self.uploaded
+        undo.assert_awaited_once_with(self.tenant_id, [uploaded_id], minio=True)
+        outbox_repo.enqueue.assert_not_awaited()
+        assert result["ingestion_status"] == "duplicate"
+        assert result["document_id"] == str(existing_id)
+
+    @pytest.mark.asyncio
+    async def test_existing_document_content_restored_on_failure(self):
+        """Overwriting an existing document keeps a copy that is put back if the update fails."""
+        document_id = uuid4()
+        doc_repo = MagicMock()
+        doc_repo.get_by_id = AsyncMock(return_value=MagicMock(
+            document_id=document_id, content_hash="old", version_number=1
+        ))
+        doc_repo.update = AsyncMock()
+        outbox_repo = MagicMock()
+        outbox_repo.enqueue = AsyncMock(side_effect=RuntimeError("outbox unavailable"))
+        session = MagicMock()
+        session.commit = AsyncMock()
+        backup = AsyncMock(return_value=f"documents/{document_id}.previous")
+        restore = AsyncMock()
+
+        patches = self._patches(doc_repo, outbox_repo, session)
+        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5], patches[6] as undo, \
+             patch("app.db.repositories.document_version_repository.DocumentVersionRepository.create", AsyncMock()), \
+             patch("app.mcp.tools.document_ingestion.backup_document_content", backup), \
+             patch("app.mcp.tools.document_ingestion.restore_document_content", restore):
+            with pytest.raises(RuntimeError, match="outbox unavailable"):
+                await ingest_document_stream(
+                    _chunks(b"new content"), {"title": "Updated"}, document_id=str(document_id)
+                )
+
+        backup.assert_awaited_once_with(self.tenant_id, document_id)
+        restore.assert_awaited_once_with(
+            self.tenant_id, document_id, f"documents/{document_id}.previous", restore=True
+        )
+        undo.assert_not_awaited()
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_existing_document_backup_dropped_after_commit(self):
+        """Once the new version is committed the copy of the previous content is deleted."""
+        document_id = uuid4()
+        doc_repo = MagicMock()
+        doc_repo.get_by_id = AsyncMock(return_value=MagicMock(
+            document_id=document_id, content_hash="old", version_number=1
+        ))
+        doc_repo.update = AsyncMock()
+        outbox_repo = MagicMock()
+        outbox_repo.enqueue = AsyncMock()
+        session = MagicMock()
+        session.commit = AsyncMock()
+        restore = AsyncMock()
+
+        patches = self._patches(doc_repo, outbox_repo, session)
+        with patches[0], patches[1], patches[2], patches[3], patches[4], patches[5], patches[6], \
+             patch("app.db.repositories.document_version_repository.DocumentVersionRepository.create", AsyncMock()), \
+             patch("app.mcp.tools.document_ingestion.backup_document_content", AsyncMock(return_value="copy")), \
+             patch("app.mcp.tools.document_ingestion.restore_document_content", restore):
+            result = await ingest_document_stream(
+                _chunks(b"new content"), {"title": "Updated"}, document_id=str(document_id)
+            )
+
+        assert result["ingestion_status"] == "queued"
+        session.commit.assert_awaited_once()
+        restore.assert_awaited_once_with(self.tenant_id, document_id, "copy", restore=False)
+
+
+def _request(peer, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+def test_forwarded_for_only_trusted_from_proxies():
+    """X-Forwarded-For is ignored unless the peer is a trusted proxy."""
+    with patch("app.api.documents.settings.trusted_proxy_ips", ["10.0.0.1", "10.0.0.2"]):
+        assert _client_ip(_request("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+        assert _client_ip(_request("10.0.0.1", "198.51.100.1")) == "198.51.100.1"
+        # Entries left of the first untrusted hop can be forged by the client
+        assert _client_ip(_request("10.0.0.1", "1.2.3.4, 198.51.100.1, 10.0.0.2")) == "198.51.100.1"
+        assert _client_ip(_request("10.0.0.1", "not-an-ip")) == "10.0.0.1"
+
+
+class TestStreamDocumentEndpoint:
+    """Tests for POST /api/documents/stream."""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.tenant_id = uuid4()
+        self.auth_context = MCPContext(tenant_id=self.tenant_id, user_id=uuid4(), role="tenant_admin")
+        self.request = _request("203.0.113.9", "198.51.100.1")
+        self.request.stream = MagicMock()
+
+    def _patches(self, ingest, rate_limit):
+        return (
+            patch("app.api.documents.authenticate_request", AsyncMock(return_value=self.auth_context)),
+            patch("app.api.documents.validate_tenant_membership", AsyncMock()),
+            patch("app.api.documents.enforce_rate_limit", rate_limit),
+            patch("app.api.documents.ingest_document_stream", ingest),
+            patch("app.api.documents.log_audit_event", AsyncMock()),
+        )
+
+    @pytest.mark.asyncio
+    async def test_upload_audited_in_tenant_context(self):
+        """The upload runs in the caller's tenant context and is audited with the peer IP."""
+        async def ingest(chunks, metadata, tenant_id, document_id):
+            assert get_tenant_id_from_context() == self.tenant_id
+            return {"document_id": "doc-1", "ingestion_status": "queued"}
+
+        rate_limit = AsyncMock()
+        patches = self._patches(AsyncMock(side_effect=ingest), rate_limit)
+        with patches[0], patches[1], patches[2], patches[3], patches[4] as audit:
+            result = await stream_document(self.request, title="Streamed")
+
+        assert result["document_id"] == "doc-1"
+        assert get_tenant_id_from_context() is None
+        rate_limit.assert_awaited_once_with(self.tenant_id, self.auth_context.user_id, "tenant_admin")
+        audit.assert_called_once()
+        event = audit.call_args.kwargs
+        assert (event["action"], event["resource_id"], event["success"]) == ("rag_ingest_stream", "doc-1", True)
+        assert event["ip_address"] == "203.0.113.9"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_upload_rejected(self):
+        """A tenant over its rate limit gets 429 with Retry-After and nothing is ingested."""
+        ingest = AsyncMock()
+        rate_limit = AsyncMock(side_effect=RateLimitExceededError(
+            "Rate limit exceeded", retry_after=7, limit=10, remaining=0, reset_time=0
+        ))
+        patches = self._patches(ingest, rate_limit)
+        with patches[0], patches[1], patches[2], patches[3], patches[4] as audit:
+            response = await stream_document(self.request, title="Streamed")
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "7"
+        ingest.assert_not_awaited()
+        assert audit.call_args.kwargs["success"] is False
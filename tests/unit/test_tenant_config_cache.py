@@ -0,0 +1,143 @@
+"""
+Unit tests for the tenant configuration cache.
+
+Tests cover:
+- Serving repeated lookups from memory until the TTL expires
+- Explicit invalidation, including loads racing with an invalidation
+- Caching tenants without configuration
+- EmbeddingService routing by model instead of shared state
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.tenant_config_cache import TenantConfigCache, TenantConfigSnapshot
+
+
+def make_tenant_config(embedding_model="gpu-ai", personalization_enabled=False):
+    """Build a TenantConfig-like object."""
+    config = MagicMock()
+    config.model_configuration = {"embedding_model": embedding_model}
+    config.custom_configuration = {"personalization_enabled": personalization_enabled}
+    config.updated_at = None
+    return config
+
+
+@pytest.fixture
+def config_repo():
+    """Patch the cache's database access with a mocked TenantConfigRepository."""
+    repo = MagicMock()
+    repo.get_by_tenant_id = AsyncMock(return_value=make_tenant_config())
+
+    async def fake_session():
+        yield MagicMock()
+
+    with patch("app.services.tenant_config_cache.get_db_session", fake_session), \
+         patch("app.services.tenant_config_cache.TenantConfigRepository", return_value=repo):
+        yield repo
+
+
+class TestTenantConfigCache:
+    """Tests for TenantConfigCache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookups_served_from_memory(self, config_repo):
+        """Only the first lookup within the TTL reads the database."""
+        cache = TenantConfigCache(ttl_seconds=60)
+        tenant_id = uuid4()
+        config_repo.get_by_tenant_id.return_value = make_tenant_config("text-embedding-3-small", True)
+
+        snapshots = [await cache.get(tenant_id) for _ in range(3)]
+
+        assert config_repo.get_by_tenant_id.await_count == 1
+        assert snapshots[0] is snapshots[2]
+        assert snapshots[0].embedding_model == "text-embedding-3-small"
+        assert snapshots[0].embedding_dimension == 1536
+        assert snapshots[0].personalization_enabled is True
+        assert snapshots[0].use_gpu_ai is False
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_new_configuration(self, config_repo):
+        """A write followed by invalidate() is visible on the next lookup."""
+        cache = TenantConfigCache(ttl_seconds=60)
+        tenant_id = uuid4()
+        await cache.get(tenant_id)
+
+        config_repo.get_by_tenant_id.return_value = make_tenant_config("text-embedding-3-large")
+        cache.invalidate(tenant_id)
+        snapshot = await cache.get(tenant_id)
+
+        assert snapshot.embedding_model == "text-embedding-3-large"
+        assert snapshot.embedding_dimension == 3072
+        assert snapshot.version == 1
+
+    @pytest.mark.asyncio
+    async def test_load_racing_with_invalidate_not_cached(self, config_repo):
+        """A snapshot read before an invalidation is returned but never stored."""
+        cache = TenantConfigCache(ttl_seconds=60)
+        tenant_id = uuid4()
+        release = asyncio.Event()
+
+        async def slow_read(_tenant_id):
+            await release.wait()
+            return make_tenant_config("gpu-ai")
+
+        config_repo.get_by_tenant_id.side_effect = slow_read
+        stale_load = asyncio.create_task(cache.get(tenant_id))
+        await asyncio.sleep(0)
+
+        cache.invalidate(tenant_id)
+        release.set()
+        assert (await stale_load).embedding_model == "gpu-ai"
+
+        config_repo.get_by_tenant_id.side_effect = None
+        config_repo.get_by_tenant_id.return_value = make_tenant_config("text-embedding-3-small")
+        assert (await cache.get(tenant_id)).embedding_model == "text-embedding-3-small"
+
+    @pytest.mark.asyncio
+    async def test_missing_configuration_cached(self, config_repo):
+        """Tenants without configuration are cached as None until invalidated."""
+        cache = TenantConfigCache(ttl_seconds=60)
+        tenant_id = uuid4()
+        config_repo.get_by_tenant_id.return_value = None
+
+        assert await cache.get(tenant_id) is None
+        assert await cache.get(tenant_id) is None
+        assert config_repo.get_by_tenant_id.await_count == 1
+
+
+class TestEmbeddingServiceTenantConfig:
+    """Tests for EmbeddingService with the tenant configuration cache."""
+
+    @pytest.mark.asyncio
+    async def test_backend_chosen_by_model_not_previous_tenant(self):
+        """An OpenAI tenant's batch goes to OpenAI even after a GPU-AI tenant's lookup."""
+        from app.services import embedding_service as embedding_module
+        from app.services.embedding_service import EmbeddingService
+
+        gpu_tenant, openai_tenant = uuid4(), uuid4()
+        snapshots = {
+            gpu_tenant: TenantConfigSnapshot(gpu_tenant, 0, None, "gpu-ai", 384, False),
+            openai_tenant: TenantConfigSnapshot(openai_tenant, 0, None, "text-embedding-3-small", 1536, False),
+        }
+        service = EmbeddingService()
+        service.cache = None
+
+        openai_backend = MagicMock()
+        openai_backend.embed = AsyncMock(return_value=np.full((1, 1536), 0.5, dtype=np.float32))
+
+        with patch.object(embedding_module.tenant_config_cache, "get", AsyncMock(side_effect=snapshots.get)), \
+             patch.object(embedding_module.gpu_ai_client, "generate_embeddings", AsyncMock()) as gpu_ai, \
+             patch.object(embedding_module, "OPENAI_AVAILABLE", True), \
+             patch.object(service, "openai_backend", openai_backend):
+            assert await service._get_tenant_embedding_model(str(gpu_tenant)) == ("gpu-ai", 384)
+            embeddings = await service.generate_embeddings(["hello"], str(openai_tenant))
+
+        gpu_ai.assert_not_awaited()
+        assert embeddings.shape == (1, 1536)
+        assert np.allclose(embeddings, 0.5)
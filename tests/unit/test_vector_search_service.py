@@ -6,6 +6,7 @@ Tests cover:
 - Search with empty query (should raise ValidationError)
 - Query embedding generation
 - FAISS ID to document ID resolution
+- Aggregation of chunk hits per document, with the best passage
 - Result ranking and filtering
 - Tenant isolation
 - Error handling (embedding generation failure, FAISS search failure)
@@ -109,6 +110,7 @@ class TestVectorSearchService:
                 tenant_id=mock_tenant_id,
                 query_embedding=query_embedding,
                 k=k,
+                filters=None,
             )
             
             # Verify document resolution was called
@@ -248,12 +250,110 @@ class TestVectorSearchService:
                 tenant_id=mock_tenant_id,
                 query_embedding=query_embedding,
                 k=k,
+                filters=None,
             )
             
             # Verify results
             assert len(results) == 5
 
 
+class TestVectorSearchServiceBatch:
+    """Tests for VectorSearchService.search_batch()."""
+
+    @pytest.mark.asyncio
+    async def test_search_batch_embeds_and_resolves_once(
+        self, vector_search_service, mock_tenant_id, mock_document_ids
+    ):
+        """Queries are embedded in one request and resolved with one lookup."""
+        query_embeddings = np.random.rand(2, 384).astype(np.float32)
+        vector_search_service.embedding_service.generate_embeddings = AsyncMock(
+            return_value=query_embeddings
+        )
+        vector_search_service.faiss_manager.search_batch = MagicMock(return_value=[
+            [(100, 0.9), (200, 0.8)],
+            [(200, 0.7), (300, 0.6)],
+        ])
+        
+        mock_repo = MagicMock()
+        mock_repo.get_passages_by_faiss_ids = AsyncMock(return_value={})
+        mock_repo.get_document_ids_by_faiss_ids = AsyncMock(return_value={
+            100: mock_document_ids[0],
+            200: mock_document_ids[1],
+        })
+        
+        async def mock_get_db_session():
+            yield MagicMock()
+        
+        with patch("app.services.vector_search_service.get_db_session", mock_get_db_session), \
+             patch("app.services.vector_search_service.DocumentRepository", return_value=mock_repo), \
+             patch("app.services.vector_search_service.ingestion_settings.chunk_search_oversample", 1):
+            results = await vector_search_service.search_batch(
+                tenant_id=mock_tenant_id,
+                query_texts=["first query", "second query"],
+                k=2,
+            )
+        
+        vector_search_service.embedding_service.generate_embeddings.assert_awaited_once_with(
+            texts=["first query", "second query"],
+            tenant_id=str(mock_tenant_id),
+        )
+        vector_search_service.faiss_manager.search_batch.assert_called_once()
+        mock_repo.get_document_ids_by_faiss_ids.assert_awaited_once()
+        assert results == [
+            [(mock_document_ids[0], 0.9), (mock_document_ids[1], 0.8)],
+            [(mock_document_ids[1], 0.7)],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_batch_oversamples_crowded_queries(
+        self, vector_search_service, mock_tenant_id, mock_document_ids
+    ):
+        """Only queries whose chunk hits resolve to fewer than k documents are fetched again."""
+        query_embeddings = np.random.rand(2, 384).astype(np.float32)
+        vector_search_service.embedding_service.generate_embeddings = AsyncMock(
+            return_value=query_embeddings
+        )
+        vector_search_service.faiss_manager.search_batch = MagicMock(side_effect=[
+            [[(100, 0.9), (200, 0.8)], [(300, 0.7), (301, 0.6)]],
+            [[(300, 0.7), (301, 0.6), (400, 0.5), (401, 0.4)]],
+        ])
+        
+        async def mock_resolve(tenant_id, faiss_result_batches):
+            owners = {100: 0, 200: 1, 300: 2, 301: 2, 400: 3, 401: 3}
+            resolved = []
+            for faiss_results in faiss_result_batches:
+                best = {}
+                for faiss_id, score in faiss_results:
+                    best.setdefault(mock_document_ids[owners[faiss_id]], score)
+                resolved.append(list(best.items()))
+            return resolved
+        
+        with patch("app.services.vector_search_service._resolve_faiss_result_batches", mock_resolve), \
+             patch("app.services.vector_search_service.ingestion_settings.chunk_search_oversample", 2):
+            results = await vector_search_service.search_batch(
+                tenant_id=mock_tenant_id,
+                query_texts=["first query", "second query"],
+                k=2,
+            )
+        
+        second_call = vector_search_service.faiss_manager.search_batch.call_args_list[1].kwargs
+        assert second_call["k"] == 4
+        np.testing.assert_array_equal(second_call["query_embeddings"], query_embeddings[1:])
+        assert results == [
+            [(mock_document_ids[0], 0.9), (mock_document_ids[1], 0.8)],
+            [(mock_document_ids[2], 0.7), (mock_document_ids[3], 0.5)],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_batch_rejects_empty_query(self, vector_search_service, mock_tenant_id):
+        """An empty query text in the batch raises ValidationError."""
+        with pytest.raises(ValidationError, match="Query text cannot be empty"):
+            await vector_search_service.search_batch(
+                tenant_id=mock_tenant_id,
+                query_texts=["valid query", "  "],
+            )
+
+
 class TestResolveFAISSIDsToDocumentIDs:
     """Tests for _resolve_faiss_ids_to_document_ids function."""
 
@@ -263,7 +363,7 @@ class TestResolveFAISSIDsToDocumentIDs:
     ):
         """Test successful FAISS ID to document ID resolution."""
         # Create FAISS results
-        # FAISS IDs are hash(document_id) % (2**31)
+        # FAISS IDs are derived deterministically from document_id
         from app.services.vector_search_service import _document_id_to_faiss_id
         
         faiss_results = [
@@ -271,37 +371,35 @@ class TestResolveFAISSIDsToDocumentIDs:
             (_document_id_to_faiss_id(mock_document_ids[1]), 0.8),
             (_document_id_to_faiss_id(mock_document_ids[2]), 0.7),
         ]
-        
-        # Mock database documents
-        from app.db.models.document import Document
-        from sqlalchemy import select
-        
-        mock_documents = []
-        for i, doc_id in enumerate(mock_document_ids[:3]):
-            mock_doc = MagicMock()
-            mock_doc.document_id = doc_id
-            mock_doc.tenant_id = mock_tenant_id
-            mock_doc.deleted_at = None
-            mock_documents.append(mock_doc)
+        id_map = {
+            _document_id_to_faiss_id(doc_id): doc_id
+            for doc_id in mock_document_ids[:3]
+        }
         
         # Mock database session
         with patch("app.services.vector_search_service.get_db_session") as mock_session:
             mock_session_obj = AsyncMock()
             mock_session.return_value.__aiter__.return_value = [mock_session_obj]
             
-            # Mock query execution
-            mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = mock_documents
-            mock_session_obj.execute = AsyncMock(return_value=mock_result)
-            
-            # Mock DocumentRepository
-            with patch("app.services.vector_search_service.DocumentRepository"):
+            # Mock DocumentRepository indexed lookup
+            with patch("app.services.vector_search_service.DocumentRepository") as mock_repo_class:
+                mock_repo = MagicMock()
+                mock_repo.get_passages_by_faiss_ids = AsyncMock(return_value={})
+                mock_repo.get_document_ids_by_faiss_ids = AsyncMock(return_value=id_map)
+                mock_repo_class.return_value = mock_repo
+                
                 # Perform resolution
                 resolved_results = await _resolve_faiss_ids_to_document_ids(
                     tenant_id=mock_tenant_id,
                     faiss_results=faiss_results,
                 )
                 
+                # Verify a single lookup bounded by the k hits
+                mock_repo.get_document_ids_by_faiss_ids.assert_awaited_once_with(
+                    tenant_id=mock_tenant_id,
+                    faiss_ids=[faiss_id for faiss_id, _ in faiss_results],
+                )
+                
                 # Verify results
                 assert len(resolved_results) == 3
                 assert all(isinstance(r, tuple) and len(r) == 2 for r in resolved_results)
@@ -339,13 +437,13 @@ class TestResolveFAISSIDsToDocumentIDs:
             mock_session_obj = AsyncMock()
             mock_session.return_value.__aiter__.return_value = [mock_session_obj]
             
-            # Mock query execution - return empty list
-            mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = []
-            mock_session_obj.execute = AsyncMock(return_value=mock_result)
-            
-            # Mock DocumentRepository
-            with patch("app.services.vector_search_service.DocumentRepository"):
+            # Mock DocumentRepository - no rows match the FAISS IDs
+            with patch("app.services.vector_search_service.DocumentRepository") as mock_repo_class:
+                mock_repo = MagicMock()
+                mock_repo.get_passages_by_faiss_ids = AsyncMock(return_value={})
+                mock_repo.get_document_ids_by_faiss_ids = AsyncMock(return_value={})
+                mock_repo_class.return_value = mock_repo
+                
                 # Perform resolution
                 resolved_results = await _resolve_faiss_ids_to_document_ids(
                     tenant_id=mock_tenant_id,
@@ -356,4 +454,112 @@ class TestResolveFAISSIDsToDocumentIDs:
                 assert resolved_results == []
 
 
+class TestChunkAggregation:
+    """Tests for aggregating chunk hits into document results."""
+
+    @staticmethod
+    def _patch_repo(passages, legacy=None):
+        """Patch the session and a repository resolving chunk and legacy IDs."""
+        mock_repo = MagicMock()
+        mock_repo.get_passages_by_faiss_ids = AsyncMock(return_value=passages)
+        mock_repo.get_document_ids_by_faiss_ids = AsyncMock(return_value=legacy or {})
+
+        async def mock_get_db_session():
+            yield MagicMock()
+
+        return mock_repo, (
+            patch("app.services.vector_search_service.get_db_session", mock_get_db_session),
+            patch("app.services.vector_search_service.DocumentRepository", return_value=mock_repo),
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("aggregation, expected", [("max", [0.9, 0.8]), ("sum", [1.0, 0.8 / 1.6])])
+    async def test_chunk_hits_aggregated_with_best_passage(
+        self, mock_tenant_id, mock_document_ids, aggregation, expected
+    ):
+        """Chunks of one document combine into one result; its best chunk is the passage."""
+        from app.services.passage_context import passage_scope
+
+        chunked, legacy = mock_document_ids[0], mock_document_ids[1]
+        mock_repo, patches = self._patch_repo(
+            passages={1: (chunked, 0, 0, 100), 2: (chunked, 3, 250, 400)},
+            legacy={3: legacy},
+        )
+
+        with patches[0], patches[1], \
+             patch("app.services.vector_search_service.ingestion_settings.chunk_aggregation", aggregation), \
+             passage_scope() as passages:
+            results = await _resolve_faiss_ids_to_document_ids(
+                tenant_id=mock_tenant_id,
+                faiss_results=[(2, 0.9), (3, 0.8), (1, 0.7)],
+            )
+
+        assert [document_id for document_id, _ in results] == [chunked, legacy]
+        assert [score for _, score in results] == pytest.approx(expected)
+        assert passages.get(chunked) == {"chunk_no": 3, "start_offset": 250, "end_offset": 400, "score": 0.9}
+        assert passages.get(legacy) is None
+        mock_repo.get_document_ids_by_faiss_ids.assert_awaited_once_with(tenant_id=mock_tenant_id, faiss_ids=[3])
+
+    @pytest.mark.asyncio
+    async def test_search_fetches_more_chunks_when_documents_are_crowded_out(
+        self, vector_search_service, mock_tenant_id, query_embedding, mock_document_ids
+    ):
+        """A full page of hits on too few documents is searched again with oversampling."""
+        vector_search_service.embedding_service.generate_embedding = AsyncMock(return_value=query_embedding)
+        vector_search_service.faiss_manager.search = MagicMock(side_effect=[
+            [(1, 0.9), (2, 0.8)],
+            [(1, 0.9), (2, 0.8), (3, 0.7), (4, 0.6)],
+        ])
+        _, patches = self._patch_repo(passages={
+            1: (mock_document_ids[0], 0, 0, 10),
+            2: (mock_document_ids[0], 1, 8, 20),
+            3: (mock_document_ids[1], 0, 0, 10),
+            4: (mock_document_ids[2], 0, 0, 10),
+        })
+
+        with patches[0], patches[1], \
+             patch("app.services.vector_search_service.ingestion_settings.chunk_search_oversample", 2):
+            results = await vector_search_service.search(tenant_id=mock_tenant_id, query_text="query", k=2)
 
+        assert [call.kwargs["k"] for call in vector_search_service.faiss_manager.search.call_args_list] == [2, 4]
+        assert results == [(mock_document_ids[0], 0.9), (mock_document_ids[1], 0.7)]
+
+
+class TestDocumentRepositoryFaissLookup:
+    """Tests for DocumentRepository.get_document_ids_by_faiss_ids."""
+
+    @pytest.mark.asyncio
+    async def test_lookup_uses_indexed_any_query(self, mock_tenant_id, mock_document_ids):
+        """Lookup issues one ANY() query selecting only ID columns."""
+        from sqlalchemy.dialects import postgresql
+        from app.db.repositories.document_repository import DocumentRepository
+        
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(101, mock_document_ids[0])]
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        
+        repo = DocumentRepository(mock_session)
+        id_map = await repo.get_document_ids_by_faiss_ids(mock_tenant_id, [101, 102])
+        
+        assert id_map == {101: mock_document_ids[0]}
+        mock_session.execute.assert_awaited_once()
+        
+        statement = mock_session.execute.call_args[0][0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ANY" in sql
+        assert "documents.faiss_id" in sql
+        assert "documents.deleted_at IS NULL" in sql
+        # Only ID columns are selected, never the full row or relationships
+        assert len(statement.selected_columns) == 2
+
+    @pytest.mark.asyncio
+    async def test_lookup_with_no_ids_skips_query(self, mock_tenant_id):
+        """Empty input returns without touching the database."""
+        from app.db.repositories.document_repository import DocumentRepository
+        
+        mock_session = AsyncMock()
+        repo = DocumentRepository(mock_session)
+        
+        assert await repo.get_document_ids_by_faiss_ids(mock_tenant_id, []) == {}
+        mock_session.execute.assert_not_called()